@@ -0,0 +1,35 @@
+from typing import Any
+
+class MockAsyncConnection:
+    def __init__(self):
+        self.commands = []
+        self.responses = []
+        self.batches = []
+        self.connected = True
+
+    async def connect(self):
+        self.connected = True
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def send_command(self, *args: Any) -> None:
+        self.commands.append(args)
+
+    async def send_commands(self, commands) -> None:
+        self.batches.append([tuple(args) for args in commands])
+        self.commands.extend(tuple(args) for args in commands)
+
+    async def read_response(self, decode=None) -> Any:
+        if self.responses:
+            response = self.responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+        return None
+
+    async def disconnect(self):
+        self.connected = False
+
+    def set_responses(self, responses):
+        self.responses = responses[:]
@@ -1,9 +1,10 @@
-from typing import Union, Any
+from typing import Any
 
 class MockConnection:
     def __init__(self):
         self.commands = []
         self.responses = []
+        self.batches = []
         self.connected = True
 
     def connect(self):
@@ -15,9 +16,16 @@ class MockConnection:
     def send_command(self, *args: Any) -> None:
         self.commands.append(args)
 
-    def read_response(self) -> Union[str, int, None]:
+    def send_commands(self, commands) -> None:
+        self.batches.append([tuple(args) for args in commands])
+        self.commands.extend(tuple(args) for args in commands)
+
+    def read_response(self, decode=None) -> Any:
         if self.responses:
-            return self.responses.pop(0)
+            response = self.responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
         return None
 
     def disconnect(self):
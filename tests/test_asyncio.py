@@ -0,0 +1,247 @@
+import asyncio
+
+import pytest
+
+from zumic.asyncio import AsyncClient, AsyncConnection, AsyncConnectionPool
+from zumic.exceptions import ConnectionError, ResponseError
+
+from tests.mocks.mock_async_connection import MockAsyncConnection
+
+class DummyWriter:
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+
+    def write(self, data):
+        self.sent.append(bytes(data))
+
+    def writelines(self, buffers):
+        self.sent.append(b"".join(buffers))
+
+    async def drain(self):
+        pass
+
+    def is_closing(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        pass
+
+def make_connection(data, eof=False):
+    conn = AsyncConnection()
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    if eof:
+        reader.feed_eof()
+    conn._reader = reader
+    conn._writer = DummyWriter()  # type: ignore[assignment]
+    return conn
+
+def make_client(responses):
+    mock = MockAsyncConnection()
+    mock.set_responses(responses)
+    return AsyncClient(connection=mock), mock  # type: ignore[arg-type]
+
+def test_async_read_response_types():
+    async def run():
+        conn = make_connection(b"+OK\r\n:5\r\n$3\r\nfoo\r\n*2\r\n$1\r\na\r\n$-1\r\n")
+        assert await conn.read_response() == "OK"
+        assert await conn.read_response() == 5
+        assert await conn.read_response() == "foo"
+        assert await conn.read_response() == ["a", None]
+
+    asyncio.run(run())
+
+def test_async_read_response_error():
+    async def run():
+        conn = make_connection(b"-ERR bad\r\n")
+        with pytest.raises(ResponseError):
+            await conn.read_response()
+
+    asyncio.run(run())
+
+def test_async_read_response_closed():
+    async def run():
+        conn = make_connection(b"$10\r\nabc", eof=True)
+        with pytest.raises(ConnectionError):
+            await conn.read_response()
+        assert not conn.is_connected()
+
+    asyncio.run(run())
+
+def test_async_send_command():
+    async def run():
+        conn = make_connection(b"")
+        await conn.send_command("GET", "foo")
+        assert conn._writer.sent == [b"*2\r\n$3\r\nGET\r\n$3\r\nfoo\r\n"]  # type: ignore[union-attr]
+
+    asyncio.run(run())
+
+def test_async_client_commands():
+    async def run():
+        client, mock = make_client(["OK", "bar", 1, 3])
+        assert await client.set("foo", "bar") is True
+        assert await client.get("foo") == "bar"
+        assert await client.delete("foo") is True
+        assert await client.incr("counter") == 3
+        assert mock.commands[0] == ("SET", "foo", "bar")
+
+    asyncio.run(run())
+
+def test_async_pipeline():
+    async def run():
+        client, mock = make_client(["OK", ResponseError("ERR"), 2])
+        async with client.pipeline(raise_on_error=False) as pipe:
+            pipe.set("foo", "bar").incr("foo").incr("counter")
+            result = await pipe.execute()
+        assert result[0] is True
+        assert isinstance(result[1], ResponseError)
+        assert result[2] == 2
+        assert len(mock.batches) == 1
+
+    asyncio.run(run())
+
+def test_async_transaction_single_write():
+    async def run():
+        client, mock = make_client(["OK", "QUEUED", "QUEUED", ["OK", 5]])
+        pipe = client.pipeline(transaction=True)
+        pipe.set("foo", "bar").incr("n")
+        assert await pipe.execute() == [True, 5]
+        assert mock.batches == [[("MULTI",), ("SET", "foo", "bar"), ("INCR", "n"), ("EXEC",)]]
+
+        # Явный multi() тоже отправляет очередь атомарно
+        mock.set_responses(["OK", "QUEUED", [1]])
+        mock.batches.clear()
+        pipe = client.pipeline()
+        pipe.multi()
+        pipe.incr("n")
+        assert await pipe.execute() == [1]
+        assert mock.batches == [[("MULTI",), ("INCR", "n"), ("EXEC",)]]
+
+    asyncio.run(run())
+
+def test_async_watch_runs_immediately_and_aborted_exec_raises():
+    from zumic.exceptions import WatchError
+
+    async def run():
+        client, mock = make_client(["OK", "10", "OK", "QUEUED", None, "OK", "OK"])
+        pipe = client.pipeline(transaction=True)
+        assert await pipe.watch("stock") is True
+        assert await pipe.get("stock") == "10"
+        pipe.multi()
+        assert pipe.set("stock", 9) is pipe
+        with pytest.raises(WatchError):
+            await pipe.execute()
+        assert mock.commands[:2] == [("WATCH", "stock"), ("GET", "stock")]
+        assert mock.batches == [[("MULTI",), ("SET", "stock", 9), ("EXEC",)]]
+        assert not pipe.watching
+
+        mock.commands.clear()
+        async with client.pipeline() as pipe:
+            await pipe.watch("a")
+        assert mock.commands == [("WATCH", "a"), ("UNWATCH",)]
+        assert not pipe.watching
+
+    asyncio.run(run())
+
+def test_async_transaction_contention_with_server():
+    from zumic.benchmark import ZSPServer
+    from zumic.exceptions import WatchError
+
+    async def incr(client, times):
+        for _ in range(times):
+            while True:
+                async with client.pipeline(transaction=True) as pipe:
+                    await pipe.watch("counter")
+                    value = int(await pipe.get("counter") or 0)
+                    await asyncio.sleep(0)
+                    pipe.multi()
+                    pipe.set("counter", value + 1)
+                    try:
+                        await pipe.execute()
+                        break
+                    except WatchError:
+                        continue
+
+    async def run(host, port):
+        clients = [AsyncClient(host=host, port=port, timeout=5) for _ in range(4)]
+        await asyncio.gather(*(incr(client, 20) for client in clients))
+        assert await clients[0].get("counter") == "80"
+        for client in clients:
+            await client.close()
+
+    with ZSPServer() as server:
+        asyncio.run(run(*server.address))
+
+def test_async_pool_checkout_and_timeout():
+    async def run():
+        pool = AsyncConnectionPool(
+            max_connections=1, timeout=0.01, connection_class=MockAsyncConnection
+        )
+        conn = await pool.get_connection()
+        with pytest.raises(ConnectionError):
+            await pool.get_connection()
+        await pool.release(conn)
+        assert await pool.get_connection() is conn
+        stats = pool.stats()
+        assert stats.timeouts == 1
+        assert stats.checkouts == 2
+
+    asyncio.run(run())
+
+def test_async_client_with_pool_concurrent():
+    async def run():
+        pool = AsyncConnectionPool(max_connections=2, connection_class=MockAsyncConnection)
+        client = AsyncClient(connection_pool=pool)
+        results = await asyncio.gather(*(client.ping() for _ in range(10)))
+        assert results == [False] * 10  # MockAsyncConnection без ответов возвращает None
+        assert pool.stats().total <= 2
+        await client.close()
+
+    asyncio.run(run())
+
+def test_async_delete_exists_without_keys():
+    async def run():
+        client, mock = make_client([])
+        assert await client.delete() is False
+        assert await client.exists() is False
+        assert mock.commands == []
+
+    asyncio.run(run())
+
+def test_async_multi_key_commands():
+    async def run():
+        client, mock = make_client([["1", None], ["3"], 2])
+        assert await client.mget(["a", "b", "c"], chunk_size=2) == ["1", None, "3"]
+        assert await client.mdel(["a", "b"]) == 2
+        assert await client.mset({}) is True
+        assert mock.batches == [[("MGET", "a", "b"), ("MGET", "c")], [("DEL", "a", "b")]]
+
+    asyncio.run(run())
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_async_scan_iter(prefetch):
+    async def run():
+        client, mock = make_client([["3", ["a"]], ["0", ["b", "c"]]])
+        keys = [key async for key in client.scan_iter(prefetch=prefetch)]
+        assert keys == ["a", "b", "c"]
+        assert mock.commands == [("SCAN", 0), ("SCAN", 3)]
+
+    asyncio.run(run())
+
+def test_async_unix_socket(tmp_path):
+    from zumic.benchmark import UnixZSPServer
+
+    path = str(tmp_path / "zumic.sock")
+
+    async def scenario():
+        client = AsyncClient(unix_socket_path=path, timeout=5)
+        assert await client.set("foo", "bar") is True
+        assert await client.get("foo") == "bar"
+        await client.close()
+
+    with UnixZSPServer(path):
+        asyncio.run(scenario())
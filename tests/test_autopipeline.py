@@ -0,0 +1,154 @@
+import asyncio
+import threading
+
+import pytest
+
+from zumic.asyncio import AsyncClient
+from zumic.autopipeline import AutoPipeline
+from zumic.benchmark import ZSPServer
+from zumic.client import Client
+from zumic.exceptions import ConnectionError, ResponseError
+
+class EchoConnection:
+    """Соединение, отвечающее вторым аргументом команды."""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.connected = False
+        self.connects = 0
+        self.sent = []
+        self.read = 0
+        self.writes = 0
+
+    def connect(self):
+        with self.cond:
+            self.connected = True
+            self.connects += 1
+            self.sent, self.read = [], 0
+
+    def is_connected(self):
+        return self.connected
+
+    def send_command(self, *args):
+        self.send_commands([args])
+
+    def send_commands(self, commands):
+        with self.cond:
+            if not self.connected:
+                raise ConnectionError("closed")
+            self.sent.extend(tuple(args) for args in commands)
+            self.writes += 1
+            self.cond.notify_all()
+
+    def read_response(self, decode=None):
+        with self.cond:
+            self.cond.wait_for(lambda: len(self.sent) > self.read or not self.connected)
+            if not self.connected:
+                raise ConnectionError("closed")
+            args = self.sent[self.read]
+            self.read += 1
+        if args[0] == "FAIL":
+            raise ConnectionError("broken")
+        if args[0] == "ERR":
+            raise ResponseError("ERR bad")
+        return args[1]
+
+    def disconnect(self):
+        with self.cond:
+            self.connected = False
+            self.cond.notify_all()
+
+def test_concurrent_callers_share_batches():
+    connection = EchoConnection()
+    with AutoPipeline(connection) as pipe:
+        results = {}
+
+        def work(i):
+            results[i] = [pipe.execute("ECHO", f"{i}:{j}") for j in range(50)]
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for i in range(16):
+            assert results[i] == [f"{i}:{j}" for j in range(50)]
+        assert pipe.commands == 800
+        assert connection.writes == pipe.batches
+        assert connection.connects == 1
+
+def test_server_error_goes_to_its_caller():
+    with AutoPipeline(EchoConnection()) as pipe:
+        futures = [pipe.submit("ECHO", "a"), pipe.submit("ERR"), pipe.submit("ECHO", "b")]
+        assert futures[0].result() == "a"
+        with pytest.raises(ResponseError):
+            futures[1].result()
+        assert futures[2].result() == "b"
+
+def test_connection_error_fails_pending_and_reconnects():
+    connection = EchoConnection()
+    with AutoPipeline(connection) as pipe:
+        assert pipe.execute("ECHO", "a") == "a"
+        with pytest.raises(ConnectionError):
+            pipe.execute("FAIL")
+        assert pipe.execute("ECHO", "b") == "b"
+        assert connection.connects == 2
+
+def test_submit_many_keeps_commands_together():
+    connection = EchoConnection()
+    with AutoPipeline(connection) as pipe:
+        futures = pipe.submit_many([("ECHO", i) for i in range(10)])
+        assert [f.result() for f in futures] == list(range(10))
+
+def test_close_rejects_new_commands():
+    pipe = AutoPipeline(EchoConnection())
+    assert pipe.execute("ECHO", 1) == 1
+    pipe.close()
+    with pytest.raises(ConnectionError):
+        pipe.submit("ECHO", 2)
+
+def test_auto_pipeline_rejects_custom_connection():
+    with pytest.raises(ValueError):
+        Client(connection=EchoConnection(), auto_pipeline=True)
+    with pytest.raises(ValueError):
+        AsyncClient(connection=EchoConnection(), auto_pipeline=True)  # type: ignore[arg-type]
+
+def test_client_auto_pipeline_against_server():
+    with ZSPServer() as server:
+        host, port = server.address
+        client = Client(host=host, port=port, timeout=5, auto_pipeline=True)
+        errors = []
+
+        def work(i):
+            try:
+                for j in range(20):
+                    assert client.set(f"k{i}", j) is True
+                    assert client.get(f"k{i}") == str(j)
+            except Exception as e:  # pragma: no cover - диагностика
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        with pytest.raises(ResponseError):
+            client.execute("NOSUCHCOMMAND")
+        # Конвейер идёт через обычное соединение клиента
+        assert client.pipeline().get("k0").execute() == ["19"]
+        client.close()
+
+def test_async_client_auto_pipeline():
+    with ZSPServer() as server:
+        host, port = server.address
+
+        async def main():
+            client = AsyncClient(host=host, port=port, timeout=5, auto_pipeline=True)
+            await asyncio.gather(*(client.set(f"a{i}", i) for i in range(100)))
+            values = await asyncio.gather(*(client.get(f"a{i}") for i in range(100)))
+            assert values == [str(i) for i in range(100)]
+            assert client._auto_pipeline.batches < client._auto_pipeline.commands
+            await client.close()
+
+        asyncio.run(main())
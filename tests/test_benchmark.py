@@ -0,0 +1,84 @@
+import pytest
+
+from zumic.benchmark import (
+    BenchmarkResult,
+    ZSPServer,
+    compare,
+    default_scenarios,
+    percentile,
+    run_benchmark,
+)
+from zumic.benchmark.__main__ import main
+from zumic.client import Client
+
+@pytest.fixture
+def server():
+    with ZSPServer() as server:
+        yield server
+
+def make_client(server, **kwargs):
+    host, port = server.address
+    return Client(host=host, port=port, timeout=5, **kwargs)
+
+def test_server_speaks_zsp(server):
+    client = make_client(server)
+    assert client.ping() is True
+    assert client.set("foo", "bar") is True
+    assert client.get("foo") == "bar"
+    assert client.mget(["foo", "missing"]) == ["bar", None]
+    assert client.incr("n") == 1
+    assert client.delete_count("foo", "n", "missing") == 2
+    assert client.dbsize() == 0
+    client.close()
+
+def test_server_pipeline_and_large_value(server):
+    client = make_client(server, decode_responses=False)
+    value = bytes(range(256)) * 4096
+    pipe = client.pipeline()
+    pipe.set("big", value).get("big").strlen("big")
+    assert pipe.execute() == [True, value, len(value)]
+    client.close()
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile(values, 0.999) == 100.0
+    assert percentile([], 0.5) == 0.0
+
+def test_run_benchmark_collects_latencies(server):
+    result = run_benchmark(
+        "PING", lambda: make_client(server).ping, ops=50, concurrency=2, allocations=True
+    )
+    assert result.ops == 50
+    assert len(result.latencies) == 50
+    assert result.ops_per_sec > 0
+    assert 0 < result.p50 <= result.p99 <= result.p999
+    assert result.alloc_bytes_per_op is not None
+
+def test_default_scenarios_cover_sizes_and_concurrency(server):
+    scenarios = list(
+        default_scenarios(lambda: make_client(server), ops=10, sizes=(10, 1000),
+                          concurrency=(1, 2), pipeline_size=4)
+    )
+    names = [s["name"] for s in scenarios]
+    assert "PING" in names and "GET 1000B" in names
+    assert "PIPELINE x4 10B" in names and "GET 100B c=2" in names
+    for scenario in scenarios:
+        assert run_benchmark(**scenario).ops == scenario["ops"]
+
+def test_compare_reports_regressions():
+    result = BenchmarkResult("GET", ops=100, elapsed=1.0, latencies=[0.002] * 100)
+    baseline = [{"name": "GET", "ops_per_sec": 200.0, "p99": 0.001}]
+    assert len(compare([result], baseline)) == 2
+    assert compare([result], [{"name": "GET", "ops_per_sec": 100.0, "p99": 0.002}]) == []
+
+def test_cli_in_process(tmp_path, capsys):
+    report = tmp_path / "result.json"
+    code = main([
+        "--in-process", "--ops", "20", "--sizes", "10", "--concurrency", "1",
+        "--pipeline", "4", "--no-alloc", "--json", str(report),
+    ])
+    assert code == 0
+    assert "PING" in capsys.readouterr().out
+    assert report.exists()
@@ -0,0 +1,115 @@
+import pytest
+
+from zumic.cache import NearCache
+from zumic.client import Client
+from zumic.exceptions import ConnectionError
+
+from tests.mocks.mock_connection import MockConnection
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_client(responses, **cache_kwargs):
+    mock = MockConnection()
+    mock.set_responses(responses)
+    cache = NearCache(**cache_kwargs)
+    return Client(connection=mock, cache=cache), mock, cache
+
+def test_get_served_from_cache():
+    client, mock, cache = make_client(["bar"])
+    assert client.get("foo") == "bar"
+    assert client.get("foo") == "bar"
+    assert mock.commands == [("GET", "foo")]
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+    assert stats.hit_rate == 0.5
+
+@pytest.mark.parametrize("call", [
+    lambda c: c.set("foo", "baz"),
+    lambda c: c.delete("foo"),
+    lambda c: c.expire("foo", 10),
+    lambda c: c.incr("foo"),
+    lambda c: c.append("foo", "x"),
+    lambda c: c.flushdb(),
+    lambda c: c.mset({"x": "1", "foo": "2"}),
+])
+def test_own_writes_invalidate(call):
+    client, mock, cache = make_client(["bar", "OK", "new"])
+    client.get("foo")
+    call(client)
+    assert client.get("foo") == "new"
+    assert mock.commands[-1] == ("GET", "foo")
+
+def test_write_error_still_invalidates():
+    client, mock, cache = make_client(["bar", ConnectionError("boom"), "new"])
+    client.get("foo")
+    with pytest.raises(ConnectionError):
+        client.set("foo", "baz")
+    assert client.get("foo") == "new"
+
+def test_pipeline_writes_invalidate():
+    client, mock, cache = make_client(["bar", "OK", "new"])
+    client.get("foo")
+    client.pipeline().set("foo", "baz").execute()
+    assert client.get("foo") == "new"
+
+def test_lru_eviction():
+    cache = NearCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.lookup("a")
+    cache.put("c", 3)
+    assert cache.is_miss(cache.lookup("b"))
+    assert cache.lookup("a") == 1
+    assert cache.stats().evictions == 1
+
+def test_ttl_expiration():
+    clock = FakeClock()
+    cache = NearCache(ttl=5, clock=clock)
+    cache.put("a", 1)
+    clock.now = 4.9
+    assert cache.lookup("a") == 1
+    clock.now = 5.0
+    assert cache.is_miss(cache.lookup("a"))
+    assert cache.stats().expirations == 1
+
+def test_stale_put_rejected_after_invalidation():
+    cache = NearCache()
+    reservation = cache.reserve()
+    cache.invalidate("a")
+    assert cache.put("a", "old", reservation) is False
+    assert cache.is_miss(cache.lookup("a"))
+
+def test_server_invalidation_and_bytes_keys():
+    cache = NearCache()
+    cache.put(b"a", 1)
+    cache.put("b", 2)
+    cache.handle_invalidation(["a"])
+    assert cache.is_miss(cache.lookup("a"))
+    cache.handle_invalidation(None)
+    assert len(cache) == 0
+def test_codec_values_cached_raw_and_invalidated_by_transaction():
+    from zumic.serialization import ValueCodec
+
+    codec = ValueCodec()
+    encoded = codec.encode({"a": [1, 2]})
+    mock = MockConnection()
+    mock.set_responses([encoded, "OK", "QUEUED", ["OK"], codec.encode({"a": [3]})])
+    cache = NearCache()
+    client = Client(connection=mock, cache=cache, codec=codec)
+    first = client.get("obj")
+    assert first == {"a": [1, 2]}
+    # Кэш хранит байты, поэтому каждый вызов получает свой объект
+    first["a"].append(3)
+    assert client.get("obj") == {"a": [1, 2]}
+    assert mock.commands == [("GET", "obj")]
+    assert cache.stats().hits == 1
+
+    client.pipeline(transaction=True).set("obj", {"a": [3]}).execute()
+    assert client.get("obj") == {"a": [3]}
+    assert mock.commands[-1] == ("GET", "obj")
+    assert cache.stats().misses == 2
@@ -70,3 +70,88 @@ def test_execute_empty():
     client, mock = make_client_with_response([])
     with pytest.raises(ValueError):
         client.execute()
+
+def test_raw_mode_keeps_bytes():
+    mock = MockConnection()
+    mock.set_responses([b"OK", b"\xff\x00", b"PONG"])
+    client = Client(connection=mock, decode_responses=False)
+    assert client.set("foo", b"\xff\x00") is True
+    assert client.get("foo") == b"\xff\x00"
+    assert client.ping() is True
+
+def test_get_per_call_decode():
+    mock = MockConnection()
+    mock.set_responses([b"bar"])
+    client = Client(connection=mock)
+    assert client.get("foo", decode=False) == b"bar"
+
+def test_delete_exists_count():
+    client, mock = make_client_with_response([2, 3])
+    assert client.delete_count("a", "b", "c") == 2
+    assert client.exists_count("a", "a", "b") == 3
+    assert client.delete_count() == 0
+    assert mock.commands == [("DEL", "a", "b", "c"), ("EXISTS", "a", "a", "b")]
+
+def test_mget_chunks_in_one_batch():
+    client, mock = make_client_with_response([["1", None], ["3"]])
+    assert client.mget(iter(["a", "b", "c"]), chunk_size=2) == ["1", None, "3"]
+    assert mock.batches == [[("MGET", "a", "b"), ("MGET", "c")]]
+
+def test_mset_and_mdel_chunks():
+    client, mock = make_client_with_response(["OK", "OK", 2, 1])
+    assert client.mset({"a": "1", "b": "2", "c": "3"}, chunk_size=2) is True
+    assert mock.batches[0] == [("MSET", "a", "1", "b", "2"), ("MSET", "c", "3")]
+    assert client.mdel(["a", "b", "c"], chunk_size=2) == 3
+    assert mock.batches[1] == [("DEL", "a", "b"), ("DEL", "c")]
+
+def test_multi_key_commands_without_keys():
+    client, mock = make_client_with_response([])
+    assert client.mget([]) == []
+    assert client.mset({}) is True
+    assert client.mdel([]) == 0
+    assert mock.batches == []
+
+def test_mget_invalid_chunk_size():
+    client, mock = make_client_with_response([])
+    with pytest.raises(ValueError):
+        client.mget(["a"], chunk_size=0)
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_scan_iter_walks_cursor(prefetch):
+    client, mock = make_client_with_response([["7", ["a", "b"]], ["0", ["c"]]])
+    keys = list(client.scan_iter(match="k*", count=2, prefetch=prefetch))
+    assert keys == ["a", "b", "c"]
+    assert mock.commands == [
+        ("SCAN", 0, "MATCH", "k*", "COUNT", 2),
+        ("SCAN", 7, "MATCH", "k*", "COUNT", 2),
+    ]
+
+def test_scan_iter_is_lazy():
+    client, mock = make_client_with_response([["5", ["a"]], ["0", ["b"]]])
+    it = client.scan_iter()
+    assert next(it) == "a"
+    assert mock.commands == [("SCAN", 0)]
+
+def test_prepared_command():
+    client, mock = make_client_with_response(["OK", "OK", "bar"])
+    set_ = client.prepare("SET", 2, callback=lambda r: r == "OK")
+    assert set_("a", "1") is True
+    assert set_("b", 2) is True
+    assert client.prepare("GET")("a") == "bar"
+    assert [c[1:] for c in mock.commands] == [("a", "1"), ("b", 2), ("a",)]
+    assert mock.commands[0][0].name == "SET"
+
+def test_prepared_command_in_pipeline():
+    client, mock = make_client_with_response([1, 2])
+    pipe = client.pipeline()
+    incr = pipe.prepare("INCR", 1)
+    incr("a")
+    incr("b")
+    assert pipe.execute() == [1, 2]
+
+def test_int_arguments_passed_without_str():
+    client, mock = make_client_with_response(["OK", True, 3])
+    client.set("k", "v", ex=10)
+    client.expire("k", 5)
+    client.incrby("n", 3)
+    assert mock.commands == [("SET", "k", "v", "EX", 10), ("EXPIRE", "k", 5), ("INCRBY", "n", 3)]
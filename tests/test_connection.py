@@ -2,7 +2,14 @@ import pytest
 import socket
 
 from zumic.connection import Connection
-from zumic.exceptions import ConnectionError, ResponseError
+from zumic.encoder import (
+    BUFFER_CUTOFF,
+    CommandTemplate,
+    pack_command,
+    pack_command_buffers,
+    pack_commands_buffers,
+)
+from zumic.exceptions import ConnectionError, InvalidResponse, ResponseError
 
 class DummySocket:
     def __init__(self, recv_data=b"+PONG\r\n"):
@@ -18,6 +25,9 @@ class DummySocket:
         self._data = b""
         return r
 
+    def shutdown(self, how):
+        pass
+
     def close(self):
         self.closed = True
 
@@ -66,42 +76,89 @@ def test_read_response_int(monkeypatch):
 
     assert conn.read_response() == 42
 
-def test_read_response_bulk(monkeypatch):
-    class BulkSocket(DummySocket):
-        def __init__(self):
-            self._calls = 0
-            self.sent = []
-            self.closed = False
-
-        def recv(self, bufsize):
-            self._calls += 1
-            if self._calls == 1:
-                return b"$3\r\n"
-            elif self._calls == 2:
-                return b"foo\r\n"
+class ChunkSocket(DummySocket):
+    """Сокет, отдающий заранее заданные куски данных по одному за recv."""
+
+    def __init__(self, chunks):
+        super().__init__(b"")
+        self._chunks = list(chunks)
+        self.recv_calls = 0
+
+    def recv(self, bufsize):
+        self.recv_calls += 1
+        if not self._chunks:
             return b""
+        chunk = self._chunks.pop(0)
+        if len(chunk) > bufsize:
+            self._chunks.insert(0, chunk[bufsize:])
+            chunk = chunk[:bufsize]
+        return chunk
 
-    conn = Connection()
-    dummy = BulkSocket()
-    conn._sock = dummy  # type: ignore[assignment]
+    def recv_into(self, buffer):
+        data = self.recv(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+def make_connection(chunks, **kwargs):
+    conn = Connection(**kwargs)
+    conn._sock = ChunkSocket(chunks)  # type: ignore[assignment]
     conn._connected = True
+    return conn
 
-    # Подмена метода receive для чтения bulk данных
-    monkeypatch.setattr(
-        conn,
-        "receive",
-        lambda size=4096: b"$3\r\n" if size == 4096 else b"foo\r\n"
-    )
+def test_read_response_bulk():
+    conn = make_connection([b"$3\r\n", b"foo\r\n"])
+    assert conn.read_response() == "foo"
+
+def test_read_response_null_bulk():
+    conn = make_connection([b"$-1\r\n"])
+    assert conn.read_response() is None
+
+def test_read_response_partial_frames():
+    conn = make_connection([b"$1", b"1\r\nhello", b" worl", b"d\r", b"\n"])
+    assert conn.read_response() == "hello world"
+
+def test_read_response_multiple_replies_in_one_recv():
+    conn = make_connection([b"+OK\r\n:5\r\n$3\r\nbar\r\n"])
+    assert conn.read_response() == "OK"
+    assert conn.read_response() == 5
+    assert conn.read_response() == "bar"
+    assert conn._sock.recv_calls == 1  # type: ignore[union-attr]
+
+def test_read_response_nested_arrays():
+    conn = make_connection([b"*3\r\n:1\r\n*2\r\n$1\r\na\r\n$-1\r\n", b"*0\r\n"])
+    assert conn.read_response() == [1, ["a", None], []]
 
-    result = conn._parse_response(b"$3\r\n")
-    assert result == "foo"
+def test_read_response_error_inside_array():
+    conn = make_connection([b"*2\r\n+OK\r\n-ERR bad\r\n"])
+    result = conn.read_response()
+    assert result[0] == "OK"
+    assert isinstance(result[1], ResponseError)
+
+def test_read_response_large_bulk():
+    payload = b"x" * 100_000
+    frame = b"$%d\r\n" % len(payload) + payload + b"\r\n+OK\r\n"
+    chunks = [frame[i : i + 1000] for i in range(0, len(frame), 1000)]
+    conn = make_connection(chunks, socket_read_size=4096)
+    assert conn.read_response() == payload.decode()
+    assert conn.read_response() == "OK"
+
+def test_read_response_invalid_disconnects():
+    conn = make_connection([b"?oops\r\n"])
+    with pytest.raises(InvalidResponse):
+        conn.read_response()
+    assert not conn.is_connected()
+
+def test_read_response_connection_closed():
+    conn = make_connection([b"$10\r\nabc"])
+    with pytest.raises(ConnectionError):
+        conn.read_response()
 
 def raise_oserror(*args, **kwargs):
     raise OSError("fail")
 
 def test_connect_fail(monkeypatch):
     conn = Connection(host="unreachable", port=12345)
-    monkeypatch.setattr(socket, "create_connection", raise_oserror)
+    monkeypatch.setattr(socket, "getaddrinfo", raise_oserror)
     with pytest.raises(ConnectionError):
         conn.connect()
 
@@ -113,3 +170,163 @@ def test_disconnect_closes(monkeypatch):
     conn.disconnect()
     assert dummy.closed
     assert not conn._connected
+
+def test_send_commands_single_write():
+    conn = Connection()
+    dummy = DummySocket()
+    conn._sock = dummy  # type: ignore[assignment]
+    conn._connected = True
+    conn.send_commands([("PING",), ("GET", "foo")])
+    assert dummy.sent == [b"*1\r\n$4\r\nPING\r\n*2\r\n$3\r\nGET\r\n$3\r\nfoo\r\n"]
+
+def test_pack_command_buffers_large_arg_not_copied():
+    value = b"v" * (BUFFER_CUTOFF + 1)
+    buffers = pack_command_buffers("SET", "foo", value)
+    assert len(buffers) == 3
+    assert buffers[1] is value
+    assert b"".join(buffers) == Connection().pack_command("SET", "foo", value)
+
+def test_pack_command_accepts_bytes_like():
+    view = memoryview(bytearray(b"bar"))
+    assert pack_command("SET", b"foo", view) == (
+        b"*3\r\n$3\r\nSET\r\n$3\r\nfoo\r\n$3\r\nbar\r\n"
+    )
+    with pytest.raises(TypeError):
+        pack_command("SET", "foo", 1.5)  # type: ignore[arg-type]
+
+def test_pack_command_int_fast_path():
+    assert pack_command("EXPIRE", "k", 10) == pack_command("EXPIRE", "k", "10")
+    assert pack_command("INCRBY", "k", -5) == b"*3\r\n$6\r\nINCRBY\r\n$1\r\nk\r\n$2\r\n-5\r\n"
+    with pytest.raises(TypeError):
+        pack_command("SET", "k", True)  # type: ignore[arg-type]
+
+def test_pack_command_long_lengths_and_names():
+    value = "v" * 2000
+    name = "X" * 100
+    expected = b"*2\r\n$100\r\n" + name.encode() + b"\r\n$2000\r\n" + value.encode() + b"\r\n"
+    assert pack_command(name, value) == expected
+    args = ["MGET"] + ["k"] * 70
+    assert pack_command(*args).startswith(b"*71\r\n$4\r\nMGET\r\n")
+
+def test_command_template_matches_plain_encoding():
+    template = CommandTemplate("SET", 2)
+    assert pack_command(template, "k", b"v") == pack_command("SET", "k", b"v")
+    # Другое число аргументов - заголовок формируется заново
+    assert pack_command(template, "k", "v", "NX") == pack_command("SET", "k", "v", "NX")
+    no_arity = CommandTemplate("PING")
+    batch = pack_commands_buffers([(no_arity,), (template, "a", "b")])
+    assert b"".join(batch) == pack_command("PING") + pack_command("SET", "a", "b")
+
+def test_pack_command_non_contiguous_memoryview():
+    view = memoryview(b"abcdef")[::2]
+    assert pack_command("SET", "k", view) == pack_command("SET", "k", b"ace")
+    large = memoryview(b"xy" * BUFFER_CUTOFF)[::2]
+    buffers = pack_command_buffers("SET", "k", large)
+    assert b"".join(buffers) == pack_command("SET", "k", b"x" * BUFFER_CUTOFF)
+
+def test_send_command_vectored_write():
+    left, right = socket.socketpair()
+    try:
+        conn = Connection()
+        conn._sock = left
+        conn._connected = True
+        value = bytes(range(256)) * 40
+        conn.send_command("SET", "foo", memoryview(value))
+        expected = pack_command("SET", "foo", value)
+        received = bytearray()
+        while len(received) < len(expected):
+            received += right.recv(65536)
+        assert bytes(received) == expected
+    finally:
+        left.close()
+        right.close()
+
+def test_read_response_raw_mode_returns_bytes():
+    conn = make_connection([b"$3\r\n\xff\x00\x01\r\n+OK\r\n*1\r\n$1\r\n\xfe\r\n"], decode_responses=False)
+    assert conn.read_response() == b"\xff\x00\x01"
+    assert conn.read_response() == b"OK"
+    assert conn.read_response() == [b"\xfe"]
+
+def test_read_response_per_call_decode():
+    conn = make_connection([b"$3\r\n\xff\x00\x01\r\n$3\r\nfoo\r\n"])
+    assert conn.read_response(decode=False) == b"\xff\x00\x01"
+    assert conn.read_response() == "foo"
+
+def test_read_response_raw_large_bulk_is_bytes():
+    payload = bytes(range(256)) * 100
+    frame = b"$%d\r\n" % len(payload) + payload + b"\r\n"
+    conn = make_connection([frame[:100], frame[100:]], socket_read_size=1024, decode_responses=False)
+    result = conn.read_response()
+    assert type(result) is bytes
+    assert result == payload
+
+def test_read_response_strict_encoding_errors():
+    conn = make_connection([b"$1\r\n\xff\r\n"], encoding_errors="strict")
+    with pytest.raises(UnicodeDecodeError):
+        conn.read_response()
+
+def test_unix_socket_round_trip(tmp_path):
+    from zumic.benchmark import UnixZSPServer
+
+    path = str(tmp_path / "zumic.sock")
+    with UnixZSPServer(path):
+        conn = Connection(unix_socket_path=path, timeout=5)
+        conn.send_command("SET", "foo", "bar")
+        assert conn.read_response() == "OK"
+        conn.send_command("GET", "foo")
+        assert conn.read_response() == "bar"
+        assert conn.address == f"unix://{path}"
+        conn.disconnect()
+
+def test_unix_socket_connect_fail(tmp_path):
+    conn = Connection(unix_socket_path=str(tmp_path / "missing.sock"))
+    with pytest.raises(ConnectionError, match="unix://"):
+        conn.connect()
+
+def test_tcp_socket_options():
+    from zumic.benchmark import ZSPServer
+
+    with ZSPServer() as server:
+        host, port = server.address
+        conn = Connection(
+            host=host,
+            port=port,
+            timeout=2,
+            socket_connect_timeout=0.5,
+            socket_keepalive=True,
+            receive_buffer_size=1 << 16,
+        )
+        conn.connect()
+        sock = conn._sock
+        assert sock is not None
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+        # После подключения действует таймаут чтения, а не подключения
+        assert sock.gettimeout() == 2
+        conn.disconnect()
+
+def test_connect_timeout_defaults_to_timeout():
+    assert Connection(timeout=3).socket_connect_timeout == 3
+    assert Connection(timeout=3, socket_connect_timeout=1).socket_connect_timeout == 1
+
+def test_dns_cache(monkeypatch):
+    from zumic import connection as connection_module
+
+    calls = []
+    real_getaddrinfo = socket.getaddrinfo
+
+    def counting_getaddrinfo(host, port, *args):
+        calls.append(host)
+        return real_getaddrinfo("127.0.0.1", port, *args)
+
+    monkeypatch.setattr(socket, "getaddrinfo", counting_getaddrinfo)
+    connection_module.clear_dns_cache()
+    try:
+        first = connection_module.resolve_address("zumic.test", 6174, cache_ttl=60)
+        second = connection_module.resolve_address("zumic.test", 6174, cache_ttl=60)
+        assert first == second
+        assert calls == ["zumic.test"]
+        connection_module.resolve_address("zumic.test", 6174)
+        assert len(calls) == 2
+    finally:
+        connection_module.clear_dns_cache()
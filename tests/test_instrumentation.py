@@ -0,0 +1,109 @@
+import logging
+
+import pytest
+
+from zumic.benchmark import ZSPServer
+from zumic.client import Client
+from zumic.exceptions import ResponseError
+from zumic.instrumentation import (
+    CommandEvent,
+    HistogramObserver,
+    LatencyHistogram,
+    Observer,
+    ObserverGroup,
+    SlowLogObserver,
+)
+
+from tests.mocks.mock_connection import MockConnection
+
+class RecordingObserver(Observer):
+    def __init__(self):
+        self.started = []
+        self.events = []
+
+    def before_command(self, name, args):
+        self.started.append((name, tuple(args)))
+
+    def after_command(self, event):
+        self.events.append(event)
+
+def make_client(responses, observer):
+    mock = MockConnection()
+    mock.set_responses(responses)
+    return Client(connection=mock, observer=observer), mock
+
+def test_hooks_called_around_command():
+    observer = RecordingObserver()
+    client, mock = make_client(["OK", ResponseError("ERR")], observer)
+    client.set("foo", "bar")
+    with pytest.raises(ResponseError):
+        client.incr("foo")
+    assert observer.started == [("SET", ("SET", "foo", "bar")), ("INCR", ("INCR", "foo"))]
+    assert [e.name for e in observer.events] == ["SET", "INCR"]
+    assert observer.events[0].error is None
+    assert isinstance(observer.events[1].error, ResponseError)
+    assert observer.events[0].duration >= 0
+
+def test_pipeline_reported_as_one_event():
+    observer = RecordingObserver()
+    client, mock = make_client(["OK", "bar"], observer)
+    client.pipeline().set("foo", "bar").get("foo").execute()
+    (event,) = observer.events
+    assert event.name == "PIPELINE"
+    assert event.commands == 2
+
+def test_phase_split_and_byte_counters():
+    observer = RecordingObserver()
+    with ZSPServer() as server:
+        host, port = server.address
+        client = Client(host=host, port=port, timeout=5, observer=observer)
+        client.set("foo", "x" * 1000)
+        client.get("foo")
+        client.close()
+    set_event, get_event = observer.events
+    assert set_event.bytes_written > 1000
+    assert set_event.bytes_read == len(b"+OK\r\n")
+    assert get_event.bytes_read > 1000
+    for event in observer.events:
+        assert event.wait_time > 0
+        parts = (event.encode_time, event.send_time, event.wait_time, event.parse_time)
+        assert all(part >= 0 for part in parts)
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for micros in range(1, 1001):
+        histogram.record(micros / 1e6)
+    assert histogram.count == 1000
+    # Погрешность корзин не больше ~19%
+    assert 500e-6 <= histogram.percentile(0.5) <= 500e-6 * 1.2
+    assert 990e-6 <= histogram.percentile(0.99) <= 1000e-6
+    assert histogram.max == 1000e-6
+    histogram.reset()
+    assert histogram.percentile(0.5) == 0.0
+
+def test_histogram_observer_aggregates_by_command():
+    histograms = HistogramObserver()
+    client, mock = make_client(["OK", "bar", ResponseError("ERR")], histograms)
+    client.set("foo", "bar")
+    client.get("foo")
+    with pytest.raises(ResponseError):
+        client.get("foo")
+    stats = histograms.stats()
+    assert stats["SET"].count == 1
+    assert (stats["GET"].count, stats["GET"].errors) == (2, 1)
+    assert stats["GET"].p50 <= stats["GET"].max
+
+def test_slow_log_threshold(caplog):
+    slowlog = SlowLogObserver(threshold=0.5, max_entries=2)
+    for duration in (0.1, 0.6, 0.7, 0.8):
+        slowlog.after_command(CommandEvent("GET", ("GET", "k"), 0.0, wait_time=duration))
+    with caplog.at_level(logging.WARNING, logger="zumic.slowlog"):
+        slowlog.after_command(CommandEvent("SET", ("SET", "k", "v"), 0.0, wait_time=1.0))
+    assert [e.duration for e in slowlog.entries()] == [0.8, 1.0]
+    assert "SET" in caplog.text
+
+def test_observer_group_fans_out():
+    first, second = RecordingObserver(), RecordingObserver()
+    client, mock = make_client(["PONG"], ObserverGroup(first, second))
+    client.ping()
+    assert len(first.events) == len(second.events) == 1
@@ -0,0 +1,219 @@
+import pytest
+
+from zumic.client import Client
+from zumic.exceptions import ResponseError
+
+from tests.mocks.mock_connection import MockConnection
+
+def make_pipeline(responses, **kwargs):
+    mock = MockConnection()
+    mock.set_responses(responses)
+    client = Client(connection=mock)
+    return client.pipeline(**kwargs), mock
+
+def test_pipeline_single_batch():
+    pipe, mock = make_pipeline(["OK", "bar", 2])
+    pipe.set("foo", "bar").get("foo")
+    pipe.incr("counter")
+    assert len(pipe) == 3
+    assert pipe.execute() == [True, "bar", 2]
+    assert mock.batches == [[("SET", "foo", "bar"), ("GET", "foo"), ("INCR", "counter")]]
+    assert len(pipe) == 0
+
+def test_pipeline_empty():
+    pipe, mock = make_pipeline([])
+    assert pipe.execute() == []
+    assert mock.batches == []
+
+def test_pipeline_errors_in_place():
+    pipe, mock = make_pipeline([1, ResponseError("ERR wrong type"), True], raise_on_error=False)
+    pipe.incr("a").incr("b").expire("a", 10)
+    result = pipe.execute()
+    assert result[0] == 1
+    assert isinstance(result[1], ResponseError)
+    assert result[2] is True
+
+def test_pipeline_raise_on_error_reads_all_replies():
+    pipe, mock = make_pipeline([1, ResponseError("ERR"), 3])
+    pipe.incr("a").incr("b").incr("c")
+    with pytest.raises(ResponseError):
+        pipe.execute()
+    assert mock.responses == []
+
+def test_pipeline_context_manager_resets():
+    pipe, mock = make_pipeline([])
+    with pipe as p:
+        p.set("foo", "bar")
+    assert len(pipe) == 0
+
+def test_pipeline_empty_command():
+    pipe, mock = make_pipeline([])
+    with pytest.raises(ValueError):
+        pipe.execute_command()
+
+def test_pipeline_delete_without_keys_keeps_chaining():
+    pipe, mock = make_pipeline(["OK"])
+    pipe.delete().set("foo", "bar").exists()
+    assert pipe.execute() == [False, True, False]
+    assert mock.batches == [[("SET", "foo", "bar")]]
+
+def test_pipeline_only_local_results_skip_network():
+    pipe, mock = make_pipeline([])
+    pipe.delete()
+    assert pipe.execute() == [False]
+    assert mock.batches == []
+
+def test_pipeline_groups_multi_key_commands():
+    pipe, mock = make_pipeline([["1"], ["2"], 5, 2], raise_on_error=False)
+    pipe.mget(["a", "b"], chunk_size=1).incr("n").mdel(["a", "b"])
+    assert pipe.execute() == [["1", "2"], 5, 2]
+    assert len(mock.batches) == 1
+
+def test_pipeline_group_error_in_place():
+    pipe, mock = make_pipeline([1, ResponseError("ERR"), 4], raise_on_error=False)
+    pipe.mdel(["a", "b"], chunk_size=1).incr("n")
+    result = pipe.execute()
+    assert isinstance(result[0], ResponseError)
+    assert result[1] == 4
+
+def test_transaction_single_write():
+    pipe, mock = make_pipeline(["OK", "QUEUED", "QUEUED", ["OK", 5]], transaction=True)
+    pipe.set("foo", "bar").incr("n")
+    assert pipe.execute() == [True, 5]
+    assert mock.batches == [[("MULTI",), ("SET", "foo", "bar"), ("INCR", "n"), ("EXEC",)]]
+
+def test_transaction_errors_inside_exec():
+    err = ResponseError("ERR wrong type")
+    pipe, mock = make_pipeline(["OK", "QUEUED", "QUEUED", [err, 2]], transaction=True)
+    pipe.incr("a").incr("b")
+    with pytest.raises(ResponseError):
+        pipe.execute()
+
+def test_transaction_execabort_raises_queue_error():
+    pipe, mock = make_pipeline(
+        ["OK", ResponseError("ERR unknown command"), ResponseError("EXECABORT")],
+        transaction=True,
+    )
+    pipe.execute_command("BOGUS")
+    with pytest.raises(ResponseError, match="unknown command"):
+        pipe.execute()
+    assert mock.responses == []
+
+def test_watch_runs_immediately_and_aborted_exec_raises():
+    from zumic.exceptions import WatchError
+
+    pipe, mock = make_pipeline(["OK", "10", "OK", "QUEUED", None], transaction=True)
+    assert pipe.watch("stock") is True
+    assert pipe.get("stock") == "10"
+    pipe.multi()
+    assert pipe.set("stock", 9) is pipe
+    with pytest.raises(WatchError):
+        pipe.execute()
+    assert mock.commands[:2] == [("WATCH", "stock"), ("GET", "stock")]
+    assert mock.batches == [[("MULTI",), ("SET", "stock", 9), ("EXEC",)]]
+    assert not pipe.watching
+
+def test_reset_unwatches():
+    pipe, mock = make_pipeline(["OK", "OK"], transaction=True)
+    pipe.watch("a")
+    pipe.reset()
+    assert mock.commands == [("WATCH", "a"), ("UNWATCH",)]
+
+def test_multi_twice_raises():
+    from zumic.exceptions import WatchError
+
+    pipe, _ = make_pipeline([])
+    pipe.multi()
+    with pytest.raises(WatchError):
+        pipe.multi()
+    with pytest.raises(WatchError):
+        pipe.watch("a")
+
+def test_client_transaction_retries_on_watch_error():
+    mock = MockConnection()
+    mock.set_responses(["OK", "1", "OK", "QUEUED", None, "OK", "1", "OK", "QUEUED", ["OK"]])
+    client = Client(connection=mock)
+    calls = []
+
+    def bump(pipe):
+        value = int(pipe.get("n"))
+        calls.append(value)
+        pipe.multi()
+        pipe.set("n", value + 1)
+        return value + 1
+
+    assert client.transaction(bump, "n", value_from_callable=True) == 2
+    assert len(calls) == 2
+
+def test_client_transaction_gives_up_after_retries():
+    from zumic.exceptions import WatchError
+
+    mock = MockConnection()
+    mock.set_responses(["OK", "OK", "QUEUED", None] * 2)
+    client = Client(connection=mock)
+    with pytest.raises(WatchError):
+        client.transaction(lambda pipe: pipe.multi() or pipe.incr("n"), "n", retries=1)
+
+def test_client_transaction_without_watch_queues_everything():
+    mock = MockConnection()
+    mock.set_responses(["OK", "QUEUED", "QUEUED", [1, 2]])
+    client = Client(connection=mock)
+    assert client.transaction(lambda pipe: pipe.incr("a").incr("b")) == [1, 2]
+    assert mock.batches == [[("MULTI",), ("INCR", "a"), ("INCR", "b"), ("EXEC",)]]
+
+def test_transaction_contention_with_server():
+    import threading
+
+    from zumic.benchmark import ZSPServer
+
+    with ZSPServer() as server:
+        host, port = server.address
+
+        def worker():
+            client = Client(host=host, port=port, timeout=5)
+
+            def incr(pipe):
+                value = int(pipe.get("counter") or 0)
+                pipe.multi()
+                pipe.set("counter", value + 1)
+
+            for _ in range(20):
+                client.transaction(incr, "counter", retries=None)
+            client.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        client = Client(host=host, port=port, timeout=5)
+        assert client.get("counter") == "80"
+        client.close()
+def test_transaction_applies_decode_numeric_and_codec():
+    from array import array
+
+    from zumic.benchmark import ZSPServer
+    from zumic.serialization import ValueCodec
+    from zumic.typed import NumericReply
+
+    with ZSPServer() as server:
+        host, port = server.address
+        client = Client(host=host, port=port, timeout=5, codec=ValueCodec())
+        client.mset({"n1": 1, "n2": 2})
+        client.execute("SET", "raw", b"\xff\xfe")
+        client.set("obj", {"a": [1, 2]})
+
+        for transaction in (False, True):
+            pipe = client.pipeline(transaction=transaction)
+            pipe.execute_command("GET", "raw", decode=False)
+            pipe.execute_command("MGET", "n1", "n2", numeric=NumericReply())
+            pipe.get("obj")
+            pipe.execute_command("MGET", "n1", "n2")
+            assert pipe.execute() == [
+                b"\xff\xfe",
+                array("q", [1, 2]),
+                {"a": [1, 2]},
+                ["1", "2"],
+            ]
+        client.close()
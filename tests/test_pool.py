@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pytest
+
+from zumic.client import Client
+from zumic.exceptions import ConnectionError, ResponseError
+from zumic.pool import ConnectionPool
+
+from tests.mocks.mock_connection import MockConnection
+
+def make_pool(**kwargs):
+    return ConnectionPool(connection_class=MockConnection, **kwargs)
+
+def test_pool_reuses_released_connection():
+    pool = make_pool(max_connections=2)
+    first = pool.get_connection()
+    pool.release(first)
+    assert pool.get_connection() is first
+    stats = pool.stats()
+    assert stats.in_use == 1
+    assert stats.idle == 0
+    assert stats.checkouts == 2
+
+def test_pool_timeout_when_exhausted():
+    pool = make_pool(max_connections=1, timeout=0.01)
+    pool.get_connection()
+    with pytest.raises(ConnectionError):
+        pool.get_connection()
+    stats = pool.stats()
+    assert stats.timeouts == 1
+    assert stats.waits == 1
+    assert stats.wait_time_total > 0
+
+def test_pool_blocking_checkout_wakes_on_release():
+    pool = make_pool(max_connections=1, timeout=5)
+    conn = pool.get_connection()
+    timer = threading.Timer(0.02, pool.release, args=(conn,))
+    timer.start()
+    assert pool.get_connection() is conn
+    timer.join()
+    assert pool.stats().waits == 1
+
+def test_pool_prewarm_and_reap():
+    pool = make_pool(max_connections=4, prewarm=3, idle_timeout=0.01)
+    stats = pool.stats()
+    assert stats.idle == 3
+    assert stats.total == 3
+    time.sleep(0.02)
+    assert pool.reap_idle() == 3
+    assert pool.stats().idle == 0
+    assert pool.stats().reaped == 3
+
+def test_pool_warm_failure_releases_all():
+    class FailingConnection(MockConnection):
+        def connect(self):
+            raise ConnectionError("refused")
+
+    pool = ConnectionPool(
+        max_connections=3, timeout=0.01, connection_class=FailingConnection
+    )
+    with pytest.raises(ConnectionError):
+        pool.warm(3)
+    stats = pool.stats()
+    assert stats.in_use == 0
+    assert stats.idle == 3
+    assert len({id(pool.get_connection()) for _ in range(3)}) == 3
+
+def test_pool_invalid_sizes():
+    with pytest.raises(ValueError):
+        make_pool(max_connections=0)
+    with pytest.raises(ValueError):
+        make_pool(max_connections=1, prewarm=2)
+
+def test_pool_connection_disconnects_on_error():
+    pool = make_pool()
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            raise RuntimeError("boom")
+    assert not conn.is_connected()
+    assert pool.stats().idle == 1
+
+    with pytest.raises(ResponseError):
+        with pool.connection() as conn:
+            conn.connect()
+            raise ResponseError("ERR")
+    assert conn.is_connected()
+
+def test_client_with_pool():
+    pool = make_pool(max_connections=2)
+    client = Client(connection_pool=pool)
+    assert client.ping() is False  # MockConnection без ответов возвращает None
+    assert pool.stats().idle == 1
+    assert pool.stats().in_use == 0
+    client.close()
+    assert pool.stats().total == 0
+
+def test_client_rejects_connection_and_pool():
+    with pytest.raises(ValueError):
+        Client(connection=MockConnection(), connection_pool=make_pool())
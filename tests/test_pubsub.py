@@ -0,0 +1,241 @@
+import asyncio
+import socket
+import time
+
+import pytest
+
+from zumic.asyncio import AsyncClient, AsyncConnection
+from zumic.client import Client
+from zumic.connection import Connection
+from zumic.exceptions import PubSubError
+from zumic.pubsub import DISCONNECT, DROP_OLDEST, PubSub
+
+def push(*items):
+    frame = b"*%d\r\n" % len(items)
+    for item in items:
+        if isinstance(item, int):
+            frame += b":%d\r\n" % item
+        else:
+            data = item.encode() if isinstance(item, str) else item
+            frame += b"$%d\r\n%s\r\n" % (len(data), data)
+    return frame
+
+@pytest.fixture
+def socket_pair():
+    left, right = socket.socketpair()
+    yield left, right
+    left.close()
+    right.close()
+
+def make_pubsub(sock, **options):
+    conn = Connection()
+    conn._sock = sock
+    conn._connected = True
+    return PubSub(conn, **options)
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "условие не выполнилось"
+        time.sleep(0.005)
+
+def test_subscribe_and_receive(socket_pair):
+    left, right = socket_pair
+    pubsub = make_pubsub(left)
+    pubsub.subscribe("news", "sport")
+    assert right.recv(1024) == b"*3\r\n$9\r\nSUBSCRIBE\r\n$4\r\nnews\r\n$5\r\nsport\r\n"
+
+    right.sendall(push("subscribe", "news", 1) + push("message", "news", "hello"))
+    confirmation = pubsub.get_message(timeout=1)
+    assert (confirmation.type, confirmation.channel, confirmation.data) == ("subscribe", "news", 1)
+    message = pubsub.get_message(timeout=1)
+    assert (message.type, message.channel, message.data) == ("message", "news", "hello")
+    assert pubsub.get_message() is None
+    pubsub.close()
+
+def test_get_messages_batch_and_ignore_subscribe(socket_pair):
+    left, right = socket_pair
+    pubsub = make_pubsub(left, ignore_subscribe_messages=True)
+    pubsub.psubscribe("news.*")
+    right.recv(1024)
+    frames = push("psubscribe", "news.*", 1)
+    frames += b"".join(push("pmessage", "news.*", "news.it", str(i)) for i in range(5))
+    right.sendall(frames)
+    wait_until(lambda: pubsub.pending == 5)
+
+    batch = pubsub.get_messages(3)
+    assert [m.data for m in batch] == ["0", "1", "2"]
+    assert batch[0].pattern == "news.*" and batch[0].channel == "news.it"
+    assert [m.data for m in pubsub.get_messages(10)] == ["3", "4"]
+    pubsub.close()
+
+def test_handlers_receive_their_messages(socket_pair):
+    left, right = socket_pair
+    pubsub = make_pubsub(left, ignore_subscribe_messages=True)
+    seen = []
+    pubsub.subscribe("news", handler=seen.append)
+    pubsub.subscribe("other")
+    right.sendall(push("message", "news", "a") + push("message", "other", "b"))
+    wait_until(lambda: pubsub.pending == 2)
+
+    rest = pubsub.get_messages(10)
+    assert [m.data for m in seen] == ["a"]
+    assert [m.data for m in rest] == ["b"]
+    pubsub.close()
+
+def test_run_in_thread_dispatches(socket_pair):
+    left, right = socket_pair
+    pubsub = make_pubsub(left)
+    seen = []
+    pubsub.subscribe("news", handler=seen.append)
+    pubsub.run_in_thread()
+    right.sendall(b"".join(push("message", "news", str(i)) for i in range(10)))
+    wait_until(lambda: len(seen) == 10)
+    pubsub.close()
+
+def test_run_in_thread_survives_handler_errors(socket_pair, caplog):
+    left, right = socket_pair
+    pubsub = make_pubsub(left)
+    seen = []
+
+    def handler(message):
+        if message.data == "3":
+            raise RuntimeError("сбой обработчика")
+        seen.append(message.data)
+
+    pubsub.subscribe("news", handler=handler)
+    with caplog.at_level("ERROR", logger="zumic.pubsub"):
+        pubsub.run_in_thread()
+        right.sendall(b"".join(push("message", "news", str(i)) for i in range(5)))
+        wait_until(lambda: len(seen) == 4)
+    assert seen == ["0", "1", "2", "4"]
+    assert pubsub.run_in_thread().is_alive()
+    assert "сбой обработчика" in caplog.text
+    pubsub.close()
+
+def test_drop_oldest_policy(socket_pair):
+    left, right = socket_pair
+    pubsub = make_pubsub(left, max_queue=3, policy=DROP_OLDEST, ignore_subscribe_messages=True)
+    pubsub.subscribe("news")
+    right.sendall(b"".join(push("message", "news", str(i)) for i in range(10)))
+    wait_until(lambda: pubsub.received == 10)
+
+    assert pubsub.dropped == 7
+    assert [m.data for m in pubsub.get_messages(10)] == ["7", "8", "9"]
+    pubsub.close()
+
+def test_disconnect_policy(socket_pair):
+    left, right = socket_pair
+    pubsub = make_pubsub(left, max_queue=2, policy=DISCONNECT, ignore_subscribe_messages=True)
+    pubsub.subscribe("news")
+    right.sendall(b"".join(push("message", "news", str(i)) for i in range(3)))
+    wait_until(lambda: not pubsub.connection.is_connected())
+
+    assert [m.data for m in pubsub.get_messages(10)] == ["0", "1"]
+    with pytest.raises(PubSubError, match="переполнена"):
+        pubsub.get_message()
+    with pytest.raises(PubSubError):
+        pubsub.subscribe("more")
+
+def test_block_policy_applies_backpressure(socket_pair):
+    left, right = socket_pair
+    pubsub = make_pubsub(left, max_queue=2, ignore_subscribe_messages=True)
+    pubsub.subscribe("news")
+    right.sendall(b"".join(push("message", "news", str(i)) for i in range(5)))
+    wait_until(lambda: pubsub.received == 3)
+    time.sleep(0.05)
+    # Третье сообщение ждёт места, остальные остаются в сокете
+    assert pubsub.pending == 2 and pubsub.received == 3
+
+    received = []
+    while len(received) < 5:
+        received += [m.data for m in pubsub.get_messages(10, timeout=1)]
+    assert received == ["0", "1", "2", "3", "4"]
+    pubsub.close()
+
+def test_connection_loss_raises(socket_pair):
+    left, right = socket_pair
+    pubsub = make_pubsub(left)
+    pubsub.subscribe("news")
+    right.close()
+    with pytest.raises(PubSubError, match="потеряно"):
+        pubsub.get_message(timeout=2)
+
+def test_close_wakes_reader(socket_pair):
+    left, _ = socket_pair
+    pubsub = make_pubsub(left)
+    pubsub.subscribe("news")
+    reader = pubsub._reader
+    pubsub.close()
+    assert reader is not None and not reader.is_alive()
+    assert list(pubsub.listen()) == []
+
+def test_client_pubsub_uses_own_connection_without_read_timeout():
+    client = Client(host="example", port=1, timeout=3, socket_keepalive=True)
+    pubsub = client.pubsub(max_queue=5)
+    conn = pubsub.connection
+    assert isinstance(conn, Connection) and conn is not client.connection
+    assert conn.timeout is None
+    assert conn.socket_connect_timeout == 3
+    assert conn.socket_keepalive
+    assert conn.host == "example"
+
+def test_client_with_custom_connection_requires_explicit_one():
+    from tests.mocks.mock_connection import MockConnection
+
+    client = Client(connection=MockConnection())
+    with pytest.raises(ValueError):
+        client.pubsub()
+
+def test_async_pubsub(socket_pair):
+    left, right = socket_pair
+
+    async def scenario():
+        reader, writer = await asyncio.open_connection(sock=left)
+        conn = AsyncConnection()
+        conn._reader, conn._writer = reader, writer
+        pubsub = AsyncClient().pubsub(connection=conn, ignore_subscribe_messages=True)
+        seen = []
+
+        async def handler(message):
+            seen.append(message.data)
+
+        await pubsub.subscribe("news")
+        await pubsub.subscribe("alerts", handler=handler)
+        await asyncio.to_thread(
+            right.sendall,
+            push("subscribe", "news", 1)
+            + push("message", "alerts", "fire")
+            + push("message", "news", "a")
+            + push("message", "news", "b"),
+        )
+        message = await pubsub.get_message(timeout=1)
+        while message is None:
+            message = await pubsub.get_message(timeout=1)
+        assert message.data == "a"
+        rest = await pubsub.get_messages(10, timeout=1)
+        assert [m.data for m in rest] == ["b"]
+        assert seen == ["fire"]
+        await pubsub.close()
+
+    asyncio.run(scenario())
+
+def test_async_drop_oldest(socket_pair):
+    left, right = socket_pair
+
+    async def scenario():
+        reader, writer = await asyncio.open_connection(sock=left)
+        conn = AsyncConnection()
+        conn._reader, conn._writer = reader, writer
+        pubsub = AsyncClient().pubsub(connection=conn, max_queue=2, policy=DROP_OLDEST)
+        await pubsub.subscribe("news")
+        await asyncio.to_thread(
+            right.sendall, b"".join(push("message", "news", str(i)) for i in range(4))
+        )
+        while pubsub.received < 4:
+            await asyncio.sleep(0.01)
+        assert pubsub.dropped == 2
+        assert [m.data for m in await pubsub.get_messages(10)] == ["2", "3"]
+        await pubsub.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,157 @@
+import threading
+import time
+
+import pytest
+
+from zumic.client import Client
+from zumic.exceptions import ConnectionError
+from zumic.replication import (
+    EWMASelector,
+    LeastOutstandingSelector,
+    ReplicatedClient,
+    RoundRobinSelector,
+)
+
+from tests.mocks.mock_connection import MockConnection
+
+class SlowConnection(MockConnection):
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def read_response(self, decode=None):
+        time.sleep(self.delay)
+        return super().read_response(decode)
+
+def make_replicated(names, primary=None, **kwargs):
+    mocks = {name: MockConnection() for name in names}
+    primary = primary or MockConnection()
+    client = ReplicatedClient(
+        Client(connection=primary),
+        {name: Client(connection=mock) for name, mock in mocks.items()},
+        **kwargs,
+    )
+    return client, primary, mocks
+
+def test_reads_go_to_replicas_writes_to_primary():
+    client, primary, mocks = make_replicated(["r1"])
+    mocks["r1"].set_responses(["bar", 1, 5])
+    primary.set_responses(["OK", 1])
+    assert client.set("foo", "bar") is True
+    assert client.get("foo") == "bar"
+    assert client.exists("foo") is True
+    assert client.ttl("foo") == 5
+    assert client.incr("n") == 1
+    assert [c[0] for c in primary.commands] == ["SET", "INCR"]
+    assert [c[0] for c in mocks["r1"].commands] == ["GET", "EXISTS", "TTL"]
+
+def test_round_robin_spreads_reads():
+    client, _, mocks = make_replicated(["a", "b", "c"])
+    for mock in mocks.values():
+        mock.set_responses(["v"] * 2)
+    for _ in range(6):
+        client.get("k")
+    assert [len(m.commands) for m in mocks.values()] == [2, 2, 2]
+
+def test_failed_replica_falls_back():
+    client, primary, mocks = make_replicated(["a", "b"])
+    mocks["a"].set_responses([ConnectionError("down")])
+    mocks["b"].set_responses([ConnectionError("down")])
+    primary.set_responses(["from-primary"])
+    assert client.get("k") == "from-primary"
+
+def test_read_only_batch_runs_on_replica():
+    client, primary, mocks = make_replicated(["a"])
+    mocks["a"].set_responses([["1", "2"]])
+    assert client.mget(["x", "y"]) == ["1", "2"]
+    primary.set_responses(["OK"])
+    assert client.mset({"x": "1"}) is True
+    assert mocks["a"].commands == [("MGET", "x", "y")]
+    assert primary.commands[0][0] == "MSET"
+
+def test_pipeline_and_scan_cursor_use_primary():
+    client, primary, mocks = make_replicated(["a"])
+    primary.set_responses([["0", ["k"]]])
+    assert client.scan(0) == (0, ["k"])
+    with client.pipeline() as pipe:
+        pipe.get("k")
+        primary.set_responses(["v"])
+        assert pipe.execute() == ["v"]
+    assert mocks["a"].commands == []
+
+def test_least_outstanding_prefers_idle_replica():
+    selector = LeastOutstandingSelector()
+    selector.started("a")
+    assert selector.order(["a", "b"])[0] == "b"
+    selector.finished("a", 0.001, False)
+    assert selector.outstanding("a") == 0
+
+def test_ewma_prefers_fast_replica_and_penalizes_errors():
+    selector = EWMASelector(alpha=0.5, error_penalty=1.0)
+    for node in ("a", "b"):
+        selector.started(node)
+    selector.finished("a", 0.010, False)
+    selector.finished("b", 0.001, False)
+    assert all(selector.order(["a", "b"])[0] == "b" for _ in range(4))
+    selector.started("b")
+    selector.finished("b", 0.0, True)
+    assert selector.latency("b") == pytest.approx(0.5005)
+    assert selector.order(["a", "b"])[0] == "a"
+    # Реплика без замеров опробуется первой
+    assert selector.order(["a", "b", "c"])[0] == "c"
+
+def test_round_robin_rotates():
+    selector = RoundRobinSelector()
+    assert [selector.order(["a", "b"])[0] for _ in range(4)] == ["a", "b", "a", "b"]
+
+def test_hedged_read_returns_fast_replica():
+    slow = SlowConnection(0.5)
+    fast = MockConnection()
+    slow.set_responses(["slow"])
+    fast.set_responses(["fast"])
+    client = ReplicatedClient(
+        Client(connection=MockConnection()),
+        {"slow": Client(connection=slow), "fast": Client(connection=fast)},
+        selector=RoundRobinSelector(),
+        hedge_after=0.02,
+    )
+    started = time.perf_counter()
+    assert client.get("k") == "fast"
+    assert time.perf_counter() - started < 0.4
+    client.close()
+
+def test_hedged_read_skips_failed_replica():
+    client, _, mocks = make_replicated(["a", "b"], hedge_after=5)
+    mocks["a"].set_responses([ConnectionError("down")])
+    mocks["b"].set_responses(["v"])
+    started = time.perf_counter()
+    assert client.get("k") == "v"
+    assert time.perf_counter() - started < 1
+    client.close()
+
+def test_without_replicas_everything_goes_to_primary():
+    primary = MockConnection()
+    primary.set_responses(["v"])
+    client = ReplicatedClient(Client(connection=primary))
+    assert client.get("k") == "v"
+
+def test_invalid_selector_and_address():
+    with pytest.raises(ValueError):
+        ReplicatedClient(Client(connection=MockConnection()), selector="random")
+    with pytest.raises(ValueError):
+        ReplicatedClient("localhost")
+
+def test_concurrent_reads_balanced():
+    client, _, mocks = make_replicated(["a", "b"], selector="least_outstanding")
+    for mock in mocks.values():
+        mock.set_responses(["v"] * 100)
+    threads = [
+        threading.Thread(target=lambda: [client.get("k") for _ in range(10)])
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(len(m.commands) for m in mocks.values()) == 40
+    assert all(m.commands for m in mocks.values())
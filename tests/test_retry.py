@@ -0,0 +1,234 @@
+import asyncio
+import socket
+import time
+
+import pytest
+
+from zumic.asyncio import AsyncClient
+from zumic.client import Client
+from zumic.connection import Connection
+from zumic.exceptions import ConnectionError, ResponseError, TimeoutError
+from zumic.pool import ConnectionPool
+from zumic.retry import ConstantBackoff, ExponentialBackoff, NoBackoff, Retry
+
+from tests.mocks.mock_async_connection import MockAsyncConnection
+from tests.mocks.mock_connection import MockConnection
+
+class FlakyConnection(MockConnection):
+    """Падает на первых `failures` отправках."""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+        self.disconnects = 0
+
+    def send_command(self, *args):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("сброс соединения")
+        super().send_command(*args)
+
+    def disconnect(self):
+        self.disconnects += 1
+        super().disconnect()
+
+def test_exponential_backoff_without_jitter_is_capped():
+    backoff = ExponentialBackoff(base=0.01, cap=0.05, jitter=False)
+    assert [backoff.compute(i) for i in range(4)] == [0.01, 0.02, 0.04, 0.05]
+    assert backoff.compute(10_000) == 0.05
+
+def test_exponential_backoff_jitter_stays_in_range():
+    backoff = ExponentialBackoff(base=0.01, cap=1.0)
+    delays = [backoff.compute(3) for _ in range(200)]
+    assert all(0 <= delay <= 0.08 for delay in delays)
+    assert len(set(delays)) > 1
+
+def test_retry_succeeds_after_retryable_errors():
+    attempts = []
+    failures = []
+
+    def do():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("нет соединения")
+        return "ok"
+
+    retry = Retry(NoBackoff(), retries=3)
+    assert retry.call_with_retry(do, failures.append) == "ok"
+    assert len(attempts) == 3
+    assert len(failures) == 2
+
+def test_retry_gives_up_after_retries():
+    calls = []
+
+    def do():
+        calls.append(1)
+        raise ConnectionError("нет соединения")
+
+    with pytest.raises(ConnectionError):
+        Retry(NoBackoff(), retries=2).call_with_retry(do)
+    assert len(calls) == 3
+
+def test_retry_does_not_repeat_other_errors():
+    calls = []
+
+    def do():
+        calls.append(1)
+        raise ResponseError("ERR")
+
+    with pytest.raises(ResponseError):
+        Retry(NoBackoff(), retries=5).call_with_retry(do)
+    assert len(calls) == 1
+
+def test_retry_respects_max_elapsed():
+    calls = []
+
+    def do():
+        calls.append(1)
+        raise ConnectionError("нет соединения")
+
+    started = time.monotonic()
+    with pytest.raises(ConnectionError):
+        Retry(ConstantBackoff(0.02), retries=100, max_elapsed=0.05).call_with_retry(do)
+    assert time.monotonic() - started < 0.2
+    assert 2 <= len(calls) <= 4
+
+def test_client_retries_and_reconnects():
+    conn = FlakyConnection(failures=2)
+    conn.set_responses(["bar"])
+    client = Client(connection=conn, retry=Retry(NoBackoff(), retries=2))
+    assert client.get("foo") == "bar"
+    assert conn.disconnects == 2
+    assert conn.commands == [("GET", "foo")]
+
+def test_client_does_not_repeat_sent_non_idempotent_commands():
+    conn = MockConnection()
+    conn.set_responses([TimeoutError("нет ответа"), 1])
+    client = Client(connection=conn, retry=Retry(NoBackoff(), retries=2))
+    with pytest.raises(TimeoutError):
+        client.incr("n")
+    assert conn.commands == [("INCR", "n")]
+
+    # Идемпотентная команда повторяется и после отправки
+    conn.set_responses([TimeoutError("нет ответа"), "bar"])
+    assert client.get("foo") == "bar"
+
+    # Ошибка до отправки повторяется для любой команды
+    flaky = FlakyConnection(failures=1)
+    flaky.set_responses([2])
+    client = Client(connection=flaky, retry=Retry(NoBackoff(), retries=1))
+    assert client.incr("n") == 2
+    assert flaky.commands == [("INCR", "n")]
+
+    conn = MockConnection()
+    conn.set_responses([TimeoutError("нет ответа"), 3])
+    retry = Retry(NoBackoff(), retries=1, idempotent_only=False)
+    assert Client(connection=conn, retry=retry).incr("n") == 3
+    assert conn.commands == [("INCR", "n")] * 2
+
+def test_client_without_retry_raises():
+    client = Client(connection=FlakyConnection(failures=1))
+    with pytest.raises(ConnectionError):
+        client.get("foo")
+
+def test_connection_connect_retries(monkeypatch):
+    calls = []
+    real_getaddrinfo = socket.getaddrinfo
+
+    def flaky_getaddrinfo(host, port, *args):
+        calls.append(host)
+        if len(calls) < 3:
+            raise OSError("временная ошибка")
+        return real_getaddrinfo(host, port, *args)
+
+    monkeypatch.setattr(socket, "getaddrinfo", flaky_getaddrinfo)
+    listener = socket.create_server(("127.0.0.1", 0))
+    try:
+        port = listener.getsockname()[1]
+        conn = Connection(host="127.0.0.1", port=port, retry=Retry(NoBackoff(), retries=3))
+        conn.connect()
+        assert conn.is_connected()
+        assert len(calls) == 3
+        conn.disconnect()
+    finally:
+        listener.close()
+
+def test_check_health_detects_closed_peer():
+    left, right = socket.socketpair()
+    conn = Connection()
+    conn._sock = left
+    conn._connected = True
+    assert conn.check_health(ping=False)
+    right.close()
+    assert not conn.check_health(ping=False)
+    assert not conn.is_connected()
+
+def test_check_health_ping():
+    from zumic.benchmark import ZSPServer
+
+    with ZSPServer() as server:
+        host, port = server.address
+        conn = Connection(host=host, port=port, timeout=5)
+        conn.connect()
+        assert conn.check_health()
+        conn.disconnect()
+        assert not conn.check_health()
+
+def test_pool_health_check_replaces_dead_connection():
+    from zumic.benchmark import ZSPServer
+
+    with ZSPServer() as server:
+        host, port = server.address
+        pool = ConnectionPool(
+            max_connections=1, health_check_interval=0, host=host, port=port, timeout=5
+        )
+        client = Client(connection_pool=pool)
+        assert client.set("foo", "bar") is True
+        # Сервер закрыл простаивающий сокет (например, после перезапуска)
+        conn = pool.get_connection()
+        conn._sock.shutdown(socket.SHUT_RDWR)
+        pool.release(conn)
+
+        assert client.get("foo") == "bar"
+        stats = pool.stats()
+        assert stats.health_checks == 2
+        assert stats.health_check_failures == 1
+        client.close()
+
+def test_pool_skips_health_check_for_recent_connections():
+    pool = ConnectionPool(connection_class=MockConnection, health_check_interval=60)
+    pool.release(pool.get_connection())
+    pool.get_connection()
+    assert pool.stats().health_checks == 0
+
+def test_async_client_retries():
+    class FlakyAsyncConnection(MockAsyncConnection):
+        def __init__(self):
+            super().__init__()
+            self.failures = 1
+
+        async def send_command(self, *args):
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("сброс соединения")
+            await super().send_command(*args)
+
+    async def scenario():
+        conn = FlakyAsyncConnection()
+        conn.set_responses(["PONG"])
+        client = AsyncClient(connection=conn, retry=Retry(NoBackoff(), retries=1))
+        assert await client.ping() is True
+
+    asyncio.run(scenario())
+
+def test_async_client_does_not_repeat_sent_non_idempotent_commands():
+    async def scenario():
+        conn = MockAsyncConnection()
+        conn.set_responses([TimeoutError("нет ответа"), "bar"])
+        client = AsyncClient(connection=conn, retry=Retry(NoBackoff(), retries=1))
+        with pytest.raises(TimeoutError):
+            await client.append("k", "x")
+        assert conn.commands == [("APPEND", "k", "x")]
+        assert await client.get("foo") == "bar"
+
+    asyncio.run(scenario())
@@ -0,0 +1,206 @@
+import asyncio
+import hashlib
+
+import pytest
+
+from zumic.asyncio import AsyncClient
+from zumic.cache import NearCache
+from zumic.client import Client
+from zumic.exceptions import NoScriptError, ResponseError
+from zumic.sharding import ShardedClient
+
+from tests.mocks.mock_async_connection import MockAsyncConnection
+from tests.mocks.mock_connection import MockConnection
+from tests.test_connection import make_connection
+
+SOURCE = "return {KEYS[1], ARGV[1]}"
+SHA = hashlib.sha1(SOURCE.encode()).hexdigest()
+
+class ScriptCache:
+    """Кэш скриптов сервера: выполнение скрипта возвращает его ключи и аргументы."""
+
+    def __init__(self):
+        self.scripts = {}
+        self.queued = None
+
+    def reply(self, args):
+        name = args[0]
+        if self.queued is not None and name != "EXEC":
+            self.queued.append(args)
+            return "QUEUED"
+        if name == "MULTI":
+            self.queued = []
+            return "OK"
+        if name == "EXEC":
+            queued, self.queued = self.queued, None
+            return [self.reply(command) for command in queued]
+        if name == "EVAL":
+            source = args[1]
+            self.scripts[hashlib.sha1(source.encode()).hexdigest()] = source
+            return list(args[3:])
+        if name == "EVALSHA":
+            if args[1] not in self.scripts:
+                return NoScriptError("NOSCRIPT No matching script. Please use EVAL.")
+            return list(args[3:])
+        if args[:2] == ("SCRIPT", "LOAD"):
+            sha = hashlib.sha1(args[2].encode()).hexdigest()
+            self.scripts[sha] = args[2]
+            return sha
+        if args[:2] == ("SCRIPT", "EXISTS"):
+            return [int(sha in self.scripts) for sha in args[2:]]
+        if args[:2] == ("SCRIPT", "FLUSH"):
+            self.scripts.clear()
+            return "OK"
+        return "OK"
+
+class ScriptConnection(MockConnection):
+    def __init__(self):
+        super().__init__()
+        self.cache = ScriptCache()
+
+    def send_command(self, *args):
+        self.send_commands([args])
+
+    def send_commands(self, commands):
+        super().send_commands(commands)
+        self.responses += [self.cache.reply(tuple(args)) for args in commands]
+
+class AsyncScriptConnection(MockAsyncConnection):
+    def __init__(self):
+        super().__init__()
+        self.cache = ScriptCache()
+
+    async def send_command(self, *args):
+        await self.send_commands([args])
+
+    async def send_commands(self, commands):
+        await super().send_commands(commands)
+        self.responses += [self.cache.reply(tuple(args)) for args in commands]
+
+def names(commands):
+    return [" ".join(str(arg) for arg in args[:2]) for args in commands]
+
+def test_script_sha_computed_once():
+    client = Client(connection=ScriptConnection())
+    script = client.register_script(SOURCE)
+    assert script.sha == SHA
+    assert client.register_script(SOURCE.encode()).sha == SHA
+    assert repr(script) == f"Script(sha={SHA!r})"
+
+def test_noscript_error_is_parsed():
+    conn = make_connection([b"-NOSCRIPT No matching script\r\n-ERR other\r\n"])
+    with pytest.raises(NoScriptError):
+        conn.read_response()
+    with pytest.raises(ResponseError) as info:
+        conn.read_response()
+    assert type(info.value) is ResponseError
+
+def test_script_falls_back_to_eval_once():
+    mock = ScriptConnection()
+    client = Client(connection=mock)
+    script = client.register_script(SOURCE)
+    assert script(keys=["k"], args=[1]) == ["k", 1]
+    assert mock.commands == [("EVALSHA", SHA, 1, "k", 1), ("EVAL", SOURCE, 1, "k", 1)]
+
+    mock.commands.clear()
+    assert script(keys=["k"], args=[2]) == ["k", 2]
+    assert mock.commands == [("EVALSHA", SHA, 1, "k", 2)]
+
+    # После очистки кэша сервера скрипт снова отправляется целиком
+    assert client.script_flush() is True
+    mock.commands.clear()
+    assert script(keys=["k"], args=[3]) == ["k", 3]
+    assert names(mock.commands) == [f"EVALSHA {SHA}", f"EVAL {SOURCE}"]
+
+def test_script_commands():
+    client = Client(connection=ScriptConnection())
+    assert client.script_exists(SHA, "0" * 40) == [False, False]
+    assert client.script_load(SOURCE) == SHA
+    assert client.script_exists(SHA, "0" * 40) == [True, False]
+    assert client.evalsha(SHA, ["a"], ["b"]) == ["a", "b"]
+    assert client.eval(SOURCE) == []
+
+def test_script_in_pipeline_loads_missing_scripts():
+    mock = ScriptConnection()
+    client = Client(connection=mock)
+    script = client.register_script(SOURCE)
+    pipe = client.pipeline()
+    script(keys=["a"], args=[1], client=pipe)
+    pipe.get("x")
+    script(keys=["b"], args=[2], client=pipe)
+    assert pipe.execute() == [["a", 1], "OK", ["b", 2]]
+    assert names(mock.commands) == [
+        "SCRIPT EXISTS",
+        "SCRIPT LOAD",
+        f"EVALSHA {SHA}",
+        "GET x",
+        f"EVALSHA {SHA}",
+    ]
+
+    # Загруженный скрипт только проверяется
+    mock.commands.clear()
+    pipe.register_script(SOURCE)(keys=["c"])
+    assert pipe.execute() == [["c"]]
+    assert names(mock.commands) == ["SCRIPT EXISTS", f"EVALSHA {SHA}"]
+
+def test_script_in_transaction():
+    mock = ScriptConnection()
+    client = Client(connection=mock)
+    script = client.register_script(SOURCE)
+    pipe = client.pipeline(transaction=True)
+    script(keys=["a"], args=[1], client=pipe)
+    assert pipe.execute() == [["a", 1]]
+    assert names(mock.commands) == [
+        "SCRIPT EXISTS",
+        "SCRIPT LOAD",
+        "MULTI",
+        f"EVALSHA {SHA}",
+        "EXEC",
+    ]
+
+def test_script_invalidates_declared_keys():
+    mock = ScriptConnection()
+    mock.responses = ["old"]
+    client = Client(connection=mock, cache=NearCache())
+    assert client.get("a") == "old"
+    client.register_script(SOURCE)(keys=["a"], args=[1])
+    assert len(client.cache) == 0
+
+def test_sharded_script_runs_on_key_owner():
+    mocks = {name: ScriptConnection() for name in "abc"}
+    client = ShardedClient({name: Client(connection=mock) for name, mock in mocks.items()})
+    script = client.register_script(SOURCE)
+    assert script(keys=["user:{42}:a", "user:{42}:b"], args=[1]) == [
+        "user:{42}:a",
+        "user:{42}:b",
+        1,
+    ]
+    owner = client.get_node("42")
+    assert names(mocks[owner].commands) == [f"EVALSHA {SHA}", f"EVAL {SOURCE}"]
+    assert client.script_exists(SHA) == [False]
+    assert client.script_load(SOURCE) == SHA
+    assert client.script_exists(SHA) == [True]
+    with pytest.raises(ValueError):
+        script(args=[1])
+
+def test_async_script_fallback_and_pipeline():
+    async def run():
+        mock = AsyncScriptConnection()
+        client = AsyncClient(connection=mock)  # type: ignore[arg-type]
+        script = client.register_script(SOURCE)
+        assert await script(keys=["k"], args=[1]) == ["k", 1]
+        assert await script(keys=["k"], args=[2]) == ["k", 2]
+        assert names(mock.commands) == [
+            f"EVALSHA {SHA}",
+            f"EVAL {SOURCE}",
+            f"EVALSHA {SHA}",
+        ]
+
+        await client.script_flush()
+        mock.commands.clear()
+        pipe = client.pipeline()
+        script(keys=["a"], client=pipe)
+        assert await pipe.execute() == [["a"]]
+        assert names(mock.commands) == ["SCRIPT EXISTS", "SCRIPT LOAD", f"EVALSHA {SHA}"]
+
+    asyncio.run(run())
@@ -0,0 +1,142 @@
+import json
+import zlib
+
+import pytest
+
+from zumic.benchmark import ZSPServer
+from zumic.client import Client
+from zumic.exceptions import DataError
+from zumic.serialization import MAGIC, Serializer, ValueCodec
+from zumic.sharding import ShardedClient
+
+from tests.mocks.mock_connection import MockConnection
+
+@pytest.fixture
+def server():
+    with ZSPServer() as server:
+        yield server
+
+def make_client(server, **kwargs):
+    host, port = server.address
+    return Client(host=host, port=port, timeout=5, **kwargs)
+
+def test_strings_bytes_and_ints_stored_as_is():
+    codec = ValueCodec()
+    assert codec.encode("plain") == "plain"
+    assert codec.encode(b"raw") == b"raw"
+    assert codec.encode(42) == 42
+    assert codec.decode(b"plain") == "plain"
+    assert codec.decode(b"raw", text=False) == b"raw"
+    assert codec.decode(None) is None
+
+def test_objects_serialized_with_header():
+    codec = ValueCodec("json")
+    data = codec.encode({"a": [1, 2], "b": "ж"})
+    assert data[:2] == MAGIC
+    assert json.loads(data[3:]) == {"a": [1, 2], "b": "ж"}
+    assert codec.decode(data) == {"a": [1, 2], "b": "ж"}
+    assert codec.decode(codec.encode(True)) is True
+    with pytest.raises(DataError):
+        codec.encode({1, 2})
+
+def test_pickle_roundtrip_and_isolation():
+    pickled = ValueCodec("pickle").encode({1, 2})
+    assert ValueCodec("pickle").decode(pickled) == {1, 2}
+    # Кодек JSON не разбирает значения pickle
+    with pytest.raises(DataError):
+        ValueCodec("json").decode(pickled)
+
+@pytest.mark.parametrize("compression", ["zlib", "lzma"])
+def test_compression_above_threshold(compression):
+    codec = ValueCodec("json", compression=compression, threshold=100)
+    value = {"items": ["x" * 10] * 200}
+    data = codec.encode(value)
+    assert len(data) < len(json.dumps(value)) / 5
+    assert codec.decode(data) == value
+    # Маленькие значения не сжимаются
+    assert codec.encode({"a": 1})[2] >> 4 == 0
+    text = "y" * 1000
+    packed = codec.encode(text)
+    assert packed[:2] == MAGIC
+    assert codec.decode(packed) == text
+    assert codec.decode(packed, text=False) == text.encode()
+
+def test_incompressible_value_left_uncompressed():
+    codec = ValueCodec(compression="zlib", threshold=0)
+    value = bytes(range(256))
+    assert codec.encode(value) is value
+
+def test_raw_value_starting_with_magic_is_escaped():
+    codec = ValueCodec()
+    value = MAGIC + b"payload"
+    data = codec.encode(value)
+    assert data != value
+    assert codec.decode(data, text=False) == value
+
+def test_foreign_compression_is_decoded():
+    data = ValueCodec(compression="zlib", threshold=0).encode("z" * 100)
+    assert ValueCodec(compression="lzma").decode(data) == "z" * 100
+    assert ValueCodec(serializer=None).decode(MAGIC + b"\x10" + zlib.compress(b"a")) == "a"
+
+def test_corrupted_and_unknown_values():
+    codec = ValueCodec(compression="zlib")
+    with pytest.raises(DataError):
+        codec.decode(MAGIC + b"\x10garbage")
+    with pytest.raises(DataError):
+        codec.decode(MAGIC + b"\xf0data")
+    with pytest.raises(ValueError):
+        ValueCodec("yaml")
+
+def test_custom_serializer():
+    class Reversed(Serializer):
+        id = 9
+        name = "reversed"
+
+        def dumps(self, value):
+            return str(value)[::-1].encode()
+
+        def loads(self, data):
+            return float(data[::-1])
+
+    codec = ValueCodec(Reversed())
+    assert codec.decode(codec.encode(1.5)) == 1.5
+
+def test_client_encodes_set_and_mset():
+    mock = MockConnection()
+    mock.set_responses(["OK", "OK"])
+    client = Client(connection=mock, codec=ValueCodec())
+    client.set("k", {"a": 1})
+    client.mset({"x": [1], "y": "plain"})
+    assert mock.commands[0][2] == MAGIC + b"\x01" + b'{"a":1}'
+    assert mock.commands[1][1:] == ("x", MAGIC + b"\x01[1]", "y", "plain")
+
+def test_client_roundtrip_against_server(server):
+    codec = ValueCodec("json", compression="zlib", threshold=64)
+    client = make_client(server, codec=codec)
+    doc = {"name": "zumic", "tags": ["kv"] * 100}
+    assert client.set("doc", doc) is True
+    assert client.set("text", "hello") is True
+    assert client.set("n", 1) is True
+    assert client.get("doc") == doc
+    assert client.get("text") == "hello"
+    assert client.get("text", decode=False) == b"hello"
+    assert client.incr("n") == 2
+    assert client.mget(["doc", "text", "missing"]) == [doc, "hello", None]
+    pipe = client.pipeline()
+    pipe.set("list", [1, 2, 3]).get("list").mget(["list", "text"])
+    assert pipe.execute() == [True, [1, 2, 3], [[1, 2, 3], "hello"]]
+    # Клиент без кодека видит сжатые байты, а не испорченную строку
+    plain = make_client(server, decode_responses=False)
+    assert plain.get("doc")[:2] == MAGIC
+    assert plain.get("text") == b"hello"
+    client.close()
+    plain.close()
+
+def test_sharded_client_uses_node_codec(server):
+    host, port = server.address
+    sharded = ShardedClient([f"{host}:{port}"], codec=ValueCodec(), timeout=5)
+    sharded.set("obj", {"a": 1})
+    assert sharded.get("obj") == {"a": 1}
+    sharded.mset({"m": [1]})
+    assert sharded.mget(["m", "obj"]) == [[1], {"a": 1}]
+    sharded.close()
@@ -0,0 +1,103 @@
+import pytest
+
+from zumic.client import Client
+from zumic.exceptions import ConnectionError
+from zumic.sharding import HashRing, ShardedClient, hash_key
+
+from tests.mocks.mock_connection import MockConnection
+
+def make_sharded(names, **kwargs):
+    mocks = {name: MockConnection() for name in names}
+    clients = {name: Client(connection=mock) for name, mock in mocks.items()}
+    return ShardedClient(clients, **kwargs), mocks
+
+def test_ring_adding_node_moves_few_keys():
+    keys = [f"key:{i}" for i in range(2000)]
+    ring = HashRing(["a", "b", "c"])
+    before = {key: ring.get_node(key) for key in keys}
+    ring.add_node("d")
+    moved = [key for key in keys if ring.get_node(key) != before[key]]
+    # Переезжают только ключи, доставшиеся новому узлу
+    assert all(ring.get_node(key) == "d" for key in moved)
+    assert 0.15 < len(moved) / len(keys) < 0.35
+
+def test_ring_removing_node_keeps_other_keys():
+    keys = [f"key:{i}" for i in range(1000)]
+    ring = HashRing(["a", "b", "c"])
+    before = {key: ring.get_node(key) for key in keys}
+    ring.remove_node("b")
+    for key in keys:
+        if before[key] != "b":
+            assert ring.get_node(key) == before[key]
+
+def test_hash_tags_colocate_keys():
+    assert hash_key("user:{42}:name") == hash_key("user:{42}:age") == hash_key("42")
+    assert hash_key("{}") != hash_key("")
+
+def test_single_key_routed_to_owner():
+    client, mocks = make_sharded(["a", "b", "c"])
+    owner = client.get_node("foo")
+    mocks[owner].set_responses(["bar"])
+    assert client.get("foo") == "bar"
+    assert [name for name, m in mocks.items() if m.commands] == [owner]
+
+def test_multi_key_commands_grouped_per_node():
+    client, mocks = make_sharded(["a", "b"])
+    keys = [f"k{i}" for i in range(20)]
+    for name, mock in mocks.items():
+        owned = [k for k in keys if client.get_node(k) == name]
+        mock.set_responses([[f"v-{k}" for k in owned], len(owned)])
+    assert client.mget(keys) == [f"v-{k}" for k in keys]
+    assert client.delete_count(*keys) == 20
+    for name, mock in mocks.items():
+        assert all(client.get_node(k) == name for k in mock.commands[0][1:])
+    client.close()
+
+def test_fanout_commands():
+    client, mocks = make_sharded(["a", "b"])
+    mocks["a"].set_responses([3, ["x"]])
+    mocks["b"].set_responses([4, ["y"]])
+    assert client.dbsize() == 7
+    assert sorted(client.keys()) == ["x", "y"]
+    client.close()
+
+def test_scan_walks_all_nodes_with_single_cursor():
+    client, mocks = make_sharded(["a", "b", "c"], retry_interval=30)
+    mocks["a"].set_responses([[5, ["x"]], [0, ["y"]]])
+    mocks["c"].set_responses([[0, ["z"]]])
+    client.mark_down("b")
+    cursor, keys = client.scan(match="*")
+    assert (cursor, keys) == (15, ["x"])
+    cursor, keys = client.scan(cursor, match="*")
+    assert (cursor, keys) == (1, ["y"])
+    # Снятый с кольца узел пропускается
+    assert client.scan(cursor, match="*") == (0, ["z"])
+    assert mocks["a"].commands == [("SCAN", 0, "MATCH", "*"), ("SCAN", 5, "MATCH", "*")]
+    assert mocks["b"].commands == []
+    assert mocks["c"].commands == [("SCAN", 0, "MATCH", "*")]
+
+def test_failed_node_taken_off_ring():
+    client, mocks = make_sharded(["a", "b", "c"], retry_interval=30)
+    key = "foo"
+    owner = client.get_node(key)
+    mocks[owner].set_responses([ConnectionError("down")])
+    fallback_ring = HashRing([n for n in mocks if n != owner])
+    fallback = fallback_ring.get_node(key)
+    mocks[fallback].set_responses(["bar"])
+    assert client.get(key) == "bar"
+    assert owner not in client.ring
+    client.mark_up(owner)
+    assert client.get_node(key) == owner
+
+def test_failed_node_raises_without_retry_interval():
+    client, mocks = make_sharded(["a", "b"])
+    mocks[client.get_node("foo")].set_responses([ConnectionError("down")])
+    with pytest.raises(ConnectionError):
+        client.get("foo")
+    assert len(client.ring) == 2
+
+def test_node_address_validation():
+    with pytest.raises(ValueError):
+        ShardedClient(["localhost"])
+    with pytest.raises(ValueError):
+        ShardedClient([])
@@ -0,0 +1,147 @@
+import asyncio
+import io
+import mmap
+import os
+import tempfile
+
+import pytest
+
+from zumic.asyncio import AsyncClient
+from zumic.benchmark import ZSPServer
+from zumic.client import Client
+from zumic.encoder import pack_command, pack_stream_command
+from zumic.exceptions import DataError, ResponseError
+
+from tests.mocks.mock_connection import MockConnection
+from tests.test_connection import make_connection
+
+@pytest.fixture
+def server():
+    with ZSPServer() as server:
+        yield server
+
+def make_client(server, **kwargs):
+    host, port = server.address
+    return Client(host=host, port=port, timeout=5, **kwargs)
+
+def test_pack_stream_command_matches_regular_packing():
+    before, after = pack_stream_command(("SET", "k"), 5, ("EX", 10))
+    assert before + b"hello" + after == pack_command("SET", "k", "hello", "EX", 10)
+
+def test_read_bulk_into_buffer_across_chunks():
+    payload = os.urandom(300)
+    conn = make_connection(
+        [b"$300\r\n" + payload[:10], payload[10:200], payload[200:] + b"\r\n:1\r\n"],
+        socket_read_size=64,
+    )
+    target = bytearray(400)
+    assert conn.read_bulk_into(memoryview(target)) == 300
+    assert bytes(target[:300]) == payload
+    # Хвост следующего ответа остаётся в буфере
+    assert conn.read_response() == 1
+
+def test_read_bulk_into_file_and_null():
+    payload = os.urandom(1000)
+    conn = make_connection([b"$1000\r\n", payload, b"\r\n$-1\r\n"], socket_read_size=16)
+    out = io.BytesIO()
+    assert conn.read_bulk_into(out) == 1000
+    assert out.getvalue() == payload
+    assert conn.read_bulk_into(out) is None
+
+def test_read_bulk_into_errors():
+    conn = make_connection([b"-ERR boom\r\n"])
+    with pytest.raises(ResponseError):
+        conn.read_bulk_into(io.BytesIO())
+    assert conn.is_connected()
+    conn = make_connection([b"$10\r\n0123456789\r\n"])
+    with pytest.raises(DataError):
+        conn.read_bulk_into(memoryview(bytearray(4)))
+    # Недочитанный ответ: соединение закрывается
+    assert not conn.is_connected()
+
+def test_target_and_source_types_checked(server):
+    client = make_client(server)
+    with pytest.raises(TypeError):
+        client.get_into("k", b"readonly")
+    with pytest.raises(TypeError):
+        client.set_from("k", 42)
+    with pytest.raises(DataError):
+        client.set_from("k", b"abc", size=10)
+
+def test_set_from_file_and_get_into(server, tmp_path):
+    client = make_client(server)
+    payload = os.urandom(200_000)
+    path = tmp_path / "blob"
+    path.write_bytes(payload)
+    with open(path, "rb") as source:
+        source.seek(100)
+        assert client.set_from("blob", source) is True
+        assert source.tell() == len(payload)
+    target = bytearray(len(payload))
+    assert client.get_into("blob", target) == len(payload) - 100
+    assert bytes(target[: len(payload) - 100]) == payload[100:]
+    with open(tmp_path / "copy", "wb") as out:
+        assert client.get_into("blob", out) == len(payload) - 100
+    assert (tmp_path / "copy").read_bytes() == payload[100:]
+    assert client.get_into("missing", target) is None
+    # Соединение осталось в рабочем состоянии
+    assert client.set_from("small", io.BytesIO(b"hello")) is True
+    assert client.get("small") == "hello"
+    client.close()
+
+def test_set_from_mmap_and_memoryview(server):
+    client = make_client(server, decode_responses=False)
+    with tempfile.TemporaryFile() as file:
+        file.write(b"m" * 50_000)
+        file.flush()
+        with mmap.mmap(file.fileno(), 0) as mapped:
+            assert client.set_from("mapped", mapped) is True
+            assert client.set_from("part", memoryview(mapped), size=10) is True
+    assert client.get("mapped") == b"m" * 50_000
+    assert client.get("part") == b"m" * 10
+    with mmap.mmap(-1, 50_000) as target:
+        assert client.get_into("mapped", target) == 50_000
+        assert target[:] == b"m" * 50_000
+    client.close()
+
+def test_short_source_fails_cleanly(server):
+    client = make_client(server)
+    with pytest.raises(DataError):
+        client.set_from("short", io.BytesIO(b"abc"), size=10)
+    assert client.get("short") is None
+    client.close()
+
+def test_set_from_without_streaming_connection():
+    mock = MockConnection()
+    mock.set_responses(["OK", b"data"])
+    client = Client(connection=mock)
+    assert client.set_from("k", io.BytesIO(b"data"), ex=5) is True
+    assert mock.commands[0] == ("SET", "k", b"data", "EX", 5)
+    target = bytearray(4)
+    assert client.get_into("k", target) == 4
+    assert target == b"data"
+
+def test_async_streaming(server, tmp_path):
+    host, port = server.address
+    payload = os.urandom(300_000)
+    path = tmp_path / "blob"
+    path.write_bytes(payload)
+
+    async def main():
+        client = AsyncClient(host=host, port=port, timeout=5)
+        with open(path, "rb") as source:
+            assert await client.set_from("blob", source) is True
+        target = bytearray(len(payload))
+        assert await client.get_into("blob", target) == len(payload)
+        assert target == payload
+        out = io.BytesIO()
+        assert await client.get_into("blob", out) == len(payload)
+        assert out.getvalue() == payload
+        assert await client.get_into("missing", out) is None
+        with pytest.raises(DataError):
+            await client.get_into("blob", bytearray(1))
+        assert await client.set_from("view", memoryview(payload), size=5) is True
+        assert await client.get("view", decode=False) == payload[:5]
+        await client.close()
+
+    asyncio.run(main())
@@ -0,0 +1,208 @@
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+
+from zumic.asyncio import AsyncClient
+from zumic.client import Client
+from zumic.exceptions import ConnectionError, TimeoutError
+from zumic.pool import ConnectionPool
+from zumic.replication import ReplicatedClient
+from zumic.retry import ConstantBackoff, Retry
+from zumic.sharding import ShardedClient
+from zumic.timeouts import deadline, effective_timeout, remaining
+
+from tests.mocks.mock_connection import MockConnection
+
+PAYLOAD = b"0123456789" * 4
+
+class TrickleServer:
+    """
+    Отвечает на каждую команду строкой PAYLOAD, отправляя ответ
+    кусками с паузами: каждое отдельное чтение укладывается в таймаут
+    сокета, а ответ целиком - нет.
+    """
+
+    def __init__(self, pieces=10, pause=0.04):
+        self.pieces = pieces
+        self.pause = pause
+        self.connections = 0
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.address = self.listener.getsockname()
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._handle, args=(sock,), daemon=True).start()
+
+    def _handle(self, sock):
+        reply = b"$%d\r\n%s\r\n" % (len(PAYLOAD), PAYLOAD)
+        step = -(-len(reply) // self.pieces)
+        with sock:
+            try:
+                while True:
+                    data = sock.recv(65536)
+                    if not data:
+                        return
+                    # В аргументах тестов нет "*": по одной на команду
+                    for _ in range(data.count(b"*")):
+                        for start in range(0, len(reply), step):
+                            time.sleep(self.pause)
+                            sock.sendall(reply[start : start + step])
+            except OSError:
+                return
+
+    def close(self):
+        self.listener.close()
+
+@pytest.fixture
+def server():
+    server = TrickleServer()
+    yield server
+    server.close()
+
+def make_client(server, **kwargs):
+    host, port = server.address
+    return Client(host=host, port=port, timeout=1, decode_responses=False, **kwargs)
+
+def test_deadline_nesting_only_narrows():
+    assert remaining() is None
+    assert effective_timeout(5) == 5
+    with deadline(1.0) as outer:
+        with deadline(10.0) as inner:
+            assert inner == outer
+        with deadline(None) as same:
+            assert same == outer
+        with deadline(0.5) as narrowed:
+            assert narrowed < outer
+            assert effective_timeout(5) <= 0.5
+        assert 0.5 < remaining() <= 1.0
+        assert effective_timeout(None) <= 1.0
+    assert remaining() is None
+
+def test_effective_timeout_raises_when_expired():
+    with deadline(0):
+        with pytest.raises(TimeoutError):
+            effective_timeout(1)
+    assert issubclass(TimeoutError, ConnectionError)
+
+def test_deadline_bounds_trickling_reply(server):
+    client = make_client(server)
+    assert client.execute("GET", "k") == PAYLOAD
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        client.execute("GET", "k", deadline=0.1)
+    assert time.monotonic() - started < 0.3
+    # Недочитанный ответ не достаётся следующей команде
+    assert client.execute("GET", "k") == PAYLOAD
+    assert server.connections == 2
+    client.close()
+
+def test_deadline_covers_pipeline(server):
+    client = make_client(server)
+    pipe = client.pipeline()
+    pipe.execute_command("GET", "a")
+    pipe.execute_command("GET", "b")
+    with pytest.raises(TimeoutError):
+        pipe.execute(deadline=0.5)
+    pipe.execute_command("GET", "a")
+    assert pipe.execute(deadline=1) == [PAYLOAD]
+    client.close()
+
+def test_deadline_context_spans_commands(server):
+    client = make_client(server)
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        with deadline(0.6):
+            client.execute("GET", "a")
+            client.execute("GET", "b")
+    assert time.monotonic() - started < 0.75
+    client.close()
+
+def test_retry_stops_at_deadline():
+    class BrokenConnection(MockConnection):
+        def send_command(self, *args):
+            raise ConnectionError("нет соединения")
+
+    retry = Retry(ConstantBackoff(0.05), retries=100)
+    client = Client(connection=BrokenConnection(), retry=retry)
+    started = time.monotonic()
+    with pytest.raises(ConnectionError):
+        client.execute("GET", "k", deadline=0.12)
+    assert time.monotonic() - started < 0.3
+
+def test_pool_wait_bounded_by_deadline():
+    pool = ConnectionPool(connection_class=MockConnection, max_connections=1, timeout=5)
+    pool.get_connection()
+    started = time.monotonic()
+    with deadline(0.05):
+        with pytest.raises(TimeoutError):
+            pool.get_connection()
+    assert time.monotonic() - started < 1
+    assert pool.stats().timeouts == 1
+
+def test_auto_pipeline_deadline(server):
+    client = make_client(server, auto_pipeline=True)
+    with pytest.raises(TimeoutError):
+        client.execute("GET", "k", deadline=0.1)
+    # Ответ просроченной команды прочитан и отброшен конвейером
+    assert client.execute("GET", "k") == PAYLOAD
+    client.close()
+
+def test_deadline_covers_fanout_threads(server):
+    sharded = ShardedClient({name: make_client(server) for name in "ab"})
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        with deadline(0.1):
+            sharded.ping()
+    assert time.monotonic() - started < 0.3
+
+    replicated = ReplicatedClient(
+        make_client(server), {"r1": make_client(server)}, hedge_after=0.05
+    )
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        with deadline(0.1):
+            replicated.get("k")
+    assert time.monotonic() - started < 0.3
+    sharded.close()
+    replicated.close()
+
+def test_async_deadline(server):
+    async def run():
+        host, port = server.address
+        client = AsyncClient(host=host, port=port, timeout=1, decode_responses=False)
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            await client.execute("GET", "k", deadline=0.1)
+        assert time.monotonic() - started < 0.3
+        assert await client.execute("GET", "k") == PAYLOAD
+        assert server.connections == 2
+
+        pipe = client.pipeline()
+        pipe.execute_command("GET", "a")
+        with pytest.raises(TimeoutError):
+            await pipe.execute(deadline=0.1)
+        await client.close()
+
+    asyncio.run(run())
+
+def test_async_auto_pipeline_deadline(server):
+    async def run():
+        host, port = server.address
+        client = AsyncClient(
+            host=host, port=port, timeout=1, decode_responses=False, auto_pipeline=True
+        )
+        with pytest.raises(TimeoutError):
+            await client.execute("GET", "k", deadline=0.1)
+        assert await client.execute("GET", "k") == PAYLOAD
+        await client.close()
+
+    asyncio.run(run())
@@ -0,0 +1,148 @@
+import io
+import json
+
+import pytest
+
+from zumic.benchmark import ZSPServer
+from zumic.benchmark.replay import main, replay, trace_result
+from zumic.client import Client
+from zumic.exceptions import DataError, ResponseError
+from zumic.instrumentation import CommandEvent, HistogramObserver, ObserverGroup
+from zumic.trace import TRACE_MAGIC, TraceReader, TraceRecorder, describe, read_trace
+
+@pytest.fixture
+def server():
+    with ZSPServer() as server:
+        yield server
+
+def make_client(server, **kwargs):
+    host, port = server.address
+    return Client(host=host, port=port, timeout=5, **kwargs)
+
+def record_traffic(server, args="hashed"):
+    out = io.BytesIO()
+    recorder = TraceRecorder(out, args=args)
+    client = make_client(server, observer=recorder)
+    client.set("user:1", "secret value")
+    client.get("user:1")
+    client.get("user:2")
+    client.incr("counter")
+    client.expire("user:1", 100)
+    with pytest.raises(ResponseError):
+        client.incr("user:1")
+    pipe = client.pipeline()
+    pipe.set("a", "1").get("a").incr("a")
+    pipe.execute()
+    tx = client.pipeline(transaction=True)
+    tx.set("b", "2").get("b")
+    tx.execute()
+    client.close()
+    recorder.close()
+    out.seek(0)
+    return out
+
+def test_trace_roundtrip_hashed(server):
+    trace = record_traffic(server)
+    assert trace.getvalue().startswith(TRACE_MAGIC)
+    # Содержимое аргументов в трассу не попадает
+    assert b"secret" not in trace.getvalue()
+    assert b"user:1" not in trace.getvalue()
+    records = read_trace(trace)
+    assert [r.name for r in records] == [
+        "SET", "GET", "GET", "INCR", "EXPIRE", "INCR", "SET", "SET",
+    ]
+    set_key, get_key, other_key = (
+        records[0].calls[0][1], records[1].calls[0][1], records[2].calls[0][1]
+    )
+    # Одинаковые ключи совпадают и после восстановления, длины сохраняются
+    assert set_key == get_key != other_key
+    assert len(set_key) == len("user:1")
+    assert len(records[0].calls[0][2]) == len("secret value")
+    # Числа записываются как есть
+    assert records[4].calls[0][2] == b"100"
+    assert records[5].error and not records[4].error
+    assert records[6].pipeline and not records[6].transaction
+    assert [call[0] for call in records[6].calls] == [b"SET", b"GET", b"INCR"]
+    assert records[7].transaction and len(records[7].calls) == 2
+    assert all(r.latency > 0 for r in records)
+    assert records == sorted(records, key=lambda r: r.started)
+
+def test_trace_sizes_mode(server):
+    records = read_trace(record_traffic(server, args="sizes"))
+    assert records[0].calls[0][1] == b"x" * len("user:1")
+    summary = describe(records)
+    assert summary["records"] == 8
+    assert summary["commands"] == 11
+    assert summary["names"]["SET"] == 3
+
+def test_trace_file_path_and_observer_group(server, tmp_path):
+    path = tmp_path / "trace.zt"
+    histogram = HistogramObserver()
+    with TraceRecorder(path, buffer_size=1) as recorder:
+        client = make_client(server, observer=ObserverGroup(recorder, histogram))
+        for i in range(10):
+            client.set(f"k{i}", i)
+        client.close()
+    assert len(read_trace(path)) == 10
+    assert histogram.stats()["SET"].count == 10
+
+def test_unclosed_recorder_flushed_when_collected(tmp_path):
+    import gc
+
+    path = tmp_path / "trace.zt"
+    recorder = TraceRecorder(path)
+    recorder.after_command(CommandEvent("GET", ("GET", "key"), recorder.started))
+    file = recorder._file
+    del recorder
+    gc.collect()
+    assert file.closed
+    assert [record.name for record in read_trace(path)] == ["GET"]
+
+def test_invalid_traces():
+    with pytest.raises(DataError):
+        TraceReader(io.BytesIO(b"garbage" * 10))
+    with pytest.raises(ValueError):
+        TraceRecorder(io.BytesIO(), args="full")
+    out = io.BytesIO()
+    recorder = TraceRecorder(out)
+    recorder.after_command(CommandEvent("GET", ("GET", "key"), recorder.started))
+    recorder.close()
+    with pytest.raises(DataError):
+        read_trace(io.BytesIO(out.getvalue()[:-3]))
+
+def test_replay_max_speed(server):
+    records = read_trace(record_traffic(server))
+    result = replay(records, lambda: make_client(server), speed=None, concurrency=2)
+    assert result.records == 8
+    assert result.commands == 11
+    assert len(result.latencies) == 8
+    # INCR строки завершается ошибкой и при повторе
+    assert result.errors >= 1
+    original = trace_result(records)
+    assert original.errors == 1 and original.commands == 11
+
+def test_replay_keeps_original_pacing(server):
+    out = io.BytesIO()
+    recorder = TraceRecorder(out)
+    for offset in (0.0, 0.1, 0.2):
+        recorder.after_command(
+            CommandEvent("PING", ("PING",), recorder.started + offset)
+        )
+    recorder.close()
+    records = read_trace(io.BytesIO(out.getvalue()))
+    assert replay(records, lambda: make_client(server)).elapsed >= 0.19
+    assert replay(records, lambda: make_client(server), speed=4).elapsed < 0.15
+
+def test_replay_cli(server, tmp_path, capsys):
+    path = tmp_path / "trace.zt"
+    path.write_bytes(record_traffic(server).getvalue())
+    report = tmp_path / "replay.json"
+    host, port = server.address
+    code = main(
+        [str(path), "--host", host, "--port", str(port), "--max", "--json", str(report)]
+    )
+    assert code == 0
+    output = capsys.readouterr().out
+    assert "8 записей, 11 команд" in output
+    assert "replay" in output and "trace" in output
+    assert json.loads(report.read_text())[0]["records"] == 8
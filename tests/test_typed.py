@@ -0,0 +1,94 @@
+from array import array
+import asyncio
+
+import pytest
+
+from zumic.asyncio import AsyncClient
+from zumic.benchmark import ZSPServer
+from zumic.client import Client
+from zumic.exceptions import DataError, InvalidResponse, ResponseError
+from zumic.typed import NumericReply, as_numpy
+
+from tests.mocks.mock_async_connection import MockAsyncConnection
+from tests.mocks.mock_connection import MockConnection
+from tests.test_connection import make_connection
+
+def test_numeric_array_of_integers():
+    conn = make_connection([b"*3\r\n:1\r\n:-2\r\n:3\r\n"])
+    assert conn.read_numeric_array() == array("q", [1, -2, 3])
+
+def test_numeric_array_of_bulk_strings_split_across_reads():
+    frame = b"*3\r\n$2\r\n10\r\n$-1\r\n$3\r\n300\r\n+OK\r\n"
+    conn = make_connection([frame[i : i + 3] for i in range(0, len(frame), 3)])
+    assert conn.read_numeric_array("d", null=-1) == array("d", [10, -1, 300])
+    # Хвост следующего ответа остаётся в буфере
+    assert conn.read_response() == "OK"
+
+def test_numeric_array_null_and_errors():
+    assert make_connection([b"*-1\r\n"]).read_numeric_array() is None
+    conn = make_connection([b"*2\r\n-ERR bad\r\n:1\r\n:7\r\n"])
+    with pytest.raises(ResponseError):
+        conn.read_numeric_array()
+    # Массив дочитан целиком, поток не рассинхронизирован
+    assert conn.read_response() == 7
+
+def test_numeric_array_invalid_number_after_full_read():
+    conn = make_connection([b"*3\r\n:1\r\n$3\r\n1.5\r\n:2\r\n:7\r\n"])
+    with pytest.raises(DataError):
+        conn.read_numeric_array("q")
+    assert conn.read_response() == 7
+    conn = make_connection([b"*2\r\n:1000\r\n-ERR bad\r\n"])
+    with pytest.raises(ResponseError):
+        conn.read_numeric_array("b")
+
+def test_numeric_array_rejects_non_numeric():
+    conn = make_connection([b"*1\r\n$5\r\na\r\nbc\r\n"])
+    with pytest.raises(InvalidResponse):
+        conn.read_numeric_array()
+    assert not conn.is_connected()
+
+def test_convert_typecodes_and_null():
+    assert NumericReply("q", null=-1).convert([b"5", None]) == array("q", [5, -1])
+    assert NumericReply("d").convert([b"1.5", b"2"]) == array("d", [1.5, 2.0])
+    with pytest.raises(DataError):
+        NumericReply("q").convert([b"1.5"])
+    with pytest.raises(DataError):
+        NumericReply("b").convert([b"1000"])
+    with pytest.raises(ValueError):
+        NumericReply("u")
+
+def test_execute_numeric_with_plain_connection():
+    mock = MockConnection()
+    mock.set_responses([[b"1", None, b"3"]])
+    client = Client(connection=mock)
+    result = client.execute("MGET", "a", "b", "c", numeric=NumericReply())
+    assert result == array("q", [1, 0, 3])
+
+def test_mget_array_against_server():
+    with ZSPServer() as server:
+        host, port = server.address
+        client = Client(host=host, port=port, timeout=5)
+        client.mset({f"n{i}": i * 10 for i in range(50)})
+        keys = [f"n{i}" for i in range(50)] + ["missing"]
+        result = client.mget_array(keys, null=-1, chunk_size=7)
+        assert result == array("q", [i * 10 for i in range(50)] + [-1])
+        pipe = client.pipeline()
+        pipe.execute_command("MGET", "n1", "n2", numeric=NumericReply("d"))
+        pipe.get("n3")
+        assert pipe.execute() == [array("d", [10.0, 20.0]), "30"]
+        client.close()
+
+def test_async_mget_array():
+    mock = MockAsyncConnection()
+    mock.set_responses([[b"1", b"2"], [b"3"]])
+    client = AsyncClient(connection=mock)
+    result = asyncio.run(client.mget_array(["a", "b", "c"], chunk_size=2))
+    assert result == array("q", [1, 2, 3])
+
+def test_as_numpy_shares_memory():
+    numpy = pytest.importorskip("numpy")
+    values = array("q", [1, 2, 3])
+    view = as_numpy(values)
+    assert view.dtype == numpy.int64
+    values[0] = 42
+    assert view[0] == 42
@@ -5,8 +5,10 @@ from zumic.exceptions import (
     ConnectionError,
     InvalidResponse,
     DataError,
+    NoScriptError,
     PubSubError,
     ResponseError,
+    TimeoutError,
     WatchError,
     ZumicError,
 )
@@ -21,8 +23,10 @@ __all__ = [
     "Connection",
     "DataError",
     "InvalidResponse",
+    "NoScriptError",
     "PubSubError",
     "ResponseError",
+    "TimeoutError",
     "WatchError",
     "ZumicError",
 ]
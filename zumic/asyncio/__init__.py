@@ -0,0 +1,15 @@
+from zumic.asyncio.autopipeline import AsyncAutoPipeline
+from zumic.asyncio.client import AsyncClient
+from zumic.asyncio.connection import AsyncConnection
+from zumic.asyncio.pipeline import AsyncPipeline
+from zumic.asyncio.pool import AsyncConnectionPool
+from zumic.asyncio.pubsub import AsyncPubSub
+
+__all__ = [
+    "AsyncAutoPipeline",
+    "AsyncClient",
+    "AsyncConnection",
+    "AsyncConnectionPool",
+    "AsyncPipeline",
+    "AsyncPubSub",
+]
@@ -0,0 +1,238 @@
+from collections import deque
+from typing import Any, Deque, List, Optional, Tuple
+import asyncio
+import contextvars
+
+from zumic.asyncio.connection import AsyncConnection
+from zumic.autopipeline import DEFAULT_MAX_BATCH
+from zumic.encoder import EncodableT
+from zumic.exceptions import ConnectionError, ResponseError, TimeoutError
+from zumic.timeouts import effective_timeout
+from zumic.typed import NumericReply, read_reply_async
+
+
+class _Request:
+    """Команда в очереди автоконвейера и ожидающий её ответа future."""
+
+    __slots__ = ("args", "decode", "numeric", "future")
+
+    def __init__(
+        self,
+        args: Tuple[EncodableT, ...],
+        decode: Optional[bool],
+        numeric: Optional[NumericReply],
+        future: "asyncio.Future[Any]",
+    ) -> None:
+        self.args = args
+        self.decode = decode
+        self.numeric = numeric
+        self.future = future
+
+
+class AsyncAutoPipeline:
+    """
+    Асинхронный автоконвейер (см. `zumic.autopipeline.AutoPipeline`).
+
+    Команды конкурентных задач собираются задачей записи в одну запись
+    в сокет, а задача чтения раздаёт ответы в порядке отправки.
+    """
+
+    def __init__(
+        self, connection: AsyncConnection, max_batch: int = DEFAULT_MAX_BATCH
+    ) -> None:
+        """
+        Args:
+            connection: Соединение, используемое только автоконвейером
+            max_batch: Максимальное число команд в одной записи
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch должен быть положительным")
+        self.connection = connection
+        self.max_batch = max_batch
+        self._cond: Optional[asyncio.Condition] = None
+        self._queue: Deque[_Request] = deque()
+        self._pending: Deque[_Request] = deque()
+        self._generation = 0
+        self._reading = False
+        self._closed = False
+        self._tasks: List["asyncio.Task[None]"] = []
+        self.batches = 0
+        self.commands = 0
+
+    @property
+    def pending(self) -> int:
+        """Число команд, ожидающих записи или ответа."""
+        return len(self._queue) + len(self._pending)
+
+    async def execute(
+        self,
+        *args: EncodableT,
+        decode: Optional[bool] = None,
+        numeric: Optional[NumericReply] = None,
+    ) -> Any:
+        """
+        Выполняет команду и ждёт её ответа.
+
+        При активном бюджете времени ожидание ответа ограничено им
+        (см. `zumic.autopipeline.AutoPipeline.execute`).
+
+        Raises:
+            ResponseError: Ошибка от сервера
+            TimeoutError: Истёк бюджет времени
+            ConnectionError: Ошибка соединения
+        """
+        if not args:
+            raise ValueError("Команда не может быть пустой")
+        if self._closed:
+            raise ConnectionError("Автоконвейер закрыт")
+        timeout = effective_timeout(None)
+        cond = self._get_cond()
+        future = asyncio.get_running_loop().create_future()
+        async with cond:
+            self._queue.append(_Request(args, decode, numeric, future))
+            self._start()
+            cond.notify_all()
+        if timeout is None:
+            return await future
+        try:
+            # Отменённый future пропускается задачей чтения, поэтому
+            # конвейер не сбивается
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError("Истёк бюджет времени команды") from None
+
+    def _get_cond(self) -> asyncio.Condition:
+        # Создаётся в цикле событий, в котором автоконвейер используется
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    def _start(self) -> None:
+        if not self._tasks:
+            # Задачи создаются в чистом контексте: иначе они унаследовали
+            # бы бюджет времени (`zumic.timeouts.deadline`) первой команды
+            context = contextvars.Context()
+            self._tasks = [
+                context.run(asyncio.ensure_future, self._write_loop()),
+                context.run(asyncio.ensure_future, self._read_loop()),
+            ]
+
+    async def _write_loop(self) -> None:
+        """Отправляет накопившиеся команды одной записью."""
+        cond = self._get_cond()
+        connection = self.connection
+        while True:
+            async with cond:
+                await cond.wait_for(lambda: bool(self._queue) or self._closed)
+                if self._closed:
+                    return
+                count = min(len(self._queue), self.max_batch)
+                batch = [self._queue.popleft() for _ in range(count)]
+                if not connection.is_connected():
+                    await cond.wait_for(lambda: not self._reading)
+                    try:
+                        await connection.connect()
+                    except Exception as e:
+                        self._finish(batch, e)
+                        continue
+                generation = self._generation
+                self._pending.extend(batch)
+                cond.notify_all()
+            try:
+                await connection.send_commands([request.args for request in batch])
+            except Exception as e:
+                await self._fail(generation, e)
+                continue
+            self.batches += 1
+            self.commands += len(batch)
+
+    async def _read_loop(self) -> None:
+        """Читает ответы и раздаёт их ожидающим в порядке отправки."""
+        cond = self._get_cond()
+        connection = self.connection
+        while True:
+            async with cond:
+                await cond.wait_for(lambda: bool(self._pending) or self._closed)
+                if not self._pending:
+                    return
+                request = self._pending[0]
+                generation = self._generation
+                self._reading = True
+            reply: Any
+            try:
+                reply = await read_reply_async(
+                    connection, request.decode, request.numeric
+                )
+            except ResponseError as e:
+                reply = e
+            except Exception as e:
+                await self._fail(generation, e)
+                continue
+            finally:
+                async with cond:
+                    self._reading = False
+                    cond.notify_all()
+            async with cond:
+                if generation != self._generation:
+                    continue
+                self._pending.popleft()
+            if request.future.done():
+                continue  # Вызывающая задача отменена
+            if isinstance(reply, ResponseError):
+                request.future.set_exception(reply)
+            else:
+                request.future.set_result(reply)
+
+    async def _fail(self, generation: int, error: BaseException) -> None:
+        """Закрывает соединение и завершает отправленные команды ошибкой."""
+        cond = self._get_cond()
+        async with cond:
+            if generation != self._generation:
+                return
+            self._generation += 1
+            failed = list(self._pending)
+            self._pending.clear()
+            await self.connection.disconnect()
+            cond.notify_all()
+        self._finish(failed, error)
+
+    @staticmethod
+    def _finish(requests: List[_Request], error: BaseException) -> None:
+        if not isinstance(error, (ConnectionError, ResponseError)):
+            wrapped = ConnectionError("Ошибка соединения автоконвейера")
+            wrapped.__cause__ = error
+            error = wrapped
+        for request in requests:
+            if not request.future.done():
+                request.future.set_exception(error)
+
+    async def close(self) -> None:
+        """Останавливает задачи и закрывает соединение."""
+        if self._closed:
+            return
+        self._closed = True
+        cond = self._get_cond()
+        async with cond:
+            self._generation += 1
+            failed = list(self._pending) + list(self._queue)
+            self._pending.clear()
+            self._queue.clear()
+            cond.notify_all()
+        self._finish(failed, ConnectionError("Автоконвейер закрыт"))
+        await self.connection.disconnect()
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self):
+        """Поддержка асинхронного контекстного менеджера."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Закрывает автоконвейер."""
+        await self.close()
+        return False
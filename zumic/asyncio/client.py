@@ -0,0 +1,506 @@
+from array import array
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+import asyncio
+
+from zumic.asyncio.autopipeline import AsyncAutoPipeline
+from zumic.asyncio.connection import AsyncConnection
+from zumic.asyncio.pipeline import AsyncPipeline
+from zumic.asyncio.pool import AsyncConnectionPool
+from zumic.asyncio.pubsub import AsyncPubSub
+from zumic.commands import (
+    DEFAULT_CHUNK_SIZE,
+    BatchCommand,
+    CoreCommands,
+    _is_ok,
+    chunked,
+    set_options,
+)
+from zumic.encoder import EncodableT
+from zumic.exceptions import DataError, NoScriptError, ResponseError
+from zumic.instrumentation import CommandTimer, Observer
+from zumic.retry import Retry
+from zumic.scripting import Script
+from zumic.serialization import ValueCodec
+from zumic.streaming import readable_source, stream_size, writable_target
+from zumic.timeouts import deadline as time_budget
+from zumic.typed import NumericReply, concat_arrays, read_reply_async
+
+
+class AsyncClient(CoreCommands[Awaitable[Any]]):
+    """
+    Асинхронный клиент для работы с Zumic БД.
+
+    Повторяет набор команд `Client`, но каждая команда - корутина:
+    `await client.get("key")`.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 6174,
+        timeout: Optional[float] = None,
+        connection: Optional[AsyncConnection] = None,
+        decode_responses: bool = True,
+        encoding: str = "utf-8",
+        encoding_errors: str = "replace",
+        connection_pool: Optional[AsyncConnectionPool] = None,
+        observer: Optional[Observer] = None,
+        retry: Optional[Retry] = None,
+        codec: Optional[ValueCodec] = None,
+        auto_pipeline: bool = False,
+        unix_socket_path: Optional[str] = None,
+        socket_connect_timeout: Optional[float] = None,
+        **connection_kwargs: Any,
+    ) -> None:
+        """
+        Инициализирует асинхронный клиент Zumic.
+
+        Args:
+            host: Адрес сервера
+            port: Порт сервера
+            timeout: Таймаут чтения ответа
+            connection: Кастомное соединение
+            decode_responses: Декодировать ответы в строки (иначе - bytes)
+            encoding: Кодировка строк ответа
+            encoding_errors: Политика обработки ошибок декодирования
+            connection_pool: Пул соединений, разделяемый между задачами
+                (взаимоисключающе с `connection`)
+            observer: Наблюдатель за выполнением команд (ожидание ответа
+                и разбор замеряются вместе)
+            retry: Политика повторов команд после ошибок соединения
+            codec: Кодек значений `set`/`get`/`mset`/`mget`
+            auto_pipeline: Выполнять одиночные команды через общий
+                автоконвейер (`AsyncAutoPipeline`) на отдельном соединении
+                (несовместим с `connection`)
+            unix_socket_path: Путь к Unix-сокету сервера вместо host/port
+            socket_connect_timeout: Таймаут установки соединения
+                (None - совпадает с `timeout`)
+            **connection_kwargs: Остальные параметры `AsyncConnection`
+        """
+        if connection is not None and connection_pool is not None:
+            raise ValueError(
+                "Нельзя одновременно передать connection и connection_pool"
+            )
+        if connection is not None and auto_pipeline:
+            # Автоконвейеру нужно отдельное соединение, а параметры
+            # готового соединения клиенту неизвестны
+            raise ValueError("auto_pipeline нельзя использовать с готовым connection")
+
+        self.connection_pool = connection_pool
+        self.connection: Optional[AsyncConnection] = None
+        # Параметры соединения клиента для отдельных соединений (Pub/Sub)
+        self._connection_kwargs: Optional[Dict[str, Any]] = None
+        if connection_pool is None and connection is None:
+            self._connection_kwargs = dict(
+                host=host,
+                port=port,
+                timeout=timeout,
+                decode_responses=decode_responses,
+                encoding=encoding,
+                encoding_errors=encoding_errors,
+                unix_socket_path=unix_socket_path,
+                socket_connect_timeout=socket_connect_timeout,
+                **connection_kwargs,
+            )
+            self.connection = AsyncConnection(**self._connection_kwargs)
+        elif connection_pool is None:
+            self.connection = connection
+        self.decode_responses = decode_responses
+        self.encoding = encoding
+        self.encoding_errors = encoding_errors
+        self.observer = observer
+        self.retry = retry
+        self.codec = codec
+        self.auto_pipeline = auto_pipeline
+        self._auto_pipeline: Optional[AsyncAutoPipeline] = None
+        # Единственное соединение не должно использоваться задачами одновременно
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def get_connection(self) -> AsyncIterator[AsyncConnection]:
+        """
+        Выдаёт соединение на время одного обмена с сервером.
+
+        Соединение берётся из пула, а при его отсутствии используется
+        единственное соединение клиента под блокировкой. При любой ошибке,
+        кроме ошибки сервера, соединение закрывается.
+        """
+        if self.connection_pool is not None:
+            async with self.connection_pool.connection() as pooled:
+                yield pooled
+            return
+
+        connection = self.connection
+        assert connection is not None
+        async with self._lock:
+            try:
+                yield connection
+            except BaseException as e:
+                if not isinstance(e, ResponseError):
+                    await connection.disconnect()
+                raise
+
+    async def execute(
+        self,
+        *args: EncodableT,
+        decode: Optional[bool] = None,
+        numeric: Optional[NumericReply] = None,
+        deadline: Optional[float] = None,
+    ) -> Any:
+        """
+        Выполняет команду на сервере.
+
+        Args:
+            *args: Аргументы команды
+            decode: Декодировать строки ответа; False - вернуть bytes
+                (None - настройка клиента)
+            numeric: Разобрать ответ-массив чисел в `array.array`
+            deadline: Бюджет времени команды в секундах вместе со всеми
+                повторами (см. `zumic.timeouts.deadline`)
+
+        Returns:
+            Ответ сервера
+
+        Raises:
+            ResponseError: Ошибка от сервера
+            InvalidResponse: Некорректный ответ
+            TimeoutError: Истёк таймаут или бюджет времени
+            ConnectionError: Ошибка соединения
+        """
+        if not args:
+            raise ValueError("Команда не может быть пустой")
+        if deadline is not None:
+            with time_budget(deadline):
+                return await self._execute_retrying(args, decode, numeric)
+        return await self._execute_retrying(args, decode, numeric)
+
+    async def _execute_retrying(
+        self,
+        args: Tuple[EncodableT, ...],
+        decode: Optional[bool],
+        numeric: Optional[NumericReply] = None,
+    ) -> Any:
+        """Выполняет команду с учётом политики повторов (см. `Client`)."""
+        retry = self.retry
+        if retry is None:
+            return await self._execute_once(args, decode, numeric)
+
+        sent = False
+
+        def mark_sent() -> None:
+            nonlocal sent
+            sent = True
+
+        def attempt() -> Awaitable[Any]:
+            nonlocal sent
+            sent = False
+            return self._execute_once(args, decode, numeric, mark_sent)
+
+        return await retry.call_with_retry_async(
+            attempt, retryable=lambda error: not sent or retry.can_repeat_sent(args)
+        )
+
+    async def _execute_once(
+        self,
+        args: Tuple[EncodableT, ...],
+        decode: Optional[bool],
+        numeric: Optional[NumericReply] = None,
+        on_sent: Optional[Callable[[], None]] = None,
+    ) -> Any:
+        """
+        Выполняет команду одной попыткой.
+
+        `on_sent` вызывается, когда команда целиком записана в сокет.
+        """
+        if self.auto_pipeline:
+            if self._auto_pipeline is None:
+                self._auto_pipeline = AsyncAutoPipeline(self.make_connection())
+            if on_sent is not None:
+                on_sent()
+            response = await self._auto_pipeline.execute(
+                *args, decode=decode, numeric=numeric
+            )
+            return self._process_response(response, decode)
+        async with self.get_connection() as connection:
+            if self.observer is None:
+                await connection.send_command(*args)
+                if on_sent is not None:
+                    on_sent()
+                response = await read_reply_async(connection, decode, numeric)
+            else:
+                timer = CommandTimer(self.observer, args, connection)
+                try:
+                    await connection.send_command(*args)
+                    timer.sent()
+                    if on_sent is not None:
+                        on_sent()
+                    response = await read_reply_async(connection, decode, numeric)
+                except BaseException as e:
+                    timer.finish(e)
+                    raise
+                timer.finish()
+        return self._process_response(response, decode)
+
+    def _process_response(self, response: Any, decode: Optional[bool] = None) -> Any:
+        """
+        Приводит сырой ответ соединения к виду, отдаваемому пользователю.
+
+        Соединения клиента декодируют строки сами; здесь декодируются только
+        байты от соединений, настроенных на сырой режим.
+        """
+        if decode is None:
+            decode = self.decode_responses
+        if decode and isinstance(response, bytes):
+            response = response.decode(self.encoding, self.encoding_errors)
+        return response
+
+    async def execute_command(
+        self,
+        *args: EncodableT,
+        callback: Optional[Callable[[Any], Any]] = None,
+        **options: Any,
+    ) -> Any:
+        """
+        Выполняет команду и применяет к ответу функцию постобработки.
+
+        Args:
+            *args: Аргументы команды
+            callback: Функция постобработки ответа сервера
+            **options: Параметры выполнения (см. `execute`)
+        """
+        response = await self.execute(*args, **options)
+        return callback(response) if callback is not None else response
+
+    async def _local_result(self, value: Any) -> Any:
+        """Возвращает результат, не требующий обращения к серверу."""
+        return value
+
+    async def _execute_batch(
+        self, commands: List[BatchCommand], combine: Callable[[List[Any]], Any]
+    ) -> Any:
+        """Выполняет команды одним конвейером и сводит результаты."""
+        pipe = self.pipeline()
+        for args, callback, options in commands:
+            pipe.execute_command(*args, callback=callback, **options)
+        return combine(await pipe.execute())
+
+    async def _run_script(
+        self, script: Script, keys: Sequence[EncodableT], args: Sequence[EncodableT]
+    ) -> Any:
+        """Выполняет скрипт по SHA1, без него в кэше сервера - через EVAL."""
+        try:
+            return await self.evalsha(script.sha, keys, args)
+        except NoScriptError:
+            return await self.eval(script.source, keys, args)
+
+    async def mget_array(
+        self,
+        keys: Iterable[str],
+        typecode: str = "q",
+        null: float = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> array:
+        """
+        Асинхронно получает числовые значения многих ключей в типизированный массив.
+
+        Ответы MGET разбираются сразу в `array.array` без создания объекта
+        на каждое значение; `as_numpy()` превращает результат в массив
+        NumPy без копирования.
+
+        Args:
+            keys: Ключи (любой итерируемый объект)
+            typecode: Код типа `array.array` (по умолчанию int64)
+            null: Значение для отсутствующих ключей
+            chunk_size: Максимальное число ключей в одной команде
+
+        Returns:
+            Массив значений в порядке ключей
+
+        Raises:
+            DataError: Значение не является числом нужного типа
+        """
+        numeric = NumericReply(typecode, null)
+        pipe = self.pipeline()
+        for chunk in chunked(keys, chunk_size):
+            pipe.execute_command("MGET", *chunk, numeric=numeric)
+        return concat_arrays(await pipe.execute(), typecode)
+
+    async def get_into(self, key: str, target: Any) -> Optional[int]:
+        """
+        Асинхронно читает значение ключа прямо в буфер или файл
+        (см. `Client.get_into`).
+
+        Returns:
+            Длину значения или None, если ключ не найден
+
+        Raises:
+            DataError: Значение не помещается в буфер
+        """
+        sink = writable_target(target)
+        async with self.get_connection() as connection:
+            await connection.send_command("GET", key)
+            return await connection.read_bulk_into(sink)
+
+    async def set_from(
+        self, key: str, source: Any, size: Optional[int] = None, **kwargs: Any
+    ) -> bool:
+        """
+        Асинхронно записывает значение ключа из файла или буфера
+        (см. `Client.set_from`).
+
+        Returns:
+            True если операция успешна
+
+        Raises:
+            DataError: Источник короче `size`
+        """
+        tail = set_options(kwargs)
+        view = readable_source(source)
+        if view is not None and size is not None:
+            if size > len(view):
+                raise DataError("Источник короче заявленного размера")
+            view = view[:size]
+        elif view is None and size is None:
+            size = stream_size(source)
+        async with self.get_connection() as connection:
+            if view is not None:
+                await connection.send_command("SET", key, view, *tail)
+            else:
+                await connection.send_command_from(
+                    ("SET", key), source, size or 0, tail
+                )
+            response = await connection.read_response()
+        return _is_ok(response)
+
+    async def scan_iter(
+        self,
+        match: Optional[str] = None,
+        count: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> AsyncIterator[Any]:
+        """
+        Лениво обходит пространство ключей порциями SCAN.
+
+        Args:
+            match: Шаблон ключей
+            count: Подсказка серверу о размере порции
+            prefetch: Запрашивать следующую порцию отдельной задачей, пока
+                вызывающий код обрабатывает текущую
+
+        Yields:
+            Ключи
+        """
+        cursor, keys = await self.scan(0, match, count)
+        while True:
+            pending: Optional["asyncio.Task[Any]"] = None
+            if cursor and prefetch:
+                pending = asyncio.ensure_future(self.scan(cursor, match, count))
+            try:
+                for key in keys:
+                    yield key
+            except BaseException:
+                # Генератор закрыли досрочно - не оставляем висящую задачу
+                if pending is not None:
+                    pending.cancel()
+                raise
+            if cursor == 0:
+                return
+            if pending is not None:
+                cursor, keys = await pending
+            else:
+                cursor, keys = await self.scan(cursor, match, count)
+
+    def pipeline(
+        self, raise_on_error: bool = True, transaction: bool = False
+    ) -> AsyncPipeline:
+        """
+        Создаёт асинхронный конвейер команд.
+
+        Args:
+            raise_on_error: Бросать первую ошибку команды при `execute()`
+            transaction: Выполнять очередь атомарно через MULTI/EXEC
+        """
+        return AsyncPipeline(
+            self, raise_on_error=raise_on_error, transaction=transaction
+        )
+
+    def pubsub(
+        self, connection: Optional[AsyncConnection] = None, **options: Any
+    ) -> AsyncPubSub:
+        """
+        Создаёт асинхронного подписчика Pub/Sub на собственном соединении
+        (с настройками клиента, но без таймаута чтения).
+
+        Args:
+            connection: Готовое соединение для подписчика
+            **options: Параметры `AsyncPubSub`
+
+        Raises:
+            ValueError: Клиент создан с готовым соединением, и его
+                настройки неизвестны
+        """
+        if connection is None:
+            settings = self._connection_settings()
+            connect_timeout = settings.get("socket_connect_timeout")
+            if connect_timeout is None:
+                connect_timeout = settings.get("timeout")
+            connection = self.make_connection(
+                timeout=None, socket_connect_timeout=connect_timeout
+            )
+        return AsyncPubSub(connection, **options)
+
+    def make_connection(self, **overrides: Any) -> AsyncConnection:
+        """
+        Создаёт отдельное соединение с настройками клиента (или пула).
+
+        Args:
+            **overrides: Параметры соединения, заменяющие настройки клиента
+
+        Raises:
+            ValueError: Клиент создан с готовым соединением, и его
+                настройки неизвестны
+        """
+        factory: Callable[..., AsyncConnection] = AsyncConnection
+        if self.connection_pool is not None:
+            factory = self.connection_pool.connection_class
+        return factory(**{**self._connection_settings(), **overrides})
+
+    def _connection_settings(self) -> Dict[str, Any]:
+        if self.connection_pool is not None:
+            return self.connection_pool.connection_kwargs
+        if self._connection_kwargs is None:
+            raise ValueError(
+                "Клиент создан с готовым соединением: передайте соединение явно"
+            )
+        return self._connection_kwargs
+
+    async def close(self) -> None:
+        """Закрывает соединение с сервером (или все соединения пула)."""
+        if self._auto_pipeline is not None:
+            await self._auto_pipeline.close()
+            self._auto_pipeline = None
+        if self.connection_pool is not None:
+            await self.connection_pool.disconnect()
+        elif self.connection is not None:
+            await self.connection.disconnect()
+
+    async def __aenter__(self):
+        """Поддержка асинхронного контекстного менеджера."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Автоматическое закрытие соединения."""
+        await self.close()
+        return False
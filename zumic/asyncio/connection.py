@@ -0,0 +1,386 @@
+from typing import (
+    IO,
+    Any,
+    Iterable,
+    Mapping,
+    NoReturn,
+    Optional,
+    Sequence,
+    Union,
+)
+import asyncio
+import socket
+
+from zumic.encoder import (
+    BufferT,
+    EncodableT,
+    pack_command_buffers,
+    pack_commands_buffers,
+    pack_stream_command,
+)
+from zumic.exceptions import (
+    ConnectionError,
+    DataError,
+    InvalidResponse,
+    ResponseError,
+    TimeoutError,
+)
+from zumic.parser import (
+    ARRAY,
+    BULK,
+    CRLF,
+    STREAM_CHUNK_SIZE,
+    STRING,
+    VALUE,
+    decode_bulk,
+    parse_line,
+    write_all,
+)
+from zumic.timeouts import effective_timeout
+
+
+class AsyncConnection:
+    """Асинхронное соединение с сервером Zumic поверх asyncio streams."""
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6174,
+        timeout: Optional[float] = None,
+        decode_responses: bool = True,
+        encoding: str = "utf-8",
+        encoding_errors: str = "replace",
+        unix_socket_path: Optional[str] = None,
+        socket_connect_timeout: Optional[float] = None,
+        tcp_nodelay: bool = True,
+        socket_keepalive: bool = False,
+        socket_keepalive_options: Optional[Mapping[int, int]] = None,
+        send_buffer_size: Optional[int] = None,
+        receive_buffer_size: Optional[int] = None,
+    ) -> None:
+        """
+        Параметры транспорта совпадают с параметрами `Connection`.
+
+        Args:
+            timeout: Таймаут чтения ответа
+            unix_socket_path: Путь к Unix-сокету сервера вместо host/port
+            socket_connect_timeout: Таймаут установки соединения
+                (None - совпадает с `timeout`)
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.unix_socket_path = unix_socket_path
+        self.socket_connect_timeout = (
+            socket_connect_timeout if socket_connect_timeout is not None else timeout
+        )
+        self.tcp_nodelay = tcp_nodelay
+        self.socket_keepalive = socket_keepalive
+        self.socket_keepalive_options = dict(socket_keepalive_options or {})
+        self.send_buffer_size = send_buffer_size
+        self.receive_buffer_size = receive_buffer_size
+        self.decode_responses = decode_responses
+        self.encoding = encoding
+        self.encoding_errors = encoding_errors
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self) -> None:
+        """Устанавливает соединение с сервером."""
+        if self.is_connected():
+            return
+
+        timeout = effective_timeout(self.socket_connect_timeout)
+        if self.unix_socket_path is not None:
+            opening = asyncio.open_unix_connection(self.unix_socket_path)
+        else:
+            opening = asyncio.open_connection(self.host, self.port)
+        try:
+            reader, writer = await asyncio.wait_for(opening, timeout)
+        except asyncio.TimeoutError as e:
+            raise TimeoutError(f"Истекло время подключения к {self.address}") from e
+        except OSError as e:
+            raise ConnectionError(f"Не удалось подключиться к {self.address}") from e
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            self._configure(sock)
+        self._reader, self._writer = reader, writer
+
+    @property
+    def address(self) -> str:
+        """Адрес сервера для сообщений об ошибках."""
+        if self.unix_socket_path is not None:
+            return f"unix://{self.unix_socket_path}"
+        return f"{self.host}:{self.port}"
+
+    def _configure(self, sock: socket.socket) -> None:
+        if self.send_buffer_size is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size)
+        if self.receive_buffer_size is not None:
+            sock.setsockopt(
+                socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer_size
+            )
+        if sock.family not in (socket.AF_INET, socket.AF_INET6):
+            return
+        # asyncio включает TCP_NODELAY сам, но его можно явно отключить
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(self.tcp_nodelay))
+        if self.socket_keepalive:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for option, value in self.socket_keepalive_options.items():
+                sock.setsockopt(socket.IPPROTO_TCP, option, value)
+
+    async def disconnect(self) -> None:
+        """Закрывает соединение с сервером."""
+        writer = self._writer
+        self._reader = None
+        self._writer = None
+        if writer is not None:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except OSError:
+                pass  # Игнорируем ошибки при закрытии
+
+    def is_connected(self) -> bool:
+        """Проверяет, активно ли соединение."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def send(self, data: BufferT) -> None:
+        """Отправляет данные на сервер."""
+        await self.send_buffers([data])
+
+    async def send_buffers(self, buffers: Sequence[BufferT]) -> None:
+        """
+        Отправляет несколько буферов на сервер без их склейки.
+
+        Транспорт asyncio передаёт буферы в сокет векторной записью там,
+        где это поддерживается.
+        """
+        if not self.is_connected():
+            await self.connect()
+
+        assert self._writer is not None
+        timeout = await self._effective_timeout(None)
+        try:
+            self._writer.writelines(buffers)
+            if timeout is None:
+                await self._writer.drain()
+            else:
+                await asyncio.wait_for(self._writer.drain(), timeout)
+        except asyncio.TimeoutError as e:
+            await self._timed_out(e)
+        except OSError as e:
+            await self.disconnect()
+            raise ConnectionError("Ошибка отправки данных") from e
+
+    async def send_command(self, *args: EncodableT) -> None:
+        """Отправляет команду на сервер."""
+        if not args:
+            raise ValueError("Команда не может быть пустой")
+        await self.send_buffers(pack_command_buffers(*args))
+
+    async def send_commands(self, commands: Iterable[Sequence[EncodableT]]) -> None:
+        """Отправляет несколько команд на сервер одной записью."""
+        await self.send_buffers(pack_commands_buffers(commands))
+
+    async def send_command_from(
+        self,
+        head: Sequence[EncodableT],
+        source: IO[bytes],
+        size: int,
+        tail: Sequence[EncodableT] = (),
+    ) -> None:
+        """
+        Отправляет команду, значение которой читается из файла (см.
+        `Connection.send_command_from`).
+
+        Значение передаётся через `loop.sendfile`: системным вызовом
+        sendfile, где это возможно, иначе - кусками.
+
+        Raises:
+            DataError: Источник короче `size`
+            ConnectionError: Ошибка отправки или чтения источника
+        """
+        before, after = pack_stream_command(head, size, tail)
+        if not self.is_connected():
+            await self.connect()
+
+        writer = self._writer
+        assert writer is not None
+        timeout = await self._effective_timeout(None)
+        try:
+            sent = await asyncio.wait_for(
+                self._send_from(writer, before, source, size, after), timeout
+            )
+        except asyncio.TimeoutError as e:
+            await self._timed_out(e)
+        except OSError as e:
+            # Сервер ждёт остаток значения: соединение больше непригодно
+            await self.disconnect()
+            raise ConnectionError("Ошибка отправки данных") from e
+        if sent != size:
+            await self.disconnect()
+            raise DataError(f"Источник короче заявленного размера ({size} байт)")
+
+    @staticmethod
+    async def _send_from(
+        writer: asyncio.StreamWriter,
+        before: bytes,
+        source: IO[bytes],
+        size: int,
+        after: bytes,
+    ) -> int:
+        writer.write(before)
+        await writer.drain()
+        offset = source.tell() if source.seekable() else 0
+        sent = 0
+        if size:
+            loop = asyncio.get_running_loop()
+            sent = await loop.sendfile(writer.transport, source, offset, size)
+        if sent == size:
+            writer.write(after)
+            await writer.drain()
+        return sent
+
+    async def read_response(self, decode: Optional[bool] = None) -> Any:
+        """
+        Читает один полный ответ от сервера.
+
+        Args:
+            decode: Декодировать строки ответа; False - вернуть bytes без
+                какого-либо декодирования (None - настройка соединения)
+        """
+        if self._reader is None:
+            raise ConnectionError("Нет активного соединения")
+
+        if decode is None:
+            decode = self.decode_responses
+        encoding = self.encoding if decode else None
+        timeout = await self._effective_timeout(self.timeout)
+        try:
+            response = await asyncio.wait_for(
+                self._read_reply(self._reader, encoding), timeout
+            )
+        except asyncio.TimeoutError as e:
+            await self._timed_out(e)
+        except (asyncio.IncompleteReadError, ConnectionResetError) as e:
+            await self.disconnect()
+            raise ConnectionError("Соединение закрыто сервером") from e
+        except OSError as e:
+            await self.disconnect()
+            raise ConnectionError("Ошибка получения данных") from e
+        except InvalidResponse:
+            # После нарушения протокола поток рассинхронизирован — закрываем его
+            await self.disconnect()
+            raise
+
+        if isinstance(response, ResponseError):
+            raise response
+        return response
+
+    async def read_bulk_into(
+        self, target: Union[memoryview, IO[bytes]]
+    ) -> Optional[int]:
+        """
+        Читает ответ-строку прямо в буфер или файл кусками по
+        `STREAM_CHUNK_SIZE`, не собирая значение в памяти.
+
+        Returns:
+            Длину значения или None, если сервер вернул null
+
+        Raises:
+            DataError: Значение не помещается в буфер
+        """
+        if self._reader is None:
+            raise ConnectionError("Нет активного соединения")
+
+        timeout = await self._effective_timeout(self.timeout)
+        try:
+            return await asyncio.wait_for(
+                self._read_bulk_into(self._reader, target), timeout
+            )
+        except asyncio.TimeoutError as e:
+            await self._timed_out(e)
+        except (asyncio.IncompleteReadError, ConnectionResetError) as e:
+            await self.disconnect()
+            raise ConnectionError("Соединение закрыто сервером") from e
+        except OSError as e:
+            await self.disconnect()
+            raise ConnectionError("Ошибка получения данных") from e
+        except (InvalidResponse, DataError):
+            # Значение дочитано не до конца
+            await self.disconnect()
+            raise
+
+    async def _effective_timeout(self, timeout: Optional[float]) -> Optional[float]:
+        """Таймаут операции, сокращённый до оставшегося бюджета команды."""
+        try:
+            return effective_timeout(timeout)
+        except TimeoutError:
+            # Ответ мог остаться недочитанным: соединение больше непригодно
+            await self.disconnect()
+            raise
+
+    async def _timed_out(self, error: BaseException) -> NoReturn:
+        """Закрывает соединение после таймаута операции."""
+        await self.disconnect()
+        raise TimeoutError("Истекло время ожидания сервера") from error
+
+    @staticmethod
+    async def _read_bulk_into(
+        reader: asyncio.StreamReader, target: Union[memoryview, IO[bytes]]
+    ) -> Optional[int]:
+        line = await reader.readuntil(CRLF)
+        kind, length = parse_line(line[:-2])
+        if kind == VALUE:
+            if isinstance(length, ResponseError):
+                raise length
+            if length is None:
+                return None
+        if kind != BULK:
+            raise InvalidResponse("Ожидалась bulk-строка")
+        if isinstance(target, memoryview) and length > target.nbytes:
+            raise DataError(
+                f"Значение ({length} байт) не помещается в буфер ({target.nbytes} байт)"
+            )
+
+        filled = 0
+        while filled < length:
+            data = await reader.read(min(length - filled, STREAM_CHUNK_SIZE))
+            if not data:
+                raise asyncio.IncompleteReadError(b"", length - filled)
+            if isinstance(target, memoryview):
+                target[filled : filled + len(data)] = data
+            else:
+                write_all(target, memoryview(data))
+            filled += len(data)
+        if await reader.readexactly(2) != CRLF:
+            raise InvalidResponse("Bulk-строка не завершается CRLF")
+        return length
+
+    async def _read_reply(
+        self, reader: asyncio.StreamReader, encoding: Optional[str]
+    ) -> Any:
+        """Разбирает один ответ. Ошибки внутри массивов возвращаются на месте."""
+        line = await reader.readuntil(CRLF)
+        kind, value = parse_line(line[:-2])
+        if kind == BULK:
+            data = await reader.readexactly(value + 2)
+            if data[-2:] != CRLF:
+                raise InvalidResponse("Bulk-строка не завершается CRLF")
+            value = data[:-2]
+        elif kind == ARRAY:
+            return [await self._read_reply(reader, encoding) for _ in range(value)]
+        elif kind != STRING:
+            return value
+        return decode_bulk(value, encoding, self.encoding_errors)
+
+    async def __aenter__(self):
+        """Поддержка асинхронного контекстного менеджера."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Автоматическое закрытие соединения."""
+        await self.disconnect()
+        return False
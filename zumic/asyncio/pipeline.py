@@ -0,0 +1,355 @@
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from zumic.commands import BatchCommand, _is_ok
+from zumic.encoder import EncodableT
+from zumic.exceptions import NoScriptError, ResponseError, WatchError
+from zumic.instrumentation import CommandTimer
+from zumic.pipeline import Pipeline, QueuedCommand
+from zumic.scripting import Script
+from zumic.timeouts import deadline as time_budget
+from zumic.typed import read_reply_async
+
+if TYPE_CHECKING:
+    from zumic.asyncio.client import AsyncClient
+    from zumic.asyncio.connection import AsyncConnection
+
+
+class AsyncPipeline(Pipeline):
+    """
+    Асинхронный конвейер команд Zumic.
+
+    Команды ставятся в очередь синхронно, а отправляются и читаются
+    одной операцией `await pipe.execute()`.
+
+    Транзакции работают так же, как у `Pipeline`: очередь оборачивается
+    в MULTI/EXEC, а после `await pipe.watch(...)` конвейер держит своё
+    соединение и команды до `multi()` возвращают корутины с результатом.
+    """
+
+    client: "AsyncClient"  # type: ignore[assignment]
+
+    def __init__(
+        self,
+        client: "AsyncClient",
+        raise_on_error: bool = True,
+        transaction: bool = False,
+    ) -> None:
+        """
+        Args:
+            client: Клиент, через соединение которого выполняются команды
+            raise_on_error: Бросать первую ошибку команды при `execute()`
+            transaction: Выполнять очередь атомарно через MULTI/EXEC
+        """
+        super().__init__(client, raise_on_error, transaction)  # type: ignore[arg-type]
+        # Соединение, удерживаемое между WATCH и EXEC
+        self._async_stack: Optional[AsyncExitStack] = None
+        self._held: Optional["AsyncConnection"] = None
+
+    async def execute(  # type: ignore[override]
+        self, raise_on_error: Optional[bool] = None, deadline: Optional[float] = None
+    ) -> List[Any]:
+        """
+        Отправляет все накопленные команды и читает ответы.
+
+        Args:
+            raise_on_error: Переопределяет одноимённую настройку конвейера
+            deadline: Бюджет времени всего конвейера в секундах
+                (см. `zumic.timeouts.deadline`)
+
+        Returns:
+            Ответы в порядке постановки команд
+
+        Raises:
+            ResponseError: Первая ошибка команды (если raise_on_error)
+            WatchError: Наблюдаемый ключ изменился, транзакция отменена
+        """
+        with time_budget(deadline):
+            return await self._execute(raise_on_error)
+
+    async def _execute(  # type: ignore[override]
+        self, raise_on_error: Optional[bool]
+    ) -> List[Any]:
+        """Выполняет конвейер (см. `execute`)."""
+        commands, self._commands = self._commands, []
+        scripts, self._scripts = self._scripts, {}
+        to_send = [command for command in commands if command.args]
+        transaction = self.transaction
+
+        replies: List[Any] = []
+        aborted = False
+        try:
+            if to_send:
+                async with self._get_async_connection() as connection:
+                    if scripts:
+                        await self._load_scripts_async(
+                            connection, list(scripts.values())
+                        )
+                    timer = None
+                    if self.client.observer is not None:
+                        timer = CommandTimer(
+                            self.client.observer,
+                            to_send[0].args,
+                            connection,
+                            name="EXEC" if transaction else "PIPELINE",
+                            commands=len(to_send),
+                            batch=[command.args for command in to_send],
+                        )
+                    try:
+                        if transaction:
+                            aborted = not await self._send_and_read_transaction_async(
+                                connection, to_send, replies, timer
+                            )
+                        else:
+                            await self._send_and_read_async(
+                                connection, to_send, replies, timer
+                            )
+                    except BaseException as e:
+                        if timer is not None:
+                            timer.finish(e)
+                        raise
+                    if timer is not None:
+                        timer.finish()
+            elif self._watching:
+                await self.unwatch()
+        finally:
+            # EXEC снимает WATCH на сервере, соединение больше не нужно
+            self._watching = False
+            self._explicit_multi = False
+            await self._release_async()
+
+        if aborted:
+            raise WatchError("Наблюдаемый ключ изменился, транзакция отменена")
+        return self._build_responses(commands, replies, raise_on_error)
+
+    @staticmethod
+    async def _send_and_read_async(
+        connection: "AsyncConnection",
+        to_send: List[QueuedCommand],
+        replies: List[Any],
+        timer: Optional[CommandTimer] = None,
+    ) -> None:
+        """Отправляет команды одной записью и читает все ответы."""
+        await connection.send_commands([command.args for command in to_send])
+        if timer is not None:
+            timer.sent()
+        for command in to_send:
+            try:
+                replies.append(
+                    await read_reply_async(
+                        connection,
+                        command.options.get("decode"),
+                        command.options.get("numeric"),
+                    )
+                )
+            except ResponseError as e:
+                replies.append(e)
+
+    async def _send_and_read_transaction_async(
+        self,
+        connection: "AsyncConnection",
+        to_send: List[QueuedCommand],
+        replies: List[Any],
+        timer: Optional[CommandTimer] = None,
+    ) -> bool:
+        """
+        Отправляет MULTI, команды и EXEC одной записью и читает все ответы
+        (см. `Pipeline._send_and_read_transaction`).
+
+        Returns:
+            False, если транзакция отменена из-за WATCH
+        """
+        await connection.send_commands(
+            [("MULTI",), *(command.args for command in to_send), ("EXEC",)]
+        )
+        if timer is not None:
+            timer.sent()
+        queue_error: Optional[ResponseError] = None
+        for _ in range(len(to_send) + 1):
+            try:
+                await connection.read_response()
+            except ResponseError as e:
+                queue_error = queue_error or e
+        try:
+            result = await connection.read_response(False)
+        except ResponseError:
+            if queue_error is not None:
+                raise queue_error
+            raise
+        if result is None:
+            return False
+        replies.extend(self._exec_replies(to_send, result))
+        return True
+
+    @asynccontextmanager
+    async def _get_async_connection(self) -> AsyncIterator["AsyncConnection"]:
+        """Выдаёт удерживаемое соединение или берёт соединение у клиента."""
+        if self._held is None and not self._watching:
+            async with self.client.get_connection() as connection:
+                yield connection
+            return
+
+        if self._held is None:
+            self._async_stack = AsyncExitStack()
+            self._held = await self._async_stack.enter_async_context(
+                self.client.get_connection()
+            )
+        try:
+            yield self._held
+        except BaseException as e:
+            if not isinstance(e, ResponseError):
+                # Соединение закрывается тем же путём, что и у клиента;
+                # наблюдение на сервере при этом потеряно
+                self._watching = False
+                await self._release_async(e)
+            raise
+
+    async def _release_async(self, error: Optional[BaseException] = None) -> None:
+        """Возвращает удерживаемое соединение клиенту."""
+        stack, self._async_stack, self._held = self._async_stack, None, None
+        if stack is not None:
+            if error is None:
+                await stack.aclose()
+            else:
+                await stack.__aexit__(type(error), error, error.__traceback__)
+
+    async def _execute_immediate(
+        self,
+        args: Tuple[EncodableT, ...],
+        callback: Optional[Callable[[Any], Any]],
+        options: Dict[str, Any],
+    ) -> Any:
+        """Выполняет команду сразу на удерживаемом соединении."""
+        decode = options.get("decode")
+        async with self._get_async_connection() as connection:
+            await connection.send_command(*args)
+            reply = await read_reply_async(connection, decode, options.get("numeric"))
+        reply = self.client._process_response(reply, decode)
+        return callback(reply) if callback is not None else reply
+
+    async def watch(self, *keys: EncodableT) -> bool:  # type: ignore[override]
+        """
+        Начинает наблюдение за ключами (WATCH) на собственном соединении
+        конвейера (см. `Pipeline.watch`).
+
+        Raises:
+            WatchError: WATCH вызван после `multi()`
+        """
+        if self._explicit_multi:
+            raise WatchError("WATCH нельзя вызвать после MULTI")
+        if not keys:
+            raise ValueError("Нужен хотя бы один ключ")
+        self._watching = True
+        return await self._execute_immediate(("WATCH", *keys), _is_ok, {})
+
+    async def unwatch(self) -> bool:  # type: ignore[override]
+        """Снимает наблюдение за всеми ключами и освобождает соединение."""
+        result = True
+        if self._watching and self._held is not None:
+            result = await self._execute_immediate(("UNWATCH",), _is_ok, {})
+        self._watching = False
+        await self._release_async()
+        return result
+
+    async def reset(self) -> None:  # type: ignore[override]
+        """Очищает очередь команд и снимает наблюдение за ключами."""
+        self._commands = []
+        self._scripts = {}
+        self._explicit_multi = False
+        if self._watching:
+            try:
+                await self.unwatch()
+            except ResponseError:
+                pass
+        await self._release_async()
+
+    def _local_result(self, value: Any) -> Any:
+        """Ставит в очередь результат, не требующий обращения к серверу."""
+        if self.watching:
+            return self._immediate_value(value)
+        return super()._local_result(value)
+
+    @staticmethod
+    async def _immediate_value(value: Any) -> Any:
+        return value
+
+    def _execute_batch(
+        self, commands: List[BatchCommand], combine: Callable[[List[Any]], Any]
+    ) -> Any:
+        """Ставит группу в очередь; под WATCH - выполняет сразу (корутина)."""
+        if self.watching:
+            return self._execute_batch_immediate(commands, combine)
+        return super()._execute_batch(commands, combine)
+
+    async def _execute_batch_immediate(
+        self, commands: List[BatchCommand], combine: Callable[[List[Any]], Any]
+    ) -> Any:
+        return combine(
+            [
+                await self._execute_immediate(args, callback, options)
+                for args, callback, options in commands
+            ]
+        )
+
+    def _run_script(
+        self, script: Script, keys: Sequence[EncodableT], args: Sequence[EncodableT]
+    ) -> Any:
+        """Ставит скрипт в очередь; под WATCH - выполняет сразу (корутина)."""
+        if self.watching:
+            return self._run_script_immediate(script, keys, args)
+        return super()._run_script(script, keys, args)
+
+    async def _run_script_immediate(
+        self, script: Script, keys: Sequence[EncodableT], args: Sequence[EncodableT]
+    ) -> Any:
+        try:
+            return await self._execute_immediate(
+                ("EVALSHA", script.sha, len(keys), *keys, *args), None, {}
+            )
+        except NoScriptError:
+            return await self._execute_immediate(
+                ("EVAL", script.source, len(keys), *keys, *args), None, {}
+            )
+
+    @staticmethod
+    async def _load_scripts_async(
+        connection: "AsyncConnection", scripts: List[Script]
+    ) -> None:
+        """Загружает скрипты, которых нет в кэше сервера (см. `Pipeline`)."""
+        await connection.send_command(
+            "SCRIPT", "EXISTS", *(script.sha for script in scripts)
+        )
+        exists = await connection.read_response()
+        missing = [script for script, found in zip(scripts, exists) if not found]
+        if not missing:
+            return
+        await connection.send_commands(
+            [("SCRIPT", "LOAD", script.source) for script in missing]
+        )
+        error: Optional[ResponseError] = None
+        for _ in missing:
+            try:
+                await connection.read_response()
+            except ResponseError as e:
+                error = error or e
+        if error is not None:
+            raise error
+
+    async def __aenter__(self):
+        """Поддержка асинхронного контекстного менеджера."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Сбрасывает неотправленные команды и снимает наблюдение."""
+        await self.reset()
+        return False
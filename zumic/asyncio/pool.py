@@ -0,0 +1,227 @@
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Optional, Set, Tuple
+import asyncio
+import time
+
+from zumic.asyncio.connection import AsyncConnection
+from zumic.exceptions import ResponseError, TimeoutError
+from zumic.pool import PoolStats
+from zumic.timeouts import effective_timeout
+
+
+class AsyncConnectionPool:
+    """
+    Пул асинхронных соединений с ограниченным размером.
+
+    Асинхронный аналог `ConnectionPool`: соединения выдаются в порядке LIFO,
+    простаивающие дольше `idle_timeout` закрываются, а при исчерпании лимита
+    `get_connection` ждёт освобождения не дольше `timeout` секунд.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 10,
+        timeout: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+        connection_class: Callable[..., AsyncConnection] = AsyncConnection,
+        **connection_kwargs: Any,
+    ) -> None:
+        """
+        Инициализирует пул соединений.
+
+        Args:
+            max_connections: Максимальное число соединений
+            timeout: Максимальное время ожидания свободного соединения
+                (None - ждать без ограничений)
+            idle_timeout: Через сколько секунд простоя соединение закрывается
+            connection_class: Фабрика соединений
+            **connection_kwargs: Параметры, передаваемые в фабрику соединений
+        """
+        if max_connections < 1:
+            raise ValueError("max_connections должен быть положительным")
+
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.connection_class = connection_class
+        self.connection_kwargs = connection_kwargs
+
+        self._cond = asyncio.Condition()
+        self._idle: Deque[Tuple[AsyncConnection, float]] = deque()
+        self._in_use: Set[AsyncConnection] = set()
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._reaped = 0
+
+    def make_connection(self) -> AsyncConnection:
+        """Создаёт новое (ещё не подключённое) соединение."""
+        return self.connection_class(**self.connection_kwargs)
+
+    async def warm(self, count: int) -> int:
+        """
+        Заранее открывает соединения.
+
+        Args:
+            count: Сколько простаивающих соединений должно быть в пуле
+
+        Returns:
+            Количество открытых соединений
+        """
+        async with self._cond:
+            count = min(count - len(self._idle), self.max_connections - self._total())
+            opened = [self.make_connection() for _ in range(max(count, 0))]
+            self._in_use.update(opened)
+
+        try:
+            await asyncio.gather(*(c.connect() for c in opened))
+        finally:
+            for connection in opened:
+                await self.release(connection)
+        return len(opened)
+
+    async def get_connection(self, timeout: Optional[float] = None) -> AsyncConnection:
+        """
+        Выдаёт соединение из пула.
+
+        Args:
+            timeout: Переопределяет таймаут ожидания пула
+
+        Raises:
+            TimeoutError: Свободное соединение не появилось за отведённое
+                время или до конца бюджета команды
+        """
+        if timeout is None:
+            timeout = self.timeout
+        timeout = effective_timeout(timeout)
+
+        async with self._cond:
+            await self._reap_locked(time.monotonic())
+            if not self._idle and self._total() >= self.max_connections:
+                self._waits += 1
+                started = time.monotonic()
+                try:
+                    await asyncio.wait_for(
+                        self._cond.wait_for(
+                            lambda: (
+                                bool(self._idle) or self._total() < self.max_connections
+                            )
+                        ),
+                        timeout,
+                    )
+                except asyncio.TimeoutError:
+                    self._timeouts += 1
+                    raise TimeoutError(
+                        "Нет свободных соединений в пуле "
+                        f"(лимит {self.max_connections})"
+                    ) from None
+                finally:
+                    self._record_wait(time.monotonic() - started)
+
+            if self._idle:
+                connection, _ = self._idle.pop()
+            else:
+                connection = self.make_connection()
+            self._in_use.add(connection)
+            self._checkouts += 1
+            return connection
+
+    async def release(self, connection: AsyncConnection) -> None:
+        """Возвращает соединение в пул."""
+        async with self._cond:
+            if connection not in self._in_use:
+                return
+            self._in_use.discard(connection)
+            now = time.monotonic()
+            self._idle.append((connection, now))
+            await self._reap_locked(now)
+            self._cond.notify()
+
+    @asynccontextmanager
+    async def connection(
+        self, timeout: Optional[float] = None
+    ) -> AsyncIterator[AsyncConnection]:
+        """
+        Выдаёт соединение на время блока `async with` и возвращает его в пул.
+
+        Если внутри блока произошла любая ошибка, кроме ошибки сервера,
+        соединение закрывается: в нём может остаться недочитанный ответ.
+        """
+        connection = await self.get_connection(timeout)
+        try:
+            yield connection
+        except BaseException as e:
+            if not isinstance(e, ResponseError):
+                await connection.disconnect()
+            raise
+        finally:
+            await self.release(connection)
+
+    async def reap_idle(self) -> int:
+        """
+        Закрывает соединения, простаивающие дольше `idle_timeout`.
+
+        Returns:
+            Количество закрытых соединений
+        """
+        async with self._cond:
+            return await self._reap_locked(time.monotonic())
+
+    def stats(self) -> PoolStats:
+        """Возвращает текущие счётчики пула."""
+        return PoolStats(
+            in_use=len(self._in_use),
+            idle=len(self._idle),
+            total=self._total(),
+            max_connections=self.max_connections,
+            checkouts=self._checkouts,
+            waits=self._waits,
+            timeouts=self._timeouts,
+            wait_time_total=self._wait_time_total,
+            wait_time_max=self._wait_time_max,
+            reaped=self._reaped,
+        )
+
+    async def disconnect(self) -> None:
+        """Закрывает все соединения пула, включая выданные."""
+        async with self._cond:
+            connections = [c for c, _ in self._idle] + list(self._in_use)
+            self._idle.clear()
+            self._in_use.clear()
+            self._cond.notify_all()
+        for connection in connections:
+            await connection.disconnect()
+
+    def _total(self) -> int:
+        return len(self._idle) + len(self._in_use)
+
+    def _record_wait(self, waited: float) -> None:
+        self._wait_time_total += waited
+        self._wait_time_max = max(self._wait_time_max, waited)
+
+    async def _reap_locked(self, now: float) -> int:
+        """Закрывает устаревшие простаивающие соединения (под блокировкой)."""
+        if self.idle_timeout is None:
+            return 0
+        reaped = 0
+        # Самые старые соединения лежат в начале очереди
+        while self._idle and now - self._idle[0][1] >= self.idle_timeout:
+            connection, _ = self._idle.popleft()
+            await connection.disconnect()
+            reaped += 1
+        self._reaped += reaped
+        if reaped:
+            self._cond.notify(reaped)
+        return reaped
+
+    async def __aenter__(self):
+        """Поддержка асинхронного контекстного менеджера."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Закрывает все соединения пула."""
+        await self.disconnect()
+        return False
@@ -0,0 +1,296 @@
+from collections import deque
+from typing import AsyncIterator, Deque, List, Optional
+import asyncio
+import inspect
+
+from zumic.asyncio.connection import AsyncConnection
+from zumic.encoder import EncodableT
+from zumic.exceptions import (
+    ConnectionError,
+    InvalidResponse,
+    PubSubError,
+    ResponseError,
+)
+from zumic.pubsub import (
+    BLOCK,
+    DEFAULT_MAX_QUEUE,
+    DISCONNECT,
+    DROP_OLDEST,
+    POLICIES,
+    SUBSCRIPTION_TYPES,
+    Handler,
+    Message,
+    Subscriptions,
+    parse_message,
+)
+
+
+class AsyncMessageQueue:
+    """Ограниченная очередь сообщений для asyncio с политикой переполнения."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAX_QUEUE, policy: str = BLOCK) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize должен быть положительным")
+        if policy not in POLICIES:
+            raise ValueError(f"Неизвестная политика переполнения: {policy!r}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self._items: Deque[Message] = deque()
+        self._cond = asyncio.Condition()
+        self.closed = False
+        self._error: Optional[BaseException] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def put(self, message: Message) -> bool:
+        """Добавляет сообщение; False - очередь закрыта или переполнена."""
+        async with self._cond:
+            if len(self._items) >= self.maxsize:
+                if self.policy == DISCONNECT:
+                    return False
+                if self.policy == DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped += 1
+                else:
+                    await self._cond.wait_for(
+                        lambda: len(self._items) < self.maxsize or self.closed
+                    )
+            if self.closed:
+                return False
+            self._items.append(message)
+            self._cond.notify_all()
+            return True
+
+    async def get_many(
+        self, max_n: int, timeout: Optional[float] = 0.0
+    ) -> List[Message]:
+        """
+        Забирает до `max_n` сообщений, ожидая первое не дольше `timeout`
+        секунд (None - без ограничения).
+
+        Raises:
+            PubSubError: Очередь пуста и закрыта с ошибкой
+        """
+        async with self._cond:
+            if not self._items and not self.closed and timeout != 0:
+                try:
+                    await asyncio.wait_for(
+                        self._cond.wait_for(lambda: bool(self._items) or self.closed),
+                        timeout,
+                    )
+                except asyncio.TimeoutError:
+                    return []
+            if not self._items:
+                if self.closed and self._error is not None:
+                    raise self._error
+                return []
+            count = min(max_n, len(self._items))
+            batch = [self._items.popleft() for _ in range(count)]
+            self._cond.notify_all()
+            return batch
+
+    async def close(self, error: Optional[BaseException] = None) -> None:
+        """Закрывает очередь; после дочитывания `get_many` бросает `error`."""
+        async with self._cond:
+            if not self.closed:
+                self.closed = True
+                self._error = error
+            self._cond.notify_all()
+
+
+class AsyncPubSub:
+    """
+    Асинхронный подписчик Pub/Sub на отдельном соединении.
+
+    Повторяет `zumic.pubsub.PubSub`: фоновая задача читает сообщения
+    в ограниченную очередь с той же политикой переполнения. Обработчики
+    могут быть обычными функциями или корутинами.
+    """
+
+    def __init__(
+        self,
+        connection: AsyncConnection,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        policy: str = BLOCK,
+        ignore_subscribe_messages: bool = False,
+    ) -> None:
+        """
+        Args:
+            connection: Соединение, используемое только этим подписчиком;
+                таймаут чтения у него должен быть отключён
+            max_queue: Максимальное число непрочитанных сообщений
+            policy: Политика переполнения очереди
+            ignore_subscribe_messages: Не класть в очередь ответы на
+                (p)subscribe/(p)unsubscribe
+        """
+        self.connection = connection
+        self.ignore_subscribe_messages = ignore_subscribe_messages
+        self.subscriptions = Subscriptions()
+        self.received = 0
+        self._queue = AsyncMessageQueue(max_queue, policy)
+        self._reader: Optional["asyncio.Task[None]"] = None
+        self._dispatcher: Optional["asyncio.Task[None]"] = None
+        self._closed = False
+
+    @property
+    def dropped(self) -> int:
+        """Сколько сообщений выброшено политикой `drop_oldest`."""
+        return self._queue.dropped
+
+    @property
+    def pending(self) -> int:
+        """Число сообщений в очереди."""
+        return len(self._queue)
+
+    async def subscribe(
+        self, *channels: EncodableT, handler: Optional[Handler] = None
+    ) -> None:
+        """Подписывается на каналы (см. `PubSub.subscribe`)."""
+        await self._change("SUBSCRIBE", False, channels, handler)
+
+    async def psubscribe(
+        self, *patterns: EncodableT, handler: Optional[Handler] = None
+    ) -> None:
+        """Подписывается на каналы по шаблонам."""
+        await self._change("PSUBSCRIBE", True, patterns, handler)
+
+    async def unsubscribe(self, *channels: EncodableT) -> None:
+        """Отписывается от каналов (без аргументов - от всех)."""
+        await self._change("UNSUBSCRIBE", False, channels, None)
+
+    async def punsubscribe(self, *patterns: EncodableT) -> None:
+        """Отписывается от шаблонов (без аргументов - от всех)."""
+        await self._change("PUNSUBSCRIBE", True, patterns, None)
+
+    async def _change(
+        self,
+        command: str,
+        pattern: bool,
+        names: tuple,
+        handler: Optional[Handler],
+    ) -> None:
+        if self._closed:
+            raise PubSubError("Подписка закрыта")
+        if command in ("SUBSCRIBE", "PSUBSCRIBE"):
+            if not names:
+                raise ValueError("Нужен хотя бы один канал")
+            self.subscriptions.add(pattern, names, handler)
+        else:
+            self.subscriptions.remove(pattern, names)
+        await self.connection.send_command(command, *names)
+        if self._reader is None:
+            self._reader = asyncio.ensure_future(self._read_loop())
+
+    async def _read_loop(self) -> None:
+        """Читает сообщения из сокета, пока подписка не закрыта."""
+        queue = self._queue
+        ignore = self.ignore_subscribe_messages
+        while not self._closed:
+            try:
+                try:
+                    response = await self.connection.read_response()
+                except ResponseError as e:
+                    # Ошибка сервера не рвёт подписку, а доставляется сообщением
+                    response = e
+                message = parse_message(response)
+            except (ConnectionError, InvalidResponse, PubSubError, OSError) as e:
+                if not self._closed:
+                    error = PubSubError("Соединение Pub/Sub потеряно")
+                    error.__cause__ = e
+                    await self._fail(error)
+                return
+            self.received += 1
+            if ignore and message.type in SUBSCRIPTION_TYPES:
+                continue
+            if not await queue.put(message):
+                if not queue.closed:
+                    await self._fail(
+                        PubSubError(
+                            f"Очередь сообщений переполнена ({queue.maxsize}), "
+                            "подписка закрыта"
+                        )
+                    )
+                return
+
+    async def _fail(self, error: PubSubError) -> None:
+        self._closed = True
+        await self._queue.close(error)
+        await self.connection.disconnect()
+
+    async def _dispatch(self, messages: List[Message]) -> List[Message]:
+        """Передаёт сообщения их обработчикам и возвращает остальные."""
+        rest = []
+        for message in messages:
+            handler = self.subscriptions.handler_for(message)
+            if handler is None:
+                rest.append(message)
+                continue
+            result = handler(message)
+            if inspect.isawaitable(result):
+                await result
+        return rest
+
+    async def get_message(self, timeout: Optional[float] = 0.0) -> Optional[Message]:
+        """Возвращает следующее сообщение без обработчика или None."""
+        messages = await self._dispatch(await self._queue.get_many(1, timeout))
+        return messages[0] if messages else None
+
+    async def get_messages(
+        self, max_n: int = 100, timeout: Optional[float] = 0.0
+    ) -> List[Message]:
+        """Забирает из очереди до `max_n` сообщений за раз."""
+        return await self._dispatch(await self._queue.get_many(max_n, timeout))
+
+    async def listen(self) -> AsyncIterator[Message]:
+        """Выдаёт сообщения без обработчиков, пока подписка не закрыта."""
+        while True:
+            messages = await self._queue.get_many(100, None)
+            if not messages:
+                return
+            for message in await self._dispatch(messages):
+                yield message
+
+    def run_in_task(self, batch: int = 100) -> "asyncio.Task[None]":
+        """
+        Запускает задачу, раздающую сообщения обработчикам.
+
+        Сообщения без обработчика в этом режиме отбрасываются.
+        """
+        if self._dispatcher is None:
+
+            async def run() -> None:
+                try:
+                    while True:
+                        messages = await self._queue.get_many(batch, None)
+                        if not messages:
+                            return
+                        await self._dispatch(messages)
+                except PubSubError:
+                    return
+
+            self._dispatcher = asyncio.ensure_future(run())
+        return self._dispatcher
+
+    async def close(self) -> None:
+        """Закрывает подписку, её соединение и фоновые задачи."""
+        self._closed = True
+        await self._queue.close()
+        await self.connection.disconnect()
+        for task in (self._reader, self._dispatcher):
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+    async def __aenter__(self):
+        """Поддержка асинхронного контекстного менеджера."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Закрывает подписку."""
+        await self.close()
+        return False
@@ -0,0 +1,270 @@
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Deque, List, Optional, Sequence, Tuple
+import threading
+
+from zumic.connection_protocol import ConnectionProtocol
+from zumic.encoder import EncodableT
+from zumic.exceptions import ConnectionError, ResponseError, TimeoutError
+from zumic.timeouts import effective_timeout
+from zumic.typed import NumericReply, read_reply
+
+# Сколько команд отправляется одной записью в сокет
+DEFAULT_MAX_BATCH = 1000
+
+
+class _Request:
+    """Команда в очереди автоконвейера и ожидающий её ответа future."""
+
+    __slots__ = ("args", "decode", "numeric", "future")
+
+    def __init__(
+        self,
+        args: Tuple[EncodableT, ...],
+        decode: Optional[bool],
+        numeric: Optional[NumericReply],
+    ) -> None:
+        self.args = args
+        self.decode = decode
+        self.numeric = numeric
+        self.future: "Future[Any]" = Future()
+
+
+class AutoPipeline:
+    """
+    Общее соединение, на котором команды из многих потоков автоматически
+    собираются в конвейер.
+
+    Вызывающие потоки ставят команды в очередь записи и ждут свои future.
+    Поток записи отправляет всё, что накопилось в очереди, одной записью
+    в сокет, не дожидаясь ответов на предыдущие команды, а поток чтения
+    раздаёт ответы ожидающим в порядке отправки. Пока один поток ждёт
+    ответа, команды остальных уже уходят на сервер, поэтому при высокой
+    конкуренции одно соединение заменяет целый пул.
+
+    При ошибке соединения все отправленные, но не отвеченные команды
+    завершаются этой ошибкой, а следующая команда открывает соединение
+    заново.
+    """
+
+    def __init__(
+        self, connection: ConnectionProtocol, max_batch: int = DEFAULT_MAX_BATCH
+    ) -> None:
+        """
+        Args:
+            connection: Соединение, используемое только автоконвейером
+            max_batch: Максимальное число команд в одной записи
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch должен быть положительным")
+        self.connection = connection
+        self.max_batch = max_batch
+        self._cond = threading.Condition()
+        # Команды, ожидающие записи, и отправленные команды, ожидающие ответа
+        self._queue: Deque[_Request] = deque()
+        self._pending: Deque[_Request] = deque()
+        # Номер текущего соединения: ошибки старого соединения не должны
+        # завершать команды, отправленные уже в новое
+        self._generation = 0
+        self._reading = False
+        self._closed = False
+        self._threads: List[threading.Thread] = []
+        self.batches = 0
+        self.commands = 0
+
+    @property
+    def pending(self) -> int:
+        """Число команд, ожидающих записи или ответа."""
+        return len(self._queue) + len(self._pending)
+
+    def submit(
+        self,
+        *args: EncodableT,
+        decode: Optional[bool] = None,
+        numeric: Optional[NumericReply] = None,
+    ) -> "Future[Any]":
+        """
+        Ставит команду в очередь и сразу возвращает future её ответа.
+
+        Ошибка сервера устанавливается в future как исключение
+        `ResponseError`.
+        """
+        if not args:
+            raise ValueError("Команда не может быть пустой")
+        request = _Request(args, decode, numeric)
+        with self._cond:
+            if self._closed:
+                raise ConnectionError("Автоконвейер закрыт")
+            self._queue.append(request)
+            self._start()
+            self._cond.notify_all()
+        return request.future
+
+    def submit_many(
+        self, commands: Sequence[Tuple[EncodableT, ...]]
+    ) -> List["Future[Any]"]:
+        """
+        Ставит несколько команд в очередь подряд: между ними не окажется
+        команд других потоков.
+        """
+        requests = [_Request(tuple(args), None, None) for args in commands]
+        if any(not request.args for request in requests):
+            raise ValueError("Команда не может быть пустой")
+        with self._cond:
+            if self._closed:
+                raise ConnectionError("Автоконвейер закрыт")
+            self._queue.extend(requests)
+            self._start()
+            self._cond.notify_all()
+        return [request.future for request in requests]
+
+    def execute(
+        self,
+        *args: EncodableT,
+        decode: Optional[bool] = None,
+        numeric: Optional[NumericReply] = None,
+    ) -> Any:
+        """
+        Выполняет команду и ждёт её ответа.
+
+        При активном бюджете времени (`zumic.timeouts.deadline`) ожидание
+        ответа ограничено им. Команда при этом остаётся в конвейере:
+        её ответ будет прочитан и отброшен.
+
+        Raises:
+            ResponseError: Ошибка от сервера
+            TimeoutError: Истёк бюджет времени
+            ConnectionError: Ошибка соединения
+        """
+        timeout = effective_timeout(None)
+        future = self.submit(*args, decode=decode, numeric=numeric)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            raise TimeoutError("Истёк бюджет времени команды") from None
+
+    def _start(self) -> None:
+        """Запускает потоки записи и чтения (под блокировкой)."""
+        if self._threads:
+            return
+        for target, name in (
+            (self._write_loop, "zumic-autopipeline-writer"),
+            (self._read_loop, "zumic-autopipeline-reader"),
+        ):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _write_loop(self) -> None:
+        """Отправляет накопившиеся команды одной записью."""
+        connection = self.connection
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if self._closed:
+                    return
+                count = min(len(self._queue), self.max_batch)
+                batch = [self._queue.popleft() for _ in range(count)]
+                if not connection.is_connected():
+                    # Дожидаемся, пока поток чтения отпустит старый сокет
+                    self._cond.wait_for(lambda: not self._reading)
+                    try:
+                        connection.connect()
+                    except BaseException as e:
+                        self._finish(batch, e)
+                        continue
+                generation = self._generation
+                self._pending.extend(batch)
+                self._cond.notify_all()
+            try:
+                connection.send_commands([request.args for request in batch])
+            except BaseException as e:
+                self._fail(generation, e)
+                continue
+            self.batches += 1
+            self.commands += len(batch)
+
+    def _read_loop(self) -> None:
+        """Читает ответы и раздаёт их ожидающим в порядке отправки."""
+        connection = self.connection
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                request = self._pending[0]
+                generation = self._generation
+                self._reading = True
+            reply: Any
+            try:
+                reply = read_reply(connection, request.decode, request.numeric)
+            except ResponseError as e:
+                reply = e
+            except BaseException as e:
+                self._fail(generation, e)
+                continue
+            finally:
+                with self._cond:
+                    self._reading = False
+                    self._cond.notify_all()
+            with self._cond:
+                if generation != self._generation:
+                    continue
+                self._pending.popleft()
+            if isinstance(reply, ResponseError):
+                request.future.set_exception(reply)
+            else:
+                request.future.set_result(reply)
+
+    def _fail(self, generation: int, error: BaseException) -> None:
+        """Закрывает соединение и завершает отправленные команды ошибкой."""
+        with self._cond:
+            if generation != self._generation:
+                return
+            self._generation += 1
+            failed = list(self._pending)
+            self._pending.clear()
+            self.connection.disconnect()
+            self._cond.notify_all()
+        self._finish(failed, error)
+
+    @staticmethod
+    def _finish(requests: List[_Request], error: BaseException) -> None:
+        if not isinstance(error, (ConnectionError, ResponseError)):
+            wrapped = ConnectionError("Ошибка соединения автоконвейера")
+            wrapped.__cause__ = error
+            error = wrapped
+        for request in requests:
+            if not request.future.done():
+                request.future.set_exception(error)
+
+    def close(self) -> None:
+        """
+        Останавливает потоки и закрывает соединение. Неотправленные
+        и не получившие ответа команды завершаются `ConnectionError`.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._generation += 1
+            failed = list(self._pending) + list(self._queue)
+            self._pending.clear()
+            self._queue.clear()
+            self.connection.disconnect()
+            self._cond.notify_all()
+            threads, self._threads = self._threads, []
+        self._finish(failed, ConnectionError("Автоконвейер закрыт"))
+        for thread in threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=1)
+
+    def __enter__(self):
+        """Поддержка контекстного менеджера."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Закрывает автоконвейер."""
+        self.close()
+        return False
@@ -0,0 +1,21 @@
+from zumic.benchmark.runner import (
+    BenchmarkResult,
+    compare,
+    default_scenarios,
+    format_table,
+    percentile,
+    run_benchmark,
+)
+from zumic.benchmark.server import UnixZSPServer, ZSPServer, spawn_server
+
+__all__ = [
+    "BenchmarkResult",
+    "UnixZSPServer",
+    "ZSPServer",
+    "compare",
+    "default_scenarios",
+    "format_table",
+    "percentile",
+    "run_benchmark",
+    "spawn_server",
+]
@@ -0,0 +1,125 @@
+from typing import List, Optional
+import argparse
+import json
+import sys
+
+from zumic.benchmark.runner import (
+    DEFAULT_SIZES,
+    BenchmarkResult,
+    compare,
+    default_scenarios,
+    format_table,
+    run_benchmark,
+)
+from zumic.benchmark.server import (
+    UnixZSPServer,
+    ZSPServer,
+    _ServerThread,
+    spawn_server,
+)
+from zumic.client import Client
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m zumic.benchmark",
+        description="Бенчмарк пропускной способности и задержек клиента Zumic",
+    )
+    parser.add_argument("--host", help="Адрес сервера (по умолчанию - свой сервер)")
+    parser.add_argument("--port", type=int, default=6174)
+    parser.add_argument(
+        "--unix-socket",
+        help="Подключаться через Unix-сокет (свой сервер слушает этот путь)",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Запустить сервер в этом процессе (быстрее старт, хуже точность)",
+    )
+    parser.add_argument("--ops", type=int, default=10000, help="Операций на сценарий")
+    parser.add_argument(
+        "--sizes",
+        type=_int_list,
+        default=list(DEFAULT_SIZES),
+        help="Размеры значений в байтах через запятую (по умолчанию 10 Б - 100 МБ)",
+    )
+    parser.add_argument(
+        "--concurrency", type=_int_list, default=[1, 4, 16], help="Уровни параллелизма"
+    )
+    parser.add_argument("--pipeline", type=int, default=100, help="Команд в конвейере")
+    parser.add_argument(
+        "--filter", default="", help="Запускать только сценарии с этой подстрокой"
+    )
+    parser.add_argument(
+        "--no-alloc", action="store_true", help="Не измерять аллокации на операцию"
+    )
+    parser.add_argument("--json", dest="json_path", help="Сохранить результаты в JSON")
+    parser.add_argument("--baseline", help="JSON базового прогона для сравнения")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Допустимое ухудшение (доля)"
+    )
+    args = parser.parse_args(argv)
+
+    server: Optional[_ServerThread] = None
+    process = None
+    host, port, path = args.host, args.port, args.unix_socket
+    if host is None:
+        if args.in_process and path:
+            server = UnixZSPServer(path).start()
+        elif args.in_process:
+            tcp = ZSPServer().start()
+            server, (host, port) = tcp, tcp.address
+        else:
+            process, port = spawn_server(unix_socket_path=path)
+            host = "127.0.0.1"
+
+    results: List[BenchmarkResult] = []
+    try:
+        scenarios = default_scenarios(
+            lambda: Client(
+                host=host, port=port, unix_socket_path=path, decode_responses=False
+            ),
+            ops=args.ops,
+            sizes=args.sizes,
+            concurrency=args.concurrency,
+            pipeline_size=args.pipeline,
+        )
+        for scenario in scenarios:
+            if args.filter not in scenario["name"]:
+                continue
+            result = run_benchmark(
+                warmup=min(100, scenario["ops"]),
+                allocations=not args.no_alloc and scenario.get("concurrency", 1) == 1,
+                **scenario,
+            )
+            results.append(result)
+            print(format_table([result]).splitlines()[-1], flush=True)
+    finally:
+        if server is not None:
+            server.stop()
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print()
+    print(format_table(results))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump([result.as_dict() for result in results], f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("\nРегрессии:", *regressions, sep="\n  ")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+
+from zumic.benchmark.runner import BenchmarkResult, compare, format_table
+from zumic.benchmark.server import spawn_server
+from zumic.client import Client
+from zumic.exceptions import ResponseError, ZumicError
+from zumic.trace import TraceRecord, describe, read_trace
+
+
+@dataclass
+class ReplayResult(BenchmarkResult):
+    """Результат повтора трассы: задержки записей и число ошибок."""
+
+    errors: int = 0
+    records: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        summary = super().as_dict()
+        summary["errors"] = self.errors
+        summary["records"] = self.records
+        return summary
+
+
+def trace_result(records: Sequence[TraceRecord], name: str = "trace") -> ReplayResult:
+    """
+    Сводка исходной трассы в том же виде, что и результат повтора:
+    пропускная способность и задержки, записанные в продакшене.
+    """
+    commands = sum(len(record.calls) for record in records)
+    elapsed = 0.0
+    if records:
+        end = max(record.started + record.latency for record in records)
+        elapsed = end - min(record.started for record in records)
+    return ReplayResult(
+        name=name,
+        ops=commands,
+        elapsed=elapsed,
+        latencies=sorted(record.latency for record in records),
+        errors=sum(record.error for record in records),
+        records=len(records),
+    )
+
+
+def _execute(client: Client, record: TraceRecord) -> int:
+    """Выполняет запись трассы и возвращает число ошибок сервера."""
+    if not record.pipeline:
+        try:
+            client.execute(*record.calls[0], decode=False)
+        except ResponseError:
+            return 1
+        return 0
+    pipe = client.pipeline(raise_on_error=False, transaction=record.transaction)
+    for call in record.calls:
+        pipe.execute_command(*call, decode=False)
+    try:
+        replies = pipe.execute()
+    except ResponseError:
+        # Транзакция отклонена целиком
+        return len(record.calls)
+    return sum(isinstance(reply, ResponseError) for reply in replies)
+
+
+def replay(
+    records: Sequence[TraceRecord],
+    client_factory: Callable[[], Client],
+    speed: Optional[float] = 1.0,
+    concurrency: int = 1,
+    name: str = "replay",
+) -> ReplayResult:
+    """
+    Повторяет трассу на сервере.
+
+    Записи раздаются потокам в порядке записи. При заданной скорости
+    каждая запись отправляется в свой момент исходной трассы (сжатой
+    в `speed` раз), а задержка отсчитывается от этого момента: если
+    потоки не успевают, ожидание в очереди входит в задержку, как
+    у реальных клиентов. Без скорости записи отправляются так быстро,
+    как позволяет `concurrency`, и задержка считается от отправки.
+
+    Args:
+        records: Записи трассы (`zumic.trace.read_trace`)
+        client_factory: Фабрика клиента; у каждого потока свой клиент
+        speed: Во сколько раз ускорить трассу (None - без пауз)
+        concurrency: Число параллельных потоков
+        name: Название результата
+
+    Ошибки сервера и соединения считаются в `errors`; после ошибки
+    соединения клиент переподключается на следующей записи.
+
+    Raises:
+        Exception: Ошибка потока-нагрузчика (например, фабрики клиента)
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency должен быть положительным")
+    if speed is not None and speed <= 0:
+        raise ValueError("speed должен быть положительным")
+
+    # Ограниченная очередь: при отставании потоков задерживается раздача,
+    # а не растёт память
+    tasks: "queue.Queue[Optional[Tuple[TraceRecord, float]]]" = queue.Queue(
+        concurrency * 4
+    )
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    failures: List[BaseException] = []
+
+    def worker(index: int) -> None:
+        timings = latencies[index]
+        clock = time.perf_counter
+        client = None
+        try:
+            client = client_factory()
+            while True:
+                task = tasks.get()
+                if task is None:
+                    return
+                record, due = task
+                started = due if speed is not None else clock()
+                try:
+                    errors[index] += _execute(client, record)
+                except ZumicError:
+                    # Ошибка соединения: клиент переподключится на следующей записи
+                    errors[index] += len(record.calls)
+                timings.append(clock() - started)
+        except BaseException as e:
+            failures.append(e)
+            # Разбираем очередь, чтобы раздача не заблокировалась
+            while tasks.get() is not None:
+                pass
+        finally:
+            if client is not None:
+                client.close()
+
+    threads = [
+        threading.Thread(target=worker, args=(i,), name=f"zumic-replay-{i}")
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    # Записи попадают в трассу по завершении, поэтому упорядочиваем их
+    # по моменту начала
+    records = sorted(records, key=lambda record: record.started)
+    started = time.perf_counter()
+    origin = records[0].started if records else 0.0
+    try:
+        for record in records:
+            due = started
+            if speed is not None:
+                due = started + (record.started - origin) / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            tasks.put((record, due))
+    finally:
+        for _ in threads:
+            tasks.put(None)
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - started
+
+    if failures:
+        raise failures[0]
+
+    merged = sorted(latency for timings in latencies for latency in timings)
+    return ReplayResult(
+        name=name,
+        ops=sum(len(record.calls) for record in records),
+        elapsed=elapsed,
+        concurrency=concurrency,
+        latencies=merged,
+        errors=sum(errors),
+        records=len(records),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m zumic.benchmark.replay",
+        description="Повтор трассы команд (zumic.trace.TraceRecorder) на сервере",
+    )
+    parser.add_argument("trace", help="Файл трассы")
+    parser.add_argument("--host", help="Адрес сервера (по умолчанию - свой сервер)")
+    parser.add_argument("--port", type=int, default=6174)
+    parser.add_argument("--unix-socket", help="Подключаться через Unix-сокет")
+    speed = parser.add_mutually_exclusive_group()
+    speed.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Во сколько раз ускорить трассу (1 - исходный темп)",
+    )
+    speed.add_argument("--max", action="store_true", help="Повторять без пауз")
+    parser.add_argument("--concurrency", type=int, default=1, help="Число потоков")
+    parser.add_argument("--limit", type=int, help="Повторить только первые N записей")
+    parser.add_argument("--json", dest="json_path", help="Сохранить результаты в JSON")
+    parser.add_argument("--baseline", help="JSON базового повтора для сравнения")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Допустимое ухудшение (доля)"
+    )
+    args = parser.parse_args(argv)
+
+    records = read_trace(args.trace)
+    if args.limit is not None:
+        records = records[: args.limit]
+    summary = describe(records)
+    names = list(summary["names"].items())[:5]
+    top = ", ".join(f"{name} {count}" for name, count in names)
+    print(
+        f"Трасса: {summary['records']} записей, {summary['commands']} команд "
+        f"за {summary['duration']:.2f} с ({top})"
+    )
+
+    process = None
+    host, port, path = args.host, args.port, args.unix_socket
+    if host is None and path is None:
+        process, port = spawn_server()
+        host = "127.0.0.1"
+    try:
+        result = replay(
+            records,
+            lambda: Client(
+                host=host or "127.0.0.1",
+                port=port,
+                unix_socket_path=path,
+                decode_responses=False,
+            ),
+            speed=None if args.max else args.speed,
+            concurrency=args.concurrency,
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    original = trace_result(records)
+    print()
+    print(format_table([original, result]))
+    print(f"\nОшибки: в трассе {original.errors}, при повторе {result.errors}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump([result.as_dict()], f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare([result], json.load(f), args.threshold)
+        if regressions:
+            print("\nРегрессии:", *regressions, sep="\n  ")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
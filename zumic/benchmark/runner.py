@@ -0,0 +1,345 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+import math
+import threading
+import time
+import tracemalloc
+
+from zumic.client import Client
+
+# Операция бенчмарка: один вызов = одна измеряемая операция
+Operation = Callable[[], Any]
+# Фабрика операции: вызывается один раз в каждом потоке-нагрузчике
+OperationFactory = Callable[[], Operation]
+
+# Сколько операций прогоняется под tracemalloc для подсчёта аллокаций
+ALLOCATION_SAMPLES = 200
+
+# Размеры значений по умолчанию: от 10 байт до 100 МБ
+DEFAULT_SIZES = (10, 1000, 100_000, 1_000_000, 100_000_000)
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """
+    Возвращает перцентиль методом ближайшего ранга.
+
+    Args:
+        sorted_values: Отсортированные значения
+        fraction: Доля (0.99 - p99)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class BenchmarkResult:
+    """Результат одного сценария бенчмарка."""
+
+    name: str
+    ops: int
+    elapsed: float
+    concurrency: int = 1
+    batch: int = 1
+    value_size: int = 0
+    alloc_bytes_per_op: Optional[float] = None
+    latencies: List[float] = field(default_factory=list, repr=False)
+
+    @property
+    def commands(self) -> int:
+        """Число выполненных команд (операция конвейера - `batch` команд)."""
+        return self.ops * self.batch
+
+    @property
+    def ops_per_sec(self) -> float:
+        """Пропускная способность в командах в секунду."""
+        return self.commands / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def p50(self) -> float:
+        """Медианная задержка операции в секундах."""
+        return percentile(self.latencies, 0.50)
+
+    @property
+    def p99(self) -> float:
+        """Задержка p99 в секундах."""
+        return percentile(self.latencies, 0.99)
+
+    @property
+    def p999(self) -> float:
+        """Задержка p99.9 в секундах."""
+        return percentile(self.latencies, 0.999)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Сводка без сырых задержек (для JSON-отчётов и сравнения)."""
+        return {
+            "name": self.name,
+            "ops": self.ops,
+            "commands": self.commands,
+            "concurrency": self.concurrency,
+            "batch": self.batch,
+            "value_size": self.value_size,
+            "elapsed": self.elapsed,
+            "ops_per_sec": self.ops_per_sec,
+            "p50": self.p50,
+            "p99": self.p99,
+            "p999": self.p999,
+            "alloc_bytes_per_op": self.alloc_bytes_per_op,
+        }
+
+
+def measure_allocations(op: Operation, samples: int = ALLOCATION_SAMPLES) -> float:
+    """
+    Оценивает объём памяти, выделяемой клиентом за одну операцию.
+
+    Для каждой операции берётся пиковый прирост памяти, отслеживаемой
+    tracemalloc. Сервер должен работать в другом процессе, иначе в счёт
+    попадут и его аллокации.
+
+    Returns:
+        Средний пиковый прирост в байтах на операцию
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            op()
+            _, peak = tracemalloc.get_traced_memory()
+            total += max(peak - before, 0)
+        return total / samples if samples else 0.0
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def run_benchmark(
+    name: str,
+    factory: OperationFactory,
+    ops: int,
+    concurrency: int = 1,
+    batch: int = 1,
+    value_size: int = 0,
+    warmup: int = 0,
+    allocations: bool = False,
+) -> BenchmarkResult:
+    """
+    Прогоняет сценарий и собирает задержки каждой операции.
+
+    Args:
+        name: Название сценария
+        factory: Фабрика операции; вызывается в каждом потоке отдельно,
+            чтобы у потоков были собственные клиенты
+        ops: Общее число операций (делится между потоками)
+        concurrency: Число параллельных потоков
+        batch: Сколько команд выполняет одна операция
+        value_size: Размер значения (для отчёта)
+        warmup: Число операций на поток до начала замеров
+        allocations: Дополнительно измерить аллокации (однопоточно)
+    """
+    if ops < 1 or concurrency < 1:
+        raise ValueError("ops и concurrency должны быть положительными")
+
+    per_thread = [
+        ops // concurrency + (i < ops % concurrency) for i in range(concurrency)
+    ]
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    errors: List[BaseException] = []
+    barrier = threading.Barrier(concurrency + 1)
+
+    def worker(index: int) -> None:
+        try:
+            op = factory()
+            for _ in range(warmup):
+                op()
+        except BaseException as e:
+            errors.append(e)
+            barrier.abort()
+            return
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            return
+        timings = latencies[index]
+        clock = time.perf_counter
+        try:
+            for _ in range(per_thread[index]):
+                started = clock()
+                op()
+                timings.append(clock() - started)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=worker, args=(i,), name=f"zumic-bench-{i}")
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        pass
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if errors:
+        raise errors[0]
+
+    samples = min(ALLOCATION_SAMPLES, ops)
+    alloc = measure_allocations(factory(), samples) if allocations else None
+    merged = sorted(latency for timings in latencies for latency in timings)
+    return BenchmarkResult(
+        name=name,
+        ops=len(merged),
+        elapsed=elapsed,
+        concurrency=concurrency,
+        batch=batch,
+        value_size=value_size,
+        alloc_bytes_per_op=alloc,
+        latencies=merged,
+    )
+
+
+def _ops_for_size(ops: int, size: int, byte_budget: int) -> int:
+    """Уменьшает число операций для больших значений, чтобы ограничить трафик."""
+    return max(1, min(ops, byte_budget // max(size, 1)))
+
+
+def default_scenarios(
+    make_client: Callable[[], Client],
+    ops: int = 10000,
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    concurrency: Sequence[int] = (1, 4, 16),
+    pipeline_size: int = 100,
+    byte_budget: int = 512 * 1024 * 1024,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Перечисляет стандартные сценарии: одиночные команды, конвейеры,
+    разные размеры значений и уровни параллелизма.
+
+    Yields:
+        Именованные аргументы для `run_benchmark`
+    """
+
+    def single(command: str, size: int) -> OperationFactory:
+        def factory() -> Operation:
+            client = make_client()
+            key = f"bench:{threading.get_ident()}"
+            value = b"x" * size
+            client.set(key, value)
+            if command == "SET":
+                return lambda: client.set(key, value)
+            if command == "GET":
+                return lambda: client.get(key, decode=False)
+            return client.ping
+
+        return factory
+
+    def pipelined(size: int) -> OperationFactory:
+        def factory() -> Operation:
+            client = make_client()
+            key = f"bench:{threading.get_ident()}"
+            value = b"x" * size
+
+            def op() -> Any:
+                pipe = client.pipeline()
+                for _ in range(pipeline_size // 2):
+                    pipe.set(key, value).get(key, decode=False)
+                return pipe.execute()
+
+            return op
+
+        return factory
+
+    yield {"name": "PING", "factory": single("PING", 0), "ops": ops}
+    for size in sizes:
+        size_ops = _ops_for_size(ops, size, byte_budget)
+        for command in ("SET", "GET"):
+            yield {
+                "name": f"{command} {size}B",
+                "factory": single(command, size),
+                "ops": size_ops,
+                "value_size": size,
+            }
+    batch = pipeline_size // 2 * 2
+    for size in sizes:
+        if size * batch > byte_budget:
+            # Конвейер из огромных значений измеряет лишь пропускную
+            # способность loopback, а не клиента
+            continue
+        yield {
+            "name": f"PIPELINE x{batch} {size}B",
+            "factory": pipelined(size),
+            "ops": _ops_for_size(max(ops // batch, 1), size * batch, byte_budget),
+            "batch": batch,
+            "value_size": size,
+        }
+    for level in concurrency:
+        if level == 1:
+            continue
+        yield {
+            "name": f"GET 100B c={level}",
+            "factory": single("GET", 100),
+            "ops": ops,
+            "concurrency": level,
+            "value_size": 100,
+        }
+
+
+def compare(
+    results: Sequence[BenchmarkResult],
+    baseline: Sequence[Dict[str, Any]],
+    threshold: float = 0.1,
+) -> List[str]:
+    """
+    Сравнивает результаты с базовым прогоном.
+
+    Args:
+        results: Текущие результаты
+        baseline: Сводки базового прогона (`BenchmarkResult.as_dict`)
+        threshold: Допустимое ухудшение (0.1 - 10%)
+
+    Returns:
+        Описания регрессий (пустой список - регрессий нет)
+    """
+    previous = {entry["name"]: entry for entry in baseline}
+    regressions = []
+    for result in results:
+        base = previous.get(result.name)
+        if base is None:
+            continue
+        if result.ops_per_sec < base["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{result.name}: {result.ops_per_sec:.0f} ops/s "
+                f"(было {base['ops_per_sec']:.0f})"
+            )
+        if result.p99 > base["p99"] * (1 + threshold):
+            regressions.append(
+                f"{result.name}: p99 {result.p99 * 1e6:.0f} мкс "
+                f"(было {base['p99'] * 1e6:.0f})"
+            )
+    return regressions
+
+
+def format_table(results: Sequence[BenchmarkResult]) -> str:
+    """Форматирует результаты в текстовую таблицу."""
+    header = (
+        f"{'сценарий':<28}{'ops/s':>12}{'p50 мкс':>10}{'p99 мкс':>10}"
+        f"{'p999 мкс':>10}{'байт/оп':>10}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        alloc = (
+            f"{r.alloc_bytes_per_op:.0f}" if r.alloc_bytes_per_op is not None else "-"
+        )
+        lines.append(
+            f"{r.name:<28}{r.ops_per_sec:>12.0f}{r.p50 * 1e6:>10.1f}"
+            f"{r.p99 * 1e6:>10.1f}{r.p999 * 1e6:>10.1f}{alloc:>10}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,427 @@
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+import argparse
+import os
+import select
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+
+from zumic.encoder import CRLF, BufferT
+from zumic.exceptions import ConnectionError, InvalidResponse, ResponseError
+from zumic.parser import ZSPParser
+
+S = TypeVar("S", bound="_ServerThread")
+
+# Полезная нагрузка длиннее этого порога отправляется отдельным вызовом,
+# без склейки с заголовком
+_SEND_CUTOFF = 65536
+
+
+class Store:
+    """Потокобезопасное хранилище строк, общее для всех соединений сервера."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.data: Dict[bytes, bytes] = {}
+
+
+def _int(value: bytes) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise ResponseError("ERR value is not an integer or out of range")
+
+
+def _incr_by(store: Store, key: bytes, delta: int) -> int:
+    value = _int(store.data.get(key, b"0")) + delta
+    store.data[key] = b"%d" % value
+    return value
+
+
+def _set(store: Store, args: List[bytes]) -> str:
+    store.data[args[0]] = args[1]
+    return "OK"
+
+
+def _mset(store: Store, args: List[bytes]) -> str:
+    if not args or len(args) % 2:
+        raise IndexError
+    store.data.update(zip(args[::2], args[1::2]))
+    return "OK"
+
+
+def _append(store: Store, args: List[bytes]) -> int:
+    value = store.data.get(args[0], b"") + args[1]
+    store.data[args[0]] = value
+    return len(value)
+
+
+def _flush(store: Store, args: List[bytes]) -> str:
+    store.data.clear()
+    return "OK"
+
+
+def _scan(store: Store, args: List[bytes]) -> List[Any]:
+    # Весь обход за один шаг: курсор сразу 0
+    return [b"0", list(store.data)]
+
+
+# Обработчики команд: (хранилище, аргументы без имени команды) -> ответ.
+# Значения str отправляются как simple string, bytes - как bulk-строки.
+COMMANDS: Dict[bytes, Callable[[Store, List[bytes]], Any]] = {
+    b"PING": lambda s, a: a[0] if a else "PONG",
+    b"ECHO": lambda s, a: a[0],
+    b"SET": _set,
+    b"GET": lambda s, a: s.data.get(a[0]),
+    b"DEL": lambda s, a: sum(s.data.pop(k, None) is not None for k in a),
+    b"EXISTS": lambda s, a: sum(k in s.data for k in a),
+    b"MGET": lambda s, a: [s.data.get(k) for k in a],
+    b"MSET": _mset,
+    b"INCR": lambda s, a: _incr_by(s, a[0], 1),
+    b"DECR": lambda s, a: _incr_by(s, a[0], -1),
+    b"INCRBY": lambda s, a: _incr_by(s, a[0], _int(a[1])),
+    b"DECRBY": lambda s, a: _incr_by(s, a[0], -_int(a[1])),
+    b"APPEND": _append,
+    b"STRLEN": lambda s, a: len(s.data.get(a[0], b"")),
+    b"TTL": lambda s, a: -1 if a[0] in s.data else -2,
+    b"EXPIRE": lambda s, a: int(a[0] in s.data),
+    b"TYPE": lambda s, a: "string" if a[0] in s.data else "none",
+    b"KEYS": lambda s, a: list(s.data),
+    b"SCAN": _scan,
+    b"DBSIZE": lambda s, a: len(s.data),
+    b"FLUSHDB": _flush,
+    b"FLUSHALL": _flush,
+}
+
+
+def encode_reply(value: Any, out: List[BufferT]) -> None:
+    """Кодирует ответ в формат ZSP, дописывая буферы в `out`."""
+    if value is None:
+        out.append(b"$-1\r\n")
+    elif isinstance(value, ResponseError):
+        out.append(b"-%s\r\n" % str(value).encode())
+    elif isinstance(value, str):
+        out.append(b"+%s\r\n" % value.encode())
+    elif isinstance(value, bool):
+        out.append(b":%d\r\n" % value)
+    elif isinstance(value, int):
+        out.append(b":%d\r\n" % value)
+    elif isinstance(value, (bytes, bytearray)):
+        out.append(b"$%d\r\n" % len(value))
+        out.append(value)
+        out.append(CRLF)
+    elif isinstance(value, list):
+        out.append(b"*%d\r\n" % len(value))
+        for item in value:
+            encode_reply(item, out)
+    else:
+        raise TypeError(f"Неподдерживаемый тип ответа: {type(value).__name__}")
+
+
+def _execute(store: Store, command: Any) -> Any:
+    with store.lock:
+        return _run(store, command)
+
+
+def _run(store: Store, command: Any) -> Any:
+    """Выполняет команду; блокировка хранилища должна быть уже взята."""
+    if not isinstance(command, list) or not command:
+        return ResponseError("ERR protocol error: expected command array")
+    name = bytes(command[0]).upper()
+    handler = COMMANDS.get(name)
+    if handler is None:
+        return ResponseError(f"ERR unknown command '{name.decode(errors='replace')}'")
+    try:
+        return handler(store, command[1:])
+    except IndexError:
+        return ResponseError(
+            f"ERR wrong number of arguments for '{name.decode().lower()}'"
+        )
+    except ResponseError as e:
+        return e
+
+
+class _Transaction:
+    """Состояние MULTI/WATCH одного соединения."""
+
+    def __init__(self) -> None:
+        self.queued: Optional[List[Any]] = None
+        self.aborted = False
+        # Ключ -> значение в момент WATCH; EXEC отменяется, если оно изменилось
+        self.watched: Dict[bytes, Optional[bytes]] = {}
+
+    def execute(self, store: Store, command: Any) -> Any:
+        name = bytes(command[0]).upper() if isinstance(command, list) else b""
+        if name == b"MULTI":
+            if self.queued is not None:
+                return ResponseError("ERR MULTI calls can not be nested")
+            self.queued = []
+            return "OK"
+        if name == b"WATCH":
+            if self.queued is not None:
+                return ResponseError("ERR WATCH inside MULTI is not allowed")
+            with store.lock:
+                for key in command[1:]:
+                    key = bytes(key)
+                    self.watched.setdefault(key, store.data.get(key))
+            return "OK"
+        if name == b"UNWATCH":
+            self.watched.clear()
+            return "OK"
+        if name in (b"EXEC", b"DISCARD"):
+            if self.queued is None:
+                return ResponseError(f"ERR {name.decode()} without MULTI")
+            queued, watched, aborted = self.queued, self.watched, self.aborted
+            self.queued, self.watched, self.aborted = None, {}, False
+            if name == b"DISCARD":
+                return "OK"
+            if aborted:
+                return ResponseError(
+                    "EXECABORT Transaction discarded because of previous errors."
+                )
+            with store.lock:
+                if any(store.data.get(k) != v for k, v in watched.items()):
+                    return None
+                return [_run(store, queued_command) for queued_command in queued]
+        if self.queued is not None:
+            if name not in COMMANDS:
+                self.aborted = True
+                return ResponseError(
+                    f"ERR unknown command '{name.decode(errors='replace')}'"
+                )
+            self.queued.append(command)
+            return "QUEUED"
+        return _execute(store, command)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: "ZSPServer"
+
+    def handle(self) -> None:
+        sock: socket.socket = self.request
+        if sock.family != socket.AF_UNIX:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        parser = ZSPParser(
+            self._recv, self._recv_into, decode_responses=False, read_size=65536
+        )
+        while True:
+            try:
+                command = parser.read_response()
+            except (ConnectionError, InvalidResponse, OSError):
+                return
+            reply: List[BufferT] = []
+            encode_reply(self._transaction.execute(self.server.store, command), reply)
+            self._queue(reply)
+
+    def setup(self) -> None:
+        # Неотправленные ответы. Они отправляются, пока сервер ждёт
+        # следующих данных, поэтому конвейер получает их пачкой, а клиент,
+        # который пишет большой конвейер целиком, не блокируется навсегда
+        self._pending: Deque[memoryview] = deque()
+        self._transaction = _Transaction()
+
+    def _queue(self, reply: List[BufferT]) -> None:
+        small = bytearray()
+        for chunk in reply:
+            if len(chunk) > _SEND_CUTOFF:
+                if small:
+                    self._pending.append(memoryview(small))
+                    small = bytearray()
+                self._pending.append(memoryview(chunk))
+            else:
+                small += chunk
+        if small:
+            self._pending.append(memoryview(small))
+
+    def _wait_readable(self, sock: socket.socket) -> None:
+        """Отправляет накопленные ответы, пока не появятся входные данные."""
+        while self._pending:
+            readable, writable, _ = select.select([sock], [sock], [])
+            if writable:
+                self._send_some(sock)
+            if readable:
+                return
+
+    def _send_some(self, sock: socket.socket) -> None:
+        """Отправляет столько ответов, сколько помещается без блокировки."""
+        while self._pending:
+            chunk = self._pending[0]
+            try:
+                sent = sock.send(chunk, socket.MSG_DONTWAIT)
+            except BlockingIOError:
+                return
+            if sent < len(chunk):
+                self._pending[0] = chunk[sent:]
+                return
+            self._pending.popleft()
+
+    def _recv(self, size: int) -> bytes:
+        sock: socket.socket = self.request
+        self._wait_readable(sock)
+        data = sock.recv(size)
+        if not data:
+            raise ConnectionError("Клиент закрыл соединение")
+        return data
+
+    def _recv_into(self, buffer: memoryview) -> int:
+        sock: socket.socket = self.request
+        self._wait_readable(sock)
+        received = sock.recv_into(buffer)
+        if not received:
+            raise ConnectionError("Клиент закрыл соединение")
+        return received
+
+
+class _ServerThread:
+    """Запуск сервера в фоновом потоке и поддержка контекстного менеджера."""
+
+    _thread: Optional[threading.Thread] = None
+
+    if TYPE_CHECKING:
+
+        def serve_forever(self, poll_interval: float = 0.5) -> None: ...
+        def shutdown(self) -> None: ...
+        def server_close(self) -> None: ...
+
+    def start(self: S) -> S:
+        """Запускает сервер в фоновом потоке."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="zumic-bench-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер и закрывает слушающий сокет."""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self):
+        """Поддержка контекстного менеджера: запускает сервер."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Останавливает сервер."""
+        self.stop()
+        return False
+
+
+class ZSPServer(_ServerThread, socketserver.ThreadingTCPServer):
+    """
+    Минимальный сервер Zumic-протокола (ZSP) для бенчмарков и тестов.
+
+    Хранит строки в памяти и понимает основные строковые команды
+    (`COMMANDS`), а также транзакции MULTI/EXEC/WATCH. Каждое соединение
+    обслуживается отдельным потоком.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """
+        Args:
+            host: Адрес для прослушивания
+            port: Порт (0 - выбрать свободный)
+        """
+        super().__init__((host, port), _Handler)
+        self.store = Store()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Фактический адрес сервера (host, port)."""
+        host, port = self.server_address[:2]
+        return str(host), int(port)
+
+
+class UnixZSPServer(_ServerThread, socketserver.ThreadingUnixStreamServer):
+    """Тот же сервер ZSP, но на Unix-сокете (для замеров без TCP-стека)."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path: Путь к файлу сокета; существующий файл удаляется
+        """
+        if os.path.exists(path):
+            os.unlink(path)
+        super().__init__(path, _Handler)
+        self.store = Store()
+        self.path = path
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def spawn_server(
+    host: str = "127.0.0.1", unix_socket_path: Optional[str] = None
+) -> Tuple[subprocess.Popen, int]:
+    """
+    Запускает сервер в отдельном процессе, чтобы он не делил GIL
+    и счётчики аллокаций с измеряемым клиентом.
+
+    Args:
+        host: Адрес для прослушивания
+        unix_socket_path: Слушать Unix-сокет по этому пути вместо TCP
+
+    Returns:
+        Процесс сервера и выбранный им порт (0 для Unix-сокета)
+    """
+    command = [sys.executable, "-m", "zumic.benchmark.server", "--host", host]
+    if unix_socket_path is not None:
+        command += ["--unix", unix_socket_path]
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert process.stdout is not None
+    line = process.stdout.readline()
+    if not line.startswith("PORT "):
+        process.kill()
+        raise RuntimeError("Не удалось запустить сервер бенчмарка")
+    return process, int(line.split()[1])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Сервер ZSP для бенчмарков")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--unix", help="Путь к Unix-сокету вместо TCP")
+    args = parser.parse_args(argv)
+
+    server: _ServerThread
+    if args.unix:
+        server, port = UnixZSPServer(args.unix), 0
+    else:
+        tcp = ZSPServer(args.host, args.port)
+        server, port = tcp, tcp.address[1]
+    with server:
+        print(f"PORT {port}", flush=True)
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import threading
+import time
+
+from zumic.encoder import CommandTemplate, EncodableT, encode_arg
+
+
+def _first_key(args: Sequence[EncodableT]) -> List[EncodableT]:
+    return list(args[1:2])
+
+
+def _all_keys(args: Sequence[EncodableT]) -> List[EncodableT]:
+    return list(args[1:])
+
+
+def _pair_keys(args: Sequence[EncodableT]) -> List[EncodableT]:
+    return list(args[1::2])
+
+
+def _script_keys(args: Sequence[EncodableT]) -> List[EncodableT]:
+    # EVAL script numkeys key... arg...: скрипт меняет только объявленные ключи
+    numkeys = int(encode_arg(args[2])) if len(args) > 2 else 0
+    return list(args[3 : 3 + numkeys])
+
+
+# Команды, изменяющие значения ключей, и функции извлечения этих ключей
+WRITE_COMMANDS: Dict[str, Callable[[Sequence[EncodableT]], List[EncodableT]]] = {
+    "SET": _first_key,
+    "DEL": _all_keys,
+    "EXPIRE": _first_key,
+    "INCR": _first_key,
+    "DECR": _first_key,
+    "INCRBY": _first_key,
+    "DECRBY": _first_key,
+    "APPEND": _first_key,
+    "MSET": _pair_keys,
+    "EVAL": _script_keys,
+    "EVALSHA": _script_keys,
+}
+
+# Команды, после которых кэш целиком теряет актуальность
+FLUSH_COMMANDS = frozenset({"FLUSHDB", "FLUSHALL"})
+
+_MISSING = object()
+
+
+def command_name(args: Sequence[EncodableT]) -> str:
+    """Возвращает имя команды в верхнем регистре."""
+    name = args[0]
+    if isinstance(name, CommandTemplate):
+        name = name.name
+    elif not isinstance(name, str):
+        name = bytes(encode_arg(name)).decode("utf-8", "replace")
+    return name.upper()
+
+
+def _cache_key(key: EncodableT) -> str:
+    """Приводит ключ к единому виду, чтобы str и bytes совпадали."""
+    if isinstance(key, str):
+        return key
+    return bytes(encode_arg(key)).decode("utf-8", "surrogateescape")
+
+
+@dataclass
+class CacheStats:
+    """Снимок счётчиков локального кэша."""
+
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Доля попаданий среди всех обращений."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class NearCache:
+    """
+    Локальный (in-process) кэш значений GET с вытеснением LRU и TTL.
+
+    Клиент сам инвалидирует записи при собственных командах записи
+    (`set`, `delete`, `expire`, `incr`, `append` и т.д.). Изменения, сделанные
+    другими клиентами, кэш видит только по истечении TTL или через
+    `handle_invalidation`, если сервер умеет присылать уведомления.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            max_size: Максимальное число записей
+            ttl: Время жизни записи в секундах (None - без ограничения)
+            clock: Источник монотонного времени
+        """
+        if max_size < 1:
+            raise ValueError("max_size должен быть положительным")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        # Увеличивается при каждой инвалидации, чтобы не положить в кэш
+        # значение, прочитанное до конкурентной записи
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def lookup(self, key: EncodableT) -> Any:
+        """
+        Ищет значение в кэше.
+
+        Returns:
+            Значение или внутренний маркер отсутствия (см. `is_miss`)
+        """
+        cache_key = _cache_key(key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self._misses += 1
+                return _MISSING
+            value, expires_at = entry
+            if expires_at is not None and self._clock() >= expires_at:
+                del self._entries[cache_key]
+                self._expirations += 1
+                self._misses += 1
+                return _MISSING
+            self._entries.move_to_end(cache_key)
+            self._hits += 1
+            return value
+
+    @staticmethod
+    def is_miss(value: Any) -> bool:
+        """Проверяет, что `lookup` не нашёл значение."""
+        return value is _MISSING
+
+    def reserve(self) -> int:
+        """Возвращает метку для последующего `put` (см. `put`)."""
+        with self._lock:
+            return self._generation
+
+    def put(
+        self,
+        key: EncodableT,
+        value: Any,
+        reservation: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> bool:
+        """
+        Сохраняет значение в кэше.
+
+        Args:
+            key: Ключ
+            value: Значение
+            reservation: Метка из `reserve()`, полученная до запроса к серверу.
+                Если с тех пор была инвалидация, значение может быть устаревшим
+                и не сохраняется
+            ttl: Переопределяет TTL кэша для этой записи
+
+        Returns:
+            True если значение сохранено
+        """
+        if ttl is None:
+            ttl = self.ttl
+        expires_at = self._clock() + ttl if ttl is not None else None
+        cache_key = _cache_key(key)
+        with self._lock:
+            if reservation is not None and reservation != self._generation:
+                return False
+            self._entries[cache_key] = (value, expires_at)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+            return True
+
+    def invalidate(self, *keys: EncodableT) -> int:
+        """
+        Удаляет записи для указанных ключей.
+
+        Returns:
+            Количество удалённых записей
+        """
+        removed = 0
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if self._entries.pop(_cache_key(key), None) is not None:
+                    removed += 1
+            self._invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        """Очищает кэш целиком."""
+        with self._lock:
+            self._generation += 1
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+    def handle_invalidation(self, keys: Optional[Iterable[EncodableT]]) -> None:
+        """
+        Обработчик серверных уведомлений об инвалидации.
+
+        Args:
+            keys: Изменившиеся ключи; None означает сброс всего кэша
+        """
+        if keys is None:
+            self.clear()
+        else:
+            self.invalidate(*keys)
+
+    def invalidate_for_command(self, args: Sequence[EncodableT]) -> None:
+        """Инвалидирует записи, которые может изменить команда `args`."""
+        name = command_name(args)
+        if name in FLUSH_COMMANDS:
+            self.clear()
+            return
+        extract = WRITE_COMMANDS.get(name)
+        if extract is not None:
+            self.invalidate(*extract(args))
+
+    def stats(self) -> CacheStats:
+        """Возвращает текущие счётчики кэша."""
+        with self._lock:
+            return CacheStats(
+                size=len(self._entries),
+                max_size=self.max_size,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                invalidations=self._invalidations,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,10 +1,46 @@
-from typing import Any, Optional, Union, List
-
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import copy_context
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import threading
+
+from zumic.autopipeline import AutoPipeline
+from zumic.cache import NearCache, command_name
+from zumic.commands import (
+    DEFAULT_CHUNK_SIZE,
+    BatchCommand,
+    CoreCommands,
+    _is_ok,
+    chunked,
+    set_options,
+)
 from zumic.connection import Connection
 from zumic.connection_protocol import ConnectionProtocol
-
-
-class Client:
+from zumic.encoder import EncodableT
+from zumic.exceptions import DataError, ResponseError, WatchError
+from zumic.instrumentation import CommandTimer, Observer
+from zumic.pipeline import Pipeline
+from zumic.pool import ConnectionPool
+from zumic.pubsub import PubSub
+from zumic.retry import Retry
+from zumic.serialization import ValueCodec
+from zumic.streaming import (
+    read_into,
+    readable_source,
+    send_from,
+    stream_size,
+    writable_target,
+)
+from zumic.timeouts import deadline as time_budget
+from zumic.typed import NumericReply, concat_arrays, read_reply
+
+
+# Число повторов транзакции при конфликте WATCH по умолчанию
+DEFAULT_TRANSACTION_RETRIES = 10
+
+
+class Client(CoreCommands[Any]):
     """Клиент для работы с Zumic БД."""
 
     def __init__(
@@ -14,6 +50,17 @@ class Client:
         timeout: Optional[float] = None,
         connection: Optional[ConnectionProtocol] = None,
         decode_responses: bool = True,
+        encoding: str = "utf-8",
+        encoding_errors: str = "replace",
+        connection_pool: Optional[ConnectionPool] = None,
+        cache: Optional[NearCache] = None,
+        observer: Optional[Observer] = None,
+        retry: Optional[Retry] = None,
+        codec: Optional[ValueCodec] = None,
+        auto_pipeline: bool = False,
+        unix_socket_path: Optional[str] = None,
+        socket_connect_timeout: Optional[float] = None,
+        **connection_kwargs: Any,
     ) -> None:
         """
         Инициализирует клиент Zumic.
@@ -21,21 +68,121 @@ class Client:
         Args:
             host: Адрес сервера
             port: Порт сервера
-            timeout: Таймаут соединения
+            timeout: Таймаут операций чтения и записи
             connection: Кастомное соединение
-            decode_responses: Декодировать ответы в строки
-        """
-        self.connection: ConnectionProtocol = connection or Connection(
-            host=host, port=port, timeout=timeout
-        )
+            decode_responses: Декодировать ответы в строки (иначе - bytes)
+            encoding: Кодировка строк ответа
+            encoding_errors: Политика обработки ошибок декодирования
+            connection_pool: Пул соединений, разделяемый между потоками
+                (взаимоисключающе с `connection`)
+            cache: Локальный кэш значений GET
+            observer: Наблюдатель за выполнением команд (см.
+                `zumic.instrumentation`); без него замеры не выполняются
+            retry: Политика повторов команд после ошибок соединения
+                (`zumic.retry.Retry`); None - без повторов. Повторяются
+                одиночные команды, конвейеры и транзакции - нет.
+                Неидемпотентные команды (INCR, APPEND, ...) после ошибки,
+                случившейся уже после их отправки, не повторяются
+            codec: Кодек значений `set`/`get`/`mset`/`mget`
+                (`zumic.serialization.ValueCodec`): сериализация объектов
+                и сжатие больших значений
+            auto_pipeline: Выполнять одиночные команды через общий
+                автоконвейер (`zumic.autopipeline.AutoPipeline`) на отдельном
+                соединении: команды параллельных потоков отправляются
+                вместе, не дожидаясь ответов друг друга. Конвейеры
+                и транзакции по-прежнему используют обычное соединение;
+                фазы команд автоконвейера наблюдателем не замеряются.
+                Несовместим с `connection`
+            unix_socket_path: Путь к Unix-сокету сервера вместо host/port
+            socket_connect_timeout: Таймаут установки соединения
+                (None - совпадает с `timeout`)
+            **connection_kwargs: Остальные параметры `Connection`
+                (`tcp_nodelay`, `socket_keepalive`, размеры буферов,
+                `dns_cache_ttl`)
+        """
+        if connection is not None and connection_pool is not None:
+            raise ValueError(
+                "Нельзя одновременно передать connection и connection_pool"
+            )
+        if connection is not None and auto_pipeline:
+            # Автоконвейеру нужно отдельное соединение, а параметры
+            # готового соединения клиенту неизвестны
+            raise ValueError("auto_pipeline нельзя использовать с готовым connection")
+
+        self.connection_pool = connection_pool
+        self.connection: Optional[ConnectionProtocol] = None
+        # Параметры соединения клиента; нужны, чтобы открывать отдельные
+        # соединения (например, для Pub/Sub)
+        self._connection_kwargs: Optional[Dict[str, Any]] = None
+        if connection_pool is None and connection is None:
+            self._connection_kwargs = dict(
+                host=host,
+                port=port,
+                timeout=timeout,
+                decode_responses=decode_responses,
+                encoding=encoding,
+                encoding_errors=encoding_errors,
+                unix_socket_path=unix_socket_path,
+                socket_connect_timeout=socket_connect_timeout,
+                **connection_kwargs,
+            )
+            self.connection = Connection(**self._connection_kwargs)
+        elif connection_pool is None:
+            self.connection = connection
         self.decode_responses = decode_responses
-
-    def execute(self, *args: Union[str, bytes]) -> Any:
+        self.encoding = encoding
+        self.encoding_errors = encoding_errors
+        self.cache = cache
+        self.observer = observer
+        self.retry = retry
+        self.codec = codec
+        self.auto_pipeline = auto_pipeline
+        self._auto_pipeline: Optional[AutoPipeline] = None
+        # Единственное соединение не должно использоваться потоками одновременно
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def get_connection(self) -> Iterator[ConnectionProtocol]:
+        """
+        Выдаёт соединение на время одного обмена с сервером.
+
+        Соединение берётся из пула, а при его отсутствии используется
+        единственное соединение клиента под блокировкой. При любой ошибке,
+        кроме ошибки сервера, соединение закрывается, чтобы недочитанный
+        ответ не достался следующей команде.
+        """
+        if self.connection_pool is not None:
+            with self.connection_pool.connection() as pooled:
+                yield pooled
+            return
+
+        connection = self.connection
+        assert connection is not None
+        with self._lock:
+            try:
+                yield connection
+            except BaseException as e:
+                if not isinstance(e, ResponseError):
+                    connection.disconnect()
+                raise
+
+    def execute(
+        self,
+        *args: EncodableT,
+        decode: Optional[bool] = None,
+        numeric: Optional[NumericReply] = None,
+        deadline: Optional[float] = None,
+    ) -> Any:
         """
         Выполняет команду на сервере.
 
         Args:
             *args: Аргументы команды
+            decode: Декодировать строки ответа; False - вернуть bytes
+                (None - настройка клиента)
+            numeric: Разобрать ответ-массив чисел в `array.array`
+            deadline: Бюджет времени команды в секундах вместе со всеми
+                повторами (см. `zumic.timeouts.deadline`)
 
         Returns:
             Ответ сервера
@@ -43,255 +190,446 @@ class Client:
         Raises:
             ResponseError: Ошибка от сервера
             InvalidResponse: Некорректный ответ
+            TimeoutError: Истёк таймаут или бюджет времени
             ConnectionError: Ошибка соединения
         """
         if not args:
             raise ValueError("Команда не может быть пустой")
+        if deadline is not None:
+            with time_budget(deadline):
+                return self._execute_retrying(args, decode, numeric)
+        return self._execute_retrying(args, decode, numeric)
 
-        # Отправляем и читаем ответ напрямую:
-        self.connection.send_command(*args)
-        response = self.connection.read_response()
-
-        # Декодируем байты в строки, если включено декодирование
-        if self.decode_responses and isinstance(response, bytes):
-            response = response.decode("utf-8", errors="replace")  # type: ignore[unreachable]
+    def _execute_retrying(
+        self,
+        args: Tuple[EncodableT, ...],
+        decode: Optional[bool],
+        numeric: Optional[NumericReply] = None,
+    ) -> Any:
+        """Выполняет команду с учётом политики повторов."""
+        retry = self.retry
+        if retry is None:
+            return self._execute_once(args, decode, numeric)
+
+        sent = False
+
+        def mark_sent() -> None:
+            nonlocal sent
+            sent = True
+
+        def attempt() -> Any:
+            nonlocal sent
+            sent = False
+            return self._execute_once(args, decode, numeric, mark_sent)
+
+        # Сломанное соединение закрывает get_connection, следующая
+        # попытка переподключается. Уже отправленную команду сервер мог
+        # выполнить, поэтому её повтор решает политика
+        return retry.call_with_retry(
+            attempt, retryable=lambda error: not sent or retry.can_repeat_sent(args)
+        )
 
+    def _execute_once(
+        self,
+        args: Tuple[EncodableT, ...],
+        decode: Optional[bool],
+        numeric: Optional[NumericReply] = None,
+        on_sent: Optional[Callable[[], None]] = None,
+    ) -> Any:
+        """
+        Выполняет команду одной попыткой.
+
+        `on_sent` вызывается, когда команда целиком записана в сокет.
+        """
+        if self.auto_pipeline:
+            # Момент отправки в автоконвейере неизвестен: считаем
+            # команду отправленной
+            if on_sent is not None:
+                on_sent()
+            response = self._get_auto_pipeline().execute(
+                *args, decode=decode, numeric=numeric
+            )
+            return self._process_response(response, decode)
+        with self.get_connection() as connection:
+            if self.observer is None:
+                connection.send_command(*args)
+                if on_sent is not None:
+                    on_sent()
+                response = read_reply(connection, decode, numeric)
+            else:
+                response = self._execute_observed(
+                    self.observer, connection, args, decode, numeric, on_sent
+                )
+        return self._process_response(response, decode)
+
+    @staticmethod
+    def _execute_observed(
+        observer: Observer,
+        connection: ConnectionProtocol,
+        args: Tuple[EncodableT, ...],
+        decode: Optional[bool],
+        numeric: Optional[NumericReply] = None,
+        on_sent: Optional[Callable[[], None]] = None,
+    ) -> Any:
+        """Выполняет команду, замеряя её фазы для наблюдателя."""
+        timer = CommandTimer(observer, args, connection)
+        try:
+            connection.send_command(*args)
+            timer.sent()
+            if on_sent is not None:
+                on_sent()
+            response = read_reply(connection, decode, numeric)
+        except BaseException as e:
+            timer.finish(e)
+            raise
+        timer.finish()
         return response
 
-    def ping(self, message: Optional[str] = None) -> Union[str, bool]:
-        """
-        Проверяет соединение с сервером.
+    def _get_auto_pipeline(self) -> AutoPipeline:
+        """Возвращает автоконвейер клиента, создавая его при первом вызове."""
+        auto_pipeline = self._auto_pipeline
+        if auto_pipeline is None:
+            with self._lock:
+                if self._auto_pipeline is None:
+                    self._auto_pipeline = AutoPipeline(self.make_connection())
+                auto_pipeline = self._auto_pipeline
+        return auto_pipeline
 
-        Args:
-            message: Опциональное сообщение
-
-        Returns:
-            "PONG" или переданное сообщение
+    def _process_response(self, response: Any, decode: Optional[bool] = None) -> Any:
         """
-        if message is not None:
-            return self.execute("PING", message) == message
-        return self.execute("PING") == "PONG"
+        Приводит сырой ответ соединения к виду, отдаваемому пользователю.
 
-    def set(self, key: str, value: Union[str, bytes], **kwargs) -> bool:
+        Соединения клиента декодируют строки сами; здесь декодируются только
+        байты от соединений, настроенных на сырой режим.
         """
-        Устанавливает значение ключа.
-
-        Args:
-            key: Ключ
-            value: Значение
-            **kwargs: Дополнительные параметры (EX, PX, NX, XX)
-
-        Returns:
-            True если операция успешна
-        """
-        args: List[Union[str, bytes]] = ["SET", key, value]
-        if "ex" in kwargs:
-            args += ["EX", str(kwargs["ex"])]
-        if "px" in kwargs:
-            args += ["PX", str(kwargs["px"])]
-        if kwargs.get("nx"):
-            args.append("NX")
-        if kwargs.get("xx"):
-            args.append("XX")
-        return self.execute(*args) == "OK"
-
-    def get(self, key: str) -> Optional[str]:
-        """
-        Получает значение ключа.
-
-        Args:
-            key: Ключ
-
-        Returns:
-            Значение ключа или None если ключ не найден
-        """
-        return self.execute("GET", key)
+        if decode is None:
+            decode = self.decode_responses
+        # Декодируем байты в строки, если включено декодирование
+        if decode and isinstance(response, bytes):
+            response = response.decode(self.encoding, self.encoding_errors)
+        return response
 
-    def delete(self, *keys: str) -> bool:
+    def execute_command(
+        self,
+        *args: EncodableT,
+        callback: Optional[Callable[[Any], Any]] = None,
+        **options: Any,
+    ) -> Any:
         """
-        Удаляет один или несколько ключей.
+        Выполняет команду и применяет к ответу функцию постобработки.
 
         Args:
-            *keys: Ключи для удаления
-
-        Returns:
-            True если хотя бы один ключ удалён, иначе False
+            *args: Аргументы команды
+            callback: Функция постобработки ответа сервера
+            **options: Параметры выполнения (см. `execute`)
+        """
+        if self.cache is not None and args:
+            response = self._execute_cached(self.cache, args, options)
+        else:
+            response = self.execute(*args, **options)
+        return callback(response) if callback is not None else response
+
+    def _execute_cached(
+        self, cache: NearCache, args: Tuple[EncodableT, ...], options: Dict[str, Any]
+    ) -> Any:
+        """
+        Выполняет команду с учётом локального кэша.
+
+        Кэшируется GET в том виде, в каком его читает `get`: при кодеке
+        значений - сырые байты (кодек разбирает их и при попадании в кэш),
+        без кодека - ответ с декодированием по настройке клиента.
+        """
+        name = command_name(args)
+        cached_decode = None if self.codec is None else False
+        if name == "GET" and len(args) == 2 and options.get("decode") is cached_decode:
+            value = cache.lookup(args[1])
+            if not cache.is_miss(value):
+                return value
+            reservation = cache.reserve()
+            value = self.execute(*args, **options)
+            cache.put(args[1], value, reservation)
+            return value
+
+        try:
+            return self.execute(*args, **options)
+        finally:
+            # Инвалидируем и при ошибке: запись могла дойти до сервера
+            cache.invalidate_for_command(args)
+
+    def _local_result(self, value: Any) -> Any:
+        """Возвращает результат, не требующий обращения к серверу."""
+        return value
+
+    def _execute_batch(
+        self, commands: List[BatchCommand], combine: Callable[[List[Any]], Any]
+    ) -> Any:
+        """Выполняет команды одним конвейером и сводит результаты."""
+        pipe = self.pipeline()
+        for args, callback, options in commands:
+            pipe.execute_command(*args, callback=callback, **options)
+        return combine(pipe.execute())
+
+    def mget_array(
+        self,
+        keys: Iterable[str],
+        typecode: str = "q",
+        null: float = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> array:
         """
-        if not keys:
-            return False
-        return bool(self.execute("DEL", *keys))
+        Получает числовые значения многих ключей в типизированный массив.
 
-    def exists(self, *keys: str) -> bool:
-        """
-        Проверяет существование ключей.
+        Ответы MGET разбираются сразу в `array.array` без создания объекта
+        на каждое значение; `as_numpy()` превращает результат в массив
+        NumPy без копирования.
 
         Args:
-            *keys: Ключи для проверки
+            keys: Ключи (любой итерируемый объект)
+            typecode: Код типа `array.array` (по умолчанию int64)
+            null: Значение для отсутствующих ключей
+            chunk_size: Максимальное число ключей в одной команде
 
         Returns:
-            True если хотя бы один ключ существует
-        """
-        if not keys:
-            return False
-        return bool(self.execute("EXISTS", *keys))
+            Массив значений в порядке ключей
 
-    def keys(self, pattern: str = "*") -> List[str]:
+        Raises:
+            DataError: Значение не является числом нужного типа
         """
-        Возвращает список ключей по шаблону.
-
-        Args:
-            pattern: Шаблон поиска
+        numeric = NumericReply(typecode, null)
+        pipe = self.pipeline()
+        for chunk in chunked(keys, chunk_size):
+            pipe.execute_command("MGET", *chunk, numeric=numeric)
+        return concat_arrays(pipe.execute(), typecode)
 
-        Returns:
-            Возвращает список ключей по шаблону.
+    def get_into(self, key: str, target: Any) -> Optional[int]:
         """
-        result = self.execute("KEYS", pattern)
-        return result if isinstance(result, list) else []
+        Читает значение ключа прямо в буфер или файл, не собирая его
+        в памяти целиком.
 
-    def ttl(self, key: str) -> int:
-        """
-        Возвращает время жизни ключа в секундах.
+        Значение читается как есть, без кодека и локального кэша.
 
         Args:
             key: Ключ
+            target: Записываемый буфер (`bytearray`, `memoryview`, `mmap`,
+                `array.array`) - значение пишется с его начала, - или
+                файловый объект, открытый на запись в двоичном режиме
 
         Returns:
-            Время жизни в секундах (-1 если ключ постоянный, -2 если не существует)
-        """
-        return self.execute("TTL", key)
+            Длину значения или None, если ключ не найден
 
-    def expire(self, key: str, seconds: int) -> bool:
+        Raises:
+            DataError: Значение не помещается в буфер
         """
-        Устанавливает время жизни ключа.
+        sink = writable_target(target)
+        with self.get_connection() as connection:
+            connection.send_command("GET", key)
+            return read_into(connection, sink)
 
-        Args:
-            key: Ключ
-            seconds: Время жизни в секундах
-
-        Returns:
-            True если операция успешна
+    def set_from(
+        self, key: str, source: Any, size: Optional[int] = None, **kwargs: Any
+    ) -> bool:
         """
-        return bool(self.execute("EXPIRE", key, str(seconds)))
+        Записывает значение ключа из файла или буфера, не копируя его
+        в память процесса.
 
-    def type(self, key: str) -> str:
-        """
-        Возвращает тип значения ключа.
+        Файл передаётся в сокет через sendfile, буфер (`bytes`,
+        `memoryview`, `mmap`) - векторной записью без склейки. Значение
+        записывается как есть, без кодека; команда не повторяется
+        политикой `retry`, так как источник уже прочитан.
 
         Args:
             key: Ключ
+            source: Файловый объект, открытый на чтение в двоичном режиме
+                (значение читается с текущей позиции), или буфер
+            size: Длина значения в байтах (по умолчанию - до конца файла
+                или буфера)
+            **kwargs: Дополнительные параметры (EX, PX, NX, XX)
 
         Returns:
-            Тип значения
-        """
-        return self.execute("TYPE", key)
-
-    # Команды для работы со строками.
-    def incr(self, key: str) -> int:
-        """
-        Увеличивает значение ключа на 1.
-
-        Args:
-            key: Ключ
+            True если операция успешна
 
-        Returns:
-            Новое значение
+        Raises:
+            DataError: Источник короче `size`
+        """
+        tail = set_options(kwargs)
+        view = readable_source(source)
+        if view is not None and size is not None:
+            if size > len(view):
+                raise DataError("Источник короче заявленного размера")
+            view = view[:size]
+        elif view is None and size is None:
+            size = stream_size(source)
+        try:
+            with self.get_connection() as connection:
+                if view is not None:
+                    connection.send_command("SET", key, view, *tail)
+                else:
+                    send_from(connection, ("SET", key), source, size or 0, tail)
+                response = connection.read_response()
+        finally:
+            # Инвалидируем и при ошибке: запись могла дойти до сервера
+            if self.cache is not None:
+                self.cache.invalidate_for_command(("SET", key))
+        return _is_ok(response)
+
+    def scan_iter(
+        self,
+        match: Optional[str] = None,
+        count: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> Iterator[Any]:
         """
-        return self.execute("INCR", key)
+        Лениво обходит пространство ключей порциями SCAN.
 
-    def decr(self, key: str) -> int:
-        """
-        Уменьшает значение ключа на 1.
+        В памяти одновременно находятся не больше двух порций, независимо
+        от размера базы. Сервер может вернуть один ключ несколько раз,
+        если пространство ключей менялось во время обхода.
 
         Args:
-            key: Ключ
-
-        Returns:
-            Новое значение
-        """
-        return self.execute("DECR", key)
-
-    def incrby(self, key: str, amount: int) -> int:
-        """
-        Увеличивает значение ключа на указанное количество.
+            match: Шаблон ключей
+            count: Подсказка серверу о размере порции
+            prefetch: Запрашивать следующую порцию в фоновом потоке, пока
+                вызывающий код обрабатывает текущую
+
+        Yields:
+            Ключи
+        """
+        cursor, keys = self.scan(0, match, count)
+        if not prefetch:
+            while True:
+                yield from keys
+                if cursor == 0:
+                    return
+                cursor, keys = self.scan(cursor, match, count)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while True:
+                pending = (
+                    executor.submit(copy_context().run, self.scan, cursor, match, count)
+                    if cursor
+                    else None
+                )
+                yield from keys
+                if pending is None:
+                    return
+                cursor, keys = pending.result()
+
+    def pipeline(
+        self, raise_on_error: bool = True, transaction: bool = False
+    ) -> Pipeline:
+        """
+        Создаёт конвейер для пакетной отправки команд за один round trip.
 
         Args:
-            key: Ключ
-            amount: Количество для увеличения
+            raise_on_error: Бросать первую ошибку команды при `execute()`
+            transaction: Выполнять команды атомарно через MULTI/EXEC
 
         Returns:
-            Новое значение
+            Новый объект Pipeline
         """
-        return self.execute("INCRBY", key, str(amount))
+        return Pipeline(self, raise_on_error=raise_on_error, transaction=transaction)
 
-    def decrby(self, key: str, amount: int) -> int:
-        """
-        Уменьшает значение ключа на указанное количество.
-
-        Args:
-            key: Ключ
-            amount: Количество для уменьшения
-
-        Returns:
-            Новое значение
+    def transaction(
+        self,
+        func: Callable[[Pipeline], Any],
+        *watch_keys: EncodableT,
+        retries: Optional[int] = DEFAULT_TRANSACTION_RETRIES,
+        value_from_callable: bool = False,
+    ) -> Any:
         """
-        return self.execute("DECRBY", key, str(amount))
+        Выполняет оптимистичную транзакцию с повтором при `WatchError`.
 
-    def append(self, key: str, value: str) -> int:
-        """
-        Добавляет строку к значению ключа.
+        `func` получает конвейер, который уже наблюдает за `watch_keys`:
+        команды до `pipe.multi()` выполняются сразу (чтение текущих
+        значений), после - ставятся в очередь и уходят одной записью
+        MULTI...EXEC. Без `watch_keys` все команды `func` попадают
+        в транзакцию. Внутри `func` нужно использовать только `pipe`:
+        соединение клиента занято до конца попытки.
 
         Args:
-            key: Ключ
-            value: Строка для добавления
+            func: Тело транзакции
+            *watch_keys: Ключи для WATCH
+            retries: Сколько раз повторять при конфликте (None - без
+                ограничения)
+            value_from_callable: Вернуть результат `func` вместо ответов EXEC
 
         Returns:
-            Новая длина строки
-        """
-        return self.execute("APPEND", key, value)
+            Ответы команд транзакции (или результат `func`)
 
-    def strlen(self, key: str) -> int:
-        """
-        Возвращает длину строки.
+        Raises:
+            WatchError: Конфликты не прекратились за `retries` повторов
+        """
+        attempt = 0
+        while True:
+            with self.pipeline(transaction=True) as pipe:
+                try:
+                    if watch_keys:
+                        pipe.watch(*watch_keys)
+                    value = func(pipe)
+                    result = pipe.execute()
+                    return value if value_from_callable else result
+                except WatchError:
+                    attempt += 1
+                    if retries is not None and attempt > retries:
+                        raise
+
+    def make_connection(self, **overrides: Any) -> ConnectionProtocol:
+        """
+        Открывает отдельное соединение с настройками клиента (или пула).
 
         Args:
-            key: Ключ
-
-        Returns:
-            Длина строки
-        """
-        return self.execute("STRLEN", key)
-
-    # Служебные методы
-    def flushdb(self) -> bool:
-        """
-        Очищает текущую базу данных.
-
-        Returns:
-            True если операция успешна
-        """
-        return self.execute("FLUSHDB") == "OK"
+            **overrides: Параметры соединения, заменяющие настройки клиента
 
-    def flushall(self) -> bool:
+        Raises:
+            ValueError: Клиент создан с готовым соединением, и его
+                настройки неизвестны
         """
-        Очищает все базы данных.
+        if self.connection_pool is not None:
+            pool = self.connection_pool
+            return pool.connection_class(**{**pool.connection_kwargs, **overrides})
+        if self._connection_kwargs is None:
+            raise ValueError(
+                "Клиент создан с готовым соединением: передайте соединение явно"
+            )
+        return Connection(**{**self._connection_kwargs, **overrides})
 
-        Returns:
-            True если операция успешна
+    def pubsub(
+        self, connection: Optional[ConnectionProtocol] = None, **options: Any
+    ) -> PubSub:
         """
-        return self.execute("FLUSHALL") == "OK"
+        Создаёт подписчика Pub/Sub на собственном соединении.
 
-    def dbsize(self) -> int:
-        """
-        Возвращает количество ключей в базе данных.
+        Соединение открывается с настройками клиента, но без таймаута
+        чтения: подписчик может подолгу ждать сообщений.
 
-        Returns:
-            Количество ключей
-        """
-        return self.execute("DBSIZE")
+        Args:
+            connection: Готовое соединение для подписчика
+            **options: Параметры `PubSub` (`max_queue`, `policy`,
+                `ignore_subscribe_messages`)
+        """
+        if connection is None:
+            settings = (
+                self.connection_pool.connection_kwargs
+                if self.connection_pool is not None
+                else self._connection_kwargs or {}
+            )
+            connect_timeout = settings.get("socket_connect_timeout")
+            if connect_timeout is None:
+                connect_timeout = settings.get("timeout")
+            connection = self.make_connection(
+                timeout=None, socket_connect_timeout=connect_timeout
+            )
+        return PubSub(connection, **options)
 
     def close(self) -> None:
-        """Закрывает соединение с сервером."""
-        self.connection.disconnect()
+        """Закрывает соединение с сервером (или все соединения пула)."""
+        if self._auto_pipeline is not None:
+            self._auto_pipeline.close()
+            self._auto_pipeline = None
+        if self.connection_pool is not None:
+            self.connection_pool.disconnect()
+        elif self.connection is not None:
+            self.connection.disconnect()
 
     def __enter__(self):
         """Поддержка контекстного менеджера."""
@@ -301,3 +639,21 @@ class Client:
         """Автоматическое закрытие соединения."""
         self.close()
         return False
+
+
+def client_for_address(address: str, client_kwargs: Dict[str, Any]) -> Client:
+    """
+    Создаёт клиент узла по адресу `host:port` (для шардированного
+    клиента и клиента с репликами).
+
+    Args:
+        address: Адрес узла `host:port`
+        client_kwargs: Остальные параметры `Client`
+
+    Raises:
+        ValueError: Адрес не имеет вида host:port
+    """
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Ожидался адрес узла вида host:port, получено {address!r}")
+    return Client(host=host, port=int(port), **client_kwargs)
@@ -0,0 +1,650 @@
+from abc import ABC, abstractmethod
+from functools import partial
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from zumic.encoder import CommandTemplate, EncodableT
+from zumic.exceptions import NoScriptError
+from zumic.scripting import Script
+from zumic.serialization import ValueCodec, decode_values
+
+# Что возвращает каждая команда: ответ сервера у Client, сам конвейер у
+# Pipeline, корутина у AsyncClient. Тип результата конкретной команды
+# (после постобработки) указан в её docstring.
+ResponseT = TypeVar("ResponseT")
+
+# Сколько ключей отправляется в одной команде MGET/MSET/DEL
+DEFAULT_CHUNK_SIZE = 1000
+
+# Команда группы: аргументы, постобработка ответа и параметры чтения ответа
+BatchCommand = Tuple[
+    Tuple[EncodableT, ...], Optional[Callable[[Any], Any]], Dict[str, Any]
+]
+
+T = TypeVar("T")
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Разбивает последовательность на списки длиной не больше `size`."""
+    if size < 1:
+        raise ValueError("Размер части должен быть положительным")
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _is_ok(response: Any) -> bool:
+    return response == "OK" or response == b"OK"
+
+
+def set_options(options: Mapping[str, Any]) -> List[EncodableT]:
+    """Аргументы SET после значения для параметров `ex`, `px`, `nx`, `xx`."""
+    args: List[EncodableT] = []
+    if "ex" in options:
+        args += ["EX", int(options["ex"])]
+    if "px" in options:
+        args += ["PX", int(options["px"])]
+    if options.get("nx"):
+        args.append("NX")
+    if options.get("xx"):
+        args.append("XX")
+    return args
+
+
+def _is_pong(response: Any) -> bool:
+    return response == "PONG" or response == b"PONG"
+
+
+def _equals(expected: str) -> Callable[[Any], bool]:
+    """Сравнение ответа со строкой, не зависящее от декодирования ответов."""
+    encoded = expected.encode("utf-8")
+    return lambda response: response == expected or response == encoded
+
+
+def _as_list(response: Any) -> List[Any]:
+    return response if isinstance(response, list) else []
+
+
+def _parse_scan(response: Any) -> Tuple[int, List[Any]]:
+    """Разбирает ответ SCAN: [курсор, [ключи...]]."""
+    if not isinstance(response, list) or len(response) != 2:
+        return 0, []
+    cursor, keys = response
+    return int(cursor), _as_list(keys)
+
+
+def _scan_args(
+    cursor: int, match: Optional[str], count: Optional[int]
+) -> List[EncodableT]:
+    args: List[EncodableT] = ["SCAN", cursor]
+    if match is not None:
+        args += ["MATCH", match]
+    if count is not None:
+        args += ["COUNT", count]
+    return args
+
+
+def _flatten(parts: List[Any]) -> List[Any]:
+    return [item for part in parts for item in part]
+
+
+def _all_true(parts: List[Any]) -> bool:
+    return all(parts)
+
+
+def _as_bools(response: Any) -> List[bool]:
+    return [bool(item) for item in _as_list(response)]
+
+
+class CoreCommands(ABC, Generic[ResponseT]):
+    """
+    Команды Zumic, общие для клиента и конвейера.
+
+    Каждая команда формирует аргументы и передаёт их в `execute_command`
+    вместе с функцией постобработки ответа и возвращает ровно то, что вернул
+    `execute_command`. Клиент выполняет команду сразу, а конвейер ставит её
+    в очередь и применяет постобработку при `execute()`.
+    """
+
+    # Кодек значений set/get/mset/mget (None - значения передаются как есть)
+    codec: Optional[ValueCodec] = None
+    decode_responses: bool = True
+
+    @abstractmethod
+    def execute_command(
+        self,
+        *args: EncodableT,
+        callback: Optional[Callable[[Any], Any]] = None,
+        **options: Any,
+    ) -> ResponseT:
+        """
+        Выполняет (или ставит в очередь) команду.
+
+        Args:
+            *args: Аргументы команды
+            callback: Функция постобработки ответа сервера
+            **options: Параметры чтения ответа (например, `decode`)
+        """
+
+    @abstractmethod
+    def _local_result(self, value: Any) -> ResponseT:
+        """
+        Возвращает результат, не требующий обращения к серверу, в той же
+        форме, что и `execute_command` (значение, конвейер или корутина).
+        """
+
+    @abstractmethod
+    def _execute_batch(
+        self, commands: List[BatchCommand], combine: Callable[[List[Any]], Any]
+    ) -> ResponseT:
+        """
+        Выполняет несколько команд подряд (одной записью в сокет) и сводит
+        их результаты в один функцией `combine`.
+
+        Args:
+            commands: Тройки (аргументы, постобработка ответа, параметры
+                чтения ответа)
+            combine: Функция, получающая список результатов команд
+        """
+
+    def prepare(
+        self,
+        name: str,
+        nargs: Optional[int] = None,
+        callback: Optional[Callable[[Any], Any]] = None,
+    ) -> Callable[..., ResponseT]:
+        """
+        Готовит команду для многократного вызова с разными аргументами.
+
+        Имя команды и заголовок кодируются один раз, поэтому каждый вызов
+        упаковывает только аргументы.
+
+        Args:
+            name: Имя команды
+            nargs: Число аргументов после имени (если оно постоянно)
+            callback: Функция постобработки ответа
+
+        Returns:
+            Функция, принимающая аргументы команды
+        """
+        return partial(
+            self.execute_command, CommandTemplate(name, nargs), callback=callback
+        )
+
+    def ping(self, message: Optional[str] = None) -> ResponseT:
+        """
+        Проверяет соединение с сервером.
+
+        Args:
+            message: Опциональное сообщение
+
+        Returns:
+            "PONG" или переданное сообщение
+        """
+        if message is not None:
+            return self.execute_command("PING", message, callback=_equals(message))
+        return self.execute_command("PING", callback=_is_pong)
+
+    def set(self, key: str, value: Any, **kwargs) -> ResponseT:
+        """
+        Устанавливает значение ключа.
+
+        Args:
+            key: Ключ
+            value: Значение (с кодеком - любой сериализуемый объект)
+            **kwargs: Дополнительные параметры (EX, PX, NX, XX)
+
+        Returns:
+            True если операция успешна
+        """
+        if self.codec is not None:
+            value = self.codec.encode(value)
+        return self.execute_command(
+            "SET", key, value, *set_options(kwargs), callback=_is_ok
+        )
+
+    def get(self, key: str, decode: Optional[bool] = None) -> ResponseT:
+        """
+        Получает значение ключа.
+
+        Args:
+            key: Ключ
+            decode: Декодировать значение в строку; False - вернуть bytes
+                (None - настройка клиента)
+
+        Returns:
+            Значение ключа или None если ключ не найден
+        """
+        codec = self.codec
+        if codec is None:
+            return self.execute_command("GET", key, decode=decode)
+        # Закодированные значения читаются байтами и разбираются кодеком
+        text = self.decode_responses if decode is None else decode
+        return self.execute_command(
+            "GET", key, callback=partial(codec.decode, text=text), decode=False
+        )
+
+    def delete(self, *keys: str) -> ResponseT:
+        """
+        Удаляет один или несколько ключей.
+
+        Args:
+            *keys: Ключи для удаления
+
+        Returns:
+            True если хотя бы один ключ удалён, иначе False
+        """
+        if not keys:
+            return self._local_result(False)
+        return self.execute_command("DEL", *keys, callback=bool)
+
+    def exists(self, *keys: str) -> ResponseT:
+        """
+        Проверяет существование ключей.
+
+        Args:
+            *keys: Ключи для проверки
+
+        Returns:
+            True если хотя бы один ключ существует
+        """
+        if not keys:
+            return self._local_result(False)
+        return self.execute_command("EXISTS", *keys, callback=bool)
+
+    def delete_count(self, *keys: str) -> ResponseT:
+        """
+        Удаляет ключи и возвращает их количество.
+
+        Args:
+            *keys: Ключи для удаления
+
+        Returns:
+            Количество удалённых ключей
+        """
+        if not keys:
+            return self._local_result(0)
+        return self.execute_command("DEL", *keys)
+
+    def exists_count(self, *keys: str) -> ResponseT:
+        """
+        Считает существующие ключи (повторы учитываются каждый раз).
+
+        Args:
+            *keys: Ключи для проверки
+
+        Returns:
+            Количество существующих ключей
+        """
+        if not keys:
+            return self._local_result(0)
+        return self.execute_command("EXISTS", *keys)
+
+    def mget(
+        self, keys: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> ResponseT:
+        """
+        Получает значения многих ключей.
+
+        Ключи разбиваются на команды MGET не длиннее `chunk_size`, которые
+        отправляются подряд одной записью в сокет.
+
+        Args:
+            keys: Ключи (любой итерируемый объект)
+            chunk_size: Максимальное число ключей в одной команде
+
+        Returns:
+            Значения в порядке ключей (None для отсутствующих)
+        """
+        callback: Callable[[Any], List[Any]] = _as_list
+        options: Dict[str, Any] = {}
+        if self.codec is not None:
+            callback = partial(decode_values, self.codec, self.decode_responses)
+            options = {"decode": False}
+        commands: List[BatchCommand] = [
+            (("MGET", *chunk), callback, options) for chunk in chunked(keys, chunk_size)
+        ]
+        return self._execute_batch(commands, _flatten)
+
+    def mset(
+        self,
+        mapping: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> ResponseT:
+        """
+        Устанавливает значения многих ключей.
+
+        Пары разбиваются на команды MSET не длиннее `chunk_size` ключей.
+        Атомарность гарантируется только в пределах одной части.
+
+        Args:
+            mapping: Словарь или последовательность пар (ключ, значение)
+            chunk_size: Максимальное число ключей в одной команде
+
+        Returns:
+            True если все части записаны успешно
+        """
+        items = mapping.items() if isinstance(mapping, Mapping) else mapping
+        codec = self.codec
+        commands: List[BatchCommand] = []
+        for chunk in chunked(items, chunk_size):
+            args: List[EncodableT] = ["MSET"]
+            for key, value in chunk:
+                args += [key, value if codec is None else codec.encode(value)]
+            commands.append((tuple(args), _is_ok, {}))
+        return self._execute_batch(commands, _all_true)
+
+    def mdel(
+        self, keys: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> ResponseT:
+        """
+        Удаляет многие ключи частями не длиннее `chunk_size`.
+
+        Args:
+            keys: Ключи (любой итерируемый объект)
+            chunk_size: Максимальное число ключей в одной команде
+
+        Returns:
+            Количество удалённых ключей
+        """
+        commands: List[BatchCommand] = [
+            (("DEL", *chunk), None, {}) for chunk in chunked(keys, chunk_size)
+        ]
+        return self._execute_batch(commands, sum)
+
+    def keys(self, pattern: str = "*") -> ResponseT:
+        """
+        Возвращает список ключей по шаблону.
+
+        KEYS блокирует сервер на время обхода всего пространства ключей
+        и собирает весь список в памяти клиента; для больших баз
+        используйте `scan_iter`.
+
+        Args:
+            pattern: Шаблон поиска
+
+        Returns:
+            Возвращает список ключей по шаблону.
+        """
+        return self.execute_command("KEYS", pattern, callback=_as_list)
+
+    def scan(
+        self,
+        cursor: int = 0,
+        match: Optional[str] = None,
+        count: Optional[int] = None,
+    ) -> ResponseT:
+        """
+        Выполняет один шаг обхода пространства ключей.
+
+        Args:
+            cursor: Курсор из предыдущего шага (0 - начать обход)
+            match: Шаблон ключей
+            count: Подсказка серверу о размере порции
+
+        Returns:
+            Пару (следующий курсор, ключи); курсор 0 означает конец обхода
+        """
+        return self.execute_command(
+            *_scan_args(cursor, match, count), callback=_parse_scan
+        )
+
+    def ttl(self, key: str) -> ResponseT:
+        """
+        Возвращает время жизни ключа в секундах.
+
+        Args:
+            key: Ключ
+
+        Returns:
+            Время жизни в секундах (-1 если ключ постоянный, -2 если не существует)
+        """
+        return self.execute_command("TTL", key)
+
+    def expire(self, key: str, seconds: int) -> ResponseT:
+        """
+        Устанавливает время жизни ключа.
+
+        Args:
+            key: Ключ
+            seconds: Время жизни в секундах
+
+        Returns:
+            True если операция успешна
+        """
+        return self.execute_command("EXPIRE", key, seconds, callback=bool)
+
+    def type(self, key: str) -> ResponseT:
+        """
+        Возвращает тип значения ключа.
+
+        Args:
+            key: Ключ
+
+        Returns:
+            Тип значения
+        """
+        return self.execute_command("TYPE", key)
+
+    # Команды для работы со строками.
+    def incr(self, key: str) -> ResponseT:
+        """
+        Увеличивает значение ключа на 1.
+
+        Args:
+            key: Ключ
+
+        Returns:
+            Новое значение
+        """
+        return self.execute_command("INCR", key)
+
+    def decr(self, key: str) -> ResponseT:
+        """
+        Уменьшает значение ключа на 1.
+
+        Args:
+            key: Ключ
+
+        Returns:
+            Новое значение
+        """
+        return self.execute_command("DECR", key)
+
+    def incrby(self, key: str, amount: int) -> ResponseT:
+        """
+        Увеличивает значение ключа на указанное количество.
+
+        Args:
+            key: Ключ
+            amount: Количество для увеличения
+
+        Returns:
+            Новое значение
+        """
+        return self.execute_command("INCRBY", key, amount)
+
+    def decrby(self, key: str, amount: int) -> ResponseT:
+        """
+        Уменьшает значение ключа на указанное количество.
+
+        Args:
+            key: Ключ
+            amount: Количество для уменьшения
+
+        Returns:
+            Новое значение
+        """
+        return self.execute_command("DECRBY", key, amount)
+
+    def append(self, key: str, value: str) -> ResponseT:
+        """
+        Добавляет строку к значению ключа.
+
+        Args:
+            key: Ключ
+            value: Строка для добавления
+
+        Returns:
+            Новая длина строки
+        """
+        return self.execute_command("APPEND", key, value)
+
+    def strlen(self, key: str) -> ResponseT:
+        """
+        Возвращает длину строки.
+
+        Args:
+            key: Ключ
+
+        Returns:
+            Длина строки
+        """
+        return self.execute_command("STRLEN", key)
+
+    # Скрипты
+    def eval(
+        self,
+        script: Union[str, bytes],
+        keys: Sequence[EncodableT] = (),
+        args: Sequence[EncodableT] = (),
+    ) -> ResponseT:
+        """
+        Выполняет скрипт, передавая его текст целиком.
+
+        Args:
+            script: Текст скрипта
+            keys: Ключи, с которыми работает скрипт (KEYS)
+            args: Остальные аргументы (ARGV)
+
+        Returns:
+            Результат скрипта
+        """
+        return self.execute_command("EVAL", script, len(keys), *keys, *args)
+
+    def evalsha(
+        self,
+        sha: str,
+        keys: Sequence[EncodableT] = (),
+        args: Sequence[EncodableT] = (),
+    ) -> ResponseT:
+        """
+        Выполняет скрипт из кэша сервера по его SHA1.
+
+        Args:
+            sha: SHA1 текста скрипта
+            keys: Ключи, с которыми работает скрипт (KEYS)
+            args: Остальные аргументы (ARGV)
+
+        Returns:
+            Результат скрипта
+
+        Raises:
+            NoScriptError: Скрипта нет в кэше сервера
+        """
+        return self.execute_command("EVALSHA", sha, len(keys), *keys, *args)
+
+    def script_load(self, script: Union[str, bytes]) -> ResponseT:
+        """
+        Загружает скрипт в кэш сервера, не выполняя его.
+
+        Args:
+            script: Текст скрипта
+
+        Returns:
+            SHA1 скрипта
+        """
+        return self.execute_command("SCRIPT", "LOAD", script, decode=True)
+
+    def script_exists(self, *shas: str) -> ResponseT:
+        """
+        Проверяет, есть ли скрипты в кэше сервера.
+
+        Args:
+            *shas: SHA1 скриптов
+
+        Returns:
+            Список bool в порядке `shas`
+        """
+        return self.execute_command("SCRIPT", "EXISTS", *shas, callback=_as_bools)
+
+    def script_flush(self) -> ResponseT:
+        """
+        Очищает кэш скриптов сервера.
+
+        Returns:
+            True если операция успешна
+        """
+        return self.execute_command("SCRIPT", "FLUSH", callback=_is_ok)
+
+    def register_script(self, source: Union[str, bytes]) -> Script:
+        """
+        Регистрирует скрипт для многократного вызова по SHA1
+        (см. `zumic.scripting.Script`).
+
+        Args:
+            source: Текст скрипта
+
+        Returns:
+            Вызываемый объект `script(keys=..., args=..., client=None)`
+        """
+        return Script(self, source)
+
+    def _run_script(
+        self, script: Script, keys: Sequence[EncodableT], args: Sequence[EncodableT]
+    ) -> ResponseT:
+        """
+        Выполняет скрипт по SHA1, а если его нет в кэше сервера - через
+        EVAL. Асинхронный клиент и конвейер переопределяют этот метод.
+        """
+        try:
+            return self.evalsha(script.sha, keys, args)
+        except NoScriptError:
+            # Кэш скриптов сервера пуст (перезапуск, SCRIPT FLUSH): EVAL
+            # выполняет скрипт и заново кэширует его
+            return self.eval(script.source, keys, args)
+
+    # Служебные методы
+    def flushdb(self) -> ResponseT:
+        """
+        Очищает текущую базу данных.
+
+        Returns:
+            True если операция успешна
+        """
+        return self.execute_command("FLUSHDB", callback=_is_ok)
+
+    def flushall(self) -> ResponseT:
+        """
+        Очищает все базы данных.
+
+        Returns:
+            True если операция успешна
+        """
+        return self.execute_command("FLUSHALL", callback=_is_ok)
+
+    def dbsize(self) -> ResponseT:
+        """
+        Возвращает количество ключей в базе данных.
+
+        Returns:
+            Количество ключей
+        """
+        return self.execute_command("DBSIZE")
@@ -1,39 +1,282 @@
-from typing import Optional, Union, cast
+from array import array
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NoReturn,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+import select
 import socket
+import threading
+import time
 
-from zumic.exceptions import ConnectionError, InvalidResponse, ResponseError
+from zumic.encoder import (
+    BufferT,
+    EncodableT,
+    pack_command,
+    pack_command_buffers,
+    pack_commands_buffers,
+    pack_stream_command,
+)
+from zumic.exceptions import (
+    ConnectionError,
+    DataError,
+    InvalidResponse,
+    ResponseError,
+    TimeoutError,
+)
+from zumic.instrumentation import IOCounters
+from zumic.parser import ZSPParser
+from zumic.retry import Retry
+from zumic.timeouts import effective_timeout
 
-CRLF = b"\r\n"
+
+# Ограничение числа буферов в одном вызове sendmsg (IOV_MAX в Linux)
+_IOV_MAX = 1024
+
+AddrInfo = Tuple[socket.AddressFamily, socket.SocketKind, int, str, Any]
+
+# Кэш разрешения имён: (host, port) -> (момент устаревания, адреса)
+_DNS_CACHE: Dict[Tuple[str, int], Tuple[float, Sequence[AddrInfo]]] = {}
+_DNS_LOCK = threading.Lock()
+
+
+def resolve_address(
+    host: str, port: int, cache_ttl: Optional[float] = None
+) -> Sequence[AddrInfo]:
+    """
+    Разрешает адрес сервера в список адресов для подключения по TCP.
+
+    Args:
+        host: Имя или IP-адрес сервера
+        port: Порт сервера
+        cache_ttl: Сколько секунд хранить результат в общем кэше процесса
+            (None - не кэшировать)
+
+    Raises:
+        OSError: Имя не удалось разрешить
+    """
+    if cache_ttl is None:
+        return socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+
+    now = time.monotonic()
+    key = (host, port)
+    with _DNS_LOCK:
+        cached = _DNS_CACHE.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    with _DNS_LOCK:
+        _DNS_CACHE[key] = (now + cache_ttl, infos)
+    return infos
+
+
+def clear_dns_cache() -> None:
+    """Очищает кэш разрешения имён."""
+    with _DNS_LOCK:
+        _DNS_CACHE.clear()
 
 
 class Connection:
     def __init__(
-        self, host: str = "localhost", port: int = 6174, timeout: Optional[float] = None
+        self,
+        host: str = "localhost",
+        port: int = 6174,
+        timeout: Optional[float] = None,
+        socket_read_size: int = 65536,
+        decode_responses: bool = True,
+        encoding: str = "utf-8",
+        encoding_errors: str = "replace",
+        unix_socket_path: Optional[str] = None,
+        socket_connect_timeout: Optional[float] = None,
+        tcp_nodelay: bool = True,
+        socket_keepalive: bool = False,
+        socket_keepalive_options: Optional[Mapping[int, int]] = None,
+        send_buffer_size: Optional[int] = None,
+        receive_buffer_size: Optional[int] = None,
+        dns_cache_ttl: Optional[float] = None,
+        retry: Optional[Retry] = None,
     ):
+        """
+        Args:
+            host: Адрес сервера
+            port: Порт сервера
+            timeout: Таймаут операций чтения и записи
+            socket_read_size: Размер порции чтения из сокета
+            decode_responses: Декодировать ответы в строки (иначе - bytes)
+            encoding: Кодировка строк ответа
+            encoding_errors: Политика обработки ошибок декодирования
+            unix_socket_path: Путь к Unix-сокету сервера; если задан,
+                `host` и `port` не используются
+            socket_connect_timeout: Таймаут установки соединения
+                (None - совпадает с `timeout`)
+            tcp_nodelay: Отключить алгоритм Нейгла, чтобы небольшие
+                команды уходили без задержки
+            socket_keepalive: Включить SO_KEEPALIVE
+            socket_keepalive_options: Параметры keepalive вида
+                `{socket.TCP_KEEPIDLE: 60, ...}`
+            send_buffer_size: Размер буфера отправки сокета (SO_SNDBUF)
+            receive_buffer_size: Размер буфера приёма сокета (SO_RCVBUF)
+            dns_cache_ttl: Сколько секунд кэшировать разрешение имени
+                сервера (None - разрешать при каждом подключении)
+            retry: Политика повторов установки соединения (None - одна
+                попытка)
+        """
         self.host = host
         self.port = port
         self.timeout = timeout
+        self.unix_socket_path = unix_socket_path
+        self.socket_connect_timeout = (
+            socket_connect_timeout if socket_connect_timeout is not None else timeout
+        )
+        self.tcp_nodelay = tcp_nodelay
+        self.socket_keepalive = socket_keepalive
+        self.socket_keepalive_options = dict(socket_keepalive_options or {})
+        self.send_buffer_size = send_buffer_size
+        self.receive_buffer_size = receive_buffer_size
+        self.dns_cache_ttl = dns_cache_ttl
+        self.retry = retry
         self._sock: Optional[socket.socket] = None
+        # Текущий таймаут сокета: меняется, только если его сокращает
+        # бюджет времени команды (`zumic.timeouts.deadline`)
+        self._sock_timeout: Optional[float] = None
         self._connected = False
+        # Счётчики ввода-вывода включаются только по запросу наблюдателя
+        self.counters: Optional[IOCounters] = None
+        self._parser = ZSPParser(
+            self.receive,
+            self.receive_into,
+            socket_read_size,
+            decode_responses=decode_responses,
+            encoding=encoding,
+            encoding_errors=encoding_errors,
+        )
 
     def connect(self):
         """Устанавливает соединение с сервером."""
         if self._connected and self._sock:
             return
 
+        if self.retry is None:
+            sock = self._open_socket()
+        else:
+            sock = self.retry.call_with_retry(self._open_socket)
+        self._sock = sock
+        self._sock_timeout = self.timeout
+        self._connected = True
+        # Остатки ответов от предыдущего сокета к новому не относятся
+        self._parser.purge()
+
+    def _open_socket(self) -> socket.socket:
         try:
-            self._sock = socket.create_connection(
-                (self.host, self.port), timeout=self.timeout
-            )
-            self._connected = True
+            if self.unix_socket_path is not None:
+                return self._connect_unix()
+            return self._connect_tcp()
+        except socket.timeout as e:
+            raise TimeoutError(f"Истекло время подключения к {self.address}") from e
         except OSError as e:
-            raise ConnectionError(
-                f"Не удалось подключиться к {self.host}:{self.port}"
-            ) from e
+            raise ConnectionError(f"Не удалось подключиться к {self.address}") from e
+
+    def check_health(self, ping: bool = True) -> bool:
+        """
+        Проверяет, что соединение живо, и закрывает его, если нет.
+
+        Сначала без блокировки проверяется, не закрыл ли сервер сокет
+        и не осталось ли в нём непрочитанных данных; затем, если `ping`,
+        выполняется PING.
+
+        Returns:
+            True, если соединением можно пользоваться
+        """
+        sock = self._sock
+        if not self._connected or sock is None:
+            return False
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+            # Простаивающий сокет не должен быть читаемым: это либо EOF,
+            # либо чужой недочитанный ответ
+            healthy = not readable and not self._parser.buffered
+            if healthy and ping:
+                self.send_command("PING")
+                healthy = self.read_response() in ("PONG", b"PONG")
+        except (OSError, ValueError, ConnectionError, InvalidResponse, ResponseError):
+            healthy = False
+        if not healthy:
+            self.disconnect()
+        return healthy
+
+    @property
+    def address(self) -> str:
+        """Адрес сервера для сообщений об ошибках."""
+        if self.unix_socket_path is not None:
+            return f"unix://{self.unix_socket_path}"
+        return f"{self.host}:{self.port}"
+
+    def _connect_unix(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._configure_buffers(sock)
+            sock.settimeout(effective_timeout(self.socket_connect_timeout))
+            sock.connect(cast(str, self.unix_socket_path))
+            sock.settimeout(self.timeout)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    def _connect_tcp(self) -> socket.socket:
+        """Подключается к первому доступному адресу сервера."""
+        error: Optional[OSError] = None
+        for family, kind, proto, _, sockaddr in resolve_address(
+            self.host, self.port, self.dns_cache_ttl
+        ):
+            sock = socket.socket(family, kind, proto)
+            try:
+                # Размеры буферов задаются до connect, чтобы учесться
+                # при согласовании окна TCP
+                self._configure_buffers(sock)
+                sock.settimeout(effective_timeout(self.socket_connect_timeout))
+                sock.connect(sockaddr)
+                sock.settimeout(self.timeout)
+                self._configure_tcp(sock)
+                return sock
+            except OSError as e:
+                error = e
+                sock.close()
+        raise error or OSError(f"Не найдено адресов для {self.host}")
+
+    def _configure_buffers(self, sock: socket.socket) -> None:
+        if self.send_buffer_size is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size)
+        if self.receive_buffer_size is not None:
+            sock.setsockopt(
+                socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer_size
+            )
+
+    def _configure_tcp(self, sock: socket.socket) -> None:
+        if self.tcp_nodelay:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.socket_keepalive:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for option, value in self.socket_keepalive_options.items():
+                sock.setsockopt(socket.IPPROTO_TCP, option, value)
 
     def disconnect(self):
         """Закрывает соединение с сервером."""
         if self._sock:
+            try:
+                # shutdown будит поток, заблокированный в recv на этом сокете
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
             try:
                 self._sock.close()
             except socket.error:
@@ -41,26 +284,147 @@ class Connection:
             finally:
                 self._sock = None
                 self._connected = False
+        self._parser.purge()
+
+    def enable_counters(self) -> IOCounters:
+        """Включает счётчики байт и времени ввода-вывода."""
+        if self.counters is None:
+            self.counters = IOCounters()
+        return self.counters
 
     def is_connected(self) -> bool:
         """Проверяет, активно ли соединение."""
         return self._connected and self._sock is not None
 
-    def send(self, data: bytes):
+    def send(self, data: BufferT):
         """Отправляет данные на сервер."""
         if not self.is_connected():
             self.connect()
 
         # Приводим тип, чтобы Pyright понял, что это не None
         sock = cast(socket.socket, self._sock)
+        self._apply_timeout(sock)
         try:
             sock.sendall(data)
+        except socket.timeout as e:
+            self._timed_out(e)
+        except socket.error as e:
+            self._connected = False
+            raise ConnectionError("Ошибка отправки данных") from e
+        if self.counters is not None:
+            self.counters.bytes_written += memoryview(data).nbytes
+
+    def send_buffers(self, buffers: Sequence[BufferT]):
+        """
+        Отправляет несколько буферов на сервер одной векторной записью.
+
+        Если сокет поддерживает `sendmsg`, буферы передаются ядру без
+        предварительной склейки (scatter/gather), иначе - по очереди.
+        """
+        if len(buffers) == 1:
+            return self.send(buffers[0])
+
+        if not self.is_connected():
+            self.connect()
+
+        sock = cast(socket.socket, self._sock)
+        self._apply_timeout(sock)
+        try:
+            if hasattr(sock, "sendmsg"):
+                self._sendmsg_all(sock, buffers)
+            else:
+                for data in buffers:
+                    sock.sendall(data)
+        except socket.timeout as e:
+            self._timed_out(e)
         except socket.error as e:
             self._connected = False
             raise ConnectionError("Ошибка отправки данных") from e
+        if self.counters is not None:
+            self.counters.bytes_written += sum(memoryview(b).nbytes for b in buffers)
+
+    @staticmethod
+    def _sendmsg_all(sock: socket.socket, buffers: Sequence[BufferT]) -> None:
+        """Отправляет все буферы через sendmsg, дописывая частичные записи."""
+        views: List[memoryview] = [memoryview(data) for data in buffers]
+        index = 0
+        while index < len(views):
+            sent = sock.sendmsg(views[index : index + _IOV_MAX])
+            # Пропускаем полностью отправленные буферы и обрезаем частичный
+            while sent:
+                size = views[index].nbytes
+                if sent >= size:
+                    sent -= size
+                    index += 1
+                else:
+                    views[index] = views[index][sent:]
+                    sent = 0
 
     def receive(self, bufsize: int = 4096) -> bytes:
         """Получает данные от сервера."""
+        sock = self._require_socket()
+        self._apply_timeout(sock)
+        counters = self.counters
+        try:
+            if counters is None:
+                data = sock.recv(bufsize)
+            else:
+                started = time.perf_counter()
+                data = sock.recv(bufsize)
+                counters.wait_time += time.perf_counter() - started
+                counters.bytes_read += len(data)
+        except socket.timeout as e:
+            self._timed_out(e)
+        except socket.error as e:
+            self._connected = False
+            raise ConnectionError("Ошибка получения данных") from e
+        if not data:
+            self._connected = False
+            raise ConnectionError("Соединение закрыто сервером")
+        return data
+
+    def receive_into(self, buffer: memoryview) -> int:
+        """Читает данные от сервера прямо в переданный буфер."""
+        sock = self._require_socket()
+        self._apply_timeout(sock)
+        counters = self.counters
+        try:
+            if counters is None:
+                nbytes = sock.recv_into(buffer)
+            else:
+                started = time.perf_counter()
+                nbytes = sock.recv_into(buffer)
+                counters.wait_time += time.perf_counter() - started
+                counters.bytes_read += nbytes
+        except socket.timeout as e:
+            self._timed_out(e)
+        except socket.error as e:
+            self._connected = False
+            raise ConnectionError("Ошибка получения данных") from e
+        if not nbytes:
+            self._connected = False
+            raise ConnectionError("Соединение закрыто сервером")
+        return nbytes
+
+    def _apply_timeout(self, sock: socket.socket) -> None:
+        """Сокращает таймаут сокета до оставшегося бюджета времени команды."""
+        try:
+            timeout = effective_timeout(self.timeout)
+        except TimeoutError:
+            # Ответ мог остаться недочитанным: соединение больше непригодно
+            self.disconnect()
+            raise
+        if timeout != self._sock_timeout:
+            sock.settimeout(timeout)
+            self._sock_timeout = timeout
+
+    def _timed_out(self, error: OSError) -> NoReturn:
+        """Закрывает соединение после таймаута операции с сокетом."""
+        self.disconnect()
+        raise TimeoutError("Истекло время ожидания сервера") from error
+
+    def _require_socket(self) -> socket.socket:
+        """Возвращает активный сокет или бросает ConnectionError."""
         if not self.is_connected():
             raise ConnectionError("Нет активного соединения")
 
@@ -69,82 +433,132 @@ class Connection:
             # На всякий случай, хотя is_connected уже гарантирует, что сокет есть
             self._connected = False
             raise ConnectionError("Нет активного соединения")
+        return self._sock
 
-        try:
-            data = self._sock.recv(bufsize)
-            if not data:
-                self._connected = False
-                raise ConnectionError("Соединение закрыто сервером")
-            return data
-        except socket.error as e:
-            self._connected = False
-            raise ConnectionError("Ошибка получения данных") from e
-
-    def pack_command(self, *args: Union[str, bytes]) -> bytes:
+    def pack_command(self, *args: EncodableT) -> bytes:
         """Упаковывает команду в Zumic-протокол (ZSP)."""
-        parts = []
-        parts.append(f"*{len(args)}".encode("utf-8") + CRLF)
-
-        for arg in args:
-            if isinstance(arg, str):
-                arg = arg.encode("utf-8")
-            parts.append(f"${len(arg)}".encode("utf-8") + CRLF)
-            parts.append(arg + CRLF)
+        return pack_command(*args)
 
-        return b"".join(parts)
+    def send_command(self, *args: EncodableT):
+        """
+        Отправляет команду на сервер.
 
-    def send_command(self, *args: Union[str, bytes]):
-        """Отправляет команду на сервер."""
+        Большие значения не копируются при упаковке, а передаются в сокет
+        отдельными буферами.
+        """
         if not args:
             raise ValueError("Команда не может быть пустой")
 
-        packed = self.pack_command(*args)
-        self.send(packed)
+        if self.counters is None:
+            self.send_buffers(pack_command_buffers(*args))
+            return
+        started = time.perf_counter()
+        buffers = pack_command_buffers(*args)
+        self.counters.encode_time += time.perf_counter() - started
+        self.send_buffers(buffers)
 
-    def read_response(self) -> Union[str, int, None]:
-        """Читает ответ от сервера."""
-        response = self.receive()
-        if not response:
-            raise InvalidResponse("Пустой ответ от сервера")
+    def send_commands(self, commands: Iterable[Sequence[EncodableT]]):
+        """Отправляет несколько команд на сервер одной записью в сокет."""
+        if self.counters is None:
+            self.send_buffers(pack_commands_buffers(commands))
+            return
+        started = time.perf_counter()
+        buffers = pack_commands_buffers(commands)
+        self.counters.encode_time += time.perf_counter() - started
+        self.send_buffers(buffers)
 
-        return self._parse_response(response)
+    def send_command_from(
+        self,
+        head: Sequence[EncodableT],
+        source: IO[bytes],
+        size: int,
+        tail: Sequence[EncodableT] = (),
+    ) -> None:
+        """
+        Отправляет команду, значение которой читается из файла.
 
-    def _parse_response(self, response: bytes) -> Union[str, int, None]:
-        """Парсит ответ сервера согласно RESP протоколу."""
-        if len(response) < 2:
-            raise InvalidResponse("Слишком короткий ответ от сервера")
+        Значение передаётся в сокет через `socket.sendfile`: для обычных
+        файлов - системным вызовом sendfile без копирования в память
+        процесса, для остальных файловых объектов - кусками.
 
-        prefix = response[0:1]
-        payload = response[1:].decode(errors="replace").strip()
+        Args:
+            head: Аргументы до значения (имя команды, ключ)
+            source: Файловый объект, открытый на чтение в двоичном режиме;
+                значение читается с текущей позиции
+            size: Длина значения в байтах
+            tail: Аргументы после значения
 
-        if prefix == b"+":  # Simple String
-            return payload
-        elif prefix == b":":  # Integer
-            try:
-                return int(payload)
-            except ValueError:
-                raise InvalidResponse(f"Некорректное целое число: {payload}")
-        elif prefix == b"$":  # Bulk String
-            try:
-                length = int(payload)
-            except ValueError:
-                raise InvalidResponse(f"Некорректная длина строки: {payload}")
+        Raises:
+            DataError: Источник короче `size`
+            ConnectionError: Ошибка отправки или чтения источника
+        """
+        before, after = pack_stream_command(head, size, tail)
+        if not self.is_connected():
+            self.connect()
+
+        sock = cast(socket.socket, self._sock)
+        self._apply_timeout(sock)
+        try:
+            sock.sendall(before)
+            # sendfile читает с переданного смещения, а не с позиции файла
+            offset = source.tell() if source.seekable() else 0
+            sent = sock.sendfile(source, offset, size) if size else 0
+            if sent == size:
+                sock.sendall(after)
+        except socket.timeout as e:
+            self._timed_out(e)
+        except OSError as e:
+            # Сервер ждёт остаток значения: соединение больше непригодно
+            self.disconnect()
+            raise ConnectionError("Ошибка отправки данных") from e
+        if sent != size:
+            self.disconnect()
+            raise DataError(f"Источник короче заявленного размера ({size} байт)")
+        if self.counters is not None:
+            self.counters.bytes_written += len(before) + size + len(after)
 
-            if length == -1:
-                return None
+    def read_response(self, decode: Optional[bool] = None) -> Any:
+        """
+        Читает один полный ответ от сервера.
 
-            # Читаем данные указанной длины + CRLF
-            data = self.receive(length + 2)
-            if len(data) < length + 2:
-                raise InvalidResponse("Неполные данные от сервера")
+        Данные, пришедшие сверх этого ответа, остаются в буфере соединения
+        и будут разобраны при следующем вызове.
 
-            return data[:-2].decode(errors="replace")
-        elif prefix == b"-":  # Error
-            raise ResponseError(payload)
-        else:
-            raise InvalidResponse(
-                f"Неизвестный префикс: {prefix.decode(errors='replace')}"
-            )
+        Args:
+            decode: Декодировать строки ответа; False - вернуть bytes без
+                какого-либо декодирования (None - настройка соединения)
+        """
+        try:
+            return self._parser.read_response(decode)
+        except InvalidResponse:
+            # После нарушения протокола поток рассинхронизирован — закрываем его
+            self.disconnect()
+            raise
+
+    def read_numeric_array(
+        self, typecode: str = "q", null: float = 0
+    ) -> Optional[array]:
+        """
+        Читает ответ-массив чисел прямо в `array.array`
+        (см. `ZSPParser.read_numeric_array`).
+        """
+        try:
+            return self._parser.read_numeric_array(typecode, null)
+        except InvalidResponse:
+            self.disconnect()
+            raise
+
+    def read_bulk_into(self, target: Union[memoryview, IO[bytes]]) -> Optional[int]:
+        """
+        Читает ответ-строку прямо в буфер или файл (см.
+        `ZSPParser.read_bulk_into`).
+        """
+        try:
+            return self._parser.read_bulk_into(target)
+        except (InvalidResponse, DataError, OSError):
+            # Значение дочитано не до конца
+            self.disconnect()
+            raise
 
     def __enter__(self):
         """Поддержка контекстного менеджера."""
@@ -1,4 +1,6 @@
-from typing import Protocol, Union
+from typing import Any, Iterable, Optional, Protocol, Sequence
+
+from zumic.encoder import EncodableT
 
 
 class ConnectionProtocol(Protocol):
@@ -10,11 +12,15 @@ class ConnectionProtocol(Protocol):
         """Возвращает True, если соединение активно."""
         ...
 
-    def send_command(self, *args: Union[str, bytes]) -> None:
+    def send_command(self, *args: EncodableT) -> None:
         """Упаковывает и отправляет команду на сервер."""
         ...
 
-    def read_response(self) -> Union[str, int, None]:
+    def send_commands(self, commands: Iterable[Sequence[EncodableT]]) -> None:
+        """Упаковывает и отправляет несколько команд одной записью."""
+        ...
+
+    def read_response(self, decode: Optional[bool] = None) -> Any:
         """Читает и возвращает распарсенный ответ сервера."""
         ...
 
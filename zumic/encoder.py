@@ -0,0 +1,208 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+CRLF = b"\r\n"
+
+# Аргументы длиннее этого порога не копируются в общий буфер заголовков,
+# а отправляются отдельными буферами (scatter/gather)
+BUFFER_CUTOFF = 6000
+
+EncodableT = Union[str, bytes, bytearray, memoryview, int, "CommandTemplate"]
+BufferT = Union[bytes, bytearray, memoryview]
+
+# Заранее отформатированные префиксы длин: `$N\r\n` и `*N\r\n`
+_BULK_PREFIXES = [b"$%d\r\n" % size for size in range(1024)]
+_ARRAY_PREFIXES = [b"*%d\r\n" % size for size in range(64)]
+
+# Закодированные имена команд (`$3\r\nSET\r\n`); кэш ограничен, чтобы
+# произвольные первые аргументы не раздували его
+_NAME_CACHE: Dict[str, bytes] = {}
+_NAME_CACHE_SIZE = 512
+_NAME_MAX_LENGTH = 32
+
+
+def _bulk_prefix(size: int) -> bytes:
+    return _BULK_PREFIXES[size] if size < 1024 else b"$%d\r\n" % size
+
+
+def _array_prefix(size: int) -> bytes:
+    return _ARRAY_PREFIXES[size] if size < 64 else b"*%d\r\n" % size
+
+
+def _encode_name(name: str) -> bytes:
+    """Возвращает закодированное имя команды вместе с префиксом длины."""
+    blob = _NAME_CACHE.get(name)
+    if blob is None:
+        data = name.encode("utf-8")
+        blob = _bulk_prefix(len(data)) + data + CRLF
+        if len(_NAME_CACHE) < _NAME_CACHE_SIZE and len(data) <= _NAME_MAX_LENGTH:
+            _NAME_CACHE[name] = blob
+    return blob
+
+
+class CommandTemplate:
+    """
+    Заранее закодированная «форма» команды: имя и число аргументов.
+
+    Передаётся первым аргументом вместо имени команды, например
+    `client.execute(template, key, value)`. Заголовок массива и имя
+    команды кодируются один раз при создании шаблона.
+    """
+
+    __slots__ = ("name", "nargs", "_name_blob", "_size", "_header")
+
+    def __init__(self, name: str, nargs: Optional[int] = None) -> None:
+        """
+        Args:
+            name: Имя команды
+            nargs: Число аргументов после имени; если известно, заголовок
+                `*N` тоже кодируется заранее
+        """
+        if not name:
+            raise ValueError("Имя команды не может быть пустым")
+        self.name = name
+        self.nargs = nargs
+        data = name.encode("utf-8")
+        self._name_blob = _bulk_prefix(len(data)) + data + CRLF
+        self._size = nargs + 1 if nargs is not None else -1
+        self._header = (
+            _array_prefix(self._size) + self._name_blob if nargs is not None else b""
+        )
+
+    def header(self, size: int) -> bytes:
+        """Возвращает заголовок команды из `size` элементов вместе с именем."""
+        if size == self._size:
+            return self._header
+        return _array_prefix(size) + self._name_blob
+
+    def __repr__(self) -> str:
+        return f"CommandTemplate({self.name!r}, nargs={self.nargs!r})"
+
+
+def encode_arg(arg: EncodableT) -> BufferT:
+    """
+    Приводит аргумент команды к байтовому буферу без копирования данных.
+
+    Строки кодируются в UTF-8, целые числа - в десятичную запись,
+    `bytes`/`bytearray` возвращаются как есть, а `memoryview` приводится
+    к плоскому побайтовому представлению (несмежные представления
+    копируются).
+    """
+    if isinstance(arg, str):
+        return arg.encode("utf-8")
+    if isinstance(arg, (bytes, bytearray)):
+        return arg
+    if isinstance(arg, memoryview):
+        if not arg.c_contiguous:
+            # Несмежное представление нельзя передать в сокет как есть
+            return arg.tobytes()
+        if arg.format != "B" or arg.ndim != 1:
+            arg = arg.cast("B")
+        return arg
+    if isinstance(arg, bool):
+        # bool - подкласс int, но "True" в качестве значения почти всегда ошибка
+        raise TypeError("Аргумент типа bool не поддерживается, передайте int или str")
+    if isinstance(arg, int):
+        return b"%d" % arg
+    if isinstance(arg, CommandTemplate):
+        return arg.name.encode("utf-8")
+    raise TypeError(
+        f"Неподдерживаемый тип аргумента: {type(arg).__name__}. "
+        "Ожидались str, bytes, bytearray, memoryview или int"
+    )
+
+
+def pack_commands_buffers(
+    commands: Iterable[Sequence[EncodableT]], buffer_cutoff: int = BUFFER_CUTOFF
+) -> List[BufferT]:
+    """
+    Упаковывает команды в список буферов для векторной записи.
+
+    Заголовки и небольшие аргументы накапливаются в одном буфере, а большие
+    аргументы вставляются в список как есть, без копирования.
+    """
+    buffers: List[BufferT] = []
+    header = bytearray()
+    for args in commands:
+        if not args:
+            raise ValueError("Команда не может быть пустой")
+        name = args[0]
+        if type(name) is str:
+            header += _array_prefix(len(args))
+            header += _encode_name(name)
+        elif type(name) is CommandTemplate:
+            header += name.header(len(args))
+        else:
+            header += _array_prefix(len(args))
+            data = encode_arg(name)
+            header += _bulk_prefix(len(data))
+            header += data
+            header += CRLF
+
+        for index in range(1, len(args)):
+            arg = args[index]
+            # Частые типы проверяются напрямую, без цепочки isinstance
+            kind = type(arg)
+            if kind is str:
+                data = arg.encode()  # type: ignore[union-attr]
+            elif kind is bytes:
+                data = arg  # type: ignore[assignment]
+            elif kind is int:
+                data = b"%d" % arg  # type: ignore[str-format]
+            else:
+                data = encode_arg(arg)
+            # После encode_arg memoryview плоский и побайтовый: len == nbytes
+            size = len(data)
+            header += _bulk_prefix(size)
+            if size > buffer_cutoff:
+                buffers.append(header)
+                buffers.append(data)
+                header = bytearray(CRLF)
+            else:
+                header += data
+                header += CRLF
+    if header:
+        buffers.append(header)
+    return buffers
+
+
+def pack_command_buffers(
+    *args: EncodableT, buffer_cutoff: int = BUFFER_CUTOFF
+) -> List[BufferT]:
+    """Упаковывает одну команду в список буферов для векторной записи."""
+    return pack_commands_buffers([args], buffer_cutoff)
+
+
+def pack_stream_command(
+    head: Sequence[EncodableT], size: int, tail: Sequence[EncodableT] = ()
+) -> Tuple[bytes, bytes]:
+    """
+    Упаковывает команду, значение которой передаётся отдельно потоком.
+
+    Args:
+        head: Аргументы до значения (имя команды, ключ)
+        size: Длина значения в байтах
+        tail: Аргументы после значения
+
+    Returns:
+        Пару (данные до значения, данные после значения): между ними
+        в сокет записываются ровно `size` байт значения
+    """
+    before = bytearray(_array_prefix(len(head) + 1 + len(tail)))
+    for arg in head:
+        data = encode_arg(arg)
+        before += _bulk_prefix(len(data))
+        before += data
+        before += CRLF
+    before += _bulk_prefix(size)
+    after = bytearray(CRLF)
+    for arg in tail:
+        data = encode_arg(arg)
+        after += _bulk_prefix(len(data))
+        after += data
+        after += CRLF
+    return bytes(before), bytes(after)
+
+
+def pack_command(*args: EncodableT) -> bytes:
+    """Упаковывает команду в Zumic-протокол (ZSP)."""
+    return b"".join(pack_command_buffers(*args))
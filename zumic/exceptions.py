@@ -16,12 +16,24 @@ class ConnectionError(ZumicError):
     pass
 
 
+class TimeoutError(ConnectionError):
+    """Истекло время ожидания сервера или бюджет времени команды."""
+
+    pass
+
+
 class ResponseError(ZumicError):
     """Сервер вернул некорректный ответ."""
 
     pass
 
 
+class NoScriptError(ResponseError):
+    """Скрипта с указанным SHA1 нет в кэше скриптов сервера (NOSCRIPT)."""
+
+    pass
+
+
 class InvalidResponse(ZumicError):
     """Ответ сервера невозможно разобрать или он нарушает протокол."""
 
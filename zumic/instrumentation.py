@@ -0,0 +1,344 @@
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any, Deque, Dict, List, Optional, Sequence
+import logging
+import math
+import threading
+import time
+
+from zumic.cache import command_name
+from zumic.encoder import EncodableT
+
+logger = logging.getLogger("zumic.slowlog")
+
+
+@dataclass
+class IOCounters:
+    """
+    Счётчики ввода-вывода соединения.
+
+    Включаются только для соединений инструментированного клиента
+    (`Connection.enable_counters`), поэтому без наблюдателя не стоят ничего.
+    """
+
+    bytes_written: int = 0
+    bytes_read: int = 0
+    encode_time: float = 0.0
+    wait_time: float = 0.0
+
+    def copy(self) -> "IOCounters":
+        return replace(self)
+
+
+@dataclass
+class CommandEvent:
+    """Сведения об одной выполненной команде (или конвейере)."""
+
+    name: str
+    args: Sequence[EncodableT]
+    started: float
+    commands: int = 1
+    encode_time: float = 0.0
+    send_time: float = 0.0
+    wait_time: float = 0.0
+    parse_time: float = 0.0
+    bytes_written: int = 0
+    bytes_read: int = 0
+    error: Optional[BaseException] = None
+    # Аргументы всех команд конвейера (для одиночной команды - None)
+    batch: Optional[Sequence[Sequence[EncodableT]]] = None
+
+    @property
+    def duration(self) -> float:
+        """Полное время выполнения в секундах."""
+        return self.encode_time + self.send_time + self.wait_time + self.parse_time
+
+
+class Observer:
+    """
+    Базовый наблюдатель за командами клиента.
+
+    Переопределите нужные методы. Методы вызываются в потоке, выполняющем
+    команду, и должны быть быстрыми.
+    """
+
+    def before_command(self, name: str, args: Sequence[EncodableT]) -> None:
+        """Вызывается перед отправкой команды."""
+
+    def after_command(self, event: CommandEvent) -> None:
+        """Вызывается после получения ответа или ошибки."""
+
+
+class ObserverGroup(Observer):
+    """Передаёт события нескольким наблюдателям по очереди."""
+
+    def __init__(self, *observers: Observer) -> None:
+        self.observers = list(observers)
+
+    def before_command(self, name: str, args: Sequence[EncodableT]) -> None:
+        for observer in self.observers:
+            observer.before_command(name, args)
+
+    def after_command(self, event: CommandEvent) -> None:
+        for observer in self.observers:
+            observer.after_command(event)
+
+
+class CommandTimer:
+    """
+    Замеряет фазы выполнения команды на одном соединении.
+
+    Время кодирования и ожидания ответа берётся из счётчиков соединения
+    (`IOCounters`); если соединение их не поддерживает, кодирование входит
+    во время отправки, а ожидание - во время разбора.
+    """
+
+    __slots__ = ("observer", "event", "connection", "_before", "_sent_at")
+
+    def __init__(
+        self,
+        observer: Observer,
+        args: Sequence[EncodableT],
+        connection: Any,
+        name: Optional[str] = None,
+        commands: int = 1,
+        batch: Optional[Sequence[Sequence[EncodableT]]] = None,
+    ) -> None:
+        if name is None:
+            name = command_name(args)
+        observer.before_command(name, args)
+        self.observer = observer
+        self.connection = connection
+        enable = getattr(connection, "enable_counters", None)
+        counters: Optional[IOCounters] = enable() if enable is not None else None
+        self._before = counters.copy() if counters is not None else None
+        self.event = CommandEvent(
+            name, args, time.perf_counter(), commands, batch=batch
+        )
+        self._sent_at: Optional[float] = None
+
+    def sent(self) -> None:
+        """Отмечает окончание отправки."""
+        self._sent_at = time.perf_counter()
+
+    def finish(self, error: Optional[BaseException] = None) -> CommandEvent:
+        """Завершает замер и передаёт событие наблюдателю."""
+        now = time.perf_counter()
+        event = self.event
+        event.error = error
+        sent_at = self._sent_at if self._sent_at is not None else now
+        send_total = sent_at - event.started
+        read_total = now - sent_at
+
+        counters: Optional[IOCounters] = getattr(self.connection, "counters", None)
+        before = self._before
+        if counters is not None and before is not None:
+            event.encode_time = min(
+                counters.encode_time - before.encode_time, send_total
+            )
+            event.wait_time = min(counters.wait_time - before.wait_time, read_total)
+            event.bytes_written = counters.bytes_written - before.bytes_written
+            event.bytes_read = counters.bytes_read - before.bytes_read
+        event.send_time = send_total - event.encode_time
+        event.parse_time = read_total - event.wait_time
+        self.observer.after_command(event)
+        return event
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек с логарифмическими корзинами.
+
+    Каждая октава (удвоение задержки) делится на `SUB_BUCKETS` корзин,
+    поэтому относительная погрешность перцентилей не превышает ~19%,
+    а запись значения стоит одного логарифма и одного инкремента.
+    """
+
+    SUB_BUCKETS = 4
+    # Корзины покрывают диапазон от 1 мкс до ~1 ч
+    BUCKETS = 32 * SUB_BUCKETS + 1
+
+    def __init__(self) -> None:
+        self._counts = [0] * self.BUCKETS
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _index(self, seconds: float) -> int:
+        micros = seconds * 1e6
+        if micros < 1:
+            return 0
+        index = int(math.log2(micros) * self.SUB_BUCKETS) + 1
+        return min(index, self.BUCKETS - 1)
+
+    def _upper_bound(self, index: int) -> float:
+        """Верхняя граница корзины в секундах."""
+        return 2 ** (index / self.SUB_BUCKETS) / 1e6
+
+    def record(self, seconds: float) -> None:
+        """Добавляет значение в секундах."""
+        index = self._index(seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Оценивает перцентиль по корзинам.
+
+        Args:
+            fraction: Доля (0.99 - p99)
+
+        Returns:
+            Верхняя граница корзины перцентиля в секундах (не больше max)
+        """
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(math.ceil(fraction * self.count), 1)
+            seen = 0
+            for index, count in enumerate(self._counts):
+                seen += count
+                if seen >= rank:
+                    return min(self._upper_bound(index), self.max)
+            return self.max
+
+    @property
+    def mean(self) -> float:
+        """Средняя задержка в секундах."""
+        return self.total / self.count if self.count else 0.0
+
+    def reset(self) -> None:
+        """Обнуляет гистограмму."""
+        with self._lock:
+            self._counts = [0] * self.BUCKETS
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+
+
+@dataclass
+class CommandStats:
+    """Сводка по одной команде."""
+
+    name: str
+    count: int
+    errors: int
+    bytes_written: int
+    bytes_read: int
+    mean: float
+    p50: float
+    p99: float
+    p999: float
+    max: float
+
+
+class _CommandAggregate:
+    __slots__ = ("histogram", "errors", "bytes_written", "bytes_read")
+
+    def __init__(self) -> None:
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+
+
+class HistogramObserver(Observer):
+    """Собирает гистограммы задержек, байты и ошибки по именам команд."""
+
+    def __init__(self) -> None:
+        self._commands: Dict[str, _CommandAggregate] = {}
+        self._lock = threading.Lock()
+
+    def after_command(self, event: CommandEvent) -> None:
+        aggregate = self._commands.get(event.name)
+        if aggregate is None:
+            with self._lock:
+                aggregate = self._commands.setdefault(event.name, _CommandAggregate())
+        aggregate.histogram.record(event.duration)
+        with self._lock:
+            aggregate.bytes_written += event.bytes_written
+            aggregate.bytes_read += event.bytes_read
+            if event.error is not None:
+                aggregate.errors += 1
+
+    def stats(self) -> Dict[str, CommandStats]:
+        """Возвращает сводку по всем командам."""
+        with self._lock:
+            items = list(self._commands.items())
+        result = {}
+        for name, aggregate in items:
+            histogram = aggregate.histogram
+            result[name] = CommandStats(
+                name=name,
+                count=histogram.count,
+                errors=aggregate.errors,
+                bytes_written=aggregate.bytes_written,
+                bytes_read=aggregate.bytes_read,
+                mean=histogram.mean,
+                p50=histogram.percentile(0.50),
+                p99=histogram.percentile(0.99),
+                p999=histogram.percentile(0.999),
+                max=histogram.max,
+            )
+        return result
+
+    def reset(self) -> None:
+        """Обнуляет все счётчики."""
+        with self._lock:
+            self._commands.clear()
+
+
+class SlowLogObserver(Observer):
+    """
+    Журнал медленных команд на стороне клиента.
+
+    Команды дольше `threshold` секунд сохраняются в кольцевом буфере
+    и пишутся в логгер `zumic.slowlog` с разбивкой по фазам.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.01,
+        max_entries: int = 128,
+        log: Optional[logging.Logger] = logger,
+    ) -> None:
+        """
+        Args:
+            threshold: Порог в секундах
+            max_entries: Сколько последних медленных команд хранить
+            log: Логгер (None - не писать в лог)
+        """
+        self.threshold = threshold
+        self.log = log
+        self._entries: Deque[CommandEvent] = deque(maxlen=max_entries)
+
+    def after_command(self, event: CommandEvent) -> None:
+        if event.duration < self.threshold:
+            return
+        self._entries.append(event)
+        if self.log is not None:
+            self.log.warning(
+                "Медленная команда %s: %.1f мс (кодирование %.1f, отправка %.1f, "
+                "ожидание %.1f, разбор %.1f), записано %d Б, прочитано %d Б%s",
+                event.name,
+                event.duration * 1e3,
+                event.encode_time * 1e3,
+                event.send_time * 1e3,
+                event.wait_time * 1e3,
+                event.parse_time * 1e3,
+                event.bytes_written,
+                event.bytes_read,
+                f", ошибка: {event.error!r}" if event.error is not None else "",
+            )
+
+    def entries(self) -> List[CommandEvent]:
+        """Возвращает сохранённые медленные команды (старые первыми)."""
+        return list(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
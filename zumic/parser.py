@@ -0,0 +1,379 @@
+from array import array
+from typing import IO, Any, Callable, List, Optional, Tuple, Union
+
+from zumic.exceptions import DataError, InvalidResponse, NoScriptError, ResponseError
+
+CRLF = b"\r\n"
+
+# Размер куска, которым bulk-строка перекладывается из сокета в файл
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Виды строк-заголовков, которые возвращает parse_line
+VALUE = 0  # готовое значение (integer, error, null)
+BULK = 1  # далее следует bulk-строка указанной длины
+ARRAY = 2  # далее следует указанное число элементов массива
+STRING = 3  # simple string, ещё не декодированная
+
+# Коды ошибок сервера, для которых есть отдельные исключения
+_ERROR_CLASSES = {"NOSCRIPT": NoScriptError}
+
+
+def _response_error(message: str) -> ResponseError:
+    """Создаёт исключение для ошибки сервера по её коду (первому слову)."""
+    code = message.split(" ", 1)[0]
+    return _ERROR_CLASSES.get(code, ResponseError)(message)
+
+
+def parse_line(line: bytes) -> Tuple[int, Any]:
+    """
+    Разбирает строку-заголовок ответа (без CRLF).
+
+    Не выполняет ввода-вывода, поэтому используется и синхронным,
+    и асинхронным парсером.
+
+    Returns:
+        Пару (VALUE, значение), (STRING, байты), (BULK, длина)
+        или (ARRAY, число элементов)
+    """
+    if not line:
+        raise InvalidResponse("Пустая строка ответа от сервера")
+
+    prefix = line[:1]
+    payload = line[1:]
+
+    if prefix == b"+":  # Simple String
+        return STRING, payload
+    elif prefix == b":":  # Integer
+        try:
+            return VALUE, int(payload)
+        except ValueError:
+            raise InvalidResponse(
+                f"Некорректное целое число: {payload.decode(errors='replace')}"
+            )
+    elif prefix == b"$":  # Bulk String
+        length = _parse_length(payload)
+        return (VALUE, None) if length == -1 else (BULK, length)
+    elif prefix == b"*":  # Array
+        length = _parse_length(payload)
+        return (VALUE, None) if length == -1 else (ARRAY, length)
+    elif prefix == b"-":  # Error
+        return VALUE, _response_error(payload.decode(errors="replace"))
+    else:
+        raise InvalidResponse(f"Неизвестный префикс: {prefix.decode(errors='replace')}")
+
+
+def decode_bulk(
+    data: Union[bytes, bytearray], encoding: Optional[str], errors: str = "strict"
+) -> Union[str, bytes]:
+    """
+    Преобразует полезную нагрузку строки в значение ответа.
+
+    Args:
+        data: Полезная нагрузка
+        encoding: Кодировка; None - вернуть байты без декодирования
+        errors: Политика обработки ошибок декодирования
+    """
+    if encoding is None:
+        return data if isinstance(data, bytes) else bytes(data)
+    return data.decode(encoding, errors)
+
+
+def _parse_length(payload: bytes) -> int:
+    """Разбирает длину bulk-строки или массива."""
+    try:
+        length = int(payload)
+    except ValueError:
+        raise InvalidResponse(f"Некорректная длина: {payload.decode(errors='replace')}")
+    if length < -1:
+        raise InvalidResponse(f"Некорректная длина: {length}")
+    return length
+
+
+def write_all(file: IO[bytes], data: memoryview) -> None:
+    """Записывает данные в файл целиком, дописывая частичные записи."""
+    while data:
+        # Буферизованные файлы пишут всё сразу, «сырые» - возможно, часть
+        written = file.write(data)
+        if not written:
+            raise OSError("Файл не принял данные")
+        data = data[written:]
+
+
+class ZSPParser:
+    """
+    Инкрементальный парсер ответов Zumic-протокола (ZSP).
+
+    Хранит постоянный буфер чтения соединения: данные из сокета дочитываются
+    кусками по мере необходимости, поэтому неполные фреймы, несколько ответов
+    в одном `recv` и вложенные массивы обрабатываются корректно. Хвост,
+    относящийся к следующему ответу, остаётся в буфере до следующего вызова.
+    """
+
+    def __init__(
+        self,
+        recv: Callable[[int], bytes],
+        recv_into: Callable[[memoryview], int],
+        read_size: int = 65536,
+        decode_responses: bool = True,
+        encoding: str = "utf-8",
+        encoding_errors: str = "replace",
+    ) -> None:
+        """
+        Args:
+            recv: Функция чтения очередного куска данных из сокета
+            recv_into: Функция чтения из сокета прямо в переданный буфер
+            read_size: Размер одного чтения из сокета
+            decode_responses: Декодировать строки ответа (иначе - bytes)
+            encoding: Кодировка строк ответа
+            encoding_errors: Политика обработки ошибок декодирования
+        """
+        self._recv = recv
+        self._recv_into = recv_into
+        self.read_size = read_size
+        self.decode_responses = decode_responses
+        self.encoding = encoding
+        self.encoding_errors = encoding_errors
+        self._buffer = bytearray()
+        self._pos = 0
+
+    @property
+    def buffered(self) -> int:
+        """Количество прочитанных, но ещё не разобранных байт."""
+        return len(self._buffer) - self._pos
+
+    def purge(self) -> None:
+        """Сбрасывает буфер (например, после разрыва соединения)."""
+        self._buffer.clear()
+        self._pos = 0
+
+    def read_response(self, decode: Optional[bool] = None) -> Any:
+        """
+        Читает и разбирает один полный ответ сервера.
+
+        Args:
+            decode: Декодировать строки этого ответа (None - настройка парсера)
+
+        Raises:
+            ResponseError: Сервер вернул ошибку
+            InvalidResponse: Ответ нарушает протокол
+            ConnectionError: Ошибка чтения из сокета
+        """
+        if decode is None:
+            decode = self.decode_responses
+        response = self._read_reply(self.encoding if decode else None)
+        if isinstance(response, ResponseError):
+            raise response
+        return response
+
+    def read_numeric_array(
+        self, typecode: str = "q", null: float = 0
+    ) -> Optional[array]:
+        """
+        Читает массив целых чисел или числовых bulk-строк прямо
+        в `array.array`, не разбирая элементы по одному.
+
+        Все полные строки, уже находящиеся в буфере, выделяются одним
+        `split`, и числа из них сразу дописываются в массив: объекты
+        ответа не создаются, а записи чисел живут только в пределах
+        одного прочитанного из сокета куска. Числовые значения не
+        содержат CRLF, поэтому длина bulk-строки только проверяется.
+
+        Args:
+            typecode: Код типа `array.array`
+            null: Значение, подставляемое вместо отсутствующих элементов
+
+        Returns:
+            Массив чисел или None, если сервер вернул null
+
+        Raises:
+            ResponseError: Сервер вернул ошибку (в том числе в элементе
+                массива - после дочитывания всего массива)
+            InvalidResponse: Ответ не является массивом чисел
+            DataError: Элемент не является числом нужного типа (после
+                дочитывания всего массива)
+        """
+        kind, count = parse_line(self._read_line())
+        if kind == VALUE:
+            if isinstance(count, ResponseError):
+                raise count
+            if count is None:
+                return None
+        if kind != ARRAY:
+            raise InvalidResponse("Ожидался массив чисел")
+
+        # Коды типов с плавающей точкой (см. `zumic.typed.FLOAT_TYPECODES`)
+        parse = float if typecode in "fd" else int
+        result: "array[Any]" = array(typecode)
+        error: Optional[ResponseError] = None
+        invalid: Optional[Exception] = None
+        done = 0
+        # Длина bulk-строки, заголовок которой уже разобран (-1 - нет такой)
+        pending = -1
+        while done < count:
+            end = self._buffer.rfind(CRLF, self._pos)
+            if end == -1:
+                self._fill()
+                continue
+            chunk: List[Any] = []
+            consumed = 0
+            for line in bytes(self._buffer[self._pos : end]).split(CRLF):
+                if done + len(chunk) == count:
+                    break
+                consumed += len(line) + 2
+                if pending != -1:
+                    if len(line) != pending:
+                        raise InvalidResponse("Элемент массива не является числом")
+                    chunk.append(line)
+                    pending = -1
+                    continue
+                prefix = line[:1]
+                if prefix == b":":
+                    chunk.append(line[1:])
+                elif prefix == b"$":
+                    pending = _parse_length(line[1:])
+                    if pending == -1:
+                        chunk.append(null)
+                elif prefix == b"-":
+                    if error is None:
+                        error = _response_error(line[1:].decode(errors="replace"))
+                    chunk.append(null)
+                else:
+                    raise InvalidResponse("Элемент массива не является числом")
+            self._pos += consumed
+            done += len(chunk)
+            if invalid is None:
+                try:
+                    result.extend(map(parse, chunk))
+                except (ValueError, TypeError, OverflowError) as e:
+                    # Массив дочитывается, чтобы не рассинхронизировать поток
+                    invalid = e
+        if error is not None:
+            raise error
+        if invalid is not None:
+            raise DataError(
+                f"Ответ не является массивом чисел типа {typecode!r}"
+            ) from invalid
+        return result
+
+    def read_bulk_into(self, target: Union[memoryview, IO[bytes]]) -> Optional[int]:
+        """
+        Читает ответ-строку, перекладывая её прямо в приёмник.
+
+        Значение целиком в памяти не собирается: в буфер оно читается из
+        сокета напрямую через `recv_into`, а в файл - кусками по
+        `STREAM_CHUNK_SIZE` через один и тот же промежуточный буфер.
+
+        Args:
+            target: Плоский записываемый `memoryview` (значение пишется
+                с его начала) или файловый объект
+
+        Returns:
+            Длину значения или None, если сервер вернул null
+
+        Raises:
+            ResponseError: Сервер вернул ошибку
+            InvalidResponse: Ответ не является строкой
+            DataError: Значение не помещается в буфер (ответ остаётся
+                недочитанным)
+        """
+        kind, length = parse_line(self._read_line())
+        if kind == VALUE:
+            if isinstance(length, ResponseError):
+                raise length
+            if length is None:
+                return None
+        if kind != BULK:
+            raise InvalidResponse("Ожидалась bulk-строка")
+
+        # Начало значения могло уже оказаться в буфере чтения
+        filled = min(self.buffered, length)
+        head = self._buffer[self._pos : self._pos + filled]
+        if isinstance(target, memoryview):
+            if length > target.nbytes:
+                raise DataError(
+                    f"Значение ({length} байт) не помещается в буфер "
+                    f"({target.nbytes} байт)"
+                )
+            target[:filled] = head
+            self._pos += filled
+            while filled < length:
+                filled += self._recv_into(target[filled:length])
+        else:
+            write_all(target, memoryview(head))
+            self._pos += filled
+            if filled < length:
+                chunk = memoryview(bytearray(min(length - filled, STREAM_CHUNK_SIZE)))
+                while filled < length:
+                    nbytes = self._recv_into(chunk[: length - filled])
+                    write_all(target, chunk[:nbytes])
+                    filled += nbytes
+        self._expect_crlf()
+        return length
+
+    def _fill(self) -> None:
+        """Дочитывает очередной кусок данных из сокета в буфер."""
+        if self._pos:
+            # Отбрасываем уже разобранную часть, чтобы буфер не рос бесконечно
+            del self._buffer[: self._pos]
+            self._pos = 0
+        self._buffer += self._recv(self.read_size)
+
+    def _read_line(self) -> bytes:
+        """Читает строку до CRLF (без самого CRLF)."""
+        while True:
+            idx = self._buffer.find(CRLF, self._pos)
+            if idx != -1:
+                line = bytes(self._buffer[self._pos : idx])
+                self._pos = idx + 2
+                return line
+            self._fill()
+
+    def _read_exact(self, length: int) -> bytes:
+        """Читает ровно `length` байт полезной нагрузки и завершающий CRLF."""
+        if length >= self.read_size and self.buffered < length + 2:
+            data = self._read_large(length)
+        else:
+            while self.buffered < length + 2:
+                self._fill()
+            start = self._pos
+            self._pos += length
+            data = bytes(self._buffer[start : self._pos])
+        self._expect_crlf()
+        return data
+
+    def _read_large(self, length: int) -> bytes:
+        """
+        Читает большую bulk-строку.
+
+        Итоговый буфер выделяется один раз, уже прочитанная часть копируется
+        в него, а остаток читается из сокета напрямую через `recv_into`, без
+        переаллокаций на каждый кусок.
+        """
+        target = bytearray(length)
+        view = memoryview(target)
+        filled = min(self.buffered, length)
+        view[:filled] = self._buffer[self._pos : self._pos + filled]
+        self._pos += filled
+        while filled < length:
+            filled += self._recv_into(view[filled:])
+        view.release()
+        return target  # type: ignore[return-value]
+
+    def _expect_crlf(self) -> None:
+        """Проверяет и пропускает CRLF после полезной нагрузки."""
+        while self.buffered < 2:
+            self._fill()
+        if self._buffer[self._pos : self._pos + 2] != CRLF:
+            raise InvalidResponse("Bulk-строка не завершается CRLF")
+        self._pos += 2
+
+    def _read_reply(self, encoding: Optional[str]) -> Any:
+        """Разбирает один ответ. Ошибки внутри массивов возвращаются на месте."""
+        kind, value = parse_line(self._read_line())
+        if kind == BULK:
+            value = self._read_exact(value)
+        elif kind == ARRAY:
+            return [self._read_reply(encoding) for _ in range(value)]
+        elif kind != STRING:
+            return value
+        return decode_bulk(value, encoding, self.encoding_errors)
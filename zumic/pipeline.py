@@ -0,0 +1,515 @@
+from contextlib import ExitStack, contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from zumic.commands import BatchCommand, CoreCommands, _is_ok
+from zumic.connection_protocol import ConnectionProtocol
+from zumic.encoder import EncodableT
+from zumic.exceptions import InvalidResponse, ResponseError, WatchError
+from zumic.instrumentation import CommandTimer
+from zumic.scripting import Script
+from zumic.timeouts import deadline as time_budget
+from zumic.typed import read_reply
+
+if TYPE_CHECKING:
+    from zumic.client import Client
+
+
+def _decode_reply(reply: Any, encoding: str, errors: str) -> Any:
+    """Декодирует строки сырого ответа, в том числе вложенные в массивы."""
+    if isinstance(reply, bytes):
+        return reply.decode(encoding, errors)
+    if isinstance(reply, list):
+        return [_decode_reply(item, encoding, errors) for item in reply]
+    return reply
+
+
+class QueuedCommand(NamedTuple):
+    """Команда в очереди конвейера."""
+
+    args: Tuple[EncodableT, ...]
+    callback: Optional[Callable[[Any], Any]]
+    options: Dict[str, Any]
+
+
+class Pipeline(CoreCommands["Pipeline"]):
+    """
+    Конвейер команд Zumic.
+
+    Команды накапливаются в очереди и при `execute()` отправляются на сервер
+    одной записью в сокет, после чего ответы читаются по порядку. Методы
+    команд возвращают сам конвейер, поэтому вызовы можно объединять в цепочку.
+
+    В режиме транзакции (`transaction=True`) очередь оборачивается
+    в MULTI/EXEC и по-прежнему отправляется одной записью. После `watch()`
+    конвейер держит своё соединение и выполняет команды сразу, возвращая
+    их результаты, пока `multi()` не начнёт очередь транзакции. Если
+    наблюдаемый ключ изменился, `execute()` бросает `WatchError`.
+
+    Скрипты (`register_script`) ставятся в очередь как EVALSHA; перед
+    отправкой очереди конвейер проверяет их наличие на сервере
+    (SCRIPT EXISTS) и загружает недостающие.
+    """
+
+    def __init__(
+        self, client: "Client", raise_on_error: bool = True, transaction: bool = False
+    ) -> None:
+        """
+        Args:
+            client: Клиент, через соединение которого выполняются команды
+            raise_on_error: Бросать первую ошибку команды при `execute()`
+            transaction: Выполнять очередь атомарно через MULTI/EXEC
+        """
+        self.client = client
+        self.raise_on_error = raise_on_error
+        self.transaction = transaction
+        self.codec = client.codec
+        self.decode_responses = client.decode_responses
+        self._commands: List[QueuedCommand] = []
+        # Скрипты очереди, которые нужно загрузить перед её отправкой
+        self._scripts: Dict[str, Script] = {}
+        # Соединение, удерживаемое между WATCH и EXEC
+        self._stack: Optional[ExitStack] = None
+        self._connection: Optional[ConnectionProtocol] = None
+        self._watching = False
+        self._explicit_multi = False
+
+    @property
+    def watching(self) -> bool:
+        """True, если конвейер наблюдает за ключами (до `multi()`)."""
+        return self._watching and not self._explicit_multi
+
+    def execute_command(
+        self,
+        *args: EncodableT,
+        callback: Optional[Callable[[Any], Any]] = None,
+        **options: Any,
+    ) -> Any:
+        """
+        Ставит команду в очередь конвейера.
+
+        Между `watch()` и `multi()` команда выполняется сразу, и вместо
+        конвейера возвращается её результат.
+        """
+        if not args:
+            raise ValueError("Команда не может быть пустой")
+        if self.watching:
+            return self._execute_immediate(args, callback, options)
+        self._commands.append(QueuedCommand(args, callback, options))
+        return self
+
+    def watch(self, *keys: EncodableT) -> bool:
+        """
+        Начинает наблюдение за ключами (WATCH) на собственном соединении
+        конвейера.
+
+        Raises:
+            WatchError: WATCH вызван после `multi()`
+        """
+        if self._explicit_multi:
+            raise WatchError("WATCH нельзя вызвать после MULTI")
+        if not keys:
+            raise ValueError("Нужен хотя бы один ключ")
+        self._watching = True
+        return self._execute_immediate(("WATCH", *keys), _is_ok, {})
+
+    def unwatch(self) -> bool:
+        """Снимает наблюдение за всеми ключами и освобождает соединение."""
+        result = True
+        if self._watching and self._connection is not None:
+            result = self._execute_immediate(("UNWATCH",), _is_ok, {})
+        self._watching = False
+        self._release()
+        return result
+
+    def multi(self) -> None:
+        """
+        Заканчивает чтение под WATCH: следующие команды ставятся в очередь
+        транзакции.
+
+        Raises:
+            WatchError: MULTI уже вызван
+        """
+        if self._explicit_multi:
+            raise WatchError("MULTI уже вызван")
+        if self._commands:
+            raise WatchError("MULTI нужно вызвать до постановки команд в очередь")
+        self.transaction = True
+        self._explicit_multi = True
+
+    @contextmanager
+    def _get_connection(self) -> Iterator[ConnectionProtocol]:
+        """Выдаёт удерживаемое соединение или берёт соединение у клиента."""
+        if self._connection is None and not self._watching:
+            with self.client.get_connection() as connection:
+                yield connection
+            return
+
+        if self._connection is None:
+            self._stack = ExitStack()
+            self._connection = self._stack.enter_context(self.client.get_connection())
+        try:
+            yield self._connection
+        except BaseException as e:
+            if not isinstance(e, ResponseError):
+                # Соединение закрывается тем же путём, что и у клиента;
+                # наблюдение на сервере при этом потеряно
+                self._watching = False
+                self._release(e)
+            raise
+
+    def _release(self, error: Optional[BaseException] = None) -> None:
+        """Возвращает удерживаемое соединение клиенту."""
+        stack, self._stack, self._connection = self._stack, None, None
+        if stack is not None:
+            if error is None:
+                stack.close()
+            else:
+                stack.__exit__(type(error), error, error.__traceback__)
+
+    def _execute_immediate(
+        self,
+        args: Tuple[EncodableT, ...],
+        callback: Optional[Callable[[Any], Any]],
+        options: Dict[str, Any],
+    ) -> Any:
+        """Выполняет команду сразу на удерживаемом соединении."""
+        decode = options.get("decode")
+        try:
+            with self._get_connection() as connection:
+                connection.send_command(*args)
+                reply = read_reply(connection, decode, options.get("numeric"))
+        finally:
+            if self.client.cache is not None:
+                self.client.cache.invalidate_for_command(args)
+        reply = self.client._process_response(reply, decode)
+        return callback(reply) if callback is not None else reply
+
+    def execute(
+        self, raise_on_error: Optional[bool] = None, deadline: Optional[float] = None
+    ) -> List[Any]:
+        """
+        Отправляет все накопленные команды и читает ответы.
+
+        Args:
+            raise_on_error: Переопределяет одноимённую настройку конвейера
+            deadline: Бюджет времени всего конвейера в секундах
+                (см. `zumic.timeouts.deadline`)
+
+        Returns:
+            Ответы в порядке постановки команд. Если ошибки не бросаются,
+            ошибки отдельных команд возвращаются на своих местах как
+            экземпляры ResponseError.
+
+        Raises:
+            ResponseError: Первая ошибка команды (если raise_on_error)
+            TimeoutError: Истёк таймаут или бюджет времени
+            ConnectionError: Ошибка соединения
+        """
+        with time_budget(deadline):
+            return self._execute(raise_on_error)
+
+    def _execute(self, raise_on_error: Optional[bool]) -> List[Any]:
+        """Выполняет конвейер (см. `execute`)."""
+        commands, self._commands = self._commands, []
+        scripts, self._scripts = self._scripts, {}
+        to_send = [command for command in commands if command.args]
+        transaction = self.transaction
+
+        replies: List[Any] = []
+        aborted = False
+        try:
+            if to_send:
+                with self._get_connection() as connection:
+                    if scripts:
+                        self._load_scripts(connection, list(scripts.values()))
+                    timer = None
+                    if self.client.observer is not None:
+                        timer = CommandTimer(
+                            self.client.observer,
+                            to_send[0].args,
+                            connection,
+                            name="EXEC" if transaction else "PIPELINE",
+                            commands=len(to_send),
+                            batch=[command.args for command in to_send],
+                        )
+                    try:
+                        if transaction:
+                            aborted = not self._send_and_read_transaction(
+                                connection, to_send, replies, timer
+                            )
+                        else:
+                            self._send_and_read(connection, to_send, replies, timer)
+                    except BaseException as e:
+                        if timer is not None:
+                            timer.finish(e)
+                        raise
+                    if timer is not None:
+                        timer.finish()
+            elif self._watching:
+                self.unwatch()
+        finally:
+            if self.client.cache is not None:
+                for command in to_send:
+                    self.client.cache.invalidate_for_command(command.args)
+            # EXEC снимает WATCH на сервере, соединение больше не нужно
+            self._watching = False
+            self._explicit_multi = False
+            self._release()
+
+        if aborted:
+            raise WatchError("Наблюдаемый ключ изменился, транзакция отменена")
+        return self._build_responses(commands, replies, raise_on_error)
+
+    @staticmethod
+    def _load_scripts(connection: ConnectionProtocol, scripts: List[Script]) -> None:
+        """
+        Загружает скрипты, которых нет в кэше сервера.
+
+        Raises:
+            ResponseError: Скрипт не компилируется
+        """
+        connection.send_command("SCRIPT", "EXISTS", *(script.sha for script in scripts))
+        exists = connection.read_response()
+        missing = [script for script, found in zip(scripts, exists) if not found]
+        if not missing:
+            return
+        connection.send_commands(
+            [("SCRIPT", "LOAD", script.source) for script in missing]
+        )
+        # Все ответы дочитываются, чтобы не оставить в соединении чужие данные
+        error: Optional[ResponseError] = None
+        for _ in missing:
+            try:
+                connection.read_response()
+            except ResponseError as e:
+                error = error or e
+        if error is not None:
+            raise error
+
+    def _send_and_read_transaction(
+        self,
+        connection: ConnectionProtocol,
+        to_send: List[QueuedCommand],
+        replies: List[Any],
+        timer: Optional[CommandTimer] = None,
+    ) -> bool:
+        """
+        Отправляет MULTI, команды и EXEC одной записью и читает все ответы.
+
+        Returns:
+            False, если транзакция отменена из-за WATCH
+
+        Raises:
+            ResponseError: Команда отклонена при постановке в очередь
+                (EXECABORT)
+        """
+        connection.send_commands(
+            [("MULTI",), *(command.args for command in to_send), ("EXEC",)]
+        )
+        if timer is not None:
+            timer.sent()
+        # Ответы MULTI и QUEUED дочитываются целиком, даже если среди них
+        # есть ошибки, чтобы не оставить в соединении чужие данные
+        queue_error: Optional[ResponseError] = None
+        for _ in range(len(to_send) + 1):
+            try:
+                connection.read_response()
+            except ResponseError as e:
+                queue_error = queue_error or e
+        try:
+            # Ответ EXEC читается сырым: строки каждой команды декодируются
+            # по её собственным параметрам
+            result = connection.read_response(False)
+        except ResponseError:
+            if queue_error is not None:
+                raise queue_error
+            raise
+        if result is None:
+            return False
+        replies.extend(self._exec_replies(to_send, result))
+        return True
+
+    def _exec_replies(self, to_send: List[QueuedCommand], result: Any) -> List[Any]:
+        """
+        Приводит элементы сырого ответа EXEC к тому виду, в каком команды
+        вернули бы их вне транзакции: числовой разбор (`numeric`)
+        или декодирование строк (`decode`).
+
+        Raises:
+            InvalidResponse: Ответ EXEC не соответствует очереди
+        """
+        if not isinstance(result, list) or len(result) != len(to_send):
+            raise InvalidResponse(f"Некорректный ответ EXEC: {result!r}")
+        client = self.client
+        replies: List[Any] = []
+        for command, reply in zip(to_send, result):
+            options = command.options
+            numeric = options.get("numeric")
+            if isinstance(reply, ResponseError):
+                pass
+            elif numeric is not None:
+                try:
+                    reply = numeric.from_reply(reply)
+                except ResponseError as e:
+                    reply = e
+            else:
+                decode = options.get("decode")
+                if decode is None:
+                    decode = client.decode_responses
+                if decode:
+                    reply = _decode_reply(
+                        reply, client.encoding, client.encoding_errors
+                    )
+            replies.append(reply)
+        return replies
+
+    @staticmethod
+    def _send_and_read(
+        connection: ConnectionProtocol,
+        to_send: List[QueuedCommand],
+        replies: List[Any],
+        timer: Optional[CommandTimer] = None,
+    ) -> None:
+        """Отправляет команды одной записью и читает все ответы."""
+        connection.send_commands([command.args for command in to_send])
+        if timer is not None:
+            timer.sent()
+        # Дочитываем все ответы, даже если встретилась ошибка,
+        # чтобы не оставить в соединении чужие данные
+        for command in to_send:
+            try:
+                options = command.options
+                replies.append(
+                    read_reply(
+                        connection, options.get("decode"), options.get("numeric")
+                    )
+                )
+            except ResponseError as e:
+                replies.append(e)
+
+    def _run_script(
+        self, script: Script, keys: Sequence[EncodableT], args: Sequence[EncodableT]
+    ) -> Any:
+        """Ставит скрипт в очередь как EVALSHA и запоминает его для загрузки."""
+        if self.watching:
+            return super()._run_script(script, keys, args)
+        self._scripts[script.sha] = script
+        return self.evalsha(script.sha, keys, args)
+
+    def _local_result(self, value: Any) -> Any:
+        """Ставит в очередь результат, не требующий обращения к серверу."""
+        if self.watching:
+            return value
+        self._commands.append(QueuedCommand((), lambda _: value, {}))
+        return self
+
+    def _execute_batch(
+        self, commands: List[BatchCommand], combine: Callable[[List[Any]], Any]
+    ) -> Any:
+        """
+        Ставит в очередь группу команд, ответы которой сводятся в один
+        результат функцией `combine`.
+        """
+        if self.watching:
+            return combine(
+                [
+                    self._execute_immediate(args, cb, options)
+                    for args, cb, options in commands
+                ]
+            )
+        for args, callback, options in commands:
+            self.execute_command(*args, callback=callback, **options)
+        # Маркер группы: при разборе ответов заменяет последние
+        # `group_size` результатов их сводкой
+        self._commands.append(QueuedCommand((), combine, {"group_size": len(commands)}))
+        return self
+
+    def _build_responses(
+        self,
+        commands: List[QueuedCommand],
+        replies: List[Any],
+        raise_on_error: Optional[bool],
+    ) -> List[Any]:
+        """
+        Сопоставляет прочитанные ответы командам и применяет постобработку.
+
+        Args:
+            commands: Команды в порядке постановки в очередь
+            replies: Сырые ответы (или ResponseError) отправленных команд
+            raise_on_error: Переопределяет одноимённую настройку конвейера
+        """
+        if raise_on_error is None:
+            raise_on_error = self.raise_on_error
+
+        pending = iter(replies)
+        responses: List[Any] = []
+        for args, callback, options in commands:
+            if not args:
+                if "group_size" in options:
+                    responses.append(
+                        self._combine_group(responses, options["group_size"], callback)
+                    )
+                    continue
+                # Локальный результат: на сервер ничего не отправлялось
+                responses.append(callback(None) if callback is not None else None)
+                continue
+            reply = next(pending)
+            if isinstance(reply, ResponseError):
+                responses.append(reply)
+                continue
+            reply = self.client._process_response(reply, options.get("decode"))
+            responses.append(callback(reply) if callback is not None else reply)
+
+        if raise_on_error:
+            for response in responses:
+                if isinstance(response, ResponseError):
+                    raise response
+        return responses
+
+    @staticmethod
+    def _combine_group(
+        responses: List[Any], size: int, combine: Optional[Callable[[List[Any]], Any]]
+    ) -> Any:
+        """Забирает из `responses` последние `size` ответов и сводит их."""
+        start = len(responses) - size
+        parts = responses[start:]
+        del responses[start:]
+        for part in parts:
+            if isinstance(part, ResponseError):
+                return part
+        return combine(parts) if combine is not None else parts
+
+    def reset(self) -> None:
+        """Очищает очередь команд и снимает наблюдение за ключами."""
+        self._commands = []
+        self._scripts = {}
+        self._explicit_multi = False
+        if self._watching:
+            try:
+                self.unwatch()
+            except ResponseError:
+                pass
+        self._release()
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __enter__(self):
+        """Поддержка контекстного менеджера."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Сбрасывает неотправленные команды."""
+        self.reset()
+        return False
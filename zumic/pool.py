@@ -0,0 +1,294 @@
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Iterator, Optional, Set, Tuple
+import threading
+import time
+
+from zumic.connection import Connection
+from zumic.connection_protocol import ConnectionProtocol
+from zumic.exceptions import ResponseError, TimeoutError
+from zumic.timeouts import effective_timeout
+
+
+@dataclass
+class PoolStats:
+    """Снимок счётчиков пула соединений."""
+
+    in_use: int
+    idle: int
+    total: int
+    max_connections: int
+    checkouts: int
+    waits: int
+    timeouts: int
+    wait_time_total: float
+    wait_time_max: float
+    reaped: int
+    health_checks: int = 0
+    health_check_failures: int = 0
+
+
+class ConnectionPool:
+    """
+    Потокобезопасный пул соединений с ограниченным размером.
+
+    Соединения выдаются в порядке LIFO, чтобы чаще переиспользовать
+    «горячие» сокеты, а простаивающие дольше `idle_timeout` закрываются.
+    Если все соединения заняты и лимит исчерпан, `get_connection` ждёт
+    освобождения не дольше `timeout` секунд. Соединение, простоявшее
+    дольше `health_check_interval`, перед выдачей проверяется, и мёртвое
+    закрывается, чтобы переподключиться при первой команде.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 10,
+        timeout: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+        prewarm: int = 0,
+        health_check_interval: Optional[float] = None,
+        connection_class: Callable[..., ConnectionProtocol] = Connection,
+        **connection_kwargs: Any,
+    ) -> None:
+        """
+        Инициализирует пул соединений.
+
+        Args:
+            max_connections: Максимальное число соединений
+            timeout: Максимальное время ожидания свободного соединения
+                (None - ждать без ограничений)
+            idle_timeout: Через сколько секунд простоя соединение закрывается
+            prewarm: Сколько соединений открыть сразу при создании пула
+            health_check_interval: Проверять перед выдачей соединения,
+                простоявшие дольше этого числа секунд (None - не проверять)
+            connection_class: Фабрика соединений
+            **connection_kwargs: Параметры, передаваемые в фабрику соединений
+        """
+        if max_connections < 1:
+            raise ValueError("max_connections должен быть положительным")
+        if prewarm > max_connections:
+            raise ValueError("prewarm не может превышать max_connections")
+
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.connection_class = connection_class
+        self.connection_kwargs = connection_kwargs
+
+        self._cond = threading.Condition()
+        self._idle: Deque[Tuple[ConnectionProtocol, float]] = deque()
+        self._in_use: Set[ConnectionProtocol] = set()
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._reaped = 0
+        self._health_checks = 0
+        self._health_check_failures = 0
+
+        if prewarm:
+            self.warm(prewarm)
+
+    def make_connection(self) -> ConnectionProtocol:
+        """Создаёт новое (ещё не подключённое) соединение."""
+        return self.connection_class(**self.connection_kwargs)
+
+    def warm(self, count: int) -> int:
+        """
+        Заранее открывает соединения, чтобы не платить за TCP-рукопожатие
+        при первых запросах.
+
+        Args:
+            count: Сколько простаивающих соединений должно быть в пуле
+
+        Returns:
+            Количество открытых соединений
+        """
+        opened = []
+        with self._cond:
+            count = min(count - len(self._idle), self.max_connections - self._total())
+            for _ in range(max(count, 0)):
+                connection = self.make_connection()
+                self._in_use.add(connection)
+                opened.append(connection)
+
+        try:
+            for connection in opened:
+                connection.connect()
+        finally:
+            # Возвращаем в пул все соединения, даже если какое-то не открылось
+            for connection in opened:
+                self.release(connection)
+        return len(opened)
+
+    def get_connection(self, timeout: Optional[float] = None) -> ConnectionProtocol:
+        """
+        Выдаёт соединение из пула.
+
+        Args:
+            timeout: Переопределяет таймаут ожидания пула
+
+        Raises:
+            TimeoutError: Свободное соединение не появилось за отведённое
+                время или до конца бюджета команды
+        """
+        if timeout is None:
+            timeout = self.timeout
+        timeout = effective_timeout(timeout)
+
+        with self._cond:
+            self._reap_locked(time.monotonic())
+            started: Optional[float] = None
+            while not self._idle and self._total() >= self.max_connections:
+                now = time.monotonic()
+                if started is None:
+                    started = now
+                    self._waits += 1
+                remaining = None if timeout is None else timeout - (now - started)
+                if remaining is not None and remaining <= 0:
+                    self._timeouts += 1
+                    self._record_wait(now - started)
+                    raise TimeoutError(
+                        "Нет свободных соединений в пуле "
+                        f"(лимит {self.max_connections})"
+                    )
+                self._cond.wait(remaining)
+
+            if started is not None:
+                self._record_wait(time.monotonic() - started)
+
+            idle_since: Optional[float] = None
+            if self._idle:
+                connection, idle_since = self._idle.pop()
+            else:
+                connection = self.make_connection()
+            self._in_use.add(connection)
+            self._checkouts += 1
+
+        interval = self.health_check_interval
+        if (
+            interval is not None
+            and idle_since is not None
+            and time.monotonic() - idle_since >= interval
+        ):
+            self._check_health(connection)
+        return connection
+
+    def _check_health(self, connection: ConnectionProtocol) -> None:
+        """
+        Проверяет простаивавшее соединение вне блокировки пула.
+
+        Мёртвое соединение закрывается (`check_health` делает это сам)
+        и переподключится при первой команде.
+        """
+        check = getattr(connection, "check_health", None)
+        if check is None:
+            return
+        healthy = check()
+        with self._cond:
+            self._health_checks += 1
+            if not healthy:
+                self._health_check_failures += 1
+
+    def release(self, connection: ConnectionProtocol) -> None:
+        """Возвращает соединение в пул."""
+        with self._cond:
+            if connection not in self._in_use:
+                return
+            self._in_use.discard(connection)
+            now = time.monotonic()
+            self._idle.append((connection, now))
+            self._reap_locked(now)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(
+        self, timeout: Optional[float] = None
+    ) -> Iterator[ConnectionProtocol]:
+        """
+        Выдаёт соединение на время блока `with` и возвращает его в пул.
+
+        Если внутри блока произошла любая ошибка, кроме ошибки сервера,
+        соединение закрывается: в нём может остаться недочитанный ответ.
+        """
+        connection = self.get_connection(timeout)
+        try:
+            yield connection
+        except BaseException as e:
+            if not isinstance(e, ResponseError):
+                connection.disconnect()
+            raise
+        finally:
+            self.release(connection)
+
+    def reap_idle(self) -> int:
+        """
+        Закрывает соединения, простаивающие дольше `idle_timeout`.
+
+        Returns:
+            Количество закрытых соединений
+        """
+        with self._cond:
+            return self._reap_locked(time.monotonic())
+
+    def stats(self) -> PoolStats:
+        """Возвращает текущие счётчики пула."""
+        with self._cond:
+            return PoolStats(
+                in_use=len(self._in_use),
+                idle=len(self._idle),
+                total=self._total(),
+                max_connections=self.max_connections,
+                checkouts=self._checkouts,
+                waits=self._waits,
+                timeouts=self._timeouts,
+                wait_time_total=self._wait_time_total,
+                wait_time_max=self._wait_time_max,
+                reaped=self._reaped,
+                health_checks=self._health_checks,
+                health_check_failures=self._health_check_failures,
+            )
+
+    def disconnect(self) -> None:
+        """Закрывает все соединения пула, включая выданные."""
+        with self._cond:
+            connections = [c for c, _ in self._idle] + list(self._in_use)
+            self._idle.clear()
+            self._in_use.clear()
+            self._cond.notify_all()
+        for connection in connections:
+            connection.disconnect()
+
+    def _total(self) -> int:
+        return len(self._idle) + len(self._in_use)
+
+    def _record_wait(self, waited: float) -> None:
+        self._wait_time_total += waited
+        self._wait_time_max = max(self._wait_time_max, waited)
+
+    def _reap_locked(self, now: float) -> int:
+        """Закрывает устаревшие простаивающие соединения (под блокировкой)."""
+        if self.idle_timeout is None:
+            return 0
+        reaped = 0
+        # Самые старые соединения лежат в начале очереди
+        while self._idle and now - self._idle[0][1] >= self.idle_timeout:
+            connection, _ = self._idle.popleft()
+            connection.disconnect()
+            reaped += 1
+        self._reaped += reaped
+        if reaped:
+            self._cond.notify(reaped)
+        return reaped
+
+    def __enter__(self):
+        """Поддержка контекстного менеджера."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Закрывает все соединения пула."""
+        self.disconnect()
+        return False
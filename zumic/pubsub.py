@@ -0,0 +1,443 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+import logging
+import threading
+import time
+
+from zumic.connection_protocol import ConnectionProtocol
+from zumic.encoder import EncodableT, encode_arg
+from zumic.exceptions import (
+    ConnectionError,
+    InvalidResponse,
+    PubSubError,
+    ResponseError,
+)
+
+logger = logging.getLogger("zumic.pubsub")
+
+# Политики переполнения очереди сообщений
+BLOCK = "block"  # читатель ждёт места, сокет перестаёт читаться
+DROP_OLDEST = "drop_oldest"  # самое старое сообщение выбрасывается
+DISCONNECT = "disconnect"  # подписка закрывается с ошибкой
+POLICIES = frozenset({BLOCK, DROP_OLDEST, DISCONNECT})
+
+DEFAULT_MAX_QUEUE = 10000
+
+# Ответы сервера на изменение подписки
+SUBSCRIPTION_TYPES = frozenset(
+    {"subscribe", "unsubscribe", "psubscribe", "punsubscribe"}
+)
+
+
+@dataclass
+class Message:
+    """
+    Сообщение Pub/Sub.
+
+    Attributes:
+        type: Тип (`message`, `pmessage`, `subscribe`, ... или `error`)
+        channel: Канал
+        data: Данные сообщения; для ответов на подписку - число подписок,
+            для `error` - исключение сервера
+        pattern: Шаблон, по которому получено сообщение `pmessage`
+    """
+
+    type: str
+    channel: Any
+    data: Any
+    pattern: Any = None
+
+
+Handler = Callable[[Message], Any]
+
+
+def parse_message(response: Any) -> Message:
+    """
+    Разбирает push-ответ сервера в `Message`.
+
+    Raises:
+        PubSubError: Ответ не похож на сообщение Pub/Sub
+    """
+    if isinstance(response, ResponseError):
+        return Message("error", None, response)
+    if not isinstance(response, list) or len(response) < 2:
+        raise PubSubError(f"Неожиданный ответ в режиме Pub/Sub: {response!r}")
+    kind = response[0]
+    if isinstance(kind, bytes):
+        kind = kind.decode("ascii", "replace")
+    kind = str(kind).lower()
+    if kind == "pmessage" and len(response) >= 4:
+        return Message(kind, response[2], response[3], response[1])
+    return Message(kind, response[1], response[2] if len(response) > 2 else None)
+
+
+def _name_key(name: Any) -> bytes:
+    """Ключ канала для поиска обработчика: str и bytes сравниваются одинаково."""
+    return bytes(encode_arg(name))
+
+
+class Subscriptions:
+    """Текущие каналы и шаблоны подписки вместе с их обработчиками."""
+
+    def __init__(self) -> None:
+        self.channels: Dict[bytes, Optional[Handler]] = {}
+        self.patterns: Dict[bytes, Optional[Handler]] = {}
+
+    def add(self, pattern: bool, names: tuple, handler: Optional[Handler]) -> None:
+        target = self.patterns if pattern else self.channels
+        for name in names:
+            target[_name_key(name)] = handler
+
+    def remove(self, pattern: bool, names: tuple) -> None:
+        target = self.patterns if pattern else self.channels
+        if not names:
+            target.clear()
+        for name in names:
+            target.pop(_name_key(name), None)
+
+    def handler_for(self, message: Message) -> Optional[Handler]:
+        """Возвращает обработчик сообщения, если он задан при подписке."""
+        if message.type == "message":
+            return self.channels.get(_name_key(message.channel))
+        if message.type == "pmessage":
+            return self.patterns.get(_name_key(message.pattern))
+        return None
+
+    def __bool__(self) -> bool:
+        return bool(self.channels or self.patterns)
+
+
+class MessageQueue:
+    """
+    Ограниченная потокобезопасная очередь сообщений с политикой
+    переполнения (`BLOCK`, `DROP_OLDEST`, `DISCONNECT`).
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAX_QUEUE, policy: str = BLOCK) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize должен быть положительным")
+        if policy not in POLICIES:
+            raise ValueError(f"Неизвестная политика переполнения: {policy!r}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self._items: Deque[Message] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._error: Optional[BaseException] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, message: Message) -> bool:
+        """
+        Добавляет сообщение в очередь.
+
+        Returns:
+            False, если очередь закрыта или переполнена при политике
+            `DISCONNECT`
+        """
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                if self.policy == DISCONNECT:
+                    return False
+                if self.policy == DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._items) >= self.maxsize and not self._closed:
+                        self._cond.wait()
+            if self._closed:
+                return False
+            self._items.append(message)
+            self._cond.notify_all()
+            return True
+
+    def get_many(self, max_n: int, timeout: Optional[float] = 0.0) -> List[Message]:
+        """
+        Забирает до `max_n` сообщений, ожидая первое не дольше `timeout`
+        секунд (None - без ограничения).
+
+        Raises:
+            PubSubError: Очередь пуста и закрыта с ошибкой
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._items:
+                if self._closed:
+                    if self._error is not None:
+                        raise self._error
+                    return []
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return []
+                self._cond.wait(remaining)
+            count = min(max_n, len(self._items))
+            batch = [self._items.popleft() for _ in range(count)]
+            self._cond.notify_all()
+            return batch
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        """
+        Закрывает очередь. Оставшиеся сообщения можно дочитать, после
+        чего `get_many` бросает `error` (если он задан).
+        """
+        with self._cond:
+            if not self._closed:
+                self._closed = True
+                self._error = error
+            self._cond.notify_all()
+
+
+class PubSub:
+    """
+    Подписчик Pub/Sub на отдельном соединении.
+
+    Фоновый поток читает push-сообщения из сокета и складывает их
+    в ограниченную очередь, поэтому медленный обработчик не мешает чтению.
+    Сообщения забираются через `get_message`/`get_messages`/`listen`
+    или раздаются обработчикам в отдельном потоке (`run_in_thread`).
+
+    При переполнении очереди действует политика `policy`:
+    `block` - поток чтения ждёт, и сервер упирается в TCP-окно;
+    `drop_oldest` - старые сообщения выбрасываются (счётчик `dropped`);
+    `disconnect` - подписка закрывается с `PubSubError`.
+    """
+
+    def __init__(
+        self,
+        connection: ConnectionProtocol,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        policy: str = BLOCK,
+        ignore_subscribe_messages: bool = False,
+    ) -> None:
+        """
+        Args:
+            connection: Соединение, используемое только этим подписчиком;
+                таймаут чтения у него должен быть отключён
+            max_queue: Максимальное число непрочитанных сообщений
+            policy: Политика переполнения очереди
+            ignore_subscribe_messages: Не класть в очередь ответы на
+                (p)subscribe/(p)unsubscribe
+        """
+        self.connection = connection
+        self.ignore_subscribe_messages = ignore_subscribe_messages
+        self.subscriptions = Subscriptions()
+        self.received = 0
+        self._queue = MessageQueue(max_queue, policy)
+        self._send_lock = threading.Lock()
+        self._reader: Optional[threading.Thread] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._closed = False
+
+    @property
+    def dropped(self) -> int:
+        """Сколько сообщений выброшено политикой `drop_oldest`."""
+        return self._queue.dropped
+
+    @property
+    def pending(self) -> int:
+        """Число сообщений в очереди."""
+        return len(self._queue)
+
+    def subscribe(self, *channels: EncodableT, handler: Optional[Handler] = None):
+        """
+        Подписывается на каналы.
+
+        Args:
+            *channels: Каналы
+            handler: Обработчик сообщений этих каналов; такие сообщения
+                не возвращаются из `get_message`, а передаются обработчику
+        """
+        self._change("SUBSCRIBE", False, channels, handler)
+
+    def psubscribe(self, *patterns: EncodableT, handler: Optional[Handler] = None):
+        """Подписывается на каналы по шаблонам (`news.*`)."""
+        self._change("PSUBSCRIBE", True, patterns, handler)
+
+    def unsubscribe(self, *channels: EncodableT):
+        """Отписывается от каналов (без аргументов - от всех)."""
+        self._change("UNSUBSCRIBE", False, channels, None)
+
+    def punsubscribe(self, *patterns: EncodableT):
+        """Отписывается от шаблонов (без аргументов - от всех)."""
+        self._change("PUNSUBSCRIBE", True, patterns, None)
+
+    def _change(
+        self,
+        command: str,
+        pattern: bool,
+        names: tuple,
+        handler: Optional[Handler],
+    ) -> None:
+        if self._closed:
+            raise PubSubError("Подписка закрыта")
+        if command in ("SUBSCRIBE", "PSUBSCRIBE"):
+            if not names:
+                raise ValueError("Нужен хотя бы один канал")
+            self.subscriptions.add(pattern, names, handler)
+        else:
+            self.subscriptions.remove(pattern, names)
+        with self._send_lock:
+            self.connection.send_command(command, *names)
+        self._start_reader()
+
+    def _start_reader(self) -> None:
+        if self._reader is not None:
+            return
+        self._reader = threading.Thread(
+            target=self._read_loop, name="zumic-pubsub-reader", daemon=True
+        )
+        self._reader.start()
+
+    def _read_loop(self) -> None:
+        """Читает сообщения из сокета, пока подписка не закрыта."""
+        queue = self._queue
+        ignore = self.ignore_subscribe_messages
+        while not self._closed:
+            try:
+                try:
+                    response = self.connection.read_response()
+                except ResponseError as e:
+                    # Ошибка сервера не рвёт подписку, а доставляется сообщением
+                    response = e
+                message = parse_message(response)
+            except (ConnectionError, InvalidResponse, PubSubError, OSError) as e:
+                if not self._closed:
+                    error = PubSubError("Соединение Pub/Sub потеряно")
+                    error.__cause__ = e
+                    self._fail(error)
+                return
+            self.received += 1
+            if ignore and message.type in SUBSCRIPTION_TYPES:
+                continue
+            if not queue.put(message):
+                if not queue.closed:
+                    self._fail(
+                        PubSubError(
+                            f"Очередь сообщений переполнена ({queue.maxsize}), "
+                            "подписка закрыта"
+                        )
+                    )
+                return
+
+    def _fail(self, error: PubSubError) -> None:
+        self._closed = True
+        self._queue.close(error)
+        self.connection.disconnect()
+
+    def _dispatch(
+        self, messages: List[Message], log_errors: bool = False
+    ) -> List[Message]:
+        """
+        Передаёт сообщения их обработчикам и возвращает остальные.
+
+        Args:
+            messages: Сообщения из очереди
+            log_errors: Записывать ошибки обработчиков в журнал
+                `zumic.pubsub` и продолжать раздачу (иначе ошибка
+                передаётся вызывающему)
+        """
+        rest = []
+        for message in messages:
+            handler = self.subscriptions.handler_for(message)
+            if handler is None:
+                rest.append(message)
+            elif log_errors:
+                try:
+                    handler(message)
+                except Exception:
+                    logger.exception(
+                        "Ошибка обработчика сообщения канала %r", message.channel
+                    )
+            else:
+                handler(message)
+        return rest
+
+    def get_message(self, timeout: Optional[float] = 0.0) -> Optional[Message]:
+        """
+        Возвращает следующее сообщение без обработчика.
+
+        Args:
+            timeout: Сколько ждать сообщения (None - без ограничения)
+
+        Returns:
+            Сообщение или None, если его нет (или оно отдано обработчику)
+
+        Raises:
+            PubSubError: Подписка закрыта из-за ошибки
+        """
+        messages = self._dispatch(self._queue.get_many(1, timeout))
+        return messages[0] if messages else None
+
+    def get_messages(
+        self, max_n: int = 100, timeout: Optional[float] = 0.0
+    ) -> List[Message]:
+        """
+        Забирает из очереди до `max_n` сообщений за раз.
+
+        Сообщения с обработчиками передаются им и в результат не попадают.
+
+        Args:
+            max_n: Максимальное число сообщений
+            timeout: Сколько ждать первого сообщения (None - без ограничения)
+        """
+        return self._dispatch(self._queue.get_many(max_n, timeout))
+
+    def listen(self) -> Iterator[Message]:
+        """Выдаёт сообщения без обработчиков, пока подписка не закрыта."""
+        while True:
+            messages = self._queue.get_many(100, None)
+            if not messages:
+                return
+            yield from self._dispatch(messages)
+
+    def run_in_thread(self, batch: int = 100) -> threading.Thread:
+        """
+        Запускает поток, раздающий сообщения обработчикам.
+
+        Сообщения без обработчика в этом режиме отбрасываются, поэтому
+        обработчик должен быть задан для каждой подписки. Исключение
+        обработчика записывается в журнал `zumic.pubsub` и не
+        останавливает раздачу следующих сообщений.
+        """
+        if self._dispatcher is None:
+
+            def run() -> None:
+                try:
+                    while True:
+                        messages = self._queue.get_many(batch, None)
+                        if not messages:
+                            return
+                        self._dispatch(messages, log_errors=True)
+                except PubSubError:
+                    return
+
+            self._dispatcher = threading.Thread(
+                target=run, name="zumic-pubsub-dispatcher", daemon=True
+            )
+            self._dispatcher.start()
+        return self._dispatcher
+
+    def close(self) -> None:
+        """Закрывает подписку, её соединение и фоновые потоки."""
+        self._closed = True
+        self._queue.close()
+        self.connection.disconnect()
+        for thread in (self._reader, self._dispatcher):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join()
+
+    def __enter__(self):
+        """Поддержка контекстного менеджера."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Закрывает подписку."""
+        self.close()
+        return False
@@ -0,0 +1,378 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    TypeVar,
+    Union,
+)
+import itertools
+import threading
+import time
+
+from zumic.cache import command_name
+from zumic.client import Client, client_for_address
+from zumic.commands import BatchCommand, CoreCommands
+from zumic.encoder import EncodableT
+from zumic.exceptions import ConnectionError
+from zumic.pipeline import Pipeline
+from zumic.pubsub import PubSub
+
+T = TypeVar("T")
+
+# Команды только для чтения, которые можно выполнять на репликах.
+# SCAN сюда не входит: курсор действителен только на своём узле
+READ_COMMANDS = frozenset(
+    {
+        "GET",
+        "MGET",
+        "EXISTS",
+        "TTL",
+        "PTTL",
+        "STRLEN",
+        "TYPE",
+        "KEYS",
+        "DBSIZE",
+        "GETRANGE",
+    }
+)
+
+
+class ReplicaSelector:
+    """
+    Стратегия выбора реплики для чтения.
+
+    Методы вызываются из разных потоков; `started`/`finished` окружают
+    каждый запрос к реплике.
+    """
+
+    def order(self, nodes: List[str]) -> List[str]:
+        """Возвращает реплики в порядке предпочтения (первая - основная)."""
+        raise NotImplementedError
+
+    def started(self, node: str) -> None:
+        """Вызывается перед отправкой запроса на реплику."""
+
+    def finished(self, node: str, latency: float, error: bool) -> None:
+        """Вызывается после ответа реплики (или ошибки)."""
+
+
+class RoundRobinSelector(ReplicaSelector):
+    """Реплики выбираются по очереди."""
+
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+
+    def order(self, nodes: List[str]) -> List[str]:
+        start = next(self._counter) % len(nodes)
+        return nodes[start:] + nodes[:start]
+
+
+class LeastOutstandingSelector(ReplicaSelector):
+    """
+    Выбирается реплика с наименьшим числом запросов в работе; при равенстве -
+    по очереди, чтобы нагрузка не скапливалась на первой реплике.
+    """
+
+    def __init__(self) -> None:
+        self._outstanding: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+
+    def order(self, nodes: List[str]) -> List[str]:
+        start = next(self._counter) % len(nodes)
+        rotated = nodes[start:] + nodes[:start]
+        with self._lock:
+            return sorted(rotated, key=lambda node: self._outstanding.get(node, 0))
+
+    def outstanding(self, node: str) -> int:
+        """Число запросов к реплике, ожидающих ответа."""
+        return self._outstanding.get(node, 0)
+
+    def started(self, node: str) -> None:
+        with self._lock:
+            self._outstanding[node] = self._outstanding.get(node, 0) + 1
+
+    def finished(self, node: str, latency: float, error: bool) -> None:
+        with self._lock:
+            self._outstanding[node] = self._outstanding.get(node, 1) - 1
+
+
+class EWMASelector(LeastOutstandingSelector):
+    """
+    Выбор по экспоненциально сглаженной задержке реплики, умноженной на
+    число запросов в работе плюс один.
+
+    Реплики без замеров считаются самыми быстрыми, чтобы они быстрее
+    получили оценку. Ошибка учитывается как задержка `error_penalty`.
+    """
+
+    def __init__(self, alpha: float = 0.3, error_penalty: float = 1.0) -> None:
+        """
+        Args:
+            alpha: Вес нового замера (0 < alpha <= 1)
+            error_penalty: Задержка в секундах, которой засчитывается ошибка
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha должен быть в диапазоне (0, 1]")
+        super().__init__()
+        self.alpha = alpha
+        self.error_penalty = error_penalty
+        self._latency: Dict[str, float] = {}
+
+    def latency(self, node: str) -> Optional[float]:
+        """Текущая оценка задержки реплики в секундах."""
+        return self._latency.get(node)
+
+    def order(self, nodes: List[str]) -> List[str]:
+        start = next(self._counter) % len(nodes)
+        rotated = nodes[start:] + nodes[:start]
+        with self._lock:
+            return sorted(
+                rotated,
+                key=lambda node: (
+                    self._latency.get(node, 0.0) * (self._outstanding.get(node, 0) + 1)
+                ),
+            )
+
+    def finished(self, node: str, latency: float, error: bool) -> None:
+        if error:
+            latency = max(latency, self.error_penalty)
+        with self._lock:
+            self._outstanding[node] = self._outstanding.get(node, 1) - 1
+            previous = self._latency.get(node)
+            self._latency[node] = (
+                latency
+                if previous is None
+                else previous + self.alpha * (latency - previous)
+            )
+
+
+SELECTORS: Dict[str, Callable[[], ReplicaSelector]] = {
+    "round_robin": RoundRobinSelector,
+    "least_outstanding": LeastOutstandingSelector,
+    "ewma": EWMASelector,
+}
+
+
+class ReplicatedClient(CoreCommands[Any]):
+    """
+    Клиент для основного узла с репликами чтения.
+
+    Команды из `READ_COMMANDS` выполняются на репликах, остальные - на
+    основном узле. Реплика выбирается стратегией `selector`; если она
+    недоступна, запрос повторяется на следующей реплике, а затем на основном
+    узле. С `hedge_after` чтение, не получившее ответа за это время,
+    дублируется на следующую реплику, и используется первый ответ.
+
+    Реплики отстают от основного узла, поэтому только что записанное
+    значение может прочитаться не сразу. Конвейеры, транзакции и Pub/Sub
+    выполняются на основном узле.
+    """
+
+    def __init__(
+        self,
+        primary: Union[str, Client],
+        replicas: Union[Iterable[str], Mapping[str, Client]] = (),
+        selector: Union[str, ReplicaSelector] = "round_robin",
+        hedge_after: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        **client_kwargs: Any,
+    ) -> None:
+        """
+        Инициализирует клиент с репликами.
+
+        Args:
+            primary: Адрес основного узла `host:port` или готовый клиент
+            replicas: Адреса реплик `host:port` или готовые клиенты по именам
+            selector: Стратегия выбора реплики: `round_robin`,
+                `least_outstanding`, `ewma` или свой `ReplicaSelector`
+            hedge_after: Через сколько секунд без ответа дублировать чтение
+                на другую реплику (None - не дублировать)
+            max_workers: Размер пула потоков для дублированных чтений
+            **client_kwargs: Параметры `Client` для узлов, заданных адресами
+        """
+        self.primary = (
+            primary
+            if isinstance(primary, Client)
+            else client_for_address(primary, client_kwargs)
+        )
+        if isinstance(replicas, Mapping):
+            self.replicas: Dict[str, Client] = dict(replicas)
+        else:
+            self.replicas = {
+                node: client_for_address(node, client_kwargs) for node in replicas
+            }
+        self.codec = self.primary.codec
+        self.decode_responses = self.primary.decode_responses
+        if isinstance(selector, str):
+            if selector not in SELECTORS:
+                raise ValueError(f"Неизвестная стратегия выбора реплики: {selector!r}")
+            selector = SELECTORS[selector]()
+        self.selector = selector
+        self.hedge_after = hedge_after
+        self.max_workers = max_workers or max(len(self.replicas), 1) * 2
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def nodes(self) -> List[str]:
+        """Имена реплик."""
+        return list(self.replicas)
+
+    def execute_command(
+        self,
+        *args: EncodableT,
+        callback: Optional[Callable[[Any], Any]] = None,
+        **options: Any,
+    ) -> Any:
+        """Выполняет чтение на реплике, а остальные команды - на основном узле."""
+        if not args:
+            raise ValueError("Команда не может быть пустой")
+        if not self.replicas or command_name(args) not in READ_COMMANDS:
+            return self.primary.execute_command(*args, callback=callback, **options)
+        return self._read(
+            lambda c: c.execute_command(*args, callback=callback, **options)
+        )
+
+    def _read(self, func: Callable[[Client], T]) -> T:
+        """Выполняет чтение на репликах с переключением и дублированием."""
+        order = self.selector.order(list(self.replicas))
+        if self.hedge_after is not None and len(order) > 1:
+            return self._hedged(order, func)
+        for node in order:
+            try:
+                return self._call_replica(node, func)
+            except ConnectionError:
+                continue
+        return func(self.primary)
+
+    def _call_replica(self, node: str, func: Callable[[Client], T]) -> T:
+        """Выполняет запрос к реплике, сообщая стратегии его задержку."""
+        selector = self.selector
+        selector.started(node)
+        started = time.perf_counter()
+        error = True
+        try:
+            result = func(self.replicas[node])
+            error = False
+            return result
+        finally:
+            selector.finished(node, time.perf_counter() - started, error)
+
+    def _hedged(self, order: List[str], func: Callable[[Client], T]) -> T:
+        """
+        Отправляет чтение на первую реплику и, если ответа нет дольше
+        `hedge_after`, дублирует его на следующую. Возвращает первый
+        успешный ответ; медленный запрос дорабатывает в фоне. Запросы
+        выполняются в копии контекста вызывающего потока (бюджет времени).
+        """
+        executor = self._get_executor()
+        pending: List["Future[T]"] = [
+            executor.submit(copy_context().run, self._call_replica, order[0], func)
+        ]
+        remaining = iter(order[1:])
+        timeout: Optional[float] = self.hedge_after
+        while pending:
+            done, _ = wait(pending, timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+                error = future.exception()
+                if error is None:
+                    return future.result()
+                if not isinstance(error, ConnectionError):
+                    raise error
+            # Дублируем по таймауту или сразу после ошибки реплики
+            node = next(remaining, None)
+            if node is not None:
+                pending.append(
+                    executor.submit(copy_context().run, self._call_replica, node, func)
+                )
+            else:
+                timeout = None
+        return func(self.primary)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="zumic-hedge"
+                )
+            return self._executor
+
+    def _local_result(self, value: Any) -> Any:
+        """Возвращает результат, не требующий обращения к серверу."""
+        return value
+
+    def _execute_batch(
+        self, commands: List[BatchCommand], combine: Callable[[List[Any]], Any]
+    ) -> Any:
+        """
+        Выполняет команды одним конвейером: на реплике, если все они только
+        читают, иначе - на основном узле.
+        """
+        if self.replicas and all(
+            command_name(args) in READ_COMMANDS for args, _, _ in commands
+        ):
+            return self._read(lambda c: c._execute_batch(commands, combine))
+        return self.primary._execute_batch(commands, combine)
+
+    def scan_iter(
+        self,
+        match: Optional[str] = None,
+        count: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> Iterator[Any]:
+        """
+        Обходит ключи одной реплики (курсор SCAN действителен только на ней).
+
+        Args:
+            match: Шаблон ключей
+            count: Подсказка серверу о размере порции
+            prefetch: Запрашивать следующую порцию заранее
+        """
+        if not self.replicas:
+            return self.primary.scan_iter(match, count, prefetch)
+        node = self.selector.order(list(self.replicas))[0]
+        return self.replicas[node].scan_iter(match, count, prefetch)
+
+    def pipeline(
+        self, raise_on_error: bool = True, transaction: bool = False
+    ) -> Pipeline:
+        """Создаёт конвейер на основном узле."""
+        return self.primary.pipeline(raise_on_error, transaction)
+
+    def transaction(
+        self, func: Callable[[Pipeline], Any], *watch_keys: EncodableT, **kwargs: Any
+    ) -> Any:
+        """Выполняет транзакцию на основном узле (см. `Client.transaction`)."""
+        return self.primary.transaction(func, *watch_keys, **kwargs)
+
+    def pubsub(self, **options: Any) -> PubSub:
+        """Создаёт подписчика Pub/Sub на основном узле (см. `Client.pubsub`)."""
+        return self.primary.pubsub(**options)
+
+    def close(self) -> None:
+        """Закрывает соединения всех узлов и пул потоков."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.primary.close()
+        for client in self.replicas.values():
+            client.close()
+
+    def __enter__(self):
+        """Поддержка контекстного менеджера."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Закрывает все соединения."""
+        self.close()
+        return False
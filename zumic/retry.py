@@ -0,0 +1,226 @@
+from typing import Any, Awaitable, Callable, Optional, Sequence, Tuple, Type, TypeVar
+import asyncio
+import random
+import time
+
+from zumic.cache import command_name
+from zumic.encoder import EncodableT
+from zumic.exceptions import ConnectionError
+from zumic.timeouts import remaining
+
+T = TypeVar("T")
+
+# Ошибки, после которых команду можно безопасно повторить на новом соединении
+DEFAULT_RETRY_ON: Tuple[Type[BaseException], ...] = (ConnectionError,)
+
+# Команды, повторное выполнение которых меняет результат: если ошибка
+# произошла после их отправки, сервер мог уже выполнить их один раз
+NON_IDEMPOTENT_COMMANDS = frozenset(
+    {
+        "INCR",
+        "DECR",
+        "INCRBY",
+        "DECRBY",
+        "INCRBYFLOAT",
+        "APPEND",
+        "EVAL",
+        "EVALSHA",
+        "PUBLISH",
+    }
+)
+
+# Показатель степени ограничен, чтобы base * 2**attempt не переполнялся
+_MAX_EXPONENT = 64
+
+
+class Backoff:
+    """Стратегия задержки перед повторной попыткой."""
+
+    def compute(self, attempt: int) -> float:
+        """
+        Возвращает задержку в секундах.
+
+        Args:
+            attempt: Номер повтора, начиная с 0
+        """
+        raise NotImplementedError
+
+
+class NoBackoff(Backoff):
+    """Повтор без задержки."""
+
+    def compute(self, attempt: int) -> float:
+        return 0.0
+
+
+class ConstantBackoff(Backoff):
+    """Одинаковая задержка перед каждым повтором."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    def compute(self, attempt: int) -> float:
+        return self.delay
+
+
+class ExponentialBackoff(Backoff):
+    """
+    Экспоненциальная задержка `base * 2**attempt`, не больше `cap`.
+
+    С `jitter` задержка выбирается случайно от 0 до этого значения
+    («full jitter»): клиенты, потерявшие соединение одновременно
+    (например, при перезапуске сервера), переподключаются вразброс,
+    а не все разом.
+    """
+
+    def __init__(self, base: float = 0.01, cap: float = 1.0, jitter: bool = True):
+        """
+        Args:
+            base: Задержка первого повтора в секундах
+            cap: Максимальная задержка в секундах
+            jitter: Выбирать задержку случайно в пределах [0, задержка]
+        """
+        if base < 0 or cap < 0:
+            raise ValueError("base и cap не могут быть отрицательными")
+        self.base = base
+        self.cap = cap
+        self.jitter = jitter
+
+    def compute(self, attempt: int) -> float:
+        delay = min(self.cap, self.base * 2 ** min(attempt, _MAX_EXPONENT))
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+class Retry:
+    """
+    Политика повторов: какие ошибки повторять, сколько раз и с какой
+    задержкой.
+
+    Перед повтором вызывается `fail` (например, чтобы закрыть соединение),
+    а следующая попытка открывает соединение заново. Повторы не выходят
+    за бюджет времени `zumic.timeouts.deadline`.
+
+    Ошибка до отправки команды (подключение, запись в сокет) всегда
+    допускает повтор. Ошибка после отправки (например, таймаут чтения
+    ответа) повторяется только для идемпотентных команд: INCR или APPEND
+    могли уже выполниться на сервере, и повтор применил бы их дважды.
+    `idempotent_only=False` снимает это ограничение.
+    """
+
+    def __init__(
+        self,
+        backoff: Optional[Backoff] = None,
+        retries: int = 3,
+        max_elapsed: Optional[float] = None,
+        retry_on: Tuple[Type[BaseException], ...] = DEFAULT_RETRY_ON,
+        idempotent_only: bool = True,
+    ) -> None:
+        """
+        Args:
+            backoff: Стратегия задержки (по умолчанию `ExponentialBackoff`)
+            retries: Максимальное число повторов (0 - без повторов)
+            max_elapsed: Предел общего времени всех попыток в секундах;
+                повтор, который его превысит, не выполняется
+            retry_on: Классы ошибок, после которых допустим повтор
+            idempotent_only: Не повторять команды из
+                `NON_IDEMPOTENT_COMMANDS`, если ошибка произошла после
+                их отправки
+        """
+        if retries < 0:
+            raise ValueError("retries не может быть отрицательным")
+        self.backoff = backoff if backoff is not None else ExponentialBackoff()
+        self.retries = retries
+        self.max_elapsed = max_elapsed
+        self.retry_on = retry_on
+        self.idempotent_only = idempotent_only
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """Проверяет, можно ли повторить операцию после этой ошибки."""
+        return isinstance(error, self.retry_on)
+
+    def can_repeat_sent(self, args: Sequence[EncodableT]) -> bool:
+        """Проверяет, можно ли повторить уже отправленную серверу команду."""
+        if not self.idempotent_only:
+            return True
+        return command_name(args) not in NON_IDEMPOTENT_COMMANDS
+
+    def _next_delay(
+        self,
+        error: BaseException,
+        attempt: int,
+        started: float,
+        retryable: Optional[Callable[[BaseException], bool]] = None,
+    ) -> Optional[float]:
+        """Задержка перед повтором или None, если повторять нельзя."""
+        if attempt >= self.retries or not self.is_retryable(error):
+            return None
+        if retryable is not None and not retryable(error):
+            return None
+        delay = self.backoff.compute(attempt)
+        if (
+            self.max_elapsed is not None
+            and time.monotonic() - started + delay > self.max_elapsed
+        ):
+            return None
+        # Повтор, который не успеет начаться до конца бюджета команды,
+        # бессмысленен
+        left = remaining()
+        if left is not None and delay >= left:
+            return None
+        return delay
+
+    def call_with_retry(
+        self,
+        do: Callable[[], T],
+        fail: Optional[Callable[[BaseException], Any]] = None,
+        retryable: Optional[Callable[[BaseException], bool]] = None,
+    ) -> T:
+        """
+        Выполняет `do`, повторяя его после допустимых ошибок.
+
+        Args:
+            do: Операция
+            fail: Вызывается с ошибкой перед каждым повтором
+            retryable: Дополнительная проверка ошибки этой операции
+                (например, успела ли команда уйти на сервер)
+
+        Raises:
+            Последнюю ошибку, если повторы исчерпаны или она не допускает
+            повтора
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return do()
+            except Exception as error:
+                delay = self._next_delay(error, attempt, started, retryable)
+                if delay is None:
+                    raise
+                if fail is not None:
+                    fail(error)
+            attempt += 1
+            if delay:
+                time.sleep(delay)
+
+    async def call_with_retry_async(
+        self,
+        do: Callable[[], Awaitable[T]],
+        fail: Optional[Callable[[BaseException], Awaitable[Any]]] = None,
+        retryable: Optional[Callable[[BaseException], bool]] = None,
+    ) -> T:
+        """Асинхронный вариант `call_with_retry`."""
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return await do()
+            except Exception as error:
+                delay = self._next_delay(error, attempt, started, retryable)
+                if delay is None:
+                    raise
+                if fail is not None:
+                    await fail(error)
+            attempt += 1
+            if delay:
+                await asyncio.sleep(delay)
@@ -0,0 +1,71 @@
+from typing import TYPE_CHECKING, Any, Optional, Sequence, Union
+import hashlib
+
+from zumic.encoder import EncodableT
+
+if TYPE_CHECKING:
+    from zumic.commands import CoreCommands
+
+
+class Script:
+    """
+    Скрипт, выполняемый на сервере по своему SHA1 (EVALSHA).
+
+    SHA1 вычисляется один раз при регистрации, поэтому обычный вызов
+    отправляет только хэш, ключи и аргументы. Если скрипта нет в кэше
+    сервера (после перезапуска или SCRIPT FLUSH), он выполняется через
+    EVAL, который заодно снова кэширует его. В конвейере скрипты
+    загружаются перед отправкой очереди (SCRIPT EXISTS / SCRIPT LOAD).
+
+    Скрипт объявляет изменяемые ключи в `keys`: по ним инвалидируется
+    локальный кэш клиента. Кодек значений к ключам, аргументам и
+    результату скрипта не применяется.
+
+    Пример:
+        incr_capped = client.register_script(
+            "local v = redis.call('INCR', KEYS[1]) "
+            "if v > tonumber(ARGV[1]) then redis.call('SET', KEYS[1], ARGV[1]) end "
+            "return v"
+        )
+        incr_capped(keys=["counter"], args=[100])
+        incr_capped(keys=["counter"], args=[100], client=pipe)
+    """
+
+    __slots__ = ("client", "source", "sha")
+
+    def __init__(self, client: "CoreCommands[Any]", source: Union[str, bytes]) -> None:
+        """
+        Args:
+            client: Клиент или конвейер, на котором скрипт выполняется
+                по умолчанию
+            source: Текст скрипта
+        """
+        self.client = client
+        self.source = source
+        encoded = source.encode("utf-8") if isinstance(source, str) else source
+        self.sha = hashlib.sha1(encoded).hexdigest()
+
+    def __call__(
+        self,
+        keys: Sequence[EncodableT] = (),
+        args: Sequence[EncodableT] = (),
+        client: Optional["CoreCommands[Any]"] = None,
+    ) -> Any:
+        """
+        Выполняет скрипт.
+
+        Args:
+            keys: Ключи, с которыми работает скрипт (KEYS)
+            args: Остальные аргументы (ARGV)
+            client: Клиент или конвейер вместо того, на котором скрипт
+                зарегистрирован
+
+        Returns:
+            Результат скрипта в той же форме, что и у команд `client`
+            (значение, конвейер или корутина)
+        """
+        target = self.client if client is None else client
+        return target._run_script(self, keys, args)
+
+    def __repr__(self) -> str:
+        return f"Script(sha={self.sha!r})"
@@ -0,0 +1,286 @@
+from typing import Any, Dict, Optional, Union
+import json
+import lzma
+import pickle
+import zlib
+
+from zumic.encoder import EncodableT
+from zumic.exceptions import DataError
+
+# Заголовок закодированного значения: MAGIC и байт флагов, в котором младшие
+# 4 бита - сериализатор, старшие - сжатие. Значения без заголовка хранятся
+# как есть и читаются как обычные строки
+MAGIC = b"\x00Z"
+HEADER_SIZE = len(MAGIC) + 1
+
+# Идентификатор «значение не сериализовано» (строка или байты)
+RAW = 0
+
+# Сжимать значения не короче этого размера в байтах
+DEFAULT_THRESHOLD = 1024
+
+
+class Serializer:
+    """
+    Преобразование объектов в байты и обратно.
+
+    `id` записывается в заголовок значения (1-15) и должен быть уникальным
+    среди сериализаторов, которыми пишутся значения одной базы.
+    """
+
+    id = 0
+    name = ""
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JSONSerializer(Serializer):
+    """Сериализация в компактный JSON (UTF-8)."""
+
+    id = 1
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode(
+                "utf-8"
+            )
+        except (TypeError, ValueError) as e:
+            raise DataError(f"Значение нельзя сериализовать в JSON: {e}") from e
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class PickleSerializer(Serializer):
+    """
+    Сериализация через pickle.
+
+    Разбор pickle выполняет произвольный код, поэтому используйте его только
+    для баз, куда пишут доверенные клиенты.
+    """
+
+    id = 2
+    name = "pickle"
+
+    def __init__(self, protocol: int = pickle.HIGHEST_PROTOCOL) -> None:
+        self.protocol = protocol
+
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=self.protocol)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+class Compressor:
+    """Сжатие байтов; `id` записывается в заголовок значения (1-15)."""
+
+    id = 0
+    name = ""
+
+    def compress(self, data: Union[bytes, bytearray, memoryview]) -> bytes:
+        raise NotImplementedError
+
+    def decompress(self, data: Union[bytes, memoryview]) -> bytes:
+        raise NotImplementedError
+
+
+class ZlibCompressor(Compressor):
+    """Сжатие zlib: быстрое, умеренная степень сжатия."""
+
+    id = 1
+    name = "zlib"
+
+    def __init__(self, level: int = 6) -> None:
+        self.level = level
+
+    def compress(self, data: Union[bytes, bytearray, memoryview]) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: Union[bytes, memoryview]) -> bytes:
+        return zlib.decompress(data)
+
+
+class LZMACompressor(Compressor):
+    """Сжатие LZMA: медленнее zlib, но сжимает сильнее."""
+
+    id = 2
+    name = "lzma"
+
+    def __init__(self, preset: int = 6) -> None:
+        self.preset = preset
+
+    def compress(self, data: Union[bytes, bytearray, memoryview]) -> bytes:
+        return lzma.compress(data, preset=self.preset)
+
+    def decompress(self, data: Union[bytes, memoryview]) -> bytes:
+        return lzma.decompress(data)
+
+
+SERIALIZERS: Dict[str, Any] = {"json": JSONSerializer, "pickle": PickleSerializer}
+COMPRESSORS: Dict[str, Any] = {"zlib": ZlibCompressor, "lzma": LZMACompressor}
+
+# Встроенное сжатие распаковывается всегда, даже если кодек настроен на другое
+_BUILTIN_COMPRESSORS: Dict[int, Compressor] = {
+    ZlibCompressor.id: ZlibCompressor(),
+    LZMACompressor.id: LZMACompressor(),
+}
+
+
+def _resolve(value: Any, registry: Dict[str, Any], error: str) -> Any:
+    """Создаёт встроенный сериализатор или сжатие по имени."""
+    if not isinstance(value, str):
+        return value
+    if value not in registry:
+        raise ValueError(f"{error}: {value!r}")
+    return registry[value]()
+
+
+class ValueCodec:
+    """
+    Кодек значений клиента: сериализация объектов и сжатие больших значений.
+
+    Строки, байты и целые числа записываются как есть, поэтому значения
+    остаются совместимыми с клиентами без кодека, а `incr` продолжает
+    работать. Остальные объекты сериализуются, а значения не короче
+    `threshold` байт сжимаются, если это уменьшает их размер. Такие
+    значения получают короткий заголовок, по которому `get`/`mget`
+    декодируют их автоматически.
+
+    Объекты разбираются только сериализатором самого кодека: значение,
+    записанное, например, через pickle, не будет разобрано кодеком JSON.
+    """
+
+    def __init__(
+        self,
+        serializer: Union[str, Serializer, None] = "json",
+        compression: Union[str, Compressor, None] = None,
+        threshold: int = DEFAULT_THRESHOLD,
+        encoding: str = "utf-8",
+        encoding_errors: str = "replace",
+    ) -> None:
+        """
+        Args:
+            serializer: `json`, `pickle`, свой `Serializer` или None (только
+                строки, байты и числа)
+            compression: `zlib`, `lzma`, свой `Compressor` или None
+            threshold: Минимальный размер значения в байтах для сжатия
+            encoding: Кодировка строк
+            encoding_errors: Политика обработки ошибок декодирования строк
+        """
+        if threshold < 0:
+            raise ValueError("threshold не может быть отрицательным")
+        self.serializer: Optional[Serializer] = _resolve(
+            serializer, SERIALIZERS, "Неизвестный сериализатор"
+        )
+        self.compression: Optional[Compressor] = _resolve(
+            compression, COMPRESSORS, "Неизвестный алгоритм сжатия"
+        )
+        for part in (self.serializer, self.compression):
+            if part is not None and not 1 <= part.id <= 15:
+                raise ValueError("Идентификатор сериализатора и сжатия - от 1 до 15")
+        self.threshold = threshold
+        self.encoding = encoding
+        self.encoding_errors = encoding_errors
+
+    def encode(self, value: Any) -> EncodableT:
+        """
+        Кодирует значение для записи.
+
+        Raises:
+            DataError: Значение нельзя сериализовать
+        """
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        kind = RAW
+        payload: Union[bytes, bytearray, memoryview]
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            payload = value
+        elif isinstance(value, str):
+            payload = value.encode(self.encoding)
+        elif self.serializer is None:
+            name = type(value).__name__
+            raise DataError(f"Значение типа {name} нельзя записать без сериализатора")
+        else:
+            kind = self.serializer.id
+            payload = self.serializer.dumps(value)
+
+        compressed = 0
+        compression = self.compression
+        if compression is not None and len(payload) >= self.threshold:
+            packed = compression.compress(payload)
+            if len(packed) < len(payload):
+                payload = packed
+                compressed = compression.id
+
+        if kind == RAW and not compressed and bytes(payload[:2]) != MAGIC:
+            # Обычная строка: без заголовка и без копирования
+            return value
+        return MAGIC + bytes((compressed << 4 | kind,)) + payload
+
+    def decode(self, data: Any, text: bool = True) -> Any:
+        """
+        Декодирует прочитанное значение.
+
+        Args:
+            data: Значение из ответа сервера (bytes или None)
+            text: Возвращать строки без сериализации как str (иначе - bytes)
+
+        Raises:
+            DataError: Значение записано неизвестным сериализатором или
+                сжатием, либо повреждено
+        """
+        if data is None or isinstance(data, (int, list)):
+            return data
+        if isinstance(data, str):
+            return data if text else data.encode(self.encoding)
+        if data[:2] != MAGIC or len(data) < HEADER_SIZE:
+            return self._raw(data, text)
+
+        flags = data[2]
+        kind, compressed = flags & 0x0F, flags >> 4
+        payload: Union[bytes, memoryview] = memoryview(data)[HEADER_SIZE:]
+        try:
+            if compressed:
+                payload = self._compressor(compressed).decompress(payload)
+            if kind == RAW:
+                return self._raw(bytes(payload), text)
+            serializer = self.serializer
+            if serializer is None or serializer.id != kind:
+                raise DataError(
+                    f"Значение записано неизвестным сериализатором (id={kind})"
+                )
+            return serializer.loads(bytes(payload))
+        except (zlib.error, lzma.LZMAError, ValueError, pickle.UnpicklingError) as e:
+            raise DataError("Не удалось декодировать значение") from e
+
+    def _raw(self, data: bytes, text: bool) -> Union[str, bytes]:
+        return data.decode(self.encoding, self.encoding_errors) if text else data
+
+    def _compressor(self, id: int) -> Compressor:
+        if self.compression is not None and self.compression.id == id:
+            return self.compression
+        if id in _BUILTIN_COMPRESSORS:
+            return _BUILTIN_COMPRESSORS[id]
+        raise DataError(f"Значение сжато неизвестным алгоритмом (id={id})")
+
+    def __repr__(self) -> str:
+        serializer = self.serializer.name if self.serializer is not None else None
+        compression = self.compression.name if self.compression is not None else None
+        return (
+            f"ValueCodec(serializer={serializer!r}, compression={compression!r}, "
+            f"threshold={self.threshold})"
+        )
+
+
+def decode_values(codec: ValueCodec, text: bool, response: Any) -> Any:
+    """Декодирует список значений (ответ MGET)."""
+    if not isinstance(response, list):
+        return []
+    decode = codec.decode
+    return [decode(value, text) for value in response]
@@ -0,0 +1,555 @@
+from bisect import bisect
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+import hashlib
+import threading
+import time
+
+from zumic.cache import command_name
+from zumic.client import Client, client_for_address
+from zumic.commands import (
+    DEFAULT_CHUNK_SIZE,
+    BatchCommand,
+    CoreCommands,
+    _as_list,
+)
+from zumic.encoder import EncodableT, encode_arg
+from zumic.exceptions import ConnectionError
+
+T = TypeVar("T")
+G = TypeVar("G")
+
+# Число точек на кольце для одного узла
+DEFAULT_REPLICAS = 160
+
+
+def _identity(value: T) -> T:
+    return value
+
+
+def _flatten(parts: List[Any]) -> List[Any]:
+    return [item for part in parts for item in _as_list(part)]
+
+
+def _script_reply(parts: List[Any]) -> Any:
+    # SCRIPT EXISTS: скрипт есть, только если он есть на всех узлах;
+    # SCRIPT LOAD и FLUSH отвечают одинаково на всех узлах
+    if parts and all(isinstance(part, list) for part in parts):
+        return [all(found) for found in zip(*parts)]
+    return parts[0] if parts else None
+
+
+# Команды без ключей выполняются на всех узлах, а ответы сводятся
+FANOUT_COMMANDS: Dict[str, Callable[[List[Any]], Any]] = {
+    "PING": all,
+    "FLUSHDB": all,
+    "FLUSHALL": all,
+    "DBSIZE": sum,
+    "KEYS": _flatten,
+    "SCRIPT": _script_reply,
+}
+
+# Команды, ключи которых группируются по узлам, а ответы суммируются
+MULTI_KEY_COMMANDS = frozenset({"DEL", "EXISTS"})
+
+# Скрипты (`EVAL script numkeys key...`) направляются на узел первого ключа
+SCRIPT_COMMANDS = frozenset({"EVAL", "EVALSHA"})
+
+
+def hash_key(key: EncodableT) -> int:
+    """
+    Возвращает позицию ключа на кольце.
+
+    Если ключ содержит непустой хэш-тег `{...}`, хэшируется только он:
+    так связанные ключи (`user:{42}:name`, `user:{42}:age`) попадают
+    на один узел.
+    """
+    data = bytes(encode_arg(key))
+    start = data.find(b"{")
+    if start != -1:
+        end = data.find(b"}", start + 1)
+        if end > start + 1:
+            data = data[start + 1 : end]
+    digest = hashlib.md5(data, usedforsecurity=False).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class HashRing:
+    """
+    Кольцо консистентного хэширования с виртуальными узлами.
+
+    Каждый узел занимает `replicas` точек на кольце, ключ принадлежит
+    первой точке по часовой стрелке. При добавлении или удалении узла
+    переезжают только ключи, попавшие на его точки.
+    """
+
+    def __init__(
+        self, nodes: Iterable[str] = (), replicas: int = DEFAULT_REPLICAS
+    ) -> None:
+        """
+        Args:
+            nodes: Имена узлов
+            replicas: Число виртуальных узлов на один узел
+        """
+        if replicas < 1:
+            raise ValueError("replicas должен быть положительным")
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self._nodes: List[str] = []
+        for node in nodes:
+            self.add_node(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        """Узлы кольца в порядке добавления."""
+        return list(self._nodes)
+
+    def add_node(self, node: str) -> None:
+        """Добавляет узел на кольцо (повторное добавление игнорируется)."""
+        if node in self._nodes:
+            return
+        self._nodes.append(node)
+        points = [
+            (hash_key(f"{node}#{replica}"), node) for replica in range(self.replicas)
+        ]
+        merged = sorted(list(zip(self._points, self._owners)) + points)
+        self._points = [point for point, _ in merged]
+        self._owners = [owner for _, owner in merged]
+
+    def remove_node(self, node: str) -> None:
+        """Убирает узел с кольца; остальные точки не меняются."""
+        if node not in self._nodes:
+            return
+        self._nodes.remove(node)
+        kept = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def get_node(self, key: EncodableT) -> str:
+        """
+        Возвращает узел, которому принадлежит ключ.
+
+        Raises:
+            ConnectionError: На кольце нет ни одного узла
+        """
+        if not self._points:
+            raise ConnectionError("Нет доступных узлов")
+        idx = bisect(self._points, hash_key(key))
+        return self._owners[idx % len(self._owners)]
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._nodes
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+
+class ShardedClient(CoreCommands[Any]):
+    """
+    Клиент, распределяющий ключи по нескольким узлам Zumic.
+
+    Узел для ключа выбирается по кольцу консистентного хэширования.
+    Команды с несколькими ключами группируются по узлам, и группы
+    выполняются параллельно в пуле потоков. Команды без ключей
+    (`ping`, `dbsize`, `flushdb`, `keys`) выполняются на всех узлах.
+
+    Если задан `retry_interval`, недоступный узел временно снимается
+    с кольца: его ключи переходят к соседям по кольцу, остальные ключи
+    остаются на месте. Через `retry_interval` секунд узел возвращается.
+    """
+
+    def __init__(
+        self,
+        nodes: Union[Iterable[str], Mapping[str, Client]] = (),
+        replicas: int = DEFAULT_REPLICAS,
+        max_workers: Optional[int] = None,
+        retry_interval: Optional[float] = None,
+        **client_kwargs: Any,
+    ) -> None:
+        """
+        Инициализирует шардированный клиент.
+
+        Args:
+            nodes: Адреса узлов `host:port` или готовые клиенты по именам узлов
+            replicas: Число виртуальных узлов на один узел
+            max_workers: Размер пула потоков для параллельных запросов
+                (None - по числу узлов)
+            retry_interval: На сколько секунд снимать с кольца недоступный
+                узел (None - не снимать, ошибка передаётся вызывающему)
+            **client_kwargs: Параметры, передаваемые в `Client` каждого узла
+        """
+        if isinstance(nodes, Mapping):
+            self.clients: Dict[str, Client] = dict(nodes)
+        else:
+            self.clients = {
+                node: client_for_address(node, client_kwargs) for node in nodes
+            }
+        if not self.clients:
+            raise ValueError("Нужен хотя бы один узел")
+
+        # Значения кодируются кодеком клиентов узлов
+        first = next(iter(self.clients.values()))
+        self.codec = first.codec
+        self.decode_responses = first.decode_responses
+        self.ring = HashRing(self.clients, replicas)
+        self.max_workers = max_workers or len(self.clients)
+        self.retry_interval = retry_interval
+        self._client_kwargs = client_kwargs
+        self._lock = threading.Lock()
+        # Узлы, снятые с кольца, и время, когда их можно вернуть
+        self._down: Dict[str, float] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def add_node(self, node: str, client: Optional[Client] = None) -> None:
+        """
+        Добавляет узел. На него переезжает только часть ключей соседей.
+
+        Args:
+            node: Имя узла (`host:port`, если клиент не передан)
+            client: Готовый клиент узла
+        """
+        with self._lock:
+            if client is None:
+                client = client_for_address(node, self._client_kwargs)
+            self.clients[node] = client
+            self._down.pop(node, None)
+            self.ring.add_node(node)
+
+    def remove_node(self, node: str) -> None:
+        """Удаляет узел и закрывает его соединения."""
+        with self._lock:
+            client = self.clients.pop(node, None)
+            self._down.pop(node, None)
+            self.ring.remove_node(node)
+        if client is not None:
+            client.close()
+
+    def mark_down(self, node: str, interval: Optional[float] = None) -> None:
+        """
+        Временно снимает узел с кольца.
+
+        Args:
+            node: Имя узла
+            interval: На сколько секунд (None - `retry_interval`, а если он
+                не задан - до вызова `mark_up`)
+        """
+        if interval is None:
+            interval = self.retry_interval
+        with self._lock:
+            if node not in self.clients:
+                return
+            until = (
+                time.monotonic() + interval if interval is not None else float("inf")
+            )
+            self._down[node] = until
+            self.ring.remove_node(node)
+
+    def mark_up(self, node: str) -> None:
+        """Возвращает снятый узел на кольцо."""
+        with self._lock:
+            if self._down.pop(node, None) is not None:
+                self.ring.add_node(node)
+
+    def get_node(self, key: EncodableT) -> str:
+        """Возвращает имя узла, которому принадлежит ключ."""
+        with self._lock:
+            self._restore_locked(time.monotonic())
+            return self.ring.get_node(key)
+
+    def get_client(self, key: EncodableT) -> Client:
+        """Возвращает клиент узла, которому принадлежит ключ."""
+        return self.clients[self.get_node(key)]
+
+    def _restore_locked(self, now: float) -> None:
+        """Возвращает на кольцо узлы, у которых истёк срок снятия."""
+        for node, until in list(self._down.items()):
+            if now >= until:
+                del self._down[node]
+                self.ring.add_node(node)
+
+    def _live_nodes(self) -> List[str]:
+        with self._lock:
+            self._restore_locked(time.monotonic())
+            return self.ring.nodes
+
+    def _group_by_node(
+        self, items: Iterable[T], key: Callable[[T], EncodableT]
+    ) -> Dict[str, List[T]]:
+        """Группирует элементы по узлам их ключей, сохраняя исходный порядок."""
+        groups: Dict[str, List[T]] = {}
+        with self._lock:
+            self._restore_locked(time.monotonic())
+            for item in items:
+                groups.setdefault(self.ring.get_node(key(item)), []).append(item)
+        return groups
+
+    def _call_node(self, node: str, func: Callable[[Client, G], T], arg: G) -> T:
+        """
+        Выполняет запрос к узлу.
+
+        Если узел недоступен и задан `retry_interval`, узел снимается
+        с кольца, а ошибка передаётся выше, чтобы вызывающий код повторил
+        запрос на новом владельце ключей.
+        """
+        try:
+            return func(self.clients[node], arg)
+        except ConnectionError:
+            if self.retry_interval is not None:
+                self.mark_down(node)
+            raise
+
+    def _run_on_nodes(
+        self, groups: Mapping[str, G], func: Callable[[Client, G], T]
+    ) -> Dict[str, T]:
+        """
+        Выполняет `func(клиент, группа)` для каждого узла параллельно.
+
+        Каждая группа выполняется в копии контекста вызывающего потока,
+        поэтому на неё распространяется бюджет `zumic.timeouts.deadline`.
+        """
+        if len(groups) == 1:
+            ((node, arg),) = groups.items()
+            return {node: self._call_node(node, func, arg)}
+
+        executor = self._get_executor()
+        futures = {
+            node: executor.submit(copy_context().run, self._call_node, node, func, arg)
+            for node, arg in groups.items()
+        }
+        return {node: future.result() for node, future in futures.items()}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="zumic-shard"
+                )
+            return self._executor
+
+    def _with_failover(self, func: Callable[[], T]) -> T:
+        """
+        Выполняет операцию, повторяя её один раз, если узел был снят
+        с кольца из-за ошибки соединения.
+        """
+        try:
+            return func()
+        except ConnectionError:
+            if self.retry_interval is None:
+                raise
+            return func()
+
+    def execute_command(
+        self,
+        *args: EncodableT,
+        callback: Optional[Callable[[Any], Any]] = None,
+        **options: Any,
+    ) -> Any:
+        """
+        Направляет команду на узел(ы) и применяет к ответу постобработку.
+
+        Команда с ключом выполняется на узле первого ключа, команды
+        из `MULTI_KEY_COMMANDS` - на всех узлах своих ключей, команды
+        из `FANOUT_COMMANDS` - на всех узлах. Скрипт выполняется на узле
+        первого из своих ключей: все его ключи должны находиться на одном
+        узле (например, иметь общий хэш-тег).
+        """
+        if not args:
+            raise ValueError("Команда не может быть пустой")
+
+        name = command_name(args)
+
+        def run_on_node(c: Client, _: Any = None) -> Any:
+            return c.execute_command(*args, callback=callback, **options)
+
+        if name in FANOUT_COMMANDS:
+
+            def run_fanout() -> Any:
+                nodes = dict.fromkeys(self._live_nodes())
+                results = self._run_on_nodes(nodes, run_on_node)
+                return FANOUT_COMMANDS[name](list(results.values()))
+
+            return self._with_failover(run_fanout)
+
+        key_index = 1
+        if name in SCRIPT_COMMANDS:
+            key_index = 3 if len(args) > 2 and int(encode_arg(args[2])) else len(args)
+        if len(args) <= key_index:
+            raise ValueError(f"Команду {name} нельзя направить на узел без ключа")
+
+        if name in MULTI_KEY_COMMANDS:
+
+            def run_multi() -> Any:
+                groups = self._group_by_node(args[1:], _identity)
+                results = self._run_on_nodes(
+                    groups, lambda c, keys: c.execute_command(args[0], *keys)
+                )
+                return sum(results.values())
+
+            total = self._with_failover(run_multi)
+            return callback(total) if callback is not None else total
+
+        return self._with_failover(
+            lambda: self._call_node(self.get_node(args[key_index]), run_on_node, None)
+        )
+
+    def _local_result(self, value: Any) -> Any:
+        """Возвращает результат, не требующий обращения к серверу."""
+        return value
+
+    def _execute_batch(
+        self, commands: List[BatchCommand], combine: Callable[[List[Any]], Any]
+    ) -> Any:
+        """Выполняет команды по очереди, направляя каждую на свой узел."""
+        return combine(
+            [
+                self.execute_command(*args, callback=cb, **options)
+                for args, cb, options in commands
+            ]
+        )
+
+    def mget(
+        self, keys: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> List[Any]:
+        """
+        Получает значения многих ключей, параллельно опрашивая узлы.
+
+        Returns:
+            Значения в порядке ключей (None для отсутствующих)
+        """
+        keys = list(keys)
+
+        def run() -> List[Any]:
+            groups = self._group_by_node(range(len(keys)), keys.__getitem__)
+            results = self._run_on_nodes(
+                groups, lambda c, idx: c.mget([keys[i] for i in idx], chunk_size)
+            )
+            values: List[Any] = [None] * len(keys)
+            for node, idx in groups.items():
+                for i, value in zip(idx, results[node]):
+                    values[i] = value
+            return values
+
+        return self._with_failover(run)
+
+    def mset(
+        self,
+        mapping: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> bool:
+        """
+        Устанавливает значения многих ключей, параллельно записывая на узлы.
+
+        Returns:
+            True если все узлы записали свои ключи
+        """
+        items = list(mapping.items() if isinstance(mapping, Mapping) else mapping)
+
+        def run() -> bool:
+            groups = self._group_by_node(items, itemgetter(0))
+            results = self._run_on_nodes(
+                groups, lambda c, pairs: c.mset(pairs, chunk_size)
+            )
+            return all(results.values())
+
+        return self._with_failover(run)
+
+    def mdel(self, keys: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Удаляет многие ключи, параллельно обращаясь к узлам.
+
+        Returns:
+            Количество удалённых ключей
+        """
+        keys = list(keys)
+
+        def run() -> int:
+            groups = self._group_by_node(keys, _identity)
+            results = self._run_on_nodes(
+                groups, lambda c, group: c.mdel(group, chunk_size)
+            )
+            return sum(results.values())
+
+        return self._with_failover(run)
+
+    def scan(
+        self,
+        cursor: int = 0,
+        match: Optional[str] = None,
+        count: Optional[int] = None,
+    ) -> Any:
+        """
+        Выполняет один шаг обхода ключей всех узлов.
+
+        Узлы обходятся по очереди в порядке `clients`. Курсор объединяет
+        номер узла и курсор SCAN на нём (`курсор узла * число узлов +
+        номер узла`), поэтому передаётся между вызовами как обычный курсор
+        SCAN. Узлы, снятые с кольца, пропускаются.
+
+        Args:
+            cursor: Курсор из предыдущего шага (0 - начать обход)
+            match: Шаблон ключей
+            count: Подсказка узлу о размере порции
+
+        Returns:
+            Пару (следующий курсор, ключи); курсор 0 означает конец обхода
+        """
+        nodes = list(self.clients)
+        node_cursor, index = divmod(cursor, len(nodes))
+        live = set(self._live_nodes())
+        while index < len(nodes) and nodes[index] not in live:
+            index, node_cursor = index + 1, 0
+        if index == len(nodes):
+            return 0, []
+
+        node_cursor, keys = self._call_node(
+            nodes[index], lambda c, _: c.scan(node_cursor, match, count), None
+        )
+        if node_cursor == 0:
+            # Узел пройден, следующий шаг начинает обход следующего узла
+            index += 1
+            if index == len(nodes):
+                return 0, keys
+        return node_cursor * len(nodes) + index, keys
+
+    def scan_iter(
+        self,
+        match: Optional[str] = None,
+        count: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> Iterator[Any]:
+        """Лениво обходит ключи всех узлов по очереди."""
+        for node in self._live_nodes():
+            yield from self.clients[node].scan_iter(match, count, prefetch)
+
+    def close(self) -> None:
+        """Закрывает соединения всех узлов и пул потоков."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for client in list(self.clients.values()):
+            client.close()
+
+    def __enter__(self):
+        """Поддержка контекстного менеджера."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Закрывает все соединения."""
+        self.close()
+        return False
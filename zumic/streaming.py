@@ -0,0 +1,140 @@
+from typing import IO, Any, Optional, Sequence, Union
+import io
+import os
+import stat
+
+from zumic.connection_protocol import ConnectionProtocol
+from zumic.encoder import EncodableT
+from zumic.exceptions import DataError
+from zumic.parser import write_all
+
+# Приёмник значения: записываемый буфер или файловый объект
+SinkT = Union[memoryview, IO[bytes]]
+
+
+def _flat_view(obj: Any) -> Optional[memoryview]:
+    """Возвращает плоское побайтовое представление буфера или None."""
+    try:
+        view = memoryview(obj)
+    except TypeError:
+        return None
+    if not view.c_contiguous:
+        raise TypeError("Несмежный буфер нельзя использовать для потоковой передачи")
+    if view.format != "B" or view.ndim != 1:
+        view = view.cast("B")
+    return view
+
+
+def writable_target(target: Any) -> SinkT:
+    """
+    Приводит приёмник `get_into` к записываемому представлению буфера
+    или проверяет, что это файловый объект.
+
+    Raises:
+        TypeError: Объект не является ни записываемым буфером, ни файлом
+    """
+    view = _flat_view(target)
+    if view is not None and not view.readonly:
+        return view
+    if hasattr(target, "write"):
+        return target
+    raise TypeError(
+        f"Нельзя записать значение в объект типа {type(target).__name__}: "
+        "ожидался записываемый буфер или файловый объект"
+    )
+
+
+def readable_source(source: Any) -> Optional[memoryview]:
+    """
+    Возвращает представление источника `set_from`, если это буфер
+    (bytes, memoryview, mmap и т.п.); для файловых объектов - None.
+
+    Raises:
+        TypeError: Объект не является ни буфером, ни файлом
+    """
+    view = _flat_view(source)
+    if view is None and not hasattr(source, "read"):
+        raise TypeError(
+            f"Нельзя прочитать значение из объекта типа {type(source).__name__}: "
+            "ожидался буфер или файловый объект"
+        )
+    return view
+
+
+def stream_size(source: IO[bytes]) -> int:
+    """
+    Определяет, сколько байт осталось в файле от текущей позиции.
+
+    Raises:
+        ValueError: Размер нельзя определить (например, у канала)
+    """
+    try:
+        info = os.fstat(source.fileno())
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        info = None
+    if info is not None and stat.S_ISREG(info.st_mode):
+        return max(info.st_size - source.tell(), 0)
+    if info is None and source.seekable():
+        position = source.tell()
+        end = source.seek(0, io.SEEK_END)
+        source.seek(position)
+        return end - position
+    raise ValueError("Размер источника неизвестен, передайте size")
+
+
+def store(target: SinkT, data: bytes) -> None:
+    """Записывает прочитанное целиком значение в приёмник."""
+    if isinstance(target, memoryview):
+        if len(data) > target.nbytes:
+            raise DataError(
+                f"Значение ({len(data)} байт) не помещается в буфер "
+                f"({target.nbytes} байт)"
+            )
+        target[: len(data)] = data
+    else:
+        write_all(target, memoryview(data))
+
+
+def read_into(connection: ConnectionProtocol, target: SinkT) -> Optional[int]:
+    """
+    Читает ответ-строку прямо в приёмник.
+
+    Соединения без потокового чтения (`read_bulk_into`) читают значение
+    целиком и затем копируют его.
+
+    Returns:
+        Длину значения или None, если сервер вернул null
+    """
+    reader = getattr(connection, "read_bulk_into", None)
+    if reader is not None:
+        return reader(target)
+    data = connection.read_response(False)
+    if data is None:
+        return None
+    if isinstance(data, str):
+        data = data.encode()
+    store(target, data)
+    return len(data)
+
+
+def send_from(
+    connection: ConnectionProtocol,
+    head: Sequence[EncodableT],
+    source: IO[bytes],
+    size: int,
+    tail: Sequence[EncodableT] = (),
+) -> None:
+    """
+    Отправляет команду, значение которой читается из файла.
+
+    Соединения без потоковой отправки (`send_command_from`) читают
+    значение в память целиком.
+    """
+    sender = getattr(connection, "send_command_from", None)
+    if sender is not None:
+        sender(head, source, size, tail)
+        return
+    data = source.read(size)
+    if len(data) < size:
+        raise DataError("Источник короче заявленного размера")
+    connection.send_command(*head, data, *tail)
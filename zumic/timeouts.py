@@ -0,0 +1,72 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+import time
+
+from zumic.exceptions import TimeoutError
+
+# Момент (time.monotonic), к которому должны завершиться команды текущего
+# потока или задачи asyncio; None - ограничения нет
+_DEADLINE: ContextVar[Optional[float]] = ContextVar("zumic_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    Ограничивает общее время всех команд внутри блока.
+
+    Бюджет покрывает подключение, ожидание соединения в пуле, отправку,
+    каждое частичное чтение ответа и повторы политики `retry`. Когда он
+    исчерпан, команда прерывается с `TimeoutError`, а соединение, на
+    котором остался недочитанный ответ, закрывается. Вложенный блок
+    может только сократить бюджет внешнего.
+
+    Контекст хранится в `contextvars`, поэтому у каждого потока и каждой
+    задачи asyncio свой бюджет.
+
+    Пример:
+        with deadline(0.05):
+            client.get("user:1")
+            client.pipeline().get("a").get("b").execute()
+
+    Args:
+        seconds: Бюджет в секундах (None - не ограничивать)
+
+    Returns:
+        Момент истечения (`time.monotonic`) или None
+    """
+    current = _DEADLINE.get()
+    if seconds is None:
+        yield current
+        return
+    expires = time.monotonic() + seconds
+    if current is not None and current < expires:
+        expires = current
+    token = _DEADLINE.set(expires)
+    try:
+        yield expires
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Оставшееся время бюджета в секундах (может быть <= 0) или None."""
+    expires = _DEADLINE.get()
+    return None if expires is None else expires - time.monotonic()
+
+
+def effective_timeout(timeout: Optional[float]) -> Optional[float]:
+    """
+    Таймаут одной операции с учётом бюджета: меньшее из `timeout`
+    и оставшегося времени.
+
+    Raises:
+        TimeoutError: Бюджет уже исчерпан
+    """
+    expires = _DEADLINE.get()
+    if expires is None:
+        return timeout
+    left = expires - time.monotonic()
+    if left <= 0:
+        raise TimeoutError("Истёк бюджет времени команды")
+    return left if timeout is None or left < timeout else timeout
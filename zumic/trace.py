@@ -0,0 +1,357 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import IO, Any, Dict, Iterator, List, Sequence, Tuple, Union
+import hashlib
+import os
+import struct
+import threading
+import time
+import weakref
+
+from zumic.encoder import EncodableT, encode_arg
+from zumic.exceptions import DataError
+from zumic.instrumentation import CommandEvent, Observer
+
+# Заголовок файла трассы: сигнатура, версия, режим аргументов и момент
+# начала записи (Unix time)
+TRACE_MAGIC = b"ZTRACE"
+TRACE_VERSION = 1
+_HEADER = struct.Struct("<6sBBd")
+
+# Режимы записи аргументов
+ARGS_SIZES = 0  # только длины
+ARGS_HASHED = 1  # длины и 64-битные хэши
+
+_MODES = {"sizes": ARGS_SIZES, "hashed": ARGS_HASHED}
+
+# Виды записей: объявление имени команды и выполненная команда (конвейер)
+_NAME = 1
+_COMMAND = 2
+_NAME_HEAD = struct.Struct("<BHB")
+_COMMAND_HEAD = struct.Struct("<BQIBH")
+_CALL_HEAD = struct.Struct("<HH")
+
+# Флаги записи команды
+FLAG_ERROR = 1
+FLAG_TRANSACTION = 2
+
+# Виды аргументов: число как есть, длина, длина и хэш
+_LITERAL = 0
+_SIZE = 1
+_HASHED = 2
+_SIZE_ARG = struct.Struct("<BI")
+_HASHED_ARG = struct.Struct("<BIQ")
+
+# Аргументы-числа не длиннее этого записываются как есть: без них
+# повтор EX, INCRBY и т.п. завершался бы ошибками сервера
+LITERAL_MAX_LENGTH = 20
+
+# Хэшируется только начало аргумента: ключи - целиком, у больших
+# значений - префикс
+HASH_PREFIX = 256
+
+# Аргументы длиннее этого при повторе заменяются заполнителем (важна
+# длина, а не содержимое), короче - строкой из своего хэша
+HASHED_REPLAY_LENGTH = 64
+
+# Размер буфера записи трассы
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+_MAX_LATENCY = 2**32 - 1
+
+
+def _is_number(data: Union[bytes, bytearray, memoryview]) -> bool:
+    if not 0 < len(data) <= LITERAL_MAX_LENGTH:
+        return False
+    digits = bytes(data[1:]) if data[:1] == b"-" else bytes(data)
+    return digits.isdigit()
+
+
+def _hash(data: Union[bytes, bytearray, memoryview]) -> int:
+    digest = hashlib.blake2b(data[:HASH_PREFIX], digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _finish_trace(file: IO[bytes], buffer: bytearray, owns_file: bool) -> None:
+    """Дописывает буфер трассы и закрывает свой файл (чужой - сбрасывает)."""
+    if file.closed:
+        return
+    file.write(buffer)
+    buffer.clear()
+    if owns_file:
+        file.close()
+    else:
+        file.flush()
+
+
+class TraceRecorder(Observer):
+    """
+    Наблюдатель, записывающий выполненные команды в компактную двоичную
+    трассу для последующего повтора (`python -m zumic.benchmark.replay`).
+
+    Для каждой команды или конвейера записываются время начала, задержка,
+    признак ошибки и аргументы. Содержимое аргументов не сохраняется:
+    в режиме `sizes` пишутся только длины, в режиме `hashed` - ещё и
+    хэши, чтобы при повторе одинаковые ключи оставались одинаковыми.
+    Короткие числа записываются как есть.
+
+    Записи копятся в буфере и сбрасываются в файл по его заполнении
+    и при `close()`. Рекордер нужно закрыть (`close()` или блок `with`):
+    иначе хвост трассы дописывается, а открытый рекордером файл
+    закрывается только при сборке рекордера мусорщиком или при выходе
+    из интерпретатора.
+
+    Пример:
+        recorder = TraceRecorder("prod.ztrace")
+        client = Client(observer=recorder)
+    """
+
+    def __init__(
+        self,
+        file: Union[str, "os.PathLike[str]", IO[bytes]],
+        args: str = "hashed",
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        """
+        Args:
+            file: Путь к файлу трассы или файловый объект, открытый
+                на запись в двоичном режиме
+            args: Режим записи аргументов: `hashed` или `sizes`
+            buffer_size: Размер буфера записи в байтах
+        """
+        if args not in _MODES:
+            raise ValueError(f"Неизвестный режим записи аргументов: {args!r}")
+        if isinstance(file, (str, os.PathLike)):
+            self._file: IO[bytes] = open(file, "wb")
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+        self.mode = _MODES[args]
+        self.buffer_size = buffer_size
+        self.started = time.perf_counter()
+        self.records = 0
+        self._names: Dict[str, int] = {}
+        self._buffer = bytearray(
+            _HEADER.pack(TRACE_MAGIC, TRACE_VERSION, self.mode, time.time())
+        )
+        self._lock = threading.Lock()
+        self._closed = False
+        # Не ссылается на рекордер, поэтому не мешает его сборке
+        self._finalizer = weakref.finalize(
+            self, _finish_trace, self._file, self._buffer, self._owns_file
+        )
+
+    def after_command(self, event: CommandEvent) -> None:
+        calls = event.batch if event.batch is not None else [event.args]
+        flags = FLAG_ERROR if event.error is not None else 0
+        if event.name == "EXEC":
+            flags |= FLAG_TRANSACTION
+        start = max(int((event.started - self.started) * 1e6), 0)
+        latency = min(int(event.duration * 1e6), _MAX_LATENCY)
+        with self._lock:
+            if self._closed:
+                return
+            record = bytearray(
+                _COMMAND_HEAD.pack(_COMMAND, start, latency, flags, len(calls))
+            )
+            for args in calls:
+                self._pack_call(record, args)
+            self._buffer += record
+            self.records += 1
+            if len(self._buffer) >= self.buffer_size:
+                self._flush()
+
+    def _pack_call(self, record: bytearray, args: Sequence[EncodableT]) -> None:
+        first = args[0]
+        name = first if isinstance(first, str) else bytes(encode_arg(first)).decode()
+        name_id = self._names.get(name)
+        if name_id is None:
+            name_id = self._names[name] = len(self._names)
+            encoded = name.encode("utf-8")[:255]
+            self._buffer += _NAME_HEAD.pack(_NAME, name_id, len(encoded))
+            self._buffer += encoded
+        record += _CALL_HEAD.pack(name_id, max(len(args) - 1, 0))
+        hashed = self.mode == ARGS_HASHED
+        for index in range(1, len(args)):
+            data = encode_arg(args[index])
+            if _is_number(data):
+                record += bytes((_LITERAL, len(data)))
+                record += data
+            elif hashed:
+                record += _HASHED_ARG.pack(_HASHED, len(data), _hash(data))
+            else:
+                record += _SIZE_ARG.pack(_SIZE, len(data))
+
+    def _flush(self) -> None:
+        self._file.write(self._buffer)
+        self._buffer.clear()
+
+    def flush(self) -> None:
+        """Сбрасывает накопленные записи в файл."""
+        with self._lock:
+            if not self._closed:
+                self._flush()
+                self._file.flush()
+
+    def close(self) -> None:
+        """Сбрасывает записи и закрывает файл, открытый самим рекордером."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._finalizer()
+
+    def __enter__(self):
+        """Поддержка контекстного менеджера."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Закрывает трассу."""
+        self.close()
+        return False
+
+
+@dataclass
+class TraceRecord:
+    """Одна записанная команда или конвейер с восстановленными аргументами."""
+
+    started: float  # секунды от начала трассы
+    latency: float  # исходная задержка в секундах
+    calls: List[Tuple[bytes, ...]] = field(default_factory=list)
+    flags: int = 0
+
+    @property
+    def name(self) -> str:
+        """Имя команды (для конвейера - первой команды)."""
+        return self.calls[0][0].decode("utf-8", "replace") if self.calls else ""
+
+    @property
+    def error(self) -> bool:
+        """Исходная команда завершилась ошибкой."""
+        return bool(self.flags & FLAG_ERROR)
+
+    @property
+    def transaction(self) -> bool:
+        """Команды выполнялись транзакцией MULTI/EXEC."""
+        return bool(self.flags & FLAG_TRANSACTION)
+
+    @property
+    def pipeline(self) -> bool:
+        """Запись - конвейер или транзакция."""
+        return len(self.calls) > 1 or self.transaction
+
+
+@lru_cache(maxsize=64)
+def _filler(size: int) -> bytes:
+    return b"x" * size
+
+
+def _from_hash(value: int, size: int) -> bytes:
+    if size > HASHED_REPLAY_LENGTH:
+        return _filler(size)
+    text = b"%016x" % value
+    return (text * (size // len(text) + 1))[:size]
+
+
+class TraceReader:
+    """
+    Чтение трассы `TraceRecorder`.
+
+    Аргументы команд восстанавливаются синтетически: числа - как были,
+    хэшированные аргументы - детерминированной строкой из хэша той же
+    длины, остальные - заполнителем нужной длины.
+    """
+
+    def __init__(self, file: Union[str, "os.PathLike[str]", IO[bytes]]) -> None:
+        """
+        Raises:
+            DataError: Файл не является трассой поддерживаемой версии
+        """
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "rb") as f:
+                self._data = f.read()
+        else:
+            self._data = file.read()
+        if len(self._data) < _HEADER.size:
+            raise DataError("Файл слишком короткий для трассы")
+        magic, version, mode, wall = _HEADER.unpack_from(self._data)
+        if magic != TRACE_MAGIC:
+            raise DataError("Файл не является трассой zumic")
+        if version != TRACE_VERSION:
+            raise DataError(f"Неподдерживаемая версия трассы: {version}")
+        self.mode = mode
+        self.recorded_at = wall
+
+    def __iter__(self) -> Iterator[TraceRecord]:
+        data = self._data
+        names: Dict[int, bytes] = {}
+        pos = _HEADER.size
+        try:
+            while pos < len(data):
+                kind = data[pos]
+                if kind == _NAME:
+                    _, name_id, length = _NAME_HEAD.unpack_from(data, pos)
+                    pos += _NAME_HEAD.size
+                    names[name_id] = data[pos : pos + length]
+                    pos += length
+                    continue
+                if kind != _COMMAND:
+                    raise DataError(f"Неизвестный вид записи трассы: {kind}")
+                _, start, latency, flags, count = _COMMAND_HEAD.unpack_from(data, pos)
+                pos += _COMMAND_HEAD.size
+                record = TraceRecord(start / 1e6, latency / 1e6, flags=flags)
+                for _ in range(count):
+                    name_id, nargs = _CALL_HEAD.unpack_from(data, pos)
+                    pos += _CALL_HEAD.size
+                    call: List[bytes] = [names[name_id]]
+                    for _ in range(nargs):
+                        pos = self._read_arg(data, pos, call)
+                    record.calls.append(tuple(call))
+                yield record
+        except (struct.error, KeyError, IndexError) as e:
+            raise DataError("Трасса повреждена или обрезана") from e
+
+    @staticmethod
+    def _read_arg(data: bytes, pos: int, call: List[bytes]) -> int:
+        kind = data[pos]
+        if kind == _LITERAL:
+            length = data[pos + 1]
+            value = data[pos + 2 : pos + 2 + length]
+            if len(value) != length:
+                raise IndexError
+            call.append(value)
+            return pos + 2 + length
+        if kind == _SIZE:
+            _, size = _SIZE_ARG.unpack_from(data, pos)
+            call.append(_filler(size))
+            return pos + _SIZE_ARG.size
+        if kind == _HASHED:
+            _, size, value = _HASHED_ARG.unpack_from(data, pos)
+            call.append(_from_hash(value, size))
+            return pos + _HASHED_ARG.size
+        raise DataError(f"Неизвестный вид аргумента трассы: {kind}")
+
+
+def read_trace(file: Union[str, "os.PathLike[str]", IO[bytes]]) -> List[TraceRecord]:
+    """Читает все записи трассы."""
+    return list(TraceReader(file))
+
+
+def describe(records: Sequence[TraceRecord]) -> Dict[str, Any]:
+    """Сводка по трассе: число записей и команд, длительность, имена."""
+    commands = sum(len(record.calls) for record in records)
+    names: Dict[str, int] = {}
+    for record in records:
+        for call in record.calls:
+            name = call[0].decode("utf-8", "replace")
+            names[name] = names.get(name, 0) + 1
+    starts = [record.started for record in records]
+    span = max(starts) - min(starts) if records else 0.0
+    return {
+        "records": len(records),
+        "commands": commands,
+        "errors": sum(record.error for record in records),
+        "duration": span,
+        "names": dict(sorted(names.items(), key=lambda item: -item[1])),
+    }
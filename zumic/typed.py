@@ -0,0 +1,128 @@
+from array import array
+from typing import Any, Iterable, List, Optional, Sequence
+
+from zumic.connection_protocol import ConnectionProtocol
+from zumic.exceptions import DataError, ResponseError
+
+# Коды типов `array.array` для целых чисел и чисел с плавающей точкой
+INT_TYPECODES = "bBhHiIlLqQ"
+FLOAT_TYPECODES = "fd"
+
+
+class NumericReply:
+    """
+    Разбор ответа-массива чисел в `array.array`.
+
+    Передаётся в `Client.execute(..., numeric=...)` и в опции команд
+    конвейера. Соединения с быстрым разбором (`read_numeric_array`)
+    дописывают числа в типизированный массив по мере разбора, без
+    создания объектов ответа; с остальными соединениями используется
+    обычный ответ в сыром режиме.
+    """
+
+    __slots__ = ("typecode", "null")
+
+    def __init__(self, typecode: str = "q", null: float = 0) -> None:
+        """
+        Args:
+            typecode: Код типа `array.array` (по умолчанию int64)
+            null: Значение, подставляемое вместо отсутствующих элементов
+        """
+        if typecode not in INT_TYPECODES + FLOAT_TYPECODES:
+            raise ValueError(f"Неподдерживаемый код типа массива: {typecode!r}")
+        self.typecode = typecode
+        self.null = null
+
+    def read(self, connection: ConnectionProtocol) -> Optional[array]:
+        """
+        Читает ответ соединения и преобразует его в массив.
+
+        Raises:
+            ResponseError: Сервер вернул ошибку
+            DataError: Ответ не является массивом чисел нужного типа
+        """
+        reader = getattr(connection, "read_numeric_array", None)
+        if reader is not None:
+            return reader(self.typecode, self.null)
+        return self.from_reply(connection.read_response(False))
+
+    def from_reply(self, reply: Any) -> Optional[array]:
+        """Преобразует уже разобранный ответ (список или None) в массив."""
+        if reply is None:
+            return None
+        if not isinstance(reply, list):
+            raise DataError("Ожидался ответ-массив чисел")
+        for item in reply:
+            if isinstance(item, ResponseError):
+                raise item
+        return self.convert(reply)
+
+    def convert(self, values: Sequence[Any]) -> array:
+        """
+        Преобразует записи чисел в массив одним проходом.
+
+        Raises:
+            DataError: Значение не является числом или не помещается в тип
+        """
+        parse = float if self.typecode in FLOAT_TYPECODES else int
+        items: Iterable[Any] = values
+        if None in values:
+            null = self.null
+            items = (null if value is None else value for value in values)
+        try:
+            return array(self.typecode, map(parse, items))
+        except (ValueError, TypeError, OverflowError) as e:
+            raise DataError(
+                f"Ответ не является массивом чисел типа {self.typecode!r}"
+            ) from e
+
+    def __repr__(self) -> str:
+        return f"NumericReply({self.typecode!r}, null={self.null!r})"
+
+
+def read_reply(
+    connection: ConnectionProtocol,
+    decode: Optional[bool] = None,
+    numeric: Optional[NumericReply] = None,
+) -> Any:
+    """Читает ответ соединения обычным или числовым разбором."""
+    if numeric is not None:
+        return numeric.read(connection)
+    return connection.read_response(decode)
+
+
+async def read_reply_async(
+    connection: Any,
+    decode: Optional[bool] = None,
+    numeric: Optional[NumericReply] = None,
+) -> Any:
+    """Асинхронный вариант `read_reply` для `AsyncConnection`."""
+    if numeric is not None:
+        return numeric.from_reply(await connection.read_response(False))
+    return await connection.read_response(decode)
+
+
+def concat_arrays(parts: List[Optional[array]], typecode: str) -> array:
+    """Склеивает массивы частей ответа (None пропускаются)."""
+    result = array(typecode)
+    for part in parts:
+        if part is not None:
+            result.extend(part)
+    return result
+
+
+def as_numpy(values: array) -> Any:
+    """
+    Возвращает NumPy-представление массива (`numpy.ndarray`) без
+    копирования данных. NumPy - необязательная зависимость.
+
+    Raises:
+        ImportError: NumPy не установлен
+    """
+    try:
+        import numpy  # type: ignore[import-not-found]
+    except ImportError as e:
+        raise ImportError("Для массивов NumPy нужно установить пакет numpy") from e
+    if not values:
+        return numpy.empty(0, dtype=values.typecode)
+    return numpy.frombuffer(values, dtype=values.typecode)